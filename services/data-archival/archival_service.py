@@ -8,30 +8,159 @@ import io
 import json
 import logging
 import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+import itertools
+import re
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional, List, Dict, Tuple
 from uuid import uuid4
 
 import psycopg2
+from botocore.exceptions import ClientError
 from psycopg2.extras import RealDictCursor
 
-from .config import Config, ArchivalConfig
-from .storage_client import StorageClient, ArchiveMetadata
+from .config import Config, ArchivalConfig, ArchiveFormat, CompressionType
+from .storage_client import BandwidthLimiter, BulkDeleteResult, StorageClient, ArchiveMetadata
 from .compression import CompressionService
+from .archive_format import iter_archive_batches, open_archive_writer
+from .archive_search import PYARROW_AVAILABLE, ArchiveSearchResult, TimeRange, naive_utc, search_archive
+from .bloom import encode_bloom_filters
+from .catalog import (
+    ArchiveCatalog,
+    VERIFICATION_ERROR,
+    VERIFICATION_MISMATCH,
+    VERIFICATION_MISSING,
+    VERIFICATION_OK,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+class _ChecksumWriter(io.RawIOBase):
+    """Write-through stream that hashes and counts what passes through"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._sha256.update(data)
+        self.size += len(data)
+        return self._fileobj.write(data)
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class ArchivalError(RuntimeError):
+    """Archiving a table stopped on a failed segment
+
+    Attributes:
+        archives: Archives committed before the failure, oldest first
+    """
+
+    def __init__(self, message: str, archives: List["ArchiveMetadata"]):
+        super().__init__(message)
+        self.archives = archives
+
+
+@dataclass
+class ScrubResult:
+    """Outcome of an integrity scrub"""
+    verified: List[str] = field(default_factory=list)  # Archive IDs whose checksum matched
+    mismatched: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)  # Archive ID -> error
+    bytes_read: int = 0
+
+
+# Escapes of PostgreSQL's COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _copy_value(value: Any) -> str:
+    """Format one value for COPY text format (PostgreSQL casts it to the column type)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        text = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    else:
+        text = str(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+class _CopyStream(io.RawIOBase):
+    """Readable COPY text-format stream, encoded one record batch at a time"""
+
+    def __init__(self, batches: Iterable[List[Dict]], columns: List[str]):
+        self._batches = iter(batches)
+        self._columns = columns
+        self._buffer = memoryview(b"")
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            batch = next(self._batches, None)
+            if batch is None:
+                return 0
+            self._buffer = memoryview("".join(
+                "\t".join(_copy_value(record.get(column)) for column in self._columns) + "\n"
+                for record in batch
+            ).encode("utf-8"))
+            self.rows += len(batch)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
 class ArchivalService:
     """Service for archiving data to cold storage"""
 
-    def __init__(self, config: Config):
+    RESTORE_SPOOL_BYTES = 64 * 1024 * 1024  # Restores download to memory up to this size, then disk
+    COPY_BUFFER_BYTES = 1024 * 1024  # Bytes sent to the server per COPY read
+
+    def __init__(
+        self,
+        config: Config,
+        storage: Optional[StorageClient] = None,
+        catalog: Optional[ArchiveCatalog] = None,
+    ):
+        """
+        Args:
+            config: Service configuration
+            storage: Storage client to share with other services (e.g. the
+                workers of a ParallelArchiver); a new one is created if None
+            catalog: Archive catalog to share; opened from
+                config.archival.catalog_path if None
+        """
         self.config = config
-        self.storage = StorageClient(config.s3)
+        self._owns_storage = storage is None
+        self.storage = storage or StorageClient(config.s3)
+        self._owns_catalog = catalog is None
+        self.catalog = catalog or ArchiveCatalog(config.archival.catalog_path)
         self.compression = CompressionService(
             config.archival.compression,
             config.archival.compression_level,
+            config.archival.compression_threads,
         )
         self.db_conn = self._create_db_connection()
 
@@ -51,118 +180,352 @@ class ArchivalService:
         table_name: str,
         partition_key: str,
         cutoff_date: datetime,
-    ) -> Optional[ArchiveMetadata]:
+        start_date: Optional[datetime] = None,
+    ) -> List[ArchiveMetadata]:
         """
         Archive data from a table older than cutoff date
 
+        Rows are archived in segments of at most max_records_per_archive,
+        in (date column, primary key) order. Each segment is one archive
+        and one transaction: the rows are streamed from a server-side
+        cursor into a compressed archive, uploaded, and then exactly that
+        key range is deleted and committed. A failed or interrupted run
+        leaves every unarchived row in place, and the next run picks up
+        from the oldest remaining row.
+
         Args:
             table_name: Name of the table to archive
             partition_key: Partition identifier (e.g., "2024-01")
             cutoff_date: Archive data older than this date
+            start_date: Only archive data at or after this date, to split a
+                table into independent time partitions
 
         Returns:
-            ArchiveMetadata if successful, None otherwise
+            ArchiveMetadata for each archive created, oldest first
+
+        Raises:
+            ArchivalError: A segment failed. Its rows are kept and its
+                transaction rolled back; the error carries the archives
+                committed before it.
         """
-        try:
-            # Query data to archive
-            records = self._query_records_to_archive(table_name, cutoff_date)
-            if not records:
-                logger.info(f"No records to archive for {table_name} before {cutoff_date}")
-                return None
+        archives = []
+        after_key = None
+
+        while True:
+            try:
+                result = self._archive_segment(
+                    table_name, partition_key, cutoff_date, after_key, start_date
+                )
+            except Exception as e:
+                logger.error(f"Failed to archive {table_name} {partition_key}: {e}")
+                try:
+                    self.db_conn.rollback()
+                except Exception as rollback_error:
+                    logger.error(f"Rollback failed, connection unusable: {rollback_error}")
+                raise ArchivalError(
+                    f"Failed to archive {table_name} {partition_key} after "
+                    f"{len(archives)} archives: {e}",
+                    archives,
+                ) from e
+
+            if result is None:
+                break
+
+            metadata, after_key = result
+            archives.append(metadata)
+
+        if not archives:
+            logger.info(f"No records archived for {table_name} before {cutoff_date}")
+
+        return archives
+
+    def _archive_segment(
+        self,
+        table_name: str,
+        partition_key: str,
+        cutoff_date: datetime,
+        after_key: Optional[Tuple],
+        start_date: Optional[datetime] = None,
+    ) -> Optional[Tuple[ArchiveMetadata, Tuple]]:
+        """
+        Archive and delete one segment of rows in a single transaction
+
+        The transaction runs at REPEATABLE READ, so the DELETE sees the
+        same snapshot as the SELECT and removes exactly the rows that were
+        written to the archive.
 
-            # Convert to JSON
-            records_json = json.dumps(records, default=str, indent=2)
-            original_size = len(records_json.encode("utf-8"))
+        Args:
+            table_name: Name of the table to archive
+            partition_key: Partition identifier
+            cutoff_date: Archive data older than this date
+            after_key: (date, primary key) of the last row archived by the
+                previous segment, or None to start from the oldest row
+            start_date: Only archive data at or after this date
+
+        Returns:
+            Tuple of (metadata, last key archived), or None if no rows remain
 
-            # Compress data
-            compressed_data = self.compression.compress(records_json.encode("utf-8"))
-            compressed_size = len(compressed_data)
+        Raises:
+            RuntimeError: The archive could not be stored or the rows not
+                deleted; the transaction is rolled back and the archive removed
+        """
+        date_column = self._get_date_column(table_name)
+        key_column = self._get_primary_key(table_name)
+        archival = self.config.archival
 
-            # Calculate checksum
-            checksum = hashlib.sha256(compressed_data).hexdigest()
+        with self.db_conn.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
 
-            # Create metadata
-            archive_id = str(uuid4())
-            now = datetime.utcnow()
-            retention_until = now + timedelta(days=self.config.archival.cold_retention_years * 365)
+        archive_id = str(uuid4())
+        now = datetime.utcnow()
+        retention_until = now + timedelta(days=archival.cold_retention_years * 365)
+        s3_key = f"{archival.archive_prefix}/{table_name}/{partition_key}/{archive_id}.{self._archive_extension()}"
+        dictionary_id = self._compression_dictionary(table_name)
 
-            s3_key = f"{self.config.archival.archive_prefix}/{table_name}/{partition_key}/{archive_id}.{self.config.archival.compression.value}"
+        # Stream straight into a multipart upload; only the part buffers
+        # are held in memory
+        object_metadata = {
+            "archive-id": archive_id,
+            "table-name": table_name,
+            "partition-key": partition_key,
+            "compression": archival.compression.value,
+            "format": archival.archive_format.value,
+            "created-at": now.isoformat(),
+            "retention-until": retention_until.isoformat(),
+        }
+        if dictionary_id is not None:
+            object_metadata["compression-dictionary"] = str(dictionary_id)
+        upload = self.storage.open_upload(s3_key, object_metadata)
+        try:
+            sink = _ChecksumWriter(upload)
+            record_count, original_size, first_key, last_key, schema, bloom_filters = self._write_segment(
+                sink, table_name, date_column, key_column, cutoff_date, after_key, start_date, dictionary_id
+            )
+            if record_count == 0:
+                self.db_conn.rollback()
+                return None
 
             metadata = ArchiveMetadata(
                 archive_id=archive_id,
                 table_name=table_name,
                 partition_key=partition_key,
-                record_count=len(records),
+                record_count=record_count,
                 original_size_bytes=original_size,
-                compressed_size_bytes=compressed_size,
-                compression_type=self.config.archival.compression.value,
+                compressed_size_bytes=sink.size,
+                compression_type=archival.compression.value,
                 created_at=now.isoformat(),
-                checksum_sha256=checksum,
+                checksum_sha256=sink.hexdigest(),
                 s3_key=s3_key,
                 retention_until=retention_until.isoformat(),
+                archive_format=archival.archive_format.value,
+                schema=schema,
+                first_record_at=self._record_time(first_key[0]),
+                last_record_at=self._record_time(last_key[0]),
+                bloom_filter_columns=sorted(bloom_filters) or None,
+                compression_dictionary_id=dictionary_id,
             )
 
-            # Upload to S3
-            data_stream = io.BytesIO(compressed_data)
-            success = self.storage.upload_archive(data_stream, metadata)
-
-            if not success:
-                logger.error(f"Failed to upload archive for {table_name}")
-                return None
+            # Finish the upload to S3
+            if not upload.complete():
+                self.db_conn.rollback()
+                raise RuntimeError(f"upload of {s3_key} failed")
+            if bloom_filters and not self.storage.put_bloom_filters(
+                archive_id, encode_bloom_filters(bloom_filters)
+            ):
+                self.db_conn.rollback()
+                self.storage.delete_archive(s3_key, archive_id)
+                raise RuntimeError(f"storing bloom filters of {archive_id} failed")
+            if not self.storage.put_metadata(metadata):
+                self.db_conn.rollback()
+                self.storage.delete_archive(s3_key, archive_id)
+                raise RuntimeError(f"storing metadata of {archive_id} failed")
+            self._catalog_add(metadata)
+        finally:
+            upload.close()
 
-            # Delete archived records from hot storage
-            deleted_count = self._delete_archived_records(table_name, cutoff_date)
-            logger.info(
-                f"Archived and deleted {deleted_count} records from {table_name} "
-                f"(compression ratio: {self.compression.get_compression_ratio(original_size, compressed_size):.2%})"
+        # Delete archived records from hot storage, same transaction
+        try:
+            deleted_count = self._delete_archived_records(
+                table_name, cutoff_date, first_key, last_key
             )
+            if deleted_count != record_count:
+                raise RuntimeError(
+                    f"deleted {deleted_count} rows but archived {record_count}"
+                )
+            self.db_conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to delete archived rows from {table_name}, keeping them: {e}")
+            self.db_conn.rollback()
+            if self.storage.delete_archive(metadata.s3_key, metadata.archive_id):
+                self.catalog.remove([metadata.archive_id])
+            raise
 
-            return metadata
+        logger.info(
+            f"Archived and deleted {deleted_count} records from {table_name} "
+            f"(compression ratio: {self.compression.get_compression_ratio(original_size, sink.size):.2%})"
+        )
+        return metadata, last_key
 
-        except Exception as e:
-            logger.error(f"Failed to archive {table_name}: {e}")
+    def _write_segment(
+        self,
+        sink: BinaryIO,
+        table_name: str,
+        date_column: str,
+        key_column: str,
+        cutoff_date: datetime,
+        after_key: Optional[Tuple],
+        start_date: Optional[datetime] = None,
+        dictionary_id: Optional[int] = None,
+    ) -> Tuple[int, int, Optional[Tuple], Optional[Tuple], Optional[Dict[str, str]], Dict[str, List]]:
+        """
+        Stream one segment of rows into sink in the configured archive format
+
+        Returns:
+            Tuple of (record count, uncompressed bytes, first key, last key,
+            column schema or None, row-group bloom filters by column)
+        """
+        record_count = 0
+        original_size = 0
+        first_key = last_key = None
+
+        archival = self.config.archival
+        writer = open_archive_writer(
+            archival.archive_format,
+            sink,
+            self.compression,
+            archival.bloom_filter_columns,
+            archival.bloom_filter_fpp,
+            dictionary_id,
+        )
+        try:
+            records = self._query_records_to_archive(table_name, cutoff_date, after_key, start_date)
+            for description, chunk in records:
+                if first_key is None:
+                    first_key = (chunk[0][date_column], chunk[0][key_column])
+                last_key = (chunk[-1][date_column], chunk[-1][key_column])
+
+                original_size += writer.write_chunk(chunk, description)
+                record_count += len(chunk)
+        finally:
+            original_size += writer.close()
+
+        return record_count, original_size, first_key, last_key, writer.schema, writer.bloom_filters
+
+    @staticmethod
+    def _record_time(value: Any) -> Optional[str]:
+        """Date column value as a naive UTC ISO 8601 string, for the catalog"""
+        if value is None:
             return None
+        value = naive_utc(value)
+        return value.isoformat() if isinstance(value, (datetime, date)) else str(value)
 
     def _query_records_to_archive(
         self,
         table_name: str,
         cutoff_date: datetime,
-    ) -> List[Dict]:
-        """Query records older than cutoff date"""
-        # Determine date column based on table
+        after_key: Optional[Tuple] = None,
+        start_date: Optional[datetime] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream records older than cutoff date, in chunks
+
+        Uses a server-side cursor and keyset pagination on (date column,
+        primary key), so memory stays at one chunk and each segment seeks
+        straight past the rows earlier segments archived.
+
+        Args:
+            table_name: Name of the table
+            cutoff_date: Records older than this date
+            after_key: Only records after this (date, primary key)
+            start_date: Only records at or after this date
+
+        Yields:
+            Tuples of (cursor description, list of up to chunk_size records)
+        """
         date_column = self._get_date_column(table_name)
+        key_column = self._get_primary_key(table_name)
+        chunk_size = self.config.archival.chunk_size
 
         query = f"""
         SELECT *
         FROM {table_name}
         WHERE {date_column} < %s
-        ORDER BY {date_column}
+        {f"AND ({date_column}, {key_column}) > (%s, %s)" if after_key else ""}
+        {f"AND {date_column} >= %s" if start_date else ""}
+        ORDER BY {date_column}, {key_column}
         LIMIT %s
         """
+        params = (
+            cutoff_date,
+            *(after_key or ()),
+            *((start_date,) if start_date else ()),
+            self.config.archival.max_records_per_archive,
+        )
+
+        with self.db_conn.cursor(name=f"archive_{uuid4().hex}") as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(query, params)
+            while True:
+                records = cursor.fetchmany(chunk_size)
+                if not records:
+                    break
+                yield cursor.description, [dict(record) for record in records]
+
+    def get_oldest_record_date(self, table_name: str, cutoff_date: datetime) -> Optional[datetime]:
+        """
+        Get the date of the oldest record due for archival
+
+        Args:
+            table_name: Name of the table
+            cutoff_date: Records older than this date
+
+        Returns:
+            Oldest date, or None if nothing is older than the cutoff
+        """
+        date_column = self._get_date_column(table_name)
 
         with self.db_conn.cursor() as cursor:
-            cursor.execute(query, (cutoff_date, self.config.archival.chunk_size))
-            records = cursor.fetchall()
-            return [dict(record) for record in records]
+            cursor.execute(
+                f"SELECT MIN({date_column}) AS oldest FROM {table_name} WHERE {date_column} < %s",
+                (cutoff_date,),
+            )
+            row = cursor.fetchone()
+        self.db_conn.rollback()  # End the read-only transaction
+
+        return row["oldest"] if row else None
 
     def _delete_archived_records(
         self,
         table_name: str,
         cutoff_date: datetime,
+        first_key: Tuple,
+        last_key: Tuple,
     ) -> int:
-        """Delete records that have been archived"""
+        """
+        Delete exactly the archived key range, without committing
+
+        Args:
+            table_name: Name of the table
+            cutoff_date: Cutoff the segment was archived with
+            first_key: (date, primary key) of the first archived row
+            last_key: (date, primary key) of the last archived row
+
+        Returns:
+            Number of rows deleted
+        """
         date_column = self._get_date_column(table_name)
+        key_column = self._get_primary_key(table_name)
 
         query = f"""
         DELETE FROM {table_name}
         WHERE {date_column} < %s
+        AND ({date_column}, {key_column}) >= (%s, %s)
+        AND ({date_column}, {key_column}) <= (%s, %s)
         """
 
         with self.db_conn.cursor() as cursor:
-            cursor.execute(query, (cutoff_date,))
-            deleted_count = cursor.rowcount
-            self.db_conn.commit()
-            return deleted_count
+            cursor.execute(query, (cutoff_date, *first_key, *last_key))
+            return cursor.rowcount
 
     def _get_date_column(self, table_name: str) -> str:
         """Get the date column name for a table"""
@@ -176,119 +539,380 @@ class ArchivalService:
         }
         return date_columns.get(table_name, "created_at")
 
-    def restore_archive(self, archive_id: str) -> Optional[List[Dict]]:
+    def _archive_extension(self) -> str:
+        """S3 key extension for new archives"""
+        archival = self.config.archival
+        if archival.archive_format == ArchiveFormat.PARQUET:
+            return "parquet"
+        return archival.compression.value
+
+    def _get_primary_key(self, table_name: str) -> str:
+        """Get the primary key column used as keyset tie-breaker"""
+        return "id"
+
+    def _catalog_add(self, metadata: ArchiveMetadata) -> None:
+        """Index a stored archive; S3 keeps it even if the catalog write fails"""
+        try:
+            self.catalog.add(metadata)
+        except sqlite3.Error as e:
+            logger.error(
+                f"Failed to catalog archive {metadata.archive_id}, run reconcile_catalog: {e}"
+            )
+
+    def _uses_compression_dictionary(self, table_name: str) -> bool:
+        """Whether archives of a table are compressed with a trained dictionary"""
+        archival = self.config.archival
+        return (
+            table_name in archival.compression_dictionary_tables
+            and archival.archive_format == ArchiveFormat.JSON
+            and self.compression.compression_type == CompressionType.ZSTD
+        )
+
+    def _compression_dictionary(self, table_name: str) -> Optional[int]:
+        """Newest dictionary of a table, loaded; None to compress without one"""
+        if not self._uses_compression_dictionary(table_name):
+            return None
+        dictionary_id = self.catalog.current_dictionary(table_name)
+        if dictionary_id is None or not self._load_dictionary(table_name, dictionary_id):
+            return None
+        return dictionary_id
+
+    def _load_dictionary(self, table_name: str, dictionary_id: int) -> bool:
+        """Register a stored dictionary with the compression service"""
+        if self.compression.has_dictionary(dictionary_id):
+            return True
+        data = self.storage.get_dictionary(table_name, dictionary_id)
+        if data is None:
+            return False
+        self.compression.add_dictionary(data)
+        return True
+
+    def train_compression_dictionary(self, table_name: str) -> Optional[int]:
+        """
+        Train a new version of a table's compression dictionary
+
+        Samples the oldest rows, the next to be archived, serialized the
+        way JSON archives store them. The dictionary is stored in S3 and
+        becomes the table's current one; earlier versions stay in place
+        for the archives compressed with them.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Dictionary ID, or None if the table doesn't use dictionaries
+            or training failed
+        """
+        if not self._uses_compression_dictionary(table_name):
+            logger.info(f"{table_name} archives are not compressed with a dictionary")
+            return None
+
+        archival = self.config.archival
+        date_column = self._get_date_column(table_name)
+        try:
+            with self.db_conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT * FROM {table_name} ORDER BY {date_column} LIMIT %s",
+                    (archival.compression_dictionary_samples,),
+                )
+                rows = cursor.fetchall()
+            self.db_conn.rollback()  # End the read-only transaction
+
+            samples = [json.dumps(dict(row), default=str).encode("utf-8") for row in rows]
+            data = CompressionService.train_dictionary(samples, archival.compression_dictionary_size)
+            dictionary_id = self.compression.add_dictionary(data)
+        except Exception as e:
+            logger.error(f"Failed to train compression dictionary for {table_name}: {e}")
+            self.db_conn.rollback()
+            return None
+
+        if self.storage.put_dictionary(table_name, dictionary_id, data) is None:
+            return None
+        self.catalog.add_dictionary(table_name, dictionary_id, datetime.utcnow())
+        logger.info(
+            f"Trained compression dictionary {dictionary_id} for {table_name} "
+            f"({len(data)} bytes from {len(samples)} rows)"
+        )
+        return dictionary_id
+
+    def train_compression_dictionaries(self) -> Dict[str, Optional[int]]:
+        """
+        Train a new dictionary for every table that uses one
+
+        Returns:
+            Table name to the new dictionary ID (None if training failed)
+        """
+        return {
+            table_name: self.train_compression_dictionary(table_name)
+            for table_name in self.config.archival.tables_to_archive
+            if self._uses_compression_dictionary(table_name)
+        }
+
+    def restore_archive(
+        self,
+        archive_id: str,
+        target_schema: Optional[str] = None,
+    ) -> Optional[List[Dict]]:
         """
         Restore archived data back to hot storage
 
+        Loads the archive like bulk_restore_archive and also returns its
+        records. Use bulk_restore_archive for archives too large to hold
+        in memory.
+
         Args:
             archive_id: Unique archive identifier
+            target_schema: Restore into this schema instead of the live table
 
         Returns:
             List of restored records, or None if restoration fails
         """
+        records: List[Dict] = []
+        if self._restore(archive_id, target_schema, on_batch=records.extend) is None:
+            return None
+        return records
+
+    def bulk_restore_archive(
+        self,
+        archive_id: str,
+        target_schema: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Stream an archive back into the database
+
+        The archive is downloaded to a spool file and its checksum checked
+        before anything is loaded. Record batches are then decoded
+        incrementally and loaded with COPY into a temporary staging table,
+        and moved into the target with one INSERT ... ON CONFLICT DO
+        NOTHING, so rows still (or again) present are skipped. The restore
+        is one transaction: it loads completely or not at all.
+
+        Args:
+            archive_id: Unique archive identifier
+            target_schema: Restore into a table of the same name in this
+                schema (created, with the live table's columns, indexes and
+                constraints, if missing), e.g. for an investigation
+                without touching live data
+
+        Returns:
+            Number of rows inserted, or None if restoration fails
+        """
+        return self._restore(archive_id, target_schema)
+
+    def _restore(
+        self,
+        archive_id: str,
+        target_schema: Optional[str],
+        on_batch: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> Optional[int]:
         try:
             # Get metadata
-            metadata = self.storage.get_metadata(archive_id)
+            metadata = self.catalog.get(archive_id) or self.storage.get_metadata(archive_id)
             if metadata is None:
                 logger.error(f"Metadata not found for archive {archive_id}")
                 return None
 
-            # Download archive
-            compressed_data = self.storage.download_archive(metadata.s3_key)
-            if compressed_data is None:
-                logger.error(f"Failed to download archive {archive_id}")
-                return None
+            with tempfile.SpooledTemporaryFile(max_size=self.RESTORE_SPOOL_BYTES) as spool:
+                # Download archive
+                actual_checksum = self.storage.download_archive_to(metadata.s3_key, spool)
+                if actual_checksum is None:
+                    logger.error(f"Failed to download archive {archive_id}")
+                    return None
 
-            # Verify integrity
-            actual_checksum = hashlib.sha256(compressed_data).hexdigest()
-            if actual_checksum != metadata.checksum_sha256:
-                logger.error(
-                    f"Checksum mismatch for archive {archive_id}: "
-                    f"expected {metadata.checksum_sha256}, got {actual_checksum}"
+                # Verify integrity
+                if actual_checksum != metadata.checksum_sha256:
+                    logger.error(
+                        f"Checksum mismatch for archive {archive_id}: "
+                        f"expected {metadata.checksum_sha256}, got {actual_checksum}"
+                    )
+                    return None
+
+                dictionary_id = metadata.compression_dictionary_id
+                if dictionary_id is not None and not self._load_dictionary(metadata.table_name, dictionary_id):
+                    logger.error(f"Compression dictionary {dictionary_id} of archive {archive_id} not found")
+                    return None
+
+                # Decode batch by batch (Parquet archives keep their column types)
+                spool.seek(0)
+                batches = iter_archive_batches(
+                    spool,
+                    metadata.archive_format,
+                    self.compression,
+                    self.config.archival.chunk_size,
+                    dictionary_id,
                 )
-                return None
+                if on_batch is not None:
+                    batches = self._tap_batches(batches, on_batch)
 
-            # Decompress
-            decompressed_data = self.compression.decompress(compressed_data)
-            records_json = decompressed_data.decode("utf-8")
-            records = json.loads(records_json)
+                restored_count = self._copy_restored_records(metadata.table_name, batches, target_schema)
 
-            # Insert records back into table
-            restored_count = self._insert_restored_records(metadata.table_name, records)
             logger.info(f"Restored {restored_count} records from archive {archive_id}")
-
-            return records
+            return restored_count
 
         except Exception as e:
             logger.error(f"Failed to restore archive {archive_id}: {e}")
             return None
 
-    def _insert_restored_records(self, table_name: str, records: List[Dict]) -> int:
-        """Insert restored records back into the database"""
-        if not records:
-            return 0
+    @staticmethod
+    def _tap_batches(
+        batches: Iterator[List[Dict]],
+        on_batch: Callable[[List[Dict]], None],
+    ) -> Iterator[List[Dict]]:
+        for batch in batches:
+            on_batch(batch)
+            yield batch
+
+    def _copy_restored_records(
+        self,
+        table_name: str,
+        batches: Iterator[List[Dict]],
+        target_schema: Optional[str] = None,
+    ) -> int:
+        """
+        Load record batches into a table through a COPY staging table
 
-        # Generate INSERT statement dynamically
-        columns = list(records[0].keys())
-        placeholders = ", ".join(["%s"] * len(columns))
-        column_names = ", ".join(columns)
+        Args:
+            table_name: Table the records were archived from
+            batches: Record batches, all with the same columns
+            target_schema: Schema of the target table (None: the live table)
 
-        query = f"""
-        INSERT INTO {table_name} ({column_names})
-        VALUES ({placeholders})
-        ON CONFLICT DO NOTHING
+        Returns:
+            Number of rows inserted
         """
+        batches = iter(batches)
+        first = next(batches, None)
+        if not first:
+            return 0
 
-        inserted_count = 0
-        with self.db_conn.cursor() as cursor:
-            for record in records:
-                values = [record[col] for col in columns]
-                try:
-                    cursor.execute(query, values)
-                    inserted_count += cursor.rowcount
-                except Exception as e:
-                    logger.warning(f"Failed to insert record: {e}")
-                    continue
+        for name in (table_name, target_schema) if target_schema else (table_name,):
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid identifier for restore: {name!r}")
+
+        columns = list(first[0].keys())
+        column_names = ", ".join(f'"{column}"' for column in columns)
+        target = f"{target_schema}.{table_name}" if target_schema else table_name
+        staging = f"restore_staging_{table_name}"
+
+        try:
+            with self.db_conn.cursor() as cursor:
+                if target_schema:
+                    cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {target_schema}")
+                    cursor.execute(
+                        f"CREATE TABLE IF NOT EXISTS {target} (LIKE {table_name} INCLUDING ALL)"
+                    )
+                cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {target}) ON COMMIT DROP")
+
+                stream = _CopyStream(itertools.chain([first], batches), columns)
+                cursor.copy_expert(
+                    f"COPY {staging} ({column_names}) FROM STDIN", stream, size=self.COPY_BUFFER_BYTES
+                )
+                cursor.execute(f"""
+                    INSERT INTO {target} ({column_names})
+                    SELECT {column_names} FROM {staging}
+                    ON CONFLICT DO NOTHING
+                """)
+                inserted_count = cursor.rowcount
 
             self.db_conn.commit()
+        except Exception:
+            self.db_conn.rollback()
+            raise
 
+        logger.info(f"Loaded {stream.rows} archived rows into {target}, {inserted_count} new")
         return inserted_count
 
-    def list_archives_for_table(self, table_name: str) -> List[ArchiveMetadata]:
+    def list_archives_for_table(
+        self,
+        table_name: str,
+        partition: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[ArchiveMetadata]:
         """
-        List all archives for a specific table
+        List archives for a specific table, from the catalog
 
         Args:
             table_name: Name of the table
+            partition: Only this partition, or partitions under it
+                (e.g., "2024-01" includes "2024-01-15")
+            created_from: Only archives created at or after this time
+            created_to: Only archives created before this time
 
         Returns:
             List of ArchiveMetadata objects
         """
-        prefix = f"{self.config.archival.archive_prefix}/{table_name}/"
-        s3_keys = self.storage.list_archives(prefix)
+        return self.catalog.find(table_name, partition, created_from, created_to)
 
-        archives = []
-        for s3_key in s3_keys:
-            # Extract archive ID from key
-            # Format: archives/{table}/{partition}/{archive_id}.{ext}
-            parts = s3_key.split("/")
-            if len(parts) >= 4:
-                filename = parts[-1]
-                archive_id = filename.split(".")[0]
-
-                metadata = self.storage.get_metadata(archive_id)
-                if metadata:
-                    archives.append(metadata)
+    def search_archives(
+        self,
+        table_name: str,
+        predicate: Dict[str, Any],
+        time_range: Optional[TimeRange] = None,
+    ) -> ArchiveSearchResult:
+        """
+        Find archived records without restoring them
 
-        return archives
+        Candidate archives come from the catalog (by table and record date
+        range). In each one, row groups are ruled out by their bloom
+        filters (for the bloom_filter_columns, e.g. a_number and
+        b_number) and min/max statistics, and only the remaining row
+        groups are fetched, with ranged GETs. Nothing is written to the
+        database. JSON archives can't be searched this way and are listed
+        in the result's unsearchable.
+
+        Args:
+            table_name: Archived table
+            predicate: Column name to the value it must equal,
+                e.g. {"b_number": "+2348031234567"}
+            time_range: (start, end) of the table's date column, end
+                exclusive; either may be None
+
+        Returns:
+            ArchiveSearchResult with the matching records, oldest archive first
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Archive search requires pyarrow")
+
+        start, end = time_range or (None, None)
+        candidates = self.catalog.find(
+            table_name,
+            records_from=naive_utc(start),
+            records_to=naive_utc(end),
+        )
+        date_column = self._get_date_column(table_name)
+
+        result = ArchiveSearchResult()
+        with ThreadPoolExecutor(max_workers=self.config.archival.max_workers) as pool:
+            for archive_result in pool.map(
+                lambda metadata: search_archive(self.storage, metadata, predicate, date_column, time_range),
+                candidates,
+            ):
+                result.merge(archive_result)
+
+        logger.info(
+            f"Searched {result.archives_searched} archives of {table_name} "
+            f"({result.archives_skipped} skipped), read {result.row_groups_read} of "
+            f"{result.row_groups_total} row groups ({result.bytes_read} bytes): "
+            f"{len(result.records)} records"
+        )
+        if result.unsearchable:
+            logger.warning(f"{len(result.unsearchable)} JSON archives not searched: {result.unsearchable}")
+        if result.failed:
+            logger.error(f"{len(result.failed)} archives could not be searched: {sorted(result.failed)}")
+        return result
 
-    def get_retention_statistics(self) -> Dict[str, any]:
+    def get_retention_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about data retention and archival
 
         Returns:
             Dictionary with retention statistics
+
+        Raises:
+            RuntimeError: If the catalog needed a bootstrap from S3 and it
+                failed (see ensure_catalog)
         """
+        self.ensure_catalog()
         stats = {
             "total_archives": 0,
             "total_archived_records": 0,
@@ -298,16 +922,17 @@ class ArchivalService:
             "by_table": {},
         }
 
+        by_table = self.catalog.statistics()
         for table_name in self.config.archival.tables_to_archive:
-            archives = self.list_archives_for_table(table_name)
-            if not archives:
+            totals = by_table.get(table_name)
+            if not totals:
                 continue
 
             table_stats = {
-                "archive_count": len(archives),
-                "record_count": sum(a.record_count for a in archives),
-                "compressed_size_mb": sum(a.compressed_size_bytes for a in archives) / (1024 * 1024),
-                "original_size_mb": sum(a.original_size_bytes for a in archives) / (1024 * 1024),
+                "archive_count": totals["archive_count"],
+                "record_count": totals["record_count"],
+                "compressed_size_mb": totals["compressed_size_bytes"] / (1024 * 1024),
+                "original_size_mb": totals["original_size_bytes"] / (1024 * 1024),
             }
 
             stats["by_table"][table_name] = table_stats
@@ -330,23 +955,193 @@ class ArchivalService:
         Returns:
             Number of archives deleted
         """
-        now = datetime.utcnow()
-        deleted_count = 0
+        return len(self.sweep_expired_archives().deleted)
 
-        for table_name in self.config.archival.tables_to_archive:
-            archives = self.list_archives_for_table(table_name)
-            for metadata in archives:
-                retention_until = datetime.fromisoformat(metadata.retention_until)
-                if now > retention_until:
-                    logger.info(f"Deleting expired archive {metadata.archive_id}")
-                    success = self.storage.delete_archive(metadata.s3_key, metadata.archive_id)
-                    if success:
-                        deleted_count += 1
-
-        logger.info(f"Deleted {deleted_count} expired archives")
-        return deleted_count
+    def sweep_expired_archives(self, limit: Optional[int] = None) -> BulkDeleteResult:
+        """
+        Delete expired archives in bulk
+
+        Expired archives come from the catalog's retention index, oldest
+        first, and are deleted with concurrent batched DeleteObjects
+        requests. Deleted archives leave the catalog; failed ones stay and
+        are retried by the next sweep.
+
+        Args:
+            limit: Maximum number of archives to delete in this sweep
+
+        Returns:
+            BulkDeleteResult with deleted and failed archive IDs
+
+        Raises:
+            RuntimeError: If the catalog needed a bootstrap from S3 and it
+                failed (see ensure_catalog); nothing is deleted
+        """
+        self.ensure_catalog()
+        expired = self.catalog.expired(datetime.utcnow(), limit=limit)
+        if not expired:
+            logger.info("No expired archives")
+            return BulkDeleteResult()
+
+        logger.info(f"Deleting {len(expired)} expired archives")
+        result = self.storage.delete_archives(expired)
+        self.catalog.remove(result.deleted)
+
+        for archive_id, error in result.failed.items():
+            logger.error(f"Failed to delete expired archive {archive_id}: {error}")
+        logger.info(f"Deleted {len(result.deleted)} expired archives, {len(result.failed)} failed")
+        return result
+
+    def scrub_archives(self, limit: Optional[int] = None) -> ScrubResult:
+        """
+        Re-verify the checksums of a rotating sample of archives
+
+        Takes the archives verified least recently (never-verified first)
+        from the catalog, so consecutive runs cycle through all of them.
+        Each archive is hashed as it streams from S3, scrub_concurrency
+        at a time, and their combined read rate is capped at
+        scrub_bandwidth_mb_per_second. Every outcome is recorded in the
+        catalog (see ArchiveCatalog.verification_failures).
+
+        Args:
+            limit: Archives to verify (default: scrub_archives_per_run)
+
+        Returns:
+            ScrubResult with the archives verified, mismatched, missing
+            and unreadable
+        """
+        archival = self.config.archival
+        limit = archival.scrub_archives_per_run if limit is None else limit
+        archives = self.catalog.least_recently_verified(limit)
+
+        limiter = None
+        if archival.scrub_bandwidth_mb_per_second > 0:
+            limiter = BandwidthLimiter(archival.scrub_bandwidth_mb_per_second * 1024 * 1024)
+
+        def verify(metadata: ArchiveMetadata) -> Tuple[str, Optional[str], int]:
+            try:
+                checksum, size = self.storage.stream_checksum(metadata.s3_key, limiter=limiter)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                    return VERIFICATION_MISSING, str(e), 0
+                return VERIFICATION_ERROR, str(e), 0
+            except Exception as e:
+                return VERIFICATION_ERROR, str(e), 0
+            if checksum != metadata.checksum_sha256:
+                return VERIFICATION_MISMATCH, f"expected {metadata.checksum_sha256}, got {checksum}", size
+            return VERIFICATION_OK, None, size
+
+        result = ScrubResult()
+        if not archives:
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=min(archival.scrub_concurrency, len(archives)), thread_name_prefix="scrub"
+        ) as pool:
+            for metadata, (status, detail, size) in zip(archives, pool.map(verify, archives)):
+                self.catalog.record_verification(metadata.archive_id, status, datetime.utcnow(), detail)
+                result.bytes_read += size
+                if status == VERIFICATION_OK:
+                    result.verified.append(metadata.archive_id)
+                elif status == VERIFICATION_MISMATCH:
+                    result.mismatched.append(metadata.archive_id)
+                    logger.error(f"Archive {metadata.archive_id} ({metadata.s3_key}) is corrupt: {detail}")
+                elif status == VERIFICATION_MISSING:
+                    result.missing.append(metadata.archive_id)
+                    logger.error(f"Archive {metadata.archive_id} ({metadata.s3_key}) is missing from S3")
+                else:
+                    result.errors[metadata.archive_id] = detail
+                    logger.warning(f"Could not verify archive {metadata.archive_id}: {detail}")
+
+        logger.info(
+            f"Scrubbed {len(archives)} archives ({result.bytes_read / (1024 * 1024):.1f} MB): "
+            f"{len(result.verified)} ok, {len(result.mismatched)} corrupt, "
+            f"{len(result.missing)} missing, {len(result.errors)} unreadable"
+        )
+        return result
+
+    def reconcile_catalog(self) -> Dict[str, Any]:
+        """
+        Rebuild the catalog from S3
+
+        Lists the archive and metadata prefixes in full (paginated) and
+        fetches the metadata JSON of every archive whose data object
+        exists. The catalog is then replaced in one transaction. Stored
+        compression dictionaries are re-registered, newest last, and the
+        time of the reconcile is recorded (see ensure_catalog).
+
+        Returns:
+            Dictionary with the archive count, entries added and removed,
+            archive IDs whose data object is missing, data objects
+            without metadata and the compression dictionary count
+        """
+        archival = self.config.archival
+        data_keys = {obj["Key"] for obj in self.storage.iter_objects(f"{archival.archive_prefix}/")}
+        archive_ids = [
+            obj["Key"].rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            for obj in self.storage.iter_objects(f"{archival.metadata_prefix}/")
+            if obj["Key"].endswith(".json")
+        ]
+
+        with ThreadPoolExecutor(max_workers=archival.max_workers) as pool:
+            found = [m for m in pool.map(self.storage.get_metadata, archive_ids) if m is not None]
+
+        archives = [m for m in found if m.s3_key in data_keys]
+        missing_data = sorted(m.archive_id for m in found if m.s3_key not in data_keys)
+        orphaned_objects = sorted(data_keys - {m.s3_key for m in found})
+
+        added, removed = self.catalog.replace_all(archives)
+
+        dictionaries = 0
+        for obj in self.storage.iter_objects("dictionaries/"):
+            _, table_name, name = obj["Key"].split("/", 2)
+            self.catalog.add_dictionary(table_name, int(name.split(".", 1)[0]), naive_utc(obj["LastModified"]))
+            dictionaries += 1
+        self.catalog.record_reconcile(datetime.utcnow())
+
+        logger.info(
+            f"Catalog reconciled: {len(archives)} archives ({added} added, {removed} removed), "
+            f"{len(missing_data)} without data, {len(orphaned_objects)} objects without metadata, "
+            f"{dictionaries} compression dictionaries"
+        )
+        return {
+            "archives": len(archives),
+            "added": added,
+            "removed": removed,
+            "missing_data": missing_data,
+            "orphaned_objects": orphaned_objects,
+            "dictionaries": dictionaries,
+        }
+
+    def ensure_catalog(self) -> Optional[Dict[str, Any]]:
+        """
+        Bootstrap the catalog from S3 if it has never been reconciled
+
+        Uploads only catalog their own archives, so a catalog that was
+        never reconciled (a new, empty catalog on a fresh volume, or one
+        that a deployment started filling after archiving without it)
+        misses older archives. Expiry and statistics read only the
+        catalog and would skip them.
+
+        Returns:
+            Reconcile report if the catalog was bootstrapped, else None
+
+        Raises:
+            RuntimeError: If the bootstrap reconcile failed
+        """
+        if self.catalog.last_reconciled() is not None:
+            return None
+
+        logger.info("Archive catalog was never reconciled with S3, bootstrapping it")
+        try:
+            return self.reconcile_catalog()
+        except Exception as e:
+            raise RuntimeError(f"Archive catalog bootstrap from S3 failed: {e}") from e
 
     def close(self):
-        """Close database connection"""
+        """Close database connection, and upload threads and catalog unless shared"""
         if self.db_conn:
             self.db_conn.close()
+        if self._owns_storage:
+            self.storage.close()
+        if self._owns_catalog:
+            self.catalog.close()
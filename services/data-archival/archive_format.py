@@ -0,0 +1,394 @@
+"""
+Archive File Formats
+
+Writers that turn chunks of database rows into an archive stream, and
+the matching readers. PARQUET stores typed columns in one row group per
+chunk, compressed per column; JSON is the original compressed JSON array.
+"""
+import codecs
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .bloom import BloomFilter, build_bloom_filter
+from .compression import CompressionService
+from .config import ArchiveFormat, CompressionType
+
+
+logger = logging.getLogger(__name__)
+
+
+# Check if pyarrow is available
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not available, Parquet archives disabled")
+
+
+# PostgreSQL type OIDs (cursor.description type_code) with a direct Arrow type
+_PG_ARROW_TYPES = {
+    16: "bool_",
+    20: "int64",
+    21: "int16",
+    23: "int32",
+    700: "float32",
+    701: "float64",
+    1082: "date32",
+    1114: "timestamp",
+    1184: "timestamptz",
+}
+_PG_NUMERIC = 1700
+_PG_JSON_TYPES = (114, 3802)  # json, jsonb
+
+
+def _json_default(value: Any) -> Any:
+    """Encode Decimal, UUID, datetime, ... inside JSON columns"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _arrow_type(type_code: int, precision: Optional[int], scale: Optional[int]) -> "pa.DataType":
+    """Map a PostgreSQL column type to an Arrow type (text when unknown)"""
+    name = _PG_ARROW_TYPES.get(type_code)
+    if name == "timestamp":
+        return pa.timestamp("us")
+    if name == "timestamptz":
+        return pa.timestamp("us", tz="UTC")
+    if name is not None:
+        return getattr(pa, name)()
+    if type_code == _PG_NUMERIC and precision and 0 < precision <= 38 and scale is not None:
+        return pa.decimal128(precision, scale)
+    return pa.string()
+
+
+def arrow_schema_from_description(description: Sequence) -> "pa.Schema":
+    """
+    Build an Arrow schema from a psycopg2 cursor description
+
+    Types without a faithful Arrow equivalent (uuid, inet, json, text,
+    unconstrained numeric, ...) are stored as strings, which PostgreSQL
+    casts back on restore.
+
+    Args:
+        description: cursor.description after the first fetch
+
+    Returns:
+        Arrow schema, one field per column
+    """
+    return pa.schema([
+        pa.field(col.name, _arrow_type(col.type_code, col.precision, col.scale))
+        for col in description
+    ])
+
+
+def _column_converter(field: "pa.Field", type_code: int) -> Optional[Callable[[Any], Any]]:
+    """Per-value conversion needed before building an Arrow column, if any"""
+    if type_code in _PG_JSON_TYPES:
+        return lambda v: None if v is None else json.dumps(v, default=_json_default)
+    if pa.types.is_string(field.type):
+        return lambda v: None if v is None else str(v)
+    return None
+
+
+class JsonArchiveWriter:
+    """Writes chunks as one compressed JSON array"""
+
+    def __init__(self, sink: BinaryIO, compression: CompressionService, dictionary_id: Optional[int] = None):
+        self._writer = compression.stream_writer(sink, dictionary_id)
+        self._empty = True
+
+    def write_chunk(self, records: List[Dict], description: Sequence = None) -> int:
+        """Append records; returns uncompressed bytes written"""
+        separator = "[" if self._empty else ","
+        data = (separator + ",".join(json.dumps(r, default=str) for r in records)).encode("utf-8")
+        self._writer.write(data)
+        self._empty = False
+        return len(data)
+
+    def close(self) -> int:
+        """Finish the stream; returns uncompressed bytes written"""
+        written = 0
+        if not self._empty:
+            self._writer.write(b"]")
+            written = 1
+        self._writer.close()
+        return written
+
+    @property
+    def schema(self) -> Optional[Dict[str, str]]:
+        return None
+
+    @property
+    def bloom_filters(self) -> Dict[str, List[BloomFilter]]:
+        return {}
+
+
+class ParquetArchiveWriter:
+    """Writes chunks as Parquet row groups with per-column compression"""
+
+    CODECS = {
+        CompressionType.ZSTD: "zstd",
+        CompressionType.GZIP: "gzip",
+        CompressionType.NONE: "none",
+    }
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression_type: CompressionType,
+        compression_level: int,
+        bloom_filter_columns: Iterable[str] = (),
+        bloom_filter_fpp: float = 0.01,
+    ):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet archives require pyarrow")
+
+        self._sink = sink
+        self._codec = self.CODECS[compression_type]
+        self._level = compression_level if compression_type != CompressionType.NONE else None
+        self._writer: Optional["pq.ParquetWriter"] = None
+        self._arrow_schema: Optional["pa.Schema"] = None
+        self._converters: Dict[str, Callable[[Any], Any]] = {}
+        self._bloom_filter_columns = list(bloom_filter_columns)
+        self._bloom_filter_fpp = bloom_filter_fpp
+        self._bloom_filters: Dict[str, List[BloomFilter]] = {}
+
+    def _open(self, description: Sequence) -> None:
+        self._arrow_schema = arrow_schema_from_description(description)
+        self._converters = {
+            field.name: converter
+            for field, col in zip(self._arrow_schema, description)
+            if (converter := _column_converter(field, col.type_code)) is not None
+        }
+        self._writer = pq.ParquetWriter(
+            self._sink,
+            self._arrow_schema,
+            compression=self._codec,
+            compression_level=self._level,
+            write_statistics=True,
+        )
+        self._bloom_filters = {
+            name: [] for name in self._bloom_filter_columns if name in self._arrow_schema.names
+        }
+
+    def write_chunk(self, records: List[Dict], description: Sequence) -> int:
+        """
+        Write records as one row group, and its bloom filters
+
+        Args:
+            records: Rows as dicts
+            description: cursor.description of the query producing them
+
+        Returns:
+            Uncompressed (Arrow in-memory) bytes of the row group
+        """
+        if self._writer is None:
+            self._open(description)
+
+        columns = {}
+        for field in self._arrow_schema:
+            values = [r[field.name] for r in records]
+            converter = self._converters.get(field.name)
+            columns[field.name] = pa.array(
+                [converter(v) for v in values] if converter else values, type=field.type
+            )
+
+        for name, row_group_filters in self._bloom_filters.items():
+            row_group_filters.append(build_bloom_filter(columns[name].to_pylist(), self._bloom_filter_fpp))
+
+        table = pa.Table.from_pydict(columns, schema=self._arrow_schema)
+        self._writer.write_table(table, row_group_size=len(records))
+        return table.nbytes
+
+    def close(self) -> int:
+        """Write the Parquet footer"""
+        if self._writer is not None:
+            self._writer.close()
+        return 0
+
+    @property
+    def schema(self) -> Optional[Dict[str, str]]:
+        """Column name to Arrow type, for ArchiveMetadata"""
+        if self._arrow_schema is None:
+            return None
+        return {field.name: str(field.type) for field in self._arrow_schema}
+
+    @property
+    def bloom_filters(self) -> Dict[str, List[BloomFilter]]:
+        """Column name to one bloom filter per row group"""
+        return self._bloom_filters
+
+
+def open_archive_writer(
+    archive_format: ArchiveFormat,
+    sink: BinaryIO,
+    compression: CompressionService,
+    bloom_filter_columns: Iterable[str] = (),
+    bloom_filter_fpp: float = 0.01,
+    dictionary_id: Optional[int] = None,
+):
+    """
+    Open the writer for an archive format
+
+    Args:
+        archive_format: Format of the archive
+        sink: Binary stream receiving the archive bytes
+        compression: Compression settings (outer stream for JSON,
+            column codec for Parquet)
+        bloom_filter_columns: Columns to build row-group bloom filters
+            for (Parquet only; ignored where the table lacks them)
+        bloom_filter_fpp: False positive rate of those filters
+        dictionary_id: Registered ZSTD dictionary to compress with (JSON
+            only; Parquet column codecs take no dictionary)
+
+    Returns:
+        JsonArchiveWriter or ParquetArchiveWriter
+    """
+    if archive_format == ArchiveFormat.PARQUET:
+        return ParquetArchiveWriter(
+            sink,
+            compression.compression_type,
+            compression.compression_level,
+            bloom_filter_columns,
+            bloom_filter_fpp,
+        )
+    return JsonArchiveWriter(sink, compression, dictionary_id)
+
+
+def read_archive(
+    data: bytes,
+    archive_format: str,
+    compression: CompressionService,
+    dictionary_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Decode a downloaded archive into records
+
+    Parquet archives come back with their original types (datetimes,
+    decimals, ints, booleans); JSON archives as parsed JSON.
+
+    Args:
+        data: Archive bytes as stored
+        archive_format: ArchiveMetadata.archive_format
+        compression: Compression service for JSON archives
+        dictionary_id: ArchiveMetadata.compression_dictionary_id, registered
+            with compression
+
+    Returns:
+        List of records
+    """
+    if archive_format == ArchiveFormat.PARQUET.value:
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet archives require pyarrow")
+        return pq.read_table(io.BytesIO(data)).to_pylist()
+
+    return json.loads(compression.decompress(data, dictionary_id).decode("utf-8"))
+
+
+def iter_archive_batches(
+    fileobj: BinaryIO,
+    archive_format: str,
+    compression: CompressionService,
+    batch_size: int = 10000,
+    dictionary_id: Optional[int] = None,
+) -> Iterator[List[Dict]]:
+    """
+    Decode an archive incrementally, one batch of records at a time
+
+    Only one batch (for Parquet, one row group's columns) is held in
+    memory, so archives of any size can be restored.
+
+    Args:
+        fileobj: Seekable binary file with the archive bytes as stored
+        archive_format: ArchiveMetadata.archive_format
+        compression: Compression service for JSON archives
+        batch_size: Records per batch
+        dictionary_id: ArchiveMetadata.compression_dictionary_id, registered
+            with compression
+
+    Yields:
+        Lists of up to batch_size records
+    """
+    if archive_format == ArchiveFormat.PARQUET.value:
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet archives require pyarrow")
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=batch_size):
+            yield batch.to_pylist()
+        return
+
+    batch = []
+    for record in _iter_json_array(compression.stream_reader(fileobj, dictionary_id)):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_json_array(stream: BinaryIO, read_size: int = 1024 * 1024) -> Iterator[Any]:
+    """
+    Parse the elements of a JSON array from a stream without loading it whole
+
+    An empty stream is an empty array (JsonArchiveWriter writes nothing
+    for an archive without records).
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, eof = "", 0, False
+    state = "start"  # start -> first -> (value -> separator)*
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        data = stream.read(read_size)
+        eof = not data
+        buffer = buffer[pos:] + utf8.decode(data, final=eof)
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if read_more():
+                continue
+            if state == "start":
+                return
+            raise ValueError("Truncated JSON archive")
+
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError(f"JSON archive is not an array (starts with {char!r})")
+            pos += 1
+            state = "first"
+            continue
+        if state in ("first", "separator") and char == "]":
+            return
+        if state == "separator":
+            if char != ",":
+                raise ValueError(f"Expected ',' in JSON archive, got {char!r}")
+            pos += 1
+            state = "value"
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if read_more():
+                continue  # Element continues in the next read
+            raise
+        if end == len(buffer) and read_more():
+            continue  # A number may go on in the next read
+        yield value
+        pos = end
+        state = "separator"
+
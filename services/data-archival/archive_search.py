@@ -0,0 +1,230 @@
+"""
+Archive Search
+
+Query-in-place over Parquet archives. The catalog narrows the search to
+archives whose records fall in the time range, bloom filters and
+row-group statistics narrow it to the row groups that may hold matches,
+and only those are fetched from S3 with ranged GETs. Nothing is written
+back to the database.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .bloom import decode_bloom_filters
+from .config import ArchiveFormat
+from .storage_client import ArchiveMetadata, StorageClient
+
+
+logger = logging.getLogger(__name__)
+
+
+# Check if pyarrow is available
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+TimeRange = Tuple[Optional[datetime], Optional[datetime]]
+
+
+@dataclass
+class ArchiveSearchResult:
+    """Matching records and what it took to find them"""
+    records: List[Dict] = field(default_factory=list)
+    archives_searched: int = 0  # Candidates from the catalog
+    archives_skipped: int = 0  # Ruled out without opening the archive
+    row_groups_total: int = 0
+    row_groups_read: int = 0
+    bytes_read: int = 0  # Archive bytes fetched with ranged GETs
+    unsearchable: List[str] = field(default_factory=list)  # JSON archives; restore them instead
+    failed: Dict[str, str] = field(default_factory=dict)  # Archive ID -> error
+
+    def merge(self, other: "ArchiveSearchResult") -> None:
+        self.records.extend(other.records)
+        self.archives_searched += other.archives_searched
+        self.archives_skipped += other.archives_skipped
+        self.row_groups_total += other.row_groups_total
+        self.row_groups_read += other.row_groups_read
+        self.bytes_read += other.bytes_read
+        self.unsearchable.extend(other.unsearchable)
+        self.failed.update(other.failed)
+
+
+def naive_utc(value: Any) -> Any:
+    """Timezone-aware datetimes as naive UTC, anything else unchanged"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _coerce(value: Any, arrow_type: "pa.DataType") -> Any:
+    """Bring a predicate value to the representation stored in the column"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return value.isoformat() if isinstance(value, (datetime, date)) else str(value)
+    return naive_utc(value)
+
+
+def _in_bounds(statistics, low: Any, high: Any, high_inclusive: bool) -> bool:
+    """Whether a column chunk's min/max may overlap [low, high]"""
+    if statistics is None or not statistics.has_min_max:
+        return True
+    try:
+        minimum, maximum = naive_utc(statistics.min), naive_utc(statistics.max)
+        if low is not None and maximum < low:
+            return False
+        if high is not None and (minimum > high if high_inclusive else minimum >= high):
+            return False
+    except TypeError:
+        pass  # Not comparable; can't rule the row group out
+    return True
+
+
+def _bounds(
+    schema: "pa.Schema",
+    predicate: Dict[str, Any],
+    date_column: str,
+    time_range: Optional[TimeRange],
+) -> Dict[str, Tuple[Any, Any, bool]]:
+    """Column name to (low, high, high inclusive) for the row-group statistics check"""
+    bounds = {}
+    for column, value in predicate.items():
+        value = _coerce(value, schema.field(column).type)
+        bounds[column] = (value, value, True)
+    if time_range and date_column in schema.names:
+        arrow_type = schema.field(date_column).type
+        start, end = (None if t is None else _coerce(t, arrow_type) for t in time_range)
+        bounds[date_column] = (start, end, False)
+    return bounds
+
+
+def _filter(
+    table: "pa.Table",
+    predicate: Dict[str, Any],
+    date_column: str,
+    time_range: Optional[TimeRange],
+) -> "pa.Table":
+    """Rows of a row group matching the predicate and time range"""
+    conditions = [
+        pc.equal(table[column], pa.scalar(_coerce(value, table.schema.field(column).type),
+                                          type=table.schema.field(column).type))
+        for column, value in predicate.items()
+    ]
+    if time_range and date_column in table.column_names:
+        arrow_type = table.schema.field(date_column).type
+        start, end = time_range
+        if start is not None:
+            conditions.append(pc.greater_equal(
+                table[date_column], pa.scalar(_coerce(start, arrow_type), type=arrow_type)))
+        if end is not None:
+            conditions.append(pc.less(
+                table[date_column], pa.scalar(_coerce(end, arrow_type), type=arrow_type)))
+
+    if not conditions:
+        return table
+    mask = conditions[0]
+    for condition in conditions[1:]:
+        mask = pc.and_(mask, condition)
+    return table.filter(mask)
+
+
+def _bloom_candidates(
+    storage: StorageClient,
+    metadata: ArchiveMetadata,
+    predicate: Dict[str, Any],
+) -> Tuple[Optional[Set[int]], int]:
+    """
+    Row groups whose bloom filters may hold every predicate value
+
+    Returns:
+        Tuple of (row group indexes, or None if no filter applies;
+        row group count)
+    """
+    columns = [c for c in predicate if c in (metadata.bloom_filter_columns or ())]
+    if not columns:
+        return None, 0
+
+    data = storage.get_bloom_filters(metadata.archive_id)
+    if data is None:
+        return None, 0
+    filters = decode_bloom_filters(data)
+
+    candidates = None
+    for column in columns:
+        matching = {i for i, bloom in enumerate(filters[column]) if str(predicate[column]) in bloom}
+        candidates = matching if candidates is None else candidates & matching
+    return candidates, len(filters[columns[0]])
+
+
+def search_archive(
+    storage: StorageClient,
+    metadata: ArchiveMetadata,
+    predicate: Dict[str, Any],
+    date_column: str,
+    time_range: Optional[TimeRange] = None,
+) -> ArchiveSearchResult:
+    """
+    Find the records of one archive matching a predicate
+
+    Args:
+        storage: Storage client
+        metadata: Archive to search
+        predicate: Column name to the value it must equal
+        date_column: Date column of the archived table
+        time_range: (start, end) of date_column, end exclusive; either
+            may be None
+
+    Returns:
+        ArchiveSearchResult for this archive
+    """
+    result = ArchiveSearchResult(archives_searched=1)
+
+    if metadata.archive_format != ArchiveFormat.PARQUET.value:
+        result.unsearchable.append(metadata.archive_id)
+        return result
+    if metadata.schema is not None and not set(predicate) <= set(metadata.schema):
+        result.archives_skipped += 1  # Columns it doesn't have can't match
+        return result
+
+    try:
+        candidates, row_groups = _bloom_candidates(storage, metadata, predicate)
+        if candidates is not None and not candidates:
+            result.archives_skipped += 1
+            result.row_groups_total += row_groups
+            return result
+
+        reader = storage.open_range_reader(metadata.s3_key, metadata.compressed_size_bytes)
+        parquet = pq.ParquetFile(reader)
+        schema = parquet.schema_arrow
+        if not set(predicate) <= set(schema.names):
+            result.archives_skipped += 1
+            return result
+        bounds = _bounds(schema, predicate, date_column, time_range)
+
+        result.row_groups_total += parquet.num_row_groups
+        for i in range(parquet.num_row_groups):
+            if candidates is not None and i not in candidates:
+                continue
+            row_group = parquet.metadata.row_group(i)
+            if not all(
+                _in_bounds(row_group.column(schema.get_field_index(column)).statistics, *bound)
+                for column, bound in bounds.items()
+            ):
+                continue
+
+            table = parquet.read_row_group(i)
+            result.row_groups_read += 1
+            result.records.extend(_filter(table, predicate, date_column, time_range).to_pylist())
+
+        result.bytes_read += reader.bytes_read
+
+    except Exception as e:
+        logger.error(f"Failed to search archive {metadata.archive_id}: {e}")
+        result.failed[metadata.archive_id] = str(e)
+
+    return result
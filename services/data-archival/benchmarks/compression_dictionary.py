@@ -0,0 +1,224 @@
+"""
+Compression Dictionary Benchmark
+
+Serializes days of synthetic CDRs (the record shape of sip-processor's
+MockCDRGenerator) as JSON archive bodies, compresses them, and reports
+compression ratio and compress/decompress throughput for:
+
+- small archives (--archives of --records rows each, like per-day
+  archives of acm_alerts or audit_events) with GZIP, ZSTD building a
+  fresh context per archive (the previous behaviour, kept below as
+  LegacyZstd), ZSTD with per-thread contexts, and ZSTD with a dictionary
+  trained on --samples rows of another day;
+- one large archive (--large-records rows) with ZSTD on the calling
+  thread and with --threads worker threads.
+
+Usage:
+    python -m data_archival.benchmarks.compression_dictionary
+    python -m data_archival.benchmarks.compression_dictionary --archives 500 --records 100 --threads 4
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import zstandard as zstd
+
+from ..compression import DEFAULT_DICTIONARY_SIZE, CompressionService
+from ..config import CompressionType
+
+
+logger = logging.getLogger(__name__)
+
+
+NIGERIAN_PREFIXES = [
+    "+234701", "+234703", "+234705", "+234706", "+234708", "+234802",
+    "+234803", "+234805", "+234806", "+234808", "+234810", "+234812",
+    "+234813", "+234816", "+234901", "+234903", "+234905", "+234906",
+]
+TERMINATION_CAUSES = ["NORMAL_CLEARING", "USER_BUSY", "NO_ANSWER", "CALL_REJECTED", "NETWORK_ERROR"]
+CALL_DIRECTIONS = ["inbound", "outbound"]
+
+
+@dataclass
+class BenchmarkResult:
+    """Result of one implementation over one scenario"""
+    scenario: str
+    implementation: str
+    archives: int
+    raw_mb: float
+    ratio: float  # Compressed / raw
+    compress_mb_s: float
+    decompress_mb_s: float
+
+
+class LegacyZstd:
+    """ZSTD as compressed before dictionaries: a new context per archive"""
+
+    def __init__(self, compression_level: int = 3):
+        self.compression_level = compression_level
+
+    def compress(self, data: bytes, dictionary_id: Optional[int] = None) -> bytes:
+        return zstd.ZstdCompressor(level=self.compression_level).compress(data)
+
+    def decompress(self, compressed_data: bytes, dictionary_id: Optional[int] = None) -> bytes:
+        return zstd.ZstdDecompressor().decompressobj().decompress(compressed_data)
+
+
+def make_records(count: int, day: datetime, seed: int = 0) -> List[Dict]:
+    """
+    Generate one day of CDRs, one in ten from a SIM box
+
+    Args:
+        count: Number of records
+        day: Date of the calls
+        seed: Random seed
+
+    Returns:
+        Records in call time order
+    """
+    rng = random.Random(seed)
+    simboxes = [f"{rng.choice(NIGERIAN_PREFIXES)}{rng.randrange(10**7):07d}" for _ in range(5)]
+    offsets = sorted(rng.randrange(86400) for _ in range(count))
+
+    records = []
+    for i, offset in enumerate(offsets):
+        call_time = day + timedelta(seconds=offset)
+        simbox = rng.random() < 0.1
+        records.append({
+            "id": seed * 10**7 + i,
+            "call_date": call_time.strftime("%Y-%m-%d"),
+            "call_time": call_time.strftime("%H:%M:%S"),
+            "caller_number": (
+                rng.choice(simboxes) if simbox
+                else f"{rng.choice(NIGERIAN_PREFIXES)}{rng.randrange(10**7):07d}"
+            ),
+            "callee_number": f"{rng.choice(NIGERIAN_PREFIXES)}{rng.randrange(10**7):07d}",
+            "duration_seconds": rng.randint(1, 5) if simbox else rng.randint(30, 1800),
+            "call_direction": "outbound" if simbox else rng.choice(CALL_DIRECTIONS),
+            "termination_cause": "NORMAL_CLEARING" if simbox else rng.choice(TERMINATION_CAUSES),
+        })
+    return records
+
+
+def serialize(records: List[Dict]) -> bytes:
+    """Records as the uncompressed body of a JSON archive"""
+    return ("[" + ",".join(json.dumps(r, default=str) for r in records) + "]").encode("utf-8")
+
+
+def _measure(
+    scenario: str,
+    implementation: str,
+    archives: List[bytes],
+    compression,
+    dictionary_id: Optional[int] = None,
+) -> BenchmarkResult:
+    """Compress then decompress every archive, timing each pass"""
+    start = time.perf_counter()
+    compressed = [compression.compress(data, dictionary_id) for data in archives]
+    compress_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in compressed:
+        compression.decompress(data, dictionary_id)
+    decompress_seconds = time.perf_counter() - start
+
+    raw_mb = sum(len(data) for data in archives) / 2**20
+    return BenchmarkResult(
+        scenario,
+        implementation,
+        len(archives),
+        raw_mb,
+        sum(len(data) for data in compressed) / sum(len(data) for data in archives),
+        raw_mb / compress_seconds,
+        raw_mb / decompress_seconds,
+    )
+
+
+def run_benchmark(
+    archives: int = 200,
+    records: int = 20,
+    samples: int = 10000,
+    large_records: int = 500_000,
+    threads: int = -1,
+    compression_level: int = 3,
+) -> List[BenchmarkResult]:
+    """
+    Benchmark every implementation on the same generated data
+
+    Args:
+        archives: Number of small archives
+        records: Records per small archive
+        samples: Records of a separate day to train the dictionary on
+        large_records: Records in the large archive
+        threads: ZSTD worker threads for the large archive (-1 = one per CPU)
+        compression_level: ZSTD level
+
+    Returns:
+        One BenchmarkResult per scenario and implementation
+    """
+    day = datetime(2026, 1, 1)
+    small = [serialize(make_records(records, day + timedelta(days=i), seed=i + 1)) for i in range(archives)]
+
+    trained = CompressionService(CompressionType.ZSTD, compression_level)
+    training_day = make_records(samples, day - timedelta(days=1), seed=0)
+    dictionary = trained.train_dictionary(
+        [json.dumps(r, default=str).encode("utf-8") for r in training_day], DEFAULT_DICTIONARY_SIZE
+    )
+    dictionary_id = trained.add_dictionary(dictionary)
+
+    results = [
+        _measure("small", "gzip", small, CompressionService(CompressionType.GZIP, 6)),
+        _measure("small", "zstd (new context)", small, LegacyZstd(compression_level)),
+        _measure("small", "zstd", small, CompressionService(CompressionType.ZSTD, compression_level)),
+        _measure("small", "zstd + dictionary", small, trained, dictionary_id),
+    ]
+
+    large = [serialize(make_records(large_records, day, seed=archives + 1))]
+    results.append(_measure(
+        "large", "zstd", large, CompressionService(CompressionType.ZSTD, compression_level)
+    ))
+    results.append(_measure(
+        "large", f"zstd threads={threads}", large,
+        CompressionService(CompressionType.ZSTD, compression_level, threads=threads),
+    ))
+    return results
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Format results as a text table"""
+    lines = [
+        f"{'scenario':>8} {'implementation':>22} {'archives':>9} {'raw MB':>8} "
+        f"{'ratio':>7} {'comp MB/s':>10} {'decomp MB/s':>12}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.scenario:>8} {r.implementation:>22} {r.archives:>9} {r.raw_mb:>8.1f} "
+            f"{r.ratio:>7.3f} {r.compress_mb_s:>10.1f} {r.decompress_mb_s:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Compression dictionary benchmark")
+    parser.add_argument("--archives", type=int, default=200, help="Small archives")
+    parser.add_argument("--records", type=int, default=20, help="Records per small archive")
+    parser.add_argument("--samples", type=int, default=10000, help="Dictionary training records")
+    parser.add_argument("--large-records", type=int, default=500_000, help="Records in the large archive")
+    parser.add_argument("--threads", type=int, default=-1, help="ZSTD threads for the large archive")
+    parser.add_argument("--level", type=int, default=3, help="ZSTD compression level")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(format_results(run_benchmark(
+        args.archives, args.records, args.samples, args.large_records, args.threads, args.level
+    )))
+
+
+if __name__ == "__main__":
+    main()
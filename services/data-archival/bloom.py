@@ -0,0 +1,99 @@
+"""
+Bloom Filters
+
+Per-row-group bloom filters on lookup columns (a_number, b_number) of
+Parquet archives. Row-group min/max statistics can't rule out a phone
+number, a bloom filter can: search_archives reads a row group only if
+its filter might contain the value, and skips an archive whose row
+groups all rule it out without touching the archive itself.
+
+The filters of an archive are stored next to its metadata in S3, as
+metadata/<archive_id>.bloom.
+"""
+import hashlib
+import json
+import math
+import struct
+from typing import Any, Dict, Iterable, List
+
+
+class BloomFilter:
+    """Bloom filter over string values, with double hashing"""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: bytes = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "BloomFilter":
+        """
+        Size a filter for a number of distinct values
+
+        Args:
+            capacity: Distinct values to be added
+            false_positive_rate: Target probability of a false "might contain"
+
+        Returns:
+            Empty BloomFilter
+        """
+        capacity = max(capacity, 1)
+        num_bits = max(int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        num_hashes = max(round(num_bits / capacity * math.log(2)), 1)
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, value: Any) -> Iterable[int]:
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, value: Any) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: Any) -> bool:
+        """False if value was definitely not added"""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def build_bloom_filter(values: Iterable[Any], false_positive_rate: float) -> BloomFilter:
+    """Filter holding the non-null values, sized to how many are distinct"""
+    distinct = {str(value) for value in values if value is not None}
+    bloom = BloomFilter.for_capacity(len(distinct), false_positive_rate)
+    for value in distinct:
+        bloom.add(value)
+    return bloom
+
+
+def encode_bloom_filters(filters: Dict[str, List[BloomFilter]]) -> bytes:
+    """
+    Serialize the row-group filters of an archive
+
+    Layout: 4-byte header length, JSON header with the column names and
+    each filter's bit count, hash count and byte length, then the filter
+    bits in header order.
+    """
+    header = {
+        column: [[f.num_bits, f.num_hashes, len(f.bits)] for f in column_filters]
+        for column, column_filters in filters.items()
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    return b"".join(
+        [struct.pack("<I", len(header_bytes)), header_bytes]
+        + [bytes(f.bits) for column_filters in filters.values() for f in column_filters]
+    )
+
+
+def decode_bloom_filters(data: bytes) -> Dict[str, List[BloomFilter]]:
+    """Inverse of encode_bloom_filters"""
+    (header_length,) = struct.unpack_from("<I", data)
+    offset = 4 + header_length
+    header = json.loads(data[4:offset].decode("utf-8"))
+
+    filters = {}
+    for column, entries in header.items():
+        filters[column] = []
+        for num_bits, num_hashes, length in entries:
+            filters[column].append(BloomFilter(num_bits, num_hashes, data[offset:offset + length]))
+            offset += length
+    return filters
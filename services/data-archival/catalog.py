@@ -0,0 +1,447 @@
+"""
+Archive Catalog
+
+Local SQLite index of the archives in S3, written alongside each upload.
+Retention statistics, expiry and lookups by table, partition or date are
+indexed queries here instead of S3 listings plus one metadata GET per
+archive. S3 stays the source of truth: the catalog can be rebuilt from
+it at any time (ArchivalService.reconcile_catalog).
+"""
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .storage_client import ArchiveMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    archive_id TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    partition_key TEXT NOT NULL,
+    record_count INTEGER NOT NULL,
+    original_size_bytes INTEGER NOT NULL,
+    compressed_size_bytes INTEGER NOT NULL,
+    compression_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    checksum_sha256 TEXT NOT NULL,
+    s3_key TEXT NOT NULL UNIQUE,
+    retention_until TEXT NOT NULL,
+    archive_format TEXT NOT NULL,
+    schema TEXT,
+    first_record_at TEXT,
+    last_record_at TEXT,
+    bloom_filter_columns TEXT,
+    compression_dictionary_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS archives_table_partition ON archives (table_name, partition_key);
+CREATE INDEX IF NOT EXISTS archives_table_created ON archives (table_name, created_at);
+CREATE INDEX IF NOT EXISTS archives_retention ON archives (retention_until);
+CREATE TABLE IF NOT EXISTS verifications (
+    archive_id TEXT PRIMARY KEY,
+    verified_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS verifications_status ON verifications (status);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    table_name TEXT NOT NULL,
+    dictionary_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (table_name, dictionary_id)
+);
+CREATE INDEX IF NOT EXISTS dictionaries_table_created ON dictionaries (table_name, created_at);
+CREATE TABLE IF NOT EXISTS catalog_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+
+# Outcomes of an integrity check
+VERIFICATION_OK = "ok"
+VERIFICATION_MISMATCH = "mismatch"  # Checksum differs from the one recorded at upload
+VERIFICATION_MISSING = "missing"  # Data object gone
+VERIFICATION_ERROR = "error"  # Couldn't be read; retried on the next pass
+
+# Columns added after the first release, for catalogs created before them
+MIGRATIONS = {
+    "first_record_at": "ALTER TABLE archives ADD COLUMN first_record_at TEXT",
+    "last_record_at": "ALTER TABLE archives ADD COLUMN last_record_at TEXT",
+    "bloom_filter_columns": "ALTER TABLE archives ADD COLUMN bloom_filter_columns TEXT",
+    "compression_dictionary_id": "ALTER TABLE archives ADD COLUMN compression_dictionary_id INTEGER",
+}
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS archives_table_records ON archives (table_name, first_record_at)",
+)
+
+# Columns stored as JSON text
+JSON_COLUMNS = ("schema", "bloom_filter_columns")
+
+COLUMNS = (
+    "archive_id", "table_name", "partition_key", "record_count",
+    "original_size_bytes", "compressed_size_bytes", "compression_type",
+    "created_at", "checksum_sha256", "s3_key", "retention_until",
+    "archive_format", "schema", "first_record_at", "last_record_at",
+    "bloom_filter_columns", "compression_dictionary_id",
+)
+
+
+class ArchiveCatalog:
+    """SQLite catalog of archive metadata"""
+
+    BUSY_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the catalog
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection shared by the archival workers; the lock keeps
+        # their statements and transactions from interleaving
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path,
+            timeout=self.BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._write() as conn:
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(archives)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in existing:
+                    conn.execute(statement)
+            for statement in INDEXES:
+                conn.execute(statement)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _row_values(metadata: ArchiveMetadata) -> Tuple:
+        values = asdict(metadata)
+        for column in JSON_COLUMNS:
+            values[column] = json.dumps(values[column]) if values[column] is not None else None
+        return tuple(values[column] for column in COLUMNS)
+
+    @staticmethod
+    def _to_metadata(row: sqlite3.Row) -> ArchiveMetadata:
+        values = dict(row)
+        for column in JSON_COLUMNS:
+            values[column] = json.loads(values[column]) if values[column] is not None else None
+        return ArchiveMetadata(**values)
+
+    def add(self, metadata: ArchiveMetadata) -> None:
+        """Record an uploaded archive (replacing any entry with its ID)"""
+        placeholders = ", ".join("?" * len(COLUMNS))
+        with self._write() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO archives ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                self._row_values(metadata),
+            )
+
+    def remove(self, archive_ids: Iterable[str]) -> int:
+        """
+        Forget deleted archives
+
+        Args:
+            archive_ids: IDs of the archives to remove
+
+        Returns:
+            Number of catalog entries removed
+        """
+        archive_ids = [(i,) for i in archive_ids]
+        with self._write() as conn:
+            cursor = conn.executemany("DELETE FROM archives WHERE archive_id = ?", archive_ids)
+            removed = cursor.rowcount
+            conn.executemany("DELETE FROM verifications WHERE archive_id = ?", archive_ids)
+            return removed
+
+    def get(self, archive_id: str) -> Optional[ArchiveMetadata]:
+        """Metadata of one archive, or None if not cataloged"""
+        rows = self._query("SELECT * FROM archives WHERE archive_id = ?", (archive_id,))
+        return self._to_metadata(rows[0]) if rows else None
+
+    def find(
+        self,
+        table_name: Optional[str] = None,
+        partition: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        records_from: Optional[datetime] = None,
+        records_to: Optional[datetime] = None,
+    ) -> List[ArchiveMetadata]:
+        """
+        Look up archives
+
+        Args:
+            table_name: Only archives of this table
+            partition: Only this partition key, or partitions under it
+                ("2024-01" matches "2024-01" and "2024-01-15")
+            created_from: Only archives created at or after this time
+            created_to: Only archives created before this time
+            records_from: Only archives that may hold records dated at or
+                after this time (UTC); archives without a recorded date
+                range always match
+            records_to: Only archives that may hold records dated before
+                this time (UTC)
+
+        Returns:
+            Matching archives, ordered by table, partition and creation time
+        """
+        conditions, params = [], []
+        if table_name is not None:
+            conditions.append("table_name = ?")
+            params.append(table_name)
+        if partition is not None:
+            conditions.append("(partition_key = ? OR partition_key LIKE ?)")
+            params.extend([partition, f"{partition}-%"])
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_from.isoformat())
+        if created_to is not None:
+            conditions.append("created_at < ?")
+            params.append(created_to.isoformat())
+        if records_from is not None:
+            conditions.append("(last_record_at IS NULL OR last_record_at >= ?)")
+            params.append(records_from.isoformat())
+        if records_to is not None:
+            conditions.append("(first_record_at IS NULL OR first_record_at < ?)")
+            params.append(records_to.isoformat())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._query(
+            f"SELECT * FROM archives {where} ORDER BY table_name, partition_key, created_at",
+            tuple(params),
+        )
+        return [self._to_metadata(row) for row in rows]
+
+    def expired(self, now: datetime, limit: Optional[int] = None) -> List[ArchiveMetadata]:
+        """
+        Archives past their retention date, from the longest expired
+
+        Reads the retention index, so only expired archives are touched.
+
+        Args:
+            now: Current time (UTC)
+            limit: Maximum number of archives to return
+
+        Returns:
+            Expired archives ordered by retention date
+        """
+        rows = self._query(
+            "SELECT * FROM archives WHERE retention_until < ? ORDER BY retention_until"
+            + (" LIMIT ?" if limit is not None else ""),
+            (now.isoformat(),) + ((limit,) if limit is not None else ()),
+        )
+        return [self._to_metadata(row) for row in rows]
+
+    def statistics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Archive totals per table
+
+        Returns:
+            Table name to archive_count, record_count,
+            compressed_size_bytes and original_size_bytes
+        """
+        rows = self._query(
+            """
+            SELECT table_name,
+                   COUNT(*) AS archive_count,
+                   SUM(record_count) AS record_count,
+                   SUM(compressed_size_bytes) AS compressed_size_bytes,
+                   SUM(original_size_bytes) AS original_size_bytes
+            FROM archives
+            GROUP BY table_name
+            """
+        )
+        return {row["table_name"]: {k: row[k] for k in row.keys() if k != "table_name"} for row in rows}
+
+    def replace_all(self, archives: Iterable[ArchiveMetadata]) -> Tuple[int, int]:
+        """
+        Replace the catalog contents in one transaction
+
+        Args:
+            archives: Every archive that exists
+
+        Returns:
+            Tuple of (entries added, entries removed)
+        """
+        archives = list(archives)
+        placeholders = ", ".join("?" * len(COLUMNS))
+        with self._write() as conn:
+            before = {row[0] for row in conn.execute("SELECT archive_id FROM archives")}
+            conn.execute("DELETE FROM archives")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO archives ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                (self._row_values(metadata) for metadata in archives),
+            )
+            conn.execute(
+                "DELETE FROM verifications WHERE archive_id NOT IN (SELECT archive_id FROM archives)"
+            )
+        after = {metadata.archive_id for metadata in archives}
+        return len(after - before), len(before - after)
+
+    def record_verification(
+        self,
+        archive_id: str,
+        status: str,
+        verified_at: datetime,
+        detail: Optional[str] = None,
+    ) -> None:
+        """
+        Record the outcome of an integrity check
+
+        Args:
+            archive_id: Archive checked
+            status: VERIFICATION_OK, _MISMATCH, _MISSING or _ERROR
+            verified_at: Time of the check (UTC)
+            detail: Error or checksum found, for failures
+        """
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verifications (archive_id, verified_at, status, detail) "
+                "VALUES (?, ?, ?, ?)",
+                (archive_id, verified_at.isoformat(), status, detail),
+            )
+
+    def least_recently_verified(self, limit: int) -> List[ArchiveMetadata]:
+        """
+        Next archives due for an integrity check
+
+        Never-verified archives come first, then the longest since their
+        last check, so repeated samples rotate through the whole catalog.
+
+        Args:
+            limit: Maximum number of archives to return
+
+        Returns:
+            Archives in verification order
+        """
+        rows = self._query(
+            """
+            SELECT archives.* FROM archives
+            LEFT JOIN verifications USING (archive_id)
+            ORDER BY verifications.verified_at IS NOT NULL, verifications.verified_at, archives.archive_id
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        return [self._to_metadata(row) for row in rows]
+
+    def verification_failures(self) -> List[Dict[str, str]]:
+        """
+        Archives whose last integrity check failed
+
+        Returns:
+            Dictionaries of archive_id, table_name, s3_key, verified_at,
+            status and detail, oldest check first
+        """
+        rows = self._query(
+            """
+            SELECT archive_id, table_name, s3_key, verified_at, status, detail
+            FROM verifications JOIN archives USING (archive_id)
+            WHERE status != ?
+            ORDER BY verified_at, archive_id
+            """,
+            (VERIFICATION_OK,),
+        )
+        return [dict(row) for row in rows]
+
+    def add_dictionary(self, table_name: str, dictionary_id: int, created_at: datetime) -> None:
+        """
+        Record a trained compression dictionary as the newest for its table
+
+        Args:
+            table_name: Table the dictionary was trained on
+            dictionary_id: ZSTD dictionary ID
+            created_at: Time of training (UTC)
+        """
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dictionaries (table_name, dictionary_id, created_at) VALUES (?, ?, ?)",
+                (table_name, dictionary_id, created_at.isoformat()),
+            )
+
+    def current_dictionary(self, table_name: str) -> Optional[int]:
+        """
+        Newest compression dictionary of a table
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Dictionary ID, or None if none has been trained
+        """
+        rows = self._query(
+            "SELECT dictionary_id FROM dictionaries WHERE table_name = ? "
+            "ORDER BY created_at DESC, rowid DESC LIMIT 1",
+            (table_name,),
+        )
+        return rows[0]["dictionary_id"] if rows else None
+
+    def record_reconcile(self, reconciled_at: datetime) -> None:
+        """
+        Record that the catalog was rebuilt from a full S3 listing
+
+        Args:
+            reconciled_at: Time of the reconcile (UTC)
+        """
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog_state (key, value) VALUES ('last_reconciled', ?)",
+                (reconciled_at.isoformat(),),
+            )
+
+    def last_reconciled(self) -> Optional[datetime]:
+        """
+        Time of the last reconcile with S3
+
+        Returns:
+            Time of the last reconcile (UTC), or None if the catalog has
+            only ever been written by uploads
+        """
+        rows = self._query("SELECT value FROM catalog_state WHERE key = 'last_reconciled'")
+        return datetime.fromisoformat(rows[0]["value"]) if rows else None
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM archives")[0][0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -14,6 +14,12 @@ class CompressionType(Enum):
     NONE = "none"
 
 
+class ArchiveFormat(Enum):
+    """Archive file formats"""
+    PARQUET = "parquet"  # Typed columns, one row group per chunk
+    JSON = "json"  # Compressed JSON array
+
+
 class ArchivalFrequency(Enum):
     """Archival schedule options"""
     DAILY = "daily"
@@ -50,6 +56,9 @@ class S3Config:
     bucket_name: str
     region: str
     use_ssl: bool = True
+    multipart_part_size: int = 8 * 1024 * 1024  # Bytes per upload part (S3 minimum 5 MiB)
+    multipart_max_concurrency: int = 4  # Parts uploading at once per archive
+    delete_concurrency: int = 4  # DeleteObjects requests in flight during expiry sweeps
 
     @classmethod
     def from_env(cls) -> "S3Config":
@@ -60,6 +69,9 @@ class S3Config:
             bucket_name=os.getenv("S3_BUCKET", "voxguard-archives"),
             region=os.getenv("S3_REGION", "us-east-1"),
             use_ssl=os.getenv("S3_USE_SSL", "true").lower() == "true",
+            multipart_part_size=int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024))),
+            multipart_max_concurrency=int(os.getenv("S3_MULTIPART_CONCURRENCY", "4")),
+            delete_concurrency=int(os.getenv("S3_DELETE_CONCURRENCY", "4")),
         )
 
 
@@ -75,7 +87,19 @@ class ArchivalConfig:
     frequency: ArchivalFrequency = ArchivalFrequency.MONTHLY
     compression: CompressionType = CompressionType.ZSTD
     compression_level: int = 3  # Balance between speed and ratio
+    archive_format: ArchiveFormat = ArchiveFormat.PARQUET
     chunk_size: int = 10000  # Records per chunk for batch processing
+    max_records_per_archive: int = 1_000_000  # Rows per archive and per delete transaction
+    compression_threads: int = 0  # ZSTD worker threads per archive (0 = none, -1 = one per CPU)
+
+    # Trained ZSTD dictionaries (JSON archives): for tables whose archives are small and repetitive
+    compression_dictionary_tables: list[str] = None
+    compression_dictionary_size: int = 112640  # Bytes
+    compression_dictionary_samples: int = 10000  # Rows sampled per training
+
+    # Archive search (Parquet): per-row-group bloom filters on lookup columns
+    bloom_filter_columns: list[str] = None
+    bloom_filter_fpp: float = 0.01  # False positive rate per row group
 
     # Tables to archive
     tables_to_archive: list[str] = None
@@ -86,11 +110,18 @@ class ArchivalConfig:
     # Storage paths
     archive_prefix: str = "archives"  # S3 prefix for archives
     metadata_prefix: str = "metadata"  # S3 prefix for metadata
+    catalog_path: str = "/var/lib/voxguard/archival/catalog.db"  # Local archive index (SQLite)
 
     # Performance
-    max_workers: int = 4  # Parallel compression workers
+    max_workers: int = 4  # Partitions archived at once (one DB connection each)
+    job_time_limit_minutes: int = 240  # Start no new partitions after this (0 = no limit)
     batch_timeout_seconds: int = 300  # 5-minute timeout per batch
 
+    # Integrity scrub (daily): re-verify a rotating sample of archive checksums
+    scrub_archives_per_run: int = 200  # 0 disables the scrub
+    scrub_concurrency: int = 4  # Archives verified at once
+    scrub_bandwidth_mb_per_second: float = 50.0  # Combined read rate (0 = unlimited)
+
     # Monitoring
     enable_metrics: bool = True
     metrics_port: int = 9092  # Prometheus metrics port
@@ -100,6 +131,10 @@ class ArchivalConfig:
     gdpr_retention_days: int = 2555  # 7 years in days
 
     def __post_init__(self):
+        if self.bloom_filter_columns is None:
+            self.bloom_filter_columns = ["a_number", "b_number"]
+        if self.compression_dictionary_tables is None:
+            self.compression_dictionary_tables = ["acm_alerts", "audit_events"]
         if self.tables_to_archive is None:
             self.tables_to_archive = [
                 "acm_alerts",
@@ -118,9 +153,29 @@ class ArchivalConfig:
             frequency=ArchivalFrequency(os.getenv("ARCHIVAL_FREQUENCY", "monthly")),
             compression=CompressionType(os.getenv("ARCHIVAL_COMPRESSION", "zstd")),
             compression_level=int(os.getenv("ARCHIVAL_COMPRESSION_LEVEL", "3")),
+            archive_format=ArchiveFormat(os.getenv("ARCHIVAL_FORMAT", "parquet")),
             chunk_size=int(os.getenv("ARCHIVAL_CHUNK_SIZE", "10000")),
+            max_records_per_archive=int(os.getenv("ARCHIVAL_MAX_RECORDS_PER_ARCHIVE", "1000000")),
+            compression_threads=int(os.getenv("ARCHIVAL_COMPRESSION_THREADS", "0")),
+            compression_dictionary_tables=[
+                t.strip()
+                for t in os.getenv("ARCHIVAL_COMPRESSION_DICTIONARY_TABLES", "acm_alerts,audit_events").split(",")
+                if t.strip()
+            ],
+            compression_dictionary_size=int(os.getenv("ARCHIVAL_COMPRESSION_DICTIONARY_SIZE", "112640")),
+            compression_dictionary_samples=int(os.getenv("ARCHIVAL_COMPRESSION_DICTIONARY_SAMPLES", "10000")),
+            bloom_filter_columns=[
+                c.strip() for c in os.getenv("ARCHIVAL_BLOOM_FILTER_COLUMNS", "a_number,b_number").split(",")
+                if c.strip()
+            ],
+            bloom_filter_fpp=float(os.getenv("ARCHIVAL_BLOOM_FILTER_FPP", "0.01")),
             schedule_cron=os.getenv("ARCHIVAL_SCHEDULE_CRON", "0 2 1 * *"),
+            catalog_path=os.getenv("ARCHIVAL_CATALOG_PATH", "/var/lib/voxguard/archival/catalog.db"),
             max_workers=int(os.getenv("ARCHIVAL_MAX_WORKERS", "4")),
+            job_time_limit_minutes=int(os.getenv("ARCHIVAL_JOB_TIME_LIMIT_MINUTES", "240")),
+            scrub_archives_per_run=int(os.getenv("ARCHIVAL_SCRUB_ARCHIVES_PER_RUN", "200")),
+            scrub_concurrency=int(os.getenv("ARCHIVAL_SCRUB_CONCURRENCY", "4")),
+            scrub_bandwidth_mb_per_second=float(os.getenv("ARCHIVAL_SCRUB_BANDWIDTH_MB_PER_SECOND", "50")),
             enable_metrics=os.getenv("ARCHIVAL_ENABLE_METRICS", "true").lower() == "true",
             metrics_port=int(os.getenv("ARCHIVAL_METRICS_PORT", "9092")),
         )
@@ -0,0 +1,270 @@
+"""
+Parallel Archival
+
+Splits each table into daily time partitions under the cutoff and
+archives them across a pool of workers. Every worker has its own
+database connection and does its own compression and upload. A worker
+whose partition fails drops its connection and opens a new one for the
+next partition.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from .archival_service import ArchivalError, ArchivalService
+from .catalog import ArchiveCatalog
+from .config import Config
+from .storage_client import ArchiveMetadata, StorageClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchivalTask:
+    """One time partition of a table to archive"""
+    table_name: str
+    partition_key: str  # e.g., "2024-01-15"
+    start_date: datetime
+    end_date: datetime  # Exclusive
+
+
+@dataclass
+class ArchivalProgress:
+    """Progress of a parallel archival run"""
+    tasks_total: int = 0
+    tasks_done: int = 0
+    tasks_failed: int = 0
+    tasks_skipped: int = 0  # Not started before the deadline
+    archives: int = 0
+    records: int = 0
+    compressed_bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def tasks_finished(self) -> int:
+        return self.tasks_done + self.tasks_failed + self.tasks_skipped
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated time to finish the remaining tasks"""
+        worked = self.tasks_done + self.tasks_failed
+        if worked == 0:
+            return None
+        return self.elapsed_seconds / worked * (self.tasks_total - self.tasks_finished)
+
+
+@dataclass
+class ArchivalRunResult:
+    """Outcome of a parallel archival run"""
+    archives: List[ArchiveMetadata]
+    progress: ArchivalProgress
+    failed_tasks: List[ArchivalTask]
+    skipped_tasks: List[ArchivalTask]
+
+
+class ParallelArchiver:
+    """Archives table partitions concurrently, max_workers at a time"""
+
+    def __init__(
+        self,
+        config: Config,
+        storage: Optional[StorageClient] = None,
+        catalog: Optional[ArchiveCatalog] = None,
+        service_factory: Optional[Callable[[], ArchivalService]] = None,
+        progress_callback: Optional[Callable[[ArchivalProgress, ArchivalTask], None]] = None,
+    ):
+        """
+        Args:
+            config: Service configuration
+            storage: Storage client shared by all workers; its upload pool
+                is the global limit on concurrent part uploads
+            catalog: Archive catalog shared by all workers
+            service_factory: Creates the ArchivalService (and DB connection)
+                of one worker; defaults to one sharing storage
+            progress_callback: Called after each task with the run's progress
+        """
+        self.config = config
+        self.storage = storage
+        self.catalog = catalog
+        self._owns_storage = self._owns_catalog = False
+        if service_factory is None:
+            if self.storage is None:
+                self.storage = StorageClient(config.s3)
+                self._owns_storage = True
+            if self.catalog is None:
+                self.catalog = ArchiveCatalog(config.archival.catalog_path)
+                self._owns_catalog = True
+            service_factory = lambda: ArchivalService(config, storage=self.storage, catalog=self.catalog)
+        self._service_factory = service_factory
+        self.progress_callback = progress_callback
+
+    def plan(self, tables: List[str], cutoff_date: datetime) -> List[ArchivalTask]:
+        """
+        Split tables into daily partitions from their oldest record to the cutoff
+
+        Args:
+            tables: Tables to archive
+            cutoff_date: Archive data older than this date
+
+        Returns:
+            Tasks ordered oldest day first, tables interleaved
+        """
+        tasks = []
+        service = self._service_factory()
+        try:
+            for table_name in tables:
+                oldest = service.get_oldest_record_date(table_name, cutoff_date)
+                if oldest is None:
+                    logger.info(f"No data to archive for {table_name}")
+                    continue
+                tasks.extend(self._daily_tasks(table_name, oldest, cutoff_date))
+        finally:
+            service.close()
+
+        tasks.sort(key=lambda task: task.start_date)  # Stable: keeps table order per day
+        return tasks
+
+    @staticmethod
+    def _daily_tasks(table_name: str, oldest: datetime, cutoff_date: datetime) -> List[ArchivalTask]:
+        if oldest.tzinfo is not None:
+            oldest = oldest.astimezone(timezone.utc).replace(tzinfo=None)
+
+        tasks = []
+        start = datetime(oldest.year, oldest.month, oldest.day)
+        while start < cutoff_date:
+            end = min(start + timedelta(days=1), cutoff_date)
+            tasks.append(ArchivalTask(table_name, start.strftime("%Y-%m-%d"), start, end))
+            start = end
+        return tasks
+
+    def run(
+        self,
+        tables: List[str],
+        cutoff_date: datetime,
+        deadline: Optional[datetime] = None,
+    ) -> ArchivalRunResult:
+        """
+        Archive all partitions of the tables older than the cutoff
+
+        Tasks not started by the deadline are skipped. They are left in the
+        database, and the next run picks them up.
+
+        Args:
+            tables: Tables to archive
+            cutoff_date: Archive data older than this date
+            deadline: Don't start new partitions after this time (UTC)
+
+        Returns:
+            ArchivalRunResult with the archives created and task outcomes
+        """
+        tasks = self.plan(tables, cutoff_date)
+        progress = ArchivalProgress(tasks_total=len(tasks))
+        result = ArchivalRunResult([], progress, [], [])
+        max_workers = self.config.archival.max_workers
+
+        logger.info(
+            f"Archiving {len(tasks)} partitions of {len(tables)} tables "
+            f"with {max_workers} workers (cutoff: {cutoff_date})"
+        )
+
+        local = threading.local()
+        services: List[ArchivalService] = []
+        services_lock = threading.Lock()
+
+        def run_task(task: ArchivalTask) -> Optional[List[ArchiveMetadata]]:
+            if deadline is not None and datetime.utcnow() >= deadline:
+                return None
+            service = getattr(local, "service", None)
+            if service is None:
+                service = local.service = self._service_factory()
+                with services_lock:
+                    services.append(service)
+            try:
+                return service.archive_table(
+                    table_name=task.table_name,
+                    partition_key=task.partition_key,
+                    cutoff_date=task.end_date,
+                    start_date=task.start_date,
+                )
+            except Exception:
+                # The connection may be broken or mid-transaction; this
+                # worker's next partition gets a new service
+                local.service = None
+                with services_lock:
+                    services.remove(service)
+                try:
+                    service.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close archival worker connection: {e}")
+                raise
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="archival") as pool:
+                futures = {pool.submit(run_task, task): task for task in tasks}
+                for future in as_completed(futures):
+                    task = futures[future]
+                    try:
+                        archives = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to archive {task.table_name} {task.partition_key}: {e}")
+                        progress.tasks_failed += 1
+                        result.failed_tasks.append(task)
+                        # Segments committed before the failure stay archived
+                        if isinstance(e, ArchivalError):
+                            self._add_archives(result, e.archives)
+                    else:
+                        if archives is None:
+                            progress.tasks_skipped += 1
+                            result.skipped_tasks.append(task)
+                        else:
+                            progress.tasks_done += 1
+                            self._add_archives(result, archives)
+                    self._report(progress, task)
+        finally:
+            for service in services:
+                service.close()
+
+        if result.skipped_tasks:
+            logger.warning(f"Deadline reached, {len(result.skipped_tasks)} partitions left for the next run")
+
+        result.archives.sort(key=lambda a: (a.table_name, a.partition_key, a.created_at))
+        return result
+
+    @staticmethod
+    def _add_archives(result: ArchivalRunResult, archives: List[ArchiveMetadata]) -> None:
+        progress = result.progress
+        progress.archives += len(archives)
+        progress.records += sum(a.record_count for a in archives)
+        progress.compressed_bytes += sum(a.compressed_size_bytes for a in archives)
+        result.archives.extend(archives)
+
+    def _report(self, progress: ArchivalProgress, task: ArchivalTask) -> None:
+        eta = progress.eta_seconds
+        logger.info(
+            f"[{progress.tasks_finished}/{progress.tasks_total}] {task.table_name} {task.partition_key}: "
+            f"{progress.records} records in {progress.archives} archives, "
+            f"{progress.compressed_bytes / (1024 * 1024):.1f} MB, "
+            f"{progress.elapsed_seconds:.0f}s elapsed"
+            + (f", ~{eta:.0f}s left" if eta is not None else "")
+        )
+        if self.progress_callback:
+            try:
+                self.progress_callback(progress, task)
+            except Exception as e:
+                logger.error(f"Progress callback failed: {e}")
+
+    def close(self):
+        """Close the storage client and catalog if this archiver created them"""
+        if self._owns_storage:
+            self.storage.close()
+        if self._owns_catalog:
+            self.catalog.close()
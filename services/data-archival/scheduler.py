@@ -5,14 +5,15 @@ Schedules and executes automated data archival jobs using APScheduler.
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
 from .config import Config
-from .archival_service import ArchivalService
+from .archival_service import ArchivalError, ArchivalService
+from .parallel_archiver import ParallelArchiver
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,15 @@ class ArchivalScheduler:
         """Start the scheduler"""
         logger.info("Starting archival scheduler")
 
+        # Index archives created before this catalog, so the first sweep
+        # and statistics see them; the jobs retry if this fails
+        try:
+            report = self.archival_service.ensure_catalog()
+            if report is not None:
+                logger.info(f"Archive catalog bootstrapped from S3: {report['archives']} archives")
+        except Exception as e:
+            logger.error(f"{e}; expiry and statistics will retry it")
+
         # Schedule monthly archival job
         self.scheduler.add_job(
             func=self._run_archival_job,
@@ -61,6 +71,16 @@ class ArchivalScheduler:
             replace_existing=True,
         )
 
+        # Schedule daily integrity scrub of a rotating sample of archives
+        if self.config.archival.scrub_archives_per_run > 0:
+            self.scheduler.add_job(
+                func=self._run_scrub_job,
+                trigger=CronTrigger(hour=4, minute=0),  # Daily at 4 AM
+                id="daily_scrub",
+                name="Daily Archive Integrity Scrub",
+                replace_existing=True,
+            )
+
         # Schedule weekly retention statistics
         self.scheduler.add_job(
             func=self._log_retention_statistics,
@@ -83,44 +103,44 @@ class ArchivalScheduler:
         self.archival_service.close()
 
     def _run_archival_job(self):
-        """Execute archival job for all configured tables"""
+        """Execute archival job for all configured tables, partitions in parallel"""
         logger.info("Starting scheduled archival job")
         start_time = datetime.utcnow()
+        archival = self.config.archival
 
         # Calculate cutoff date (data older than hot_retention_days)
-        cutoff_date = datetime.utcnow() - timedelta(days=self.config.archival.hot_retention_days)
-        partition_key = cutoff_date.strftime("%Y-%m")
+        cutoff_date = start_time - timedelta(days=archival.hot_retention_days)
+        deadline = None
+        if archival.job_time_limit_minutes > 0:
+            deadline = start_time + timedelta(minutes=archival.job_time_limit_minutes)
+
+        # New dictionary versions, trained on the rows about to be archived
+        try:
+            trained = self.archival_service.train_compression_dictionaries()
+            if trained:
+                logger.info(f"Compression dictionaries trained: {trained}")
+        except Exception as e:
+            logger.error(f"Compression dictionary training failed, archiving with previous versions: {e}")
 
-        total_archives = 0
-        total_records = 0
-
-        for table_name in self.config.archival.tables_to_archive:
-            logger.info(f"Archiving {table_name} (cutoff: {cutoff_date})")
-            try:
-                metadata = self.archival_service.archive_table(
-                    table_name=table_name,
-                    partition_key=partition_key,
-                    cutoff_date=cutoff_date,
-                )
-
-                if metadata:
-                    total_archives += 1
-                    total_records += metadata.record_count
-                    logger.info(
-                        f"Created archive {metadata.archive_id} for {table_name} "
-                        f"with {metadata.record_count} records"
-                    )
-                else:
-                    logger.info(f"No data to archive for {table_name}")
-
-            except Exception as e:
-                logger.error(f"Failed to archive {table_name}: {e}")
-                continue
+        archiver = ParallelArchiver(
+            self.config,
+            storage=self.archival_service.storage,
+            catalog=self.archival_service.catalog,
+        )
+        try:
+            result = archiver.run(archival.tables_to_archive, cutoff_date, deadline=deadline)
+        except Exception as e:
+            logger.error(f"Archival job failed: {e}")
+            return
+        finally:
+            archiver.close()
 
         elapsed = (datetime.utcnow() - start_time).total_seconds()
+        progress = result.progress
         logger.info(
             f"Archival job completed in {elapsed:.1f}s: "
-            f"{total_archives} archives created, {total_records} records archived"
+            f"{progress.archives} archives created, {progress.records} records archived, "
+            f"{progress.tasks_failed} partitions failed, {progress.tasks_skipped} left for the next run"
         )
 
     def _run_cleanup_job(self):
@@ -128,14 +148,43 @@ class ArchivalScheduler:
         logger.info("Starting scheduled cleanup job")
         start_time = datetime.utcnow()
 
+        # Without a bootstrapped catalog, archives past retention would be
+        # silently kept; fail the job so the error listener reports it
         try:
-            deleted_count = self.archival_service.delete_expired_archives()
+            self.archival_service.ensure_catalog()
+        except Exception as e:
+            logger.error(f"Cleanup job aborted, expired archives were not deleted: {e}")
+            raise
+
+        try:
+            result = self.archival_service.sweep_expired_archives()
             elapsed = (datetime.utcnow() - start_time).total_seconds()
-            logger.info(f"Cleanup job completed in {elapsed:.1f}s: {deleted_count} archives deleted")
+            logger.info(
+                f"Cleanup job completed in {elapsed:.1f}s: {len(result.deleted)} archives deleted"
+                + (f", {len(result.failed)} failed (retried next run)" if result.failed else "")
+            )
 
         except Exception as e:
             logger.error(f"Cleanup job failed: {e}")
 
+    def _run_scrub_job(self):
+        """Execute integrity scrub of the least recently verified archives"""
+        logger.info("Starting scheduled scrub job")
+        start_time = datetime.utcnow()
+
+        try:
+            result = self.archival_service.scrub_archives()
+            elapsed = (datetime.utcnow() - start_time).total_seconds()
+            failures = len(result.mismatched) + len(result.missing)
+            logger.info(
+                f"Scrub job completed in {elapsed:.1f}s: {len(result.verified)} archives verified"
+                + (f", {failures} FAILED integrity checks" if failures else "")
+                + (f", {len(result.errors)} unreadable (retried next pass)" if result.errors else "")
+            )
+
+        except Exception as e:
+            logger.error(f"Scrub job failed: {e}")
+
     def _log_retention_statistics(self):
         """Log retention statistics"""
         logger.info("Generating retention statistics")
@@ -155,7 +204,7 @@ class ArchivalScheduler:
         except Exception as e:
             logger.error(f"Failed to generate statistics: {e}")
 
-    def trigger_manual_archival(self, table_name: str, cutoff_date: datetime) -> Optional[str]:
+    def trigger_manual_archival(self, table_name: str, cutoff_date: datetime) -> List[str]:
         """
         Manually trigger archival for a specific table
 
@@ -164,28 +213,48 @@ class ArchivalScheduler:
             cutoff_date: Archive data older than this date
 
         Returns:
-            Archive ID if successful, None otherwise
+            IDs of the archives created (empty if nothing was archived)
         """
         logger.info(f"Manual archival triggered for {table_name} (cutoff: {cutoff_date})")
         partition_key = cutoff_date.strftime("%Y-%m")
 
         try:
-            metadata = self.archival_service.archive_table(
+            archives = self.archival_service.archive_table(
                 table_name=table_name,
                 partition_key=partition_key,
                 cutoff_date=cutoff_date,
             )
 
-            if metadata:
-                logger.info(f"Manual archival completed: {metadata.archive_id}")
-                return metadata.archive_id
+            if archives:
+                archive_ids = [metadata.archive_id for metadata in archives]
+                logger.info(f"Manual archival completed: {archive_ids}")
+                return archive_ids
             else:
                 logger.warning("No data to archive")
-                return None
+                return []
+
+        except ArchivalError as e:
+            logger.error(f"Manual archival failed: {e}")
+            return [metadata.archive_id for metadata in e.archives]
 
         except Exception as e:
             logger.error(f"Manual archival failed: {e}")
-            return None
+            return []
+
+    def trigger_catalog_reconcile(self) -> dict:
+        """
+        Rebuild the archive catalog from a full S3 listing
+
+        Returns:
+            Reconcile report (see ArchivalService.reconcile_catalog), or
+            an empty dictionary if it failed
+        """
+        logger.info("Catalog reconcile triggered")
+        try:
+            return self.archival_service.reconcile_catalog()
+        except Exception as e:
+            logger.error(f"Catalog reconcile failed: {e}")
+            return {}
 
     def get_next_run_times(self) -> dict:
         """
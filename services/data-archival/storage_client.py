@@ -4,12 +4,16 @@ S3-Compatible Storage Client for Data Archival
 Provides abstraction over S3-compatible storage (AWS S3, MinIO, etc.)
 for archival data storage with compression and metadata tracking.
 """
+import hashlib
 import io
 import json
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, BinaryIO
-from dataclasses import dataclass, asdict
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 
 import boto3
 from botocore.exceptions import ClientError
@@ -20,6 +24,9 @@ from .config import S3Config, CompressionType
 
 logger = logging.getLogger(__name__)
 
+# Maximum keys in one S3 DeleteObjects request
+DELETE_OBJECTS_MAX_KEYS = 1000
+
 
 @dataclass
 class ArchiveMetadata:
@@ -35,6 +42,244 @@ class ArchiveMetadata:
     checksum_sha256: str
     s3_key: str
     retention_until: str  # ISO 8601 timestamp (7 years from creation)
+    archive_format: str = "json"  # "parquet" or "json"
+    schema: Optional[Dict[str, str]] = None  # Column name -> Arrow type (Parquet)
+    first_record_at: Optional[str] = None  # Date column of the oldest record (ISO 8601, UTC)
+    last_record_at: Optional[str] = None  # Date column of the newest record (ISO 8601, UTC)
+    bloom_filter_columns: Optional[List[str]] = None  # Columns with row-group bloom filters
+    compression_dictionary_id: Optional[int] = None  # Trained ZSTD dictionary (JSON archives)
+
+
+@dataclass
+class BulkDeleteResult:
+    """Outcome of deleting many archives"""
+    deleted: List[str] = field(default_factory=list)  # Archive IDs
+    failed: Dict[str, str] = field(default_factory=dict)  # Archive ID -> error
+
+
+class BandwidthLimiter:
+    """
+    Caps the combined read rate of the threads sharing it
+
+    Each caller reports the bytes it just read and sleeps until the
+    budget covers them, so the average rate stays at bytes_per_second
+    however many threads read.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self._seconds_per_byte = 1.0 / bytes_per_second
+        self._lock = threading.Lock()
+        self._available_at = time.monotonic()
+
+    def consume(self, nbytes: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._available_at = max(self._available_at, now) + nbytes * self._seconds_per_byte
+            delay = self._available_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RangedReader(io.RawIOBase):
+    """
+    Seekable read-only view of an S3 object
+
+    Every read is one ranged GET of exactly the bytes asked for, so a
+    Parquet reader fetches the footer and the column chunks it needs and
+    nothing else.
+    """
+
+    def __init__(self, storage: "StorageClient", s3_key: str, size: int):
+        self._storage = storage
+        self._s3_key = s3_key
+        self._size = size
+        self._position = 0
+        self.bytes_read = 0
+        self.requests = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = min(max(offset, 0), self._size)
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = self._size if size is None or size < 0 else min(self._position + size, self._size)
+        if end <= self._position:
+            return b""
+
+        response = self._storage.s3_client.get_object(
+            Bucket=self._storage.config.bucket_name,
+            Key=self._s3_key,
+            Range=f"bytes={self._position}-{end - 1}",
+        )
+        data = response["Body"].read()
+        self._position += len(data)
+        self.bytes_read += len(data)
+        self.requests += 1
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class MultipartUpload(io.RawIOBase):
+    """
+    Writable stream uploaded to S3 as a multipart upload
+
+    Written bytes are cut into parts of multipart_part_size, and up to
+    multipart_max_concurrency parts upload at once. write() blocks while
+    that many are in flight, so memory stays near
+    (multipart_max_concurrency + 1) parts whatever the archive size.
+    An object that never fills its first part is sent with one PUT.
+
+    Nothing is visible in the bucket until complete() succeeds; closing
+    the stream without completing it aborts the upload.
+    """
+
+    def __init__(
+        self,
+        storage: "StorageClient",
+        s3_key: str,
+        object_metadata: Dict[str, str],
+        content_type: str = "application/octet-stream",
+    ):
+        self._storage = storage
+        self._s3 = storage.s3_client
+        self._bucket = storage.config.bucket_name
+        self._part_size = storage.config.multipart_part_size
+        self.s3_key = s3_key
+        self._extra_args = {
+            "ContentType": content_type,
+            "Metadata": object_metadata,
+            "ServerSideEncryption": "AES256",  # Enable encryption at rest
+        }
+
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Future] = []
+        self._slots = threading.BoundedSemaphore(storage.config.multipart_max_concurrency)
+        self._completed = False
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._raise_failed_part()
+        before = len(self._buffer)
+        self._buffer += data
+        written = len(self._buffer) - before
+        self.size += written
+
+        while len(self._buffer) >= self._part_size:
+            self._submit_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return written
+
+    def _submit_part(self, body: bytes) -> None:
+        """Upload one part in the background, waiting for a free slot"""
+        if self._upload_id is None:
+            response = self._s3.create_multipart_upload(
+                Bucket=self._bucket, Key=self.s3_key, **self._extra_args
+            )
+            self._upload_id = response["UploadId"]
+
+        self._slots.acquire()
+        try:
+            future = self._storage.upload_executor.submit(
+                self._upload_part, len(self._parts) + 1, body
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._parts.append(future)
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict:
+        response = self._s3.upload_part(
+            Bucket=self._bucket,
+            Key=self.s3_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _raise_failed_part(self) -> None:
+        for future in self._parts:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+    def complete(self) -> bool:
+        """
+        Upload what is buffered and make the object visible
+
+        Returns:
+            True if the object was stored, False otherwise (the upload
+            is aborted)
+        """
+        try:
+            if self._upload_id is None:
+                self._s3.put_object(
+                    Bucket=self._bucket, Key=self.s3_key, Body=bytes(self._buffer), **self._extra_args
+                )
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._parts]
+                self._s3.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self.s3_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            self._completed = True
+        except Exception as e:
+            logger.error(f"Failed to upload {self.s3_key}: {e}")
+            self.abort()
+            return False
+        finally:
+            self._buffer = bytearray()
+
+        logger.info(f"Uploaded {self.s3_key} ({self.size} bytes, {max(len(self._parts), 1)} parts)")
+        self.close()
+        return True
+
+    def abort(self) -> None:
+        """Discard the upload and any parts already stored"""
+        self._buffer = bytearray()
+        if self._upload_id is None or self._completed:
+            return
+
+        upload_id, self._upload_id = self._upload_id, None
+        for future in self._parts:
+            future.cancel()
+        for future in self._parts:
+            if not future.cancelled():
+                future.exception()  # Wait, so no part lands after the abort
+        try:
+            self._s3.abort_multipart_upload(Bucket=self._bucket, Key=self.s3_key, UploadId=upload_id)
+        except ClientError as e:
+            logger.error(f"Failed to abort multipart upload of {self.s3_key}: {e}")
+
+    def close(self) -> None:
+        if not self.closed and not self._completed:
+            self.abort()
+        super().close()
 
 
 class StorageClient:
@@ -44,6 +289,19 @@ class StorageClient:
         self.config = config
         self.s3_client = self._create_s3_client()
         self._ensure_bucket_exists()
+        self._upload_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def upload_executor(self) -> ThreadPoolExecutor:
+        """Thread pool uploading multipart parts, created on first use"""
+        with self._executor_lock:
+            if self._upload_executor is None:
+                self._upload_executor = ThreadPoolExecutor(
+                    max_workers=self.config.multipart_max_concurrency,
+                    thread_name_prefix="s3-upload",
+                )
+            return self._upload_executor
 
     def _create_s3_client(self):
         """Create boto3 S3 client with retry configuration"""
@@ -91,6 +349,13 @@ class StorageClient:
                 logger.error(f"Error checking bucket: {e}")
                 raise
 
+    def close(self):
+        """Stop the upload threads once running uploads finish"""
+        with self._executor_lock:
+            if self._upload_executor is not None:
+                self._upload_executor.shutdown(wait=True)
+                self._upload_executor = None
+
     def upload_archive(
         self,
         data: BinaryIO,
@@ -122,6 +387,7 @@ class StorageClient:
                         "partition-key": metadata.partition_key,
                         "record-count": str(metadata.record_count),
                         "compression": metadata.compression_type,
+                        "format": metadata.archive_format,
                         "checksum-sha256": metadata.checksum_sha256,
                         "created-at": metadata.created_at,
                         "retention-until": metadata.retention_until,
@@ -131,15 +397,7 @@ class StorageClient:
             )
 
             # Upload metadata as separate JSON file
-            metadata_key = f"metadata/{metadata.archive_id}.json"
-            metadata_json = json.dumps(asdict(metadata), indent=2)
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=metadata_key,
-                Body=metadata_json.encode("utf-8"),
-                ContentType="application/json",
-                ServerSideEncryption="AES256",
-            )
+            self._put_metadata_json(metadata)
 
             logger.info(
                 f"Uploaded archive {metadata.archive_id} ({metadata.compressed_size_bytes} bytes) "
@@ -151,6 +409,161 @@ class StorageClient:
             logger.error(f"Failed to upload archive {metadata.archive_id}: {e}")
             return False
 
+    def open_upload(
+        self,
+        s3_key: str,
+        object_metadata: Dict[str, str],
+        content_type: str = "application/octet-stream",
+    ) -> MultipartUpload:
+        """
+        Open a stream that uploads an archive as it is written
+
+        Args:
+            s3_key: S3 object key
+            object_metadata: S3 user metadata known before the data is written
+            content_type: MIME type of the data
+
+        Returns:
+            MultipartUpload; call complete() to store the object
+        """
+        return MultipartUpload(self, s3_key, object_metadata, content_type)
+
+    def put_metadata(self, metadata: ArchiveMetadata) -> bool:
+        """
+        Store the metadata JSON of an archive uploaded with open_upload()
+
+        Args:
+            metadata: Archive metadata
+
+        Returns:
+            True if stored, False otherwise
+        """
+        try:
+            self._put_metadata_json(metadata)
+            return True
+        except ClientError as e:
+            logger.error(f"Failed to store metadata for archive {metadata.archive_id}: {e}")
+            return False
+
+    def _put_metadata_json(self, metadata: ArchiveMetadata) -> None:
+        metadata_key = f"metadata/{metadata.archive_id}.json"
+        metadata_json = json.dumps(asdict(metadata), indent=2)
+        self.s3_client.put_object(
+            Bucket=self.config.bucket_name,
+            Key=metadata_key,
+            Body=metadata_json.encode("utf-8"),
+            ContentType="application/json",
+            ServerSideEncryption="AES256",
+        )
+
+    def put_bloom_filters(self, archive_id: str, data: bytes) -> bool:
+        """
+        Store the encoded row-group bloom filters of an archive
+
+        Args:
+            archive_id: Unique archive identifier
+            data: Output of bloom.encode_bloom_filters
+
+        Returns:
+            True if stored, False otherwise
+        """
+        try:
+            self.s3_client.put_object(
+                Bucket=self.config.bucket_name,
+                Key=self._bloom_filter_key(archive_id),
+                Body=data,
+                ContentType="application/octet-stream",
+                ServerSideEncryption="AES256",
+            )
+            return True
+        except ClientError as e:
+            logger.error(f"Failed to store bloom filters for archive {archive_id}: {e}")
+            return False
+
+    def get_bloom_filters(self, archive_id: str) -> Optional[bytes]:
+        """
+        Fetch the encoded row-group bloom filters of an archive
+
+        Args:
+            archive_id: Unique archive identifier
+
+        Returns:
+            Encoded filters, or None if unavailable
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.config.bucket_name,
+                Key=self._bloom_filter_key(archive_id),
+            )
+            return response["Body"].read()
+        except ClientError as e:
+            logger.warning(f"Bloom filters unavailable for archive {archive_id}: {e}")
+            return None
+
+    def put_dictionary(self, table_name: str, dictionary_id: int, data: bytes) -> Optional[str]:
+        """
+        Store a trained compression dictionary
+
+        Dictionaries are kept for as long as the bucket: every archive
+        compressed with one needs it to be read.
+
+        Args:
+            table_name: Table the dictionary was trained on
+            dictionary_id: ZSTD dictionary ID
+            data: Dictionary bytes
+
+        Returns:
+            S3 key of the dictionary, or None if it could not be stored
+        """
+        s3_key = self.dictionary_key(table_name, dictionary_id)
+        try:
+            self.s3_client.put_object(
+                Bucket=self.config.bucket_name,
+                Key=s3_key,
+                Body=data,
+                ContentType="application/octet-stream",
+                Metadata={"table-name": table_name, "dictionary-id": str(dictionary_id)},
+                ServerSideEncryption="AES256",
+            )
+            return s3_key
+        except ClientError as e:
+            logger.error(f"Failed to store compression dictionary {dictionary_id} for {table_name}: {e}")
+            return None
+
+    def get_dictionary(self, table_name: str, dictionary_id: int) -> Optional[bytes]:
+        """
+        Fetch a trained compression dictionary
+
+        Args:
+            table_name: Table the dictionary was trained on
+            dictionary_id: ZSTD dictionary ID
+
+        Returns:
+            Dictionary bytes, or None if unavailable
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.config.bucket_name,
+                Key=self.dictionary_key(table_name, dictionary_id),
+            )
+            return response["Body"].read()
+        except ClientError as e:
+            logger.error(f"Compression dictionary {dictionary_id} for {table_name} unavailable: {e}")
+            return None
+
+    def open_range_reader(self, s3_key: str, size: int) -> RangedReader:
+        """
+        Open an archive for reading with ranged GETs
+
+        Args:
+            s3_key: S3 object key
+            size: Object size in bytes (ArchiveMetadata.compressed_size_bytes)
+
+        Returns:
+            Seekable RangedReader
+        """
+        return RangedReader(self, s3_key, size)
+
     def download_archive(self, s3_key: str) -> Optional[bytes]:
         """
         Download archived data from S3
@@ -174,6 +587,77 @@ class StorageClient:
             logger.error(f"Failed to download archive {s3_key}: {e}")
             return None
 
+    def download_archive_to(
+        self,
+        s3_key: str,
+        fileobj: BinaryIO,
+        chunk_size: int = 1024 * 1024,
+    ) -> Optional[str]:
+        """
+        Stream an archive from S3 into a file, hashing it on the way
+
+        Args:
+            s3_key: S3 object key
+            fileobj: Binary file object receiving the archive
+            chunk_size: Bytes read from the response body at a time
+
+        Returns:
+            SHA-256 checksum (hex) of the downloaded bytes, or None if the
+            download fails
+        """
+        try:
+            checksum, size = self.stream_checksum(s3_key, fileobj.write, chunk_size)
+            logger.info(f"Downloaded archive from {s3_key} ({size} bytes)")
+            return checksum
+
+        except ClientError as e:
+            logger.error(f"Failed to download archive {s3_key}: {e}")
+            return None
+
+    def stream_checksum(
+        self,
+        s3_key: str,
+        sink: Optional[Callable[[bytes], Any]] = None,
+        chunk_size: int = 1024 * 1024,
+        limiter: Optional[BandwidthLimiter] = None,
+    ) -> Tuple[str, int]:
+        """
+        Hash an object as its body streams in, one chunk in memory at a time
+
+        Args:
+            s3_key: S3 object key
+            sink: Called with each chunk after hashing (e.g. a file's write)
+            chunk_size: Bytes read from the response body at a time
+            limiter: Shared bandwidth cap to throttle the read
+
+        Returns:
+            Tuple of (SHA-256 checksum hex, size in bytes)
+
+        Raises:
+            ClientError: If the object can't be read
+        """
+        response = self.s3_client.get_object(
+            Bucket=self.config.bucket_name,
+            Key=s3_key,
+        )
+        body = response["Body"]
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            while True:
+                chunk = body.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                if sink is not None:
+                    sink(chunk)
+                if limiter is not None:
+                    limiter.consume(len(chunk))
+        finally:
+            body.close()
+        return digest.hexdigest(), size
+
     def get_metadata(self, archive_id: str) -> Optional[ArchiveMetadata]:
         """
         Retrieve metadata for an archive
@@ -233,6 +717,29 @@ class StorageClient:
             logger.error(f"Failed to list archives with prefix {prefix}: {e}")
             return []
 
+    def iter_objects(self, prefix: str, page_size: int = 1000) -> Iterator[Dict]:
+        """
+        List every object under a prefix, page by page
+
+        Unlike list_archives, this follows continuation tokens, so the
+        listing is never truncated. Errors are raised, not swallowed.
+
+        Args:
+            prefix: S3 key prefix
+            page_size: Keys per list_objects_v2 request (at most 1000)
+
+        Yields:
+            Object summaries (Key, Size, LastModified, ...)
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=self.config.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": page_size},
+        )
+        for page in pages:
+            yield from page.get("Contents", [])
+
     def delete_archive(self, s3_key: str, archive_id: str) -> bool:
         """
         Delete an archive and its metadata (GDPR compliance)
@@ -251,12 +758,12 @@ class StorageClient:
                 Key=s3_key,
             )
 
-            # Delete metadata
-            metadata_key = f"metadata/{archive_id}.json"
-            self.s3_client.delete_object(
-                Bucket=self.config.bucket_name,
-                Key=metadata_key,
-            )
+            # Delete metadata and bloom filters (if any)
+            for key in (self._metadata_key(archive_id), self._bloom_filter_key(archive_id)):
+                self.s3_client.delete_object(
+                    Bucket=self.config.bucket_name,
+                    Key=key,
+                )
 
             logger.info(f"Deleted archive {archive_id} and metadata")
             return True
@@ -265,6 +772,96 @@ class StorageClient:
             logger.error(f"Failed to delete archive {archive_id}: {e}")
             return False
 
+    def delete_archives(
+        self,
+        archives: Iterable[ArchiveMetadata],
+        keys_per_request: int = DELETE_OBJECTS_MAX_KEYS,
+    ) -> BulkDeleteResult:
+        """
+        Delete many archives and their metadata with batched DeleteObjects
+
+        Each request removes up to keys_per_request keys (an archive's data,
+        metadata and bloom filters go in the same request), and up to
+        delete_concurrency requests run at once. An archive counts as
+        deleted only if all of its keys were; the others are reported with
+        the S3 error, so the caller can keep them for a retry.
+
+        Args:
+            archives: Archives to delete
+            keys_per_request: Keys per DeleteObjects request (at most 1000)
+
+        Returns:
+            BulkDeleteResult with deleted and failed archive IDs
+        """
+        keys_per_request = min(keys_per_request, DELETE_OBJECTS_MAX_KEYS)
+        batches: List[List[ArchiveMetadata]] = []
+        batch_keys = 0
+        for metadata in archives:
+            keys = len(self._archive_keys(metadata))
+            if not batches or batch_keys + keys > keys_per_request:
+                batches.append([])
+                batch_keys = 0
+            batches[-1].append(metadata)
+            batch_keys += keys
+
+        result = BulkDeleteResult()
+        if not batches:
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.config.delete_concurrency, len(batches)),
+            thread_name_prefix="s3-delete",
+        ) as pool:
+            for batch, errors in zip(batches, pool.map(self._delete_batch, batches)):
+                for metadata in batch:
+                    error = next(filter(None, map(errors.get, self._archive_keys(metadata))), None)
+                    if error:
+                        result.failed[metadata.archive_id] = error
+                    else:
+                        result.deleted.append(metadata.archive_id)
+
+        logger.info(
+            f"Deleted {len(result.deleted)} archives in {len(batches)} requests"
+            + (f", {len(result.failed)} failed" if result.failed else "")
+        )
+        return result
+
+    def _delete_batch(self, batch: List[ArchiveMetadata]) -> Dict[str, str]:
+        """Delete one batch of archives; returns errors by key"""
+        keys = [key for m in batch for key in self._archive_keys(m)]
+        try:
+            response = self.s3_client.delete_objects(
+                Bucket=self.config.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except ClientError as e:
+            logger.error(f"DeleteObjects request for {len(batch)} archives failed: {e}")
+            return {key: str(e) for key in keys}
+
+        return {
+            error["Key"]: f"{error.get('Code', 'Error')}: {error.get('Message', '')}"
+            for error in response.get("Errors", [])
+        }
+
+    @staticmethod
+    def _metadata_key(archive_id: str) -> str:
+        return f"metadata/{archive_id}.json"
+
+    @staticmethod
+    def _bloom_filter_key(archive_id: str) -> str:
+        return f"metadata/{archive_id}.bloom"
+
+    @staticmethod
+    def dictionary_key(table_name: str, dictionary_id: int) -> str:
+        return f"dictionaries/{table_name}/{dictionary_id}.zdict"
+
+    def _archive_keys(self, metadata: ArchiveMetadata) -> List[str]:
+        """Every S3 key belonging to an archive"""
+        keys = [metadata.s3_key, self._metadata_key(metadata.archive_id)]
+        if metadata.bloom_filter_columns:
+            keys.append(self._bloom_filter_key(metadata.archive_id))
+        return keys
+
     def get_archive_size(self, s3_key: str) -> Optional[int]:
         """
         Get size of an archive without downloading
@@ -286,26 +883,28 @@ class StorageClient:
             logger.error(f"Failed to get size of {s3_key}: {e}")
             return None
 
-    def verify_integrity(self, s3_key: str, expected_checksum: str) -> bool:
+    def verify_integrity(
+        self,
+        s3_key: str,
+        expected_checksum: str,
+        limiter: Optional[BandwidthLimiter] = None,
+    ) -> bool:
         """
         Verify archive integrity using SHA-256 checksum
 
+        The archive is hashed as it streams in, so archives of any size
+        are verified in constant memory.
+
         Args:
             s3_key: S3 object key
             expected_checksum: Expected SHA-256 checksum (hex string)
+            limiter: Shared bandwidth cap to throttle the read
 
         Returns:
             True if checksums match, False otherwise
         """
-        import hashlib
-
         try:
-            # Download and compute checksum
-            data = self.download_archive(s3_key)
-            if data is None:
-                return False
-
-            actual_checksum = hashlib.sha256(data).hexdigest()
+            actual_checksum, size = self.stream_checksum(s3_key, limiter=limiter)
             matches = actual_checksum == expected_checksum
 
             if not matches:
@@ -314,7 +913,7 @@ class StorageClient:
                     f"expected {expected_checksum}, got {actual_checksum}"
                 )
             else:
-                logger.info(f"Checksum verified for {s3_key}")
+                logger.info(f"Checksum verified for {s3_key} ({size} bytes)")
 
             return matches
 
@@ -1,15 +1,34 @@
 """
 Unit tests for Archival Service
 """
+import dataclasses
+import hashlib
+import io
 import json
+import os
+import uuid
+from collections import namedtuple
+from decimal import Decimal
+
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock, patch, call
 from unittest import mock
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from .. import archival_service as archival_service_module
+from .. import archive_format as archive_format_module
+from ..archival_service import ArchivalError, ArchivalService
+from ..archive_format import iter_archive_batches, read_archive
+from ..catalog import ArchiveCatalog
+from ..compression import CompressionService
+from ..storage_client import ArchiveMetadata, BulkDeleteResult, StorageClient
+from ..config import Config, DatabaseConfig, S3Config, ArchivalConfig, ArchiveFormat, CompressionType
+
 
-from ..archival_service import ArchivalService
-from ..storage_client import ArchiveMetadata
-from ..config import Config, DatabaseConfig, S3Config, ArchivalConfig, CompressionType
+# Stand-in for psycopg2's cursor.description entries
+Column = namedtuple("Column", ["name", "type_code", "precision", "scale"])
 
 
 class TestArchivalService:
@@ -39,6 +58,7 @@ class TestArchivalService:
                 cold_retention_years=7,
                 compression=CompressionType.GZIP,
                 chunk_size=100,
+                catalog_path=":memory:",
             ),
         )
 
@@ -47,6 +67,12 @@ class TestArchivalService:
         """Create mock database connection"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
+        mock_cursor.description = [
+            Column("id", 23, None, None),  # int4
+            Column("detected_at", 25, None, None),  # text
+            Column("gateway_id", 1043, None, None),  # varchar
+            Column("is_fraud", 16, None, None),  # bool
+        ]
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
         return mock_conn, mock_cursor
 
@@ -60,8 +86,27 @@ class TestArchivalService:
             service = ArchivalService(test_config)
             service.db_conn = mock_conn
             service._cursor = mock_cursor
+            # As if already bootstrapped from S3, so expiry and statistics
+            # read only what each test catalogs
+            service.catalog.record_reconcile(datetime.utcnow())
             return service
 
+    @pytest.fixture
+    def s3_storage(self, archival_service):
+        """Back the service with an in-memory S3 (moto)"""
+        with mock_aws():
+            archival_service.storage = StorageClient(S3Config(
+                endpoint_url="https://s3.amazonaws.com",
+                access_key="test_key",
+                secret_key="test_secret",
+                bucket_name="test-bucket",
+                region="us-east-1",
+                multipart_part_size=5 * 1024 * 1024,  # S3 minimum
+                multipart_max_concurrency=2,
+            ))
+            yield archival_service.storage
+            archival_service.storage.close()
+
     @pytest.fixture
     def sample_records(self):
         """Create sample database records"""
@@ -113,29 +158,59 @@ class TestArchivalService:
     ):
         """Test querying records for archival"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = sample_records
+        mock_cursor.fetchmany.side_effect = [sample_records[:2], sample_records[2:], []]
 
         cutoff_date = datetime(2024, 2, 1)
-        result = archival_service._query_records_to_archive("acm_alerts", cutoff_date)
+        chunks = list(archival_service._query_records_to_archive(
+            "acm_alerts", cutoff_date, after_key=("2024-01-01T00:00:00", 0)
+        ))
 
-        # Verify query execution
-        assert mock_cursor.execute.called
+        # Verify server-side cursor and keyset query
+        assert mock_conn.cursor.call_args.kwargs["name"].startswith("archive_")
         execute_call = mock_cursor.execute.call_args
         assert "acm_alerts" in execute_call[0][0]
-        assert "detected_at" in execute_call[0][0]
-        assert execute_call[0][1][0] == cutoff_date
+        assert "(detected_at, id) >" in execute_call[0][0]
+        assert "ORDER BY detected_at, id" in execute_call[0][0]
+        assert execute_call[0][1][:3] == (cutoff_date, "2024-01-01T00:00:00", 0)
+        mock_cursor.fetchmany.assert_called_with(archival_service.config.archival.chunk_size)
+
+        # Verify results come with the column description for the writer
+        assert [len(records) for _, records in chunks] == [2, 1]
+        assert chunks[0][0] is mock_cursor.description
+        assert chunks[0][1][0]["id"] == 1
+
+    def test_query_records_within_partition(self, archival_service, mock_db_connection):
+        """Test a start date bounds the query to one time partition"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.return_value = []
 
-        # Verify results
-        assert len(result) == len(sample_records)
-        assert result[0]["id"] == 1
+        list(archival_service._query_records_to_archive(
+            "acm_alerts", datetime(2024, 1, 16), start_date=datetime(2024, 1, 15)
+        ))
+
+        execute_call = mock_cursor.execute.call_args
+        assert "detected_at >= %s" in execute_call[0][0]
+        assert execute_call[0][1][:2] == (datetime(2024, 1, 16), datetime(2024, 1, 15))
+
+    def test_get_oldest_record_date(self, archival_service, mock_db_connection):
+        """Test the oldest record date under the cutoff"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = {"oldest": datetime(2023, 11, 2, 8, 15)}
+
+        oldest = archival_service.get_oldest_record_date("audit_events", datetime(2024, 2, 1))
+
+        assert oldest == datetime(2023, 11, 2, 8, 15)
+        execute_call = mock_cursor.execute.call_args
+        assert "MIN(created_at)" in execute_call[0][0]
+        assert execute_call[0][1] == (datetime(2024, 2, 1),)
 
     def test_query_records_no_data(self, archival_service, mock_db_connection):
         """Test querying when no records exist"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchmany.return_value = []
 
         cutoff_date = datetime(2024, 2, 1)
-        result = archival_service._query_records_to_archive("acm_alerts", cutoff_date)
+        result = list(archival_service._query_records_to_archive("acm_alerts", cutoff_date))
 
         assert result == []
 
@@ -145,39 +220,41 @@ class TestArchivalService:
         mock_cursor.rowcount = 100
 
         cutoff_date = datetime(2024, 2, 1)
-        deleted_count = archival_service._delete_archived_records("acm_alerts", cutoff_date)
+        deleted_count = archival_service._delete_archived_records(
+            "acm_alerts", cutoff_date, ("2024-01-01", 1), ("2024-01-31", 100)
+        )
 
-        # Verify DELETE query execution
+        # Verify DELETE is bounded to the archived key range
         assert mock_cursor.execute.called
         execute_call = mock_cursor.execute.call_args
         assert "DELETE FROM" in execute_call[0][0]
         assert "acm_alerts" in execute_call[0][0]
+        assert execute_call[0][1] == (cutoff_date, "2024-01-01", 1, "2024-01-31", 100)
 
-        # Verify commit
-        assert mock_conn.commit.called
+        # Commit is left to the archival transaction
+        assert not mock_conn.commit.called
 
         # Verify count
         assert deleted_count == 100
 
     def test_archive_table_success(
-        self, archival_service, mock_db_connection, sample_records
+        self, archival_service, mock_db_connection, sample_records, s3_storage
     ):
         """Test successful table archival"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = sample_records
+        mock_cursor.fetchmany.side_effect = [sample_records, [], []]
         mock_cursor.rowcount = len(sample_records)
 
-        # Mock storage upload success
-        with patch.object(archival_service.storage, "upload_archive", return_value=True):
-            cutoff_date = datetime(2024, 2, 1)
-            metadata = archival_service.archive_table(
-                table_name="acm_alerts",
-                partition_key="2024-01",
-                cutoff_date=cutoff_date,
-            )
+        cutoff_date = datetime(2024, 2, 1)
+        archives = archival_service.archive_table(
+            table_name="acm_alerts",
+            partition_key="2024-01",
+            cutoff_date=cutoff_date,
+        )
 
         # Verify metadata returned
-        assert metadata is not None
+        assert len(archives) == 1
+        metadata = archives[0]
         assert metadata.table_name == "acm_alerts"
         assert metadata.partition_key == "2024-01"
         assert metadata.record_count == len(sample_records)
@@ -185,6 +262,12 @@ class TestArchivalService:
         assert metadata.compressed_size_bytes > 0
         assert metadata.checksum_sha256 is not None
 
+        # Verify archive and metadata are stored and cataloged
+        assert s3_storage.get_metadata(metadata.archive_id) == metadata
+        assert archival_service.catalog.get(metadata.archive_id) == metadata
+        assert s3_storage.verify_integrity(metadata.s3_key, metadata.checksum_sha256)
+        assert s3_storage.get_archive_size(metadata.s3_key) == metadata.compressed_size_bytes
+
         # Verify retention period (7 years)
         retention_until = datetime.fromisoformat(metadata.retention_until)
         created_at = datetime.fromisoformat(metadata.created_at)
@@ -194,36 +277,40 @@ class TestArchivalService:
     def test_archive_table_no_records(self, archival_service, mock_db_connection):
         """Test archival when no records to archive"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchmany.return_value = []
 
         cutoff_date = datetime(2024, 2, 1)
-        metadata = archival_service.archive_table(
+        archives = archival_service.archive_table(
             table_name="acm_alerts",
             partition_key="2024-01",
             cutoff_date=cutoff_date,
         )
 
-        # Should return None when no records
-        assert metadata is None
+        # Should return no archives when no records
+        assert archives == []
 
     def test_archive_table_upload_failure(
         self, archival_service, mock_db_connection, sample_records
     ):
         """Test archival handling when S3 upload fails"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = sample_records
+        mock_cursor.fetchmany.side_effect = [sample_records, []]
 
         # Mock storage upload failure
-        with patch.object(archival_service.storage, "upload_archive", return_value=False):
-            cutoff_date = datetime(2024, 2, 1)
-            metadata = archival_service.archive_table(
+        archival_service.storage.s3_client.put_object.side_effect = ClientError(
+            {"Error": {"Code": "500", "Message": "Internal Server Error"}}, "PutObject"
+        )
+        cutoff_date = datetime(2024, 2, 1)
+        with pytest.raises(ArchivalError) as excinfo:
+            archival_service.archive_table(
                 table_name="acm_alerts",
                 partition_key="2024-01",
                 cutoff_date=cutoff_date,
             )
 
-        # Should return None on upload failure
-        assert metadata is None
+        # The failure is reported, with no archives committed before it
+        assert excinfo.value.archives == []
+        assert mock_conn.rollback.called
 
         # Verify records were NOT deleted
         delete_query_found = False
@@ -234,19 +321,19 @@ class TestArchivalService:
         assert not delete_query_found
 
     def test_archive_table_compression(
-        self, archival_service, mock_db_connection, sample_records
+        self, archival_service, mock_db_connection, sample_records, s3_storage
     ):
         """Test that archival compresses data"""
         mock_conn, mock_cursor = mock_db_connection
-        mock_cursor.fetchall.return_value = sample_records
+        mock_cursor.fetchmany.side_effect = [sample_records * 20, [], []]
+        mock_cursor.rowcount = len(sample_records) * 20
 
-        with patch.object(archival_service.storage, "upload_archive", return_value=True):
-            cutoff_date = datetime(2024, 2, 1)
-            metadata = archival_service.archive_table(
-                table_name="acm_alerts",
-                partition_key="2024-01",
-                cutoff_date=cutoff_date,
-            )
+        cutoff_date = datetime(2024, 2, 1)
+        [metadata] = archival_service.archive_table(
+            table_name="acm_alerts",
+            partition_key="2024-01",
+            cutoff_date=cutoff_date,
+        )
 
         # Verify compression occurred
         assert metadata.compressed_size_bytes < metadata.original_size_bytes
@@ -256,6 +343,169 @@ class TestArchivalService:
         )
         assert compression_ratio > 0
 
+    def test_archive_table_segments_resume_after_last_key(
+        self, archival_service, mock_db_connection, sample_records, s3_storage
+    ):
+        """Test each segment is its own archive and transaction, keyed after the last"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.side_effect = [sample_records[:2], [], sample_records[2:], [], []]
+
+        def put_metadata(metadata):
+            mock_cursor.rowcount = metadata.record_count
+            return True
+
+        with patch.object(s3_storage, "put_metadata", side_effect=put_metadata):
+            archives = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        uploaded = [
+            read_archive(s3_storage.download_archive(a.s3_key), a.archive_format, archival_service.compression)
+            for a in archives
+        ]
+        assert [a.record_count for a in archives] == [2, 1]
+        assert uploaded == [sample_records[:2], sample_records[2:]]
+        assert mock_conn.commit.call_count == 2
+
+        # The second segment starts after the first segment's last (date, id)
+        selects = [c for c in mock_cursor.execute.call_args_list if "SELECT" in c[0][0]]
+        assert selects[1][0][1][1:3] == ("2024-01-16T11:45:00", 2)
+
+    def test_archive_table_keeps_rows_when_delete_count_differs(
+        self, archival_service, mock_db_connection, sample_records, s3_storage
+    ):
+        """Test a delete that doesn't match the archive rolls back and removes the archive"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.side_effect = [sample_records, []]
+        mock_cursor.rowcount = len(sample_records) + 1
+
+        with pytest.raises(ArchivalError, match="deleted 4 rows but archived 3"):
+            archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        assert mock_conn.rollback.called
+        assert not mock_conn.commit.called
+        assert s3_storage.list_archives() == []
+        assert len(archival_service.catalog) == 0
+
+    def test_archive_table_failure_reports_committed_segments(
+        self, archival_service, mock_db_connection, sample_records, s3_storage
+    ):
+        """Test a failed segment raises with the segments archived before it"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.side_effect = [sample_records[:2], [], sample_records[2:], []]
+        mock_cursor.rowcount = 2
+
+        with pytest.raises(ArchivalError) as excinfo:
+            archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        # The first segment is committed; the second deleted 2 rows, not 1
+        [committed] = excinfo.value.archives
+        assert committed.record_count == 2
+        assert mock_conn.commit.call_count == 1
+        assert s3_storage.list_archives() == [committed.s3_key]
+
+    def test_reconcile_catalog_from_s3(
+        self, archival_service, mock_db_connection, sample_records, s3_storage
+    ):
+        """Test the catalog is rebuilt from a full S3 listing"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.side_effect = [sample_records[:2], [], sample_records[2:], [], []]
+        mock_cursor.rowcount = 2
+
+        def put_metadata(metadata):
+            mock_cursor.rowcount = metadata.record_count
+            return s3_storage._put_metadata_json(metadata) or True
+
+        with patch.object(s3_storage, "put_metadata", side_effect=put_metadata):
+            archives = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+        assert len(archival_service.catalog) == 2
+
+        # Lose one archive's data, add an object nobody cataloged, and a
+        # catalog entry for an archive that no longer exists
+        s3_storage.s3_client.delete_object(Bucket="test-bucket", Key=archives[0].s3_key)
+        s3_storage.s3_client.put_object(Bucket="test-bucket", Key="archives/acm_alerts/stray.gz", Body=b"x")
+        stale = dataclasses.replace(archives[1], archive_id="gone", s3_key="archives/gone.gz")
+        archival_service.catalog.add(stale)
+
+        report = archival_service.reconcile_catalog()
+
+        assert report == {
+            "archives": 1,
+            "added": 0,
+            "removed": 2,
+            "missing_data": [archives[0].archive_id],
+            "orphaned_objects": ["archives/acm_alerts/stray.gz"],
+            "dictionaries": 0,
+        }
+        assert archival_service.list_archives_for_table("acm_alerts") == [archives[1]]
+
+    def test_archive_table_streams_multipart_upload(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test archives larger than a part are uploaded in parts, not buffered whole"""
+        mock_conn, mock_cursor = mock_db_connection
+        records = [
+            {"id": i, "detected_at": f"2024-01-15T10:{i // 600:02d}:00",
+             "gateway_id": os.urandom(512).hex(), "is_fraud": False}
+            for i in range(12000)
+        ]
+        # One segment, then an empty query for the next one
+        mock_cursor.fetchmany.side_effect = [records[i:i + 1000] for i in range(0, 12000, 1000)] + [[], []]
+        mock_cursor.rowcount = len(records)
+
+        with patch.object(
+            s3_storage.s3_client, "upload_part", wraps=s3_storage.s3_client.upload_part
+        ) as upload_part:
+            [metadata] = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        # ~12 MB of gzipped random hex, in 5 MiB parts
+        assert upload_part.call_count == 2
+        assert s3_storage.verify_integrity(metadata.s3_key, metadata.checksum_sha256)
+        restored = read_archive(
+            s3_storage.download_archive(metadata.s3_key), metadata.archive_format, archival_service.compression
+        )
+        assert restored == records
+
+    def test_parquet_archive_restores_original_types(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test Parquet archives keep column types and record the schema"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.description = [
+            Column("id", 2950, None, None),  # uuid
+            Column("detected_at", 1114, None, None),  # timestamp
+            Column("confidence_score", 1700, 5, 2),  # numeric(5,2)
+            Column("call_count", 20, None, None),  # int8
+            Column("analysis", 3802, None, None),  # jsonb
+        ]
+        records = [
+            {
+                "id": uuid.UUID(int=i),
+                "detected_at": datetime(2024, 1, 15, 10, 30, i),
+                "confidence_score": Decimal("87.50"),
+                "call_count": 10**12 + i,
+                "analysis": {"cpm": 42, "flags": ["burst"]} if i else None,
+            }
+            for i in range(3)
+        ]
+        mock_cursor.fetchmany.side_effect = [records, [], []]
+        mock_cursor.rowcount = len(records)
+
+        [metadata] = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        assert metadata.archive_format == "parquet"
+        assert metadata.s3_key.endswith(".parquet")
+        assert metadata.schema["detected_at"] == "timestamp[us]"
+        assert metadata.schema["confidence_score"] == "decimal128(5, 2)"
+
+        restored = read_archive(
+            s3_storage.download_archive(metadata.s3_key), metadata.archive_format, archival_service.compression
+        )
+        assert restored[1]["detected_at"] == datetime(2024, 1, 15, 10, 30, 1)
+        assert restored[1]["confidence_score"] == Decimal("87.50")
+        assert restored[1]["call_count"] == 10**12 + 1
+        assert restored[1]["id"] == str(uuid.UUID(int=1))
+        assert json.loads(restored[1]["analysis"]) == {"cpm": 42, "flags": ["burst"]}
+        assert restored[0]["analysis"] is None
+
     def test_restore_archive_success(self, archival_service, mock_db_connection):
         """Test successful archive restoration"""
         mock_conn, mock_cursor = mock_db_connection
@@ -269,7 +519,6 @@ class TestArchivalService:
         compressed_data = archival_service.compression.compress(records_json.encode("utf-8"))
 
         # Mock metadata
-        import hashlib
         checksum = hashlib.sha256(compressed_data).hexdigest()
         metadata = ArchiveMetadata(
             archive_id="test-123",
@@ -285,11 +534,18 @@ class TestArchivalService:
             retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
         )
 
+        def download_archive_to(s3_key, fileobj):
+            fileobj.write(compressed_data)
+            return checksum
+
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda sql, stream, size: copied.append(stream.read())
+
         # Mock storage operations
         with patch.object(archival_service.storage, "get_metadata", return_value=metadata), \
-             patch.object(archival_service.storage, "download_archive", return_value=compressed_data):
+             patch.object(archival_service.storage, "download_archive_to", side_effect=download_archive_to):
 
-            mock_cursor.rowcount = 1
+            mock_cursor.rowcount = 2
             result = archival_service.restore_archive("test-123")
 
         # Verify restoration
@@ -298,8 +554,14 @@ class TestArchivalService:
         assert result[0]["id"] == 1
         assert result[1]["id"] == 2
 
-        # Verify INSERT queries executed
-        assert mock_cursor.execute.called
+        # Verify rows loaded with COPY through a staging table
+        copy_sql = mock_cursor.copy_expert.call_args.args[0]
+        assert copy_sql == 'COPY restore_staging_acm_alerts ("id", "name") FROM STDIN'
+        assert copied == [b"1\tRecord 1\n2\tRecord 2\n"]
+        insert_sql = mock_cursor.execute.call_args.args[0]
+        assert "INSERT INTO acm_alerts" in insert_sql
+        assert "ON CONFLICT DO NOTHING" in insert_sql
+        mock_conn.commit.assert_called_once()
 
     def test_restore_archive_metadata_not_found(self, archival_service):
         """Test restoration when metadata doesn't exist"""
@@ -328,12 +590,215 @@ class TestArchivalService:
         # Mock download with different data (wrong checksum)
         corrupted_data = b"corrupted archive data"
 
+        def download_archive_to(s3_key, fileobj):
+            fileobj.write(corrupted_data)
+            return hashlib.sha256(corrupted_data).hexdigest()
+
         with patch.object(archival_service.storage, "get_metadata", return_value=metadata), \
-             patch.object(archival_service.storage, "download_archive", return_value=corrupted_data):
+             patch.object(archival_service.storage, "download_archive_to", side_effect=download_archive_to):
             result = archival_service.restore_archive("test-123")
 
-        # Restoration should fail due to checksum mismatch
+        # Restoration should fail due to checksum mismatch, before loading anything
         assert result is None
+        assert not archival_service.db_conn.cursor.called
+
+    def test_bulk_restore_archive_into_schema(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test a Parquet archive is streamed in batches into an investigation schema"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.description = [
+            Column("id", 23, None, None),  # int4
+            Column("detected_at", 1114, None, None),  # timestamp
+            Column("gateway_id", 25, None, None),  # text
+            Column("is_fraud", 16, None, None),  # bool
+        ]
+        records = [
+            {"id": i, "detected_at": datetime(2024, 1, 15, 10, 30, i % 60),
+             "gateway_id": "GW\t001" if i == 0 else None, "is_fraud": i % 2 == 0}
+            for i in range(250)
+        ]
+        mock_cursor.fetchmany.side_effect = [records, [], []]
+        mock_cursor.rowcount = len(records)
+        [metadata] = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+        mock_cursor.reset_mock()
+        mock_conn.reset_mock()
+
+        batch_sizes = []
+        read_batches = archival_service_module.iter_archive_batches
+
+        def iter_archive_batches(*args):
+            for batch in read_batches(*args):
+                batch_sizes.append(len(batch))
+                yield batch
+
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda sql, stream, size: copied.append(stream.read())
+        mock_cursor.rowcount = 240  # 10 rows were already there
+
+        with patch.object(archival_service_module, "iter_archive_batches", side_effect=iter_archive_batches):
+            restored = archival_service.bulk_restore_archive(metadata.archive_id, target_schema="investigation")
+
+        assert restored == 240
+        assert batch_sizes == [100, 100, 50]  # chunk_size records at a time
+
+        statements = [c.args[0].strip() for c in mock_cursor.execute.call_args_list]
+        assert statements[:3] == [
+            "CREATE SCHEMA IF NOT EXISTS investigation",
+            "CREATE TABLE IF NOT EXISTS investigation.acm_alerts (LIKE acm_alerts INCLUDING ALL)",
+            "CREATE TEMPORARY TABLE restore_staging_acm_alerts (LIKE investigation.acm_alerts) ON COMMIT DROP",
+        ]
+        assert statements[3].startswith('INSERT INTO investigation.acm_alerts ("id", "detected_at"')
+
+        lines = copied[0].decode("utf-8").splitlines()
+        assert len(lines) == 250
+        assert lines[0] == "0\t2024-01-15T10:30:00\tGW\\t001\tt"
+        assert lines[1] == "1\t2024-01-15T10:30:01\t\\N\tf"
+        mock_conn.commit.assert_called_once()
+
+    def test_bulk_restore_archive_rolls_back_on_failure(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test a failed COPY leaves nothing restored"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchmany.side_effect = [
+            [{"id": 1, "detected_at": "2024-01-15T10:30:00", "gateway_id": "GW001", "is_fraud": True}], [], []
+        ]
+        mock_cursor.rowcount = 1
+        [metadata] = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+        mock_conn.reset_mock()
+        mock_cursor.copy_expert.side_effect = Exception("invalid input syntax for type boolean")
+
+        assert archival_service.bulk_restore_archive(metadata.archive_id) is None
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+    def _archive_cdrs(self, archival_service, mock_db_connection):
+        """Archive 300 CDRs as a Parquet archive with 3 row groups"""
+        mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.description = [
+            Column("id", 23, None, None),  # int4
+            Column("call_start_time", 1114, None, None),  # timestamp
+            Column("a_number", 25, None, None),  # text
+            Column("b_number", 25, None, None),  # text
+        ]
+        records = [
+            {"id": i, "call_start_time": datetime(2024, 1, 1) + timedelta(hours=i),
+             "a_number": f"+23480{i % 50:08d}", "b_number": f"+23490{i:08d}"}
+            for i in range(300)
+        ]
+        mock_cursor.fetchmany.side_effect = [records[i:i + 100] for i in range(0, 300, 100)] + [[], []]
+        mock_cursor.rowcount = len(records)
+        [metadata] = archival_service.archive_table("call_detail_records", "2024-01", datetime(2024, 2, 1))
+        return metadata, records
+
+    def test_search_archives_reads_only_matching_row_groups(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test a B-number lookup fetches one row group with ranged GETs"""
+        metadata, records = self._archive_cdrs(archival_service, mock_db_connection)
+        assert metadata.bloom_filter_columns == ["a_number", "b_number"]
+        assert metadata.first_record_at == "2024-01-01T00:00:00"
+        assert metadata.last_record_at == "2024-01-13T11:00:00"
+
+        with patch.object(s3_storage.s3_client, "get_object", wraps=s3_storage.s3_client.get_object) as get_object:
+            result = archival_service.search_archives("call_detail_records", {"b_number": "+2349000000150"})
+
+        assert result.records == [records[150]]
+        assert result.archives_searched == 1
+        assert (result.row_groups_read, result.row_groups_total) == (1, 3)
+        assert result.bytes_read > 0
+
+        # Bloom filters, then two ranged GETs: the footer and the one row group
+        archive_gets = [c.kwargs for c in get_object.call_args_list if c.kwargs["Key"] == metadata.s3_key]
+        assert len(archive_gets) == 2
+        assert all("Range" in c for c in archive_gets)
+        assert archival_service.db_conn.commit.call_count == 1  # The archival only; search writes nothing
+
+    def test_search_archives_prunes_by_bloom_filter_and_time(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test archives and row groups that can't match are never fetched"""
+        metadata, records = self._archive_cdrs(archival_service, mock_db_connection)
+
+        # Not in any row group's bloom filter: the archive isn't opened
+        missing = archival_service.search_archives("call_detail_records", {"b_number": "+2348000000000"})
+        assert missing.records == [] and missing.archives_skipped == 1
+        assert missing.bytes_read == 0
+
+        # Outside the archive's record dates: not even a candidate
+        later = archival_service.search_archives(
+            "call_detail_records", {"b_number": "+2349000000150"}, (datetime(2024, 3, 1), None)
+        )
+        assert later.archives_searched == 0
+
+        # An A-number in every row group, narrowed to one by call_start_time statistics
+        calls = archival_service.search_archives(
+            "call_detail_records", {"a_number": "+2348000000007"}, (datetime(2024, 1, 10), datetime(2024, 1, 11))
+        )
+        assert calls.records == [r for r in records[216:240] if r["a_number"] == "+2348000000007"]
+        assert (calls.row_groups_read, calls.row_groups_total) == (1, 3)
+
+    def test_compression_dictionary_archive_and_restore(
+        self, archival_service, mock_db_connection, s3_storage
+    ):
+        """Test JSON archives use the table's trained dictionary and restore with it"""
+        mock_conn, mock_cursor = mock_db_connection
+        archival = archival_service.config.archival
+        archival.compression = CompressionType.ZSTD
+        archival.archive_format = ArchiveFormat.JSON
+        archival.compression_dictionary_size = 4096
+        archival_service.compression = CompressionService(CompressionType.ZSTD)
+        records = [
+            {"id": i, "detected_at": f"2024-01-{i % 28 + 1:02d}T10:00:00",
+             "gateway_id": f"GW{i % 40:03d}", "is_fraud": i % 3 == 0}
+            for i in range(1000)
+        ]
+
+        # Not used for tables outside compression_dictionary_tables
+        assert archival_service.train_compression_dictionary("call_detail_records") is None
+
+        mock_cursor.fetchall.return_value = records
+        dictionary_id = archival_service.train_compression_dictionary("acm_alerts")
+        assert dictionary_id is not None
+        assert archival_service.catalog.current_dictionary("acm_alerts") == dictionary_id
+        assert mock_cursor.execute.call_args.args[1] == (archival.compression_dictionary_samples,)
+
+        mock_cursor.fetchmany.side_effect = [records[:20], [], []]
+        mock_cursor.rowcount = 20
+        [metadata] = archival_service.archive_table("acm_alerts", "2024-01", datetime(2024, 2, 1))
+
+        assert metadata.compression_dictionary_id == dictionary_id
+        head = s3_storage.s3_client.head_object(Bucket="test-bucket", Key=metadata.s3_key)
+        assert head["Metadata"]["compression-dictionary"] == str(dictionary_id)
+
+        # A fresh process fetches the dictionary from S3 to restore
+        archival_service.compression = CompressionService(CompressionType.ZSTD)
+        mock_cursor.copy_expert.side_effect = lambda sql, stream, size: stream.read()
+        assert archival_service.restore_archive(metadata.archive_id) == json.loads(json.dumps(records[:20]))
+        assert archival_service.compression.has_dictionary(dictionary_id)
+
+        # Without the dictionary the archive can't be decoded
+        archival_service.compression = CompressionService(CompressionType.ZSTD)
+        s3_storage.s3_client.delete_object(
+            Bucket="test-bucket", Key=StorageClient.dictionary_key("acm_alerts", dictionary_id)
+        )
+        assert archival_service.restore_archive(metadata.archive_id) is None
+
+    def test_json_archive_batches_decode_incrementally(self, archival_service):
+        """Test JSON archives are parsed in batches across read boundaries"""
+        records = [{"id": i, "note": "x" * (i % 7), "tags": [i, "ä"]} for i in range(25)]
+        data = archival_service.compression.compress(json.dumps(records).encode("utf-8"))
+
+        batches = list(iter_archive_batches(io.BytesIO(data), "json", archival_service.compression, 10))
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert [r for b in batches for r in b] == records
+
+        # Elements and multi-byte characters split across reads
+        stream = archival_service.compression.stream_reader(io.BytesIO(data))
+        assert list(archive_format_module._iter_json_array(stream, read_size=5)) == records
+
+        assert list(iter_archive_batches(io.BytesIO(b""), "json", CompressionService(CompressionType.NONE), 10)) == []
 
     def test_list_archives_for_table(self, archival_service):
         """Test listing archives for specific table"""
@@ -373,13 +838,18 @@ class TestArchivalService:
             ),
         ]
 
-        with patch.object(archival_service.storage, "list_archives", return_value=s3_keys), \
-             patch.object(archival_service.storage, "get_metadata", side_effect=metadata_list):
+        for metadata in metadata_list:
+            archival_service.catalog.add(metadata)
+
+        with patch.object(archival_service.storage, "list_archives") as mock_list:
             result = archival_service.list_archives_for_table("acm_alerts")
+            january = archival_service.list_archives_for_table("acm_alerts", partition="2024-01")
 
-        # Verify results
-        assert len(result) == 2
-        assert all(m.table_name == "acm_alerts" for m in result)
+        # Verify results come from the catalog, without listing S3
+        assert result == metadata_list
+        assert [m.archive_id for m in january] == ["archive1"]
+        assert archival_service.list_archives_for_table("audit_events") == []
+        mock_list.assert_not_called()
 
     def test_get_retention_statistics(self, archival_service, test_config):
         """Test retention statistics calculation"""
@@ -417,15 +887,11 @@ class TestArchivalService:
             ],
         }
 
-        def mock_list_archives(table_name):
-            return mock_archives.get(table_name, [])
+        for archives in mock_archives.values():
+            for metadata in archives:
+                archival_service.catalog.add(metadata)
 
-        with patch.object(
-            archival_service,
-            "list_archives_for_table",
-            side_effect=mock_list_archives
-        ):
-            stats = archival_service.get_retention_statistics()
+        stats = archival_service.get_retention_statistics()
 
         # Verify overall statistics
         assert stats["total_archives"] == 2
@@ -456,24 +922,150 @@ class TestArchivalService:
             retention_until=(datetime.utcnow() - timedelta(days=1)).isoformat(),  # Expired
         )
 
-        # Mock archives list
+        archival_service.catalog.add(expired_metadata)
+
         with patch.object(
-            archival_service,
-            "list_archives_for_table",
-            return_value=[expired_metadata]
-        ), patch.object(
             archival_service.storage,
-            "delete_archive",
-            return_value=True
+            "delete_archives",
+            return_value=BulkDeleteResult(deleted=["expired-123"]),
         ) as mock_delete:
             deleted_count = archival_service.delete_expired_archives()
 
         # Verify deletion
         assert deleted_count == 1
-        mock_delete.assert_called_once_with(
-            expired_metadata.s3_key,
-            expired_metadata.archive_id
+        mock_delete.assert_called_once_with([expired_metadata])
+        assert archival_service.catalog.get("expired-123") is None
+
+    def test_sweep_expired_archives_in_batches(self, archival_service, s3_storage):
+        """Test a sweep bulk-deletes only expired archives and keeps failures cataloged"""
+        now = datetime.utcnow()
+        for i in range(7):
+            expired = i < 5
+            metadata = ArchiveMetadata(
+                archive_id=f"archive-{i}",
+                table_name="acm_alerts",
+                partition_key="2017-01",
+                record_count=10,
+                original_size_bytes=500,
+                compressed_size_bytes=100,
+                compression_type="zstd",
+                created_at=(now - timedelta(days=8 * 365)).isoformat(),
+                checksum_sha256="abc123",
+                s3_key=f"archives/acm_alerts/2017-01/archive-{i}.zstd",
+                retention_until=(now + timedelta(days=-10 + i if expired else 30)).isoformat(),
+            )
+            s3_storage.s3_client.put_object(Bucket="test-bucket", Key=metadata.s3_key, Body=b"data")
+            s3_storage.put_metadata(metadata)
+            archival_service.catalog.add(metadata)
+
+        # Let one key fail, as a partial failure
+        delete_objects = s3_storage.s3_client.delete_objects
+
+        def flaky_delete_objects(Bucket, Delete):
+            failing = {"Key": "metadata/archive-2.json"}
+            response = delete_objects(
+                Bucket=Bucket, Delete={**Delete, "Objects": [o for o in Delete["Objects"] if o != failing]}
+            )
+            return {**response, "Errors": [{**failing, "Code": "InternalError", "Message": "retry"}]}
+
+        with patch.object(s3_storage.s3_client, "delete_objects", side_effect=flaky_delete_objects) as mock_delete:
+            result = archival_service.sweep_expired_archives()
+
+        # All 5 expired archives (10 keys) fit one request
+        assert mock_delete.call_count == 1
+        assert sorted(result.deleted) == ["archive-0", "archive-1", "archive-3", "archive-4"]
+        assert result.failed == {"archive-2": "InternalError: retry"}
+
+        # Unexpired archives are untouched; the failed one stays cataloged for the next sweep
+        remaining = sorted(m.archive_id for m in archival_service.list_archives_for_table("acm_alerts"))
+        assert remaining == ["archive-2", "archive-5", "archive-6"]
+        assert sorted(s3_storage.list_archives("metadata/")) == [
+            "metadata/archive-2.json", "metadata/archive-5.json", "metadata/archive-6.json",
+        ]
+
+    def test_sweep_bootstraps_a_fresh_catalog_from_s3(self, archival_service, s3_storage):
+        """Test a sweep on a never-reconciled catalog deletes archives it didn't upload"""
+        now = datetime.utcnow()
+        metadata = ArchiveMetadata(
+            archive_id="before-catalog",
+            table_name="acm_alerts",
+            partition_key="2017-01",
+            record_count=10,
+            original_size_bytes=500,
+            compressed_size_bytes=100,
+            compression_type="zstd",
+            created_at=(now - timedelta(days=8 * 365)).isoformat(),
+            checksum_sha256="abc123",
+            s3_key="archives/acm_alerts/2017-01/before-catalog.zstd",
+            retention_until=(now - timedelta(days=30)).isoformat(),
         )
+        s3_storage.s3_client.put_object(Bucket="test-bucket", Key=metadata.s3_key, Body=b"data")
+        s3_storage.put_metadata(metadata)
+
+        archival_service.catalog = ArchiveCatalog(":memory:")
+        result = archival_service.sweep_expired_archives()
+
+        assert result.deleted == ["before-catalog"]
+        assert s3_storage.list_archives() == []
+        assert archival_service.catalog.last_reconciled() is not None
+
+        # Once reconciled, later sweeps don't list the bucket again
+        with patch.object(archival_service, "reconcile_catalog") as mock_reconcile:
+            archival_service.sweep_expired_archives()
+        mock_reconcile.assert_not_called()
+
+    def test_sweep_fails_when_catalog_bootstrap_fails(self, archival_service):
+        """Test a sweep deletes nothing and raises if the bootstrap reconcile fails"""
+        archival_service.catalog = ArchiveCatalog(":memory:")
+
+        with patch.object(archival_service.storage, "iter_objects", side_effect=ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "ListObjectsV2"
+        )), patch.object(archival_service.storage, "delete_archives") as mock_delete:
+            with pytest.raises(RuntimeError, match="bootstrap"):
+                archival_service.sweep_expired_archives()
+            with pytest.raises(RuntimeError, match="bootstrap"):
+                archival_service.get_retention_statistics()
+
+        mock_delete.assert_not_called()
+        assert archival_service.catalog.last_reconciled() is None
+
+    def test_scrub_archives_rotates_and_records_results(self, archival_service, s3_storage):
+        """Test the scrub verifies a sample, detects corruption and loss, and moves on"""
+        for i in range(4):
+            data = f"archive {i}".encode()
+            metadata = ArchiveMetadata(
+                archive_id=f"archive-{i}",
+                table_name="acm_alerts",
+                partition_key="2024-01",
+                record_count=1,
+                original_size_bytes=50,
+                compressed_size_bytes=len(data),
+                compression_type="zstd",
+                created_at=datetime.utcnow().isoformat(),
+                checksum_sha256=hashlib.sha256(data).hexdigest(),
+                s3_key=f"archives/acm_alerts/2024-01/archive-{i}.zstd",
+                retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
+            )
+            if i != 2:  # archive-2 was lost
+                body = b"bit rot" if i == 1 else data
+                s3_storage.s3_client.put_object(Bucket="test-bucket", Key=metadata.s3_key, Body=body)
+            archival_service.catalog.add(metadata)
+
+        first = archival_service.scrub_archives(limit=3)
+
+        assert first.verified == ["archive-0"]
+        assert first.mismatched == ["archive-1"]
+        assert first.missing == ["archive-2"]
+        assert first.bytes_read == len(b"archive 0") + len(b"bit rot")
+
+        # The next pass starts with the archive not yet verified
+        second = archival_service.scrub_archives(limit=1)
+        assert second.verified == ["archive-3"]
+
+        failures = archival_service.catalog.verification_failures()
+        assert [(f["archive_id"], f["status"]) for f in failures] == [
+            ("archive-1", "mismatch"), ("archive-2", "missing"),
+        ]
 
     def test_delete_expired_archives_none_expired(self, archival_service):
         """Test deletion when no archives are expired"""
@@ -492,11 +1084,9 @@ class TestArchivalService:
             retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),  # Not expired
         )
 
+        archival_service.catalog.add(active_metadata)
+
         with patch.object(
-            archival_service,
-            "list_archives_for_table",
-            return_value=[active_metadata]
-        ), patch.object(
             archival_service.storage,
             "delete_archive",
             return_value=True
@@ -506,6 +1096,7 @@ class TestArchivalService:
         # Verify no deletion
         assert deleted_count == 0
         mock_delete.assert_not_called()
+        assert archival_service.catalog.get("active-123") == active_metadata
 
     def test_close_connection(self, archival_service, mock_db_connection):
         """Test closing database connection"""
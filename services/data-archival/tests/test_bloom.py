@@ -0,0 +1,43 @@
+"""
+Unit tests for Bloom Filters
+"""
+from ..bloom import BloomFilter, build_bloom_filter, decode_bloom_filters, encode_bloom_filters
+
+
+class TestBloomFilter:
+    """Test suite for bloom filters"""
+
+    def test_no_false_negatives(self):
+        """Test every added value is reported as possibly present"""
+        numbers = [f"+23480{i:08d}" for i in range(5000)]
+        bloom = build_bloom_filter(numbers + [None], false_positive_rate=0.01)
+
+        assert all(number in bloom for number in numbers)
+
+    def test_false_positive_rate(self):
+        """Test absent values are rejected at about the configured rate"""
+        bloom = build_bloom_filter((f"+23480{i:08d}" for i in range(5000)), false_positive_rate=0.01)
+
+        false_positives = sum(f"+23490{i:08d}" in bloom for i in range(20000))
+        assert false_positives < 20000 * 0.02
+
+    def test_sized_to_distinct_values(self):
+        """Test repeated values don't grow the filter"""
+        repeated = build_bloom_filter(["+2348031234567"] * 10000, false_positive_rate=0.01)
+        single = build_bloom_filter(["+2348031234567"], false_positive_rate=0.01)
+
+        assert repeated.num_bits == single.num_bits
+
+    def test_encode_decode_round_trip(self):
+        """Test row-group filters survive serialization"""
+        filters = {
+            "a_number": [build_bloom_filter(["a1", "a2"], 0.01), build_bloom_filter(["a3"], 0.01)],
+            "b_number": [build_bloom_filter(["b1"], 0.01), BloomFilter.for_capacity(0, 0.01)],
+        }
+
+        decoded = decode_bloom_filters(encode_bloom_filters(filters))
+
+        assert list(decoded) == ["a_number", "b_number"]
+        assert [len(f) for f in decoded.values()] == [2, 2]
+        assert "a3" in decoded["a_number"][1] and "b1" in decoded["b_number"][0]
+        assert decoded["b_number"][1].bits == filters["b_number"][1].bits
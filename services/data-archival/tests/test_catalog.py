@@ -0,0 +1,209 @@
+"""
+Unit tests for Archive Catalog
+"""
+import sqlite3
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from ..catalog import ArchiveCatalog, VERIFICATION_MISMATCH, VERIFICATION_OK
+from ..storage_client import ArchiveMetadata
+
+
+class TestArchiveCatalog:
+    """Test suite for ArchiveCatalog"""
+
+    NOW = datetime(2031, 6, 1)
+
+    @pytest.fixture
+    def catalog(self, tmp_path):
+        """Create catalog in a temporary directory"""
+        catalog = ArchiveCatalog(str(tmp_path / "catalog" / "catalog.db"))
+        yield catalog
+        catalog.close()
+
+    @staticmethod
+    def _metadata(archive_id, table_name="acm_alerts", partition_key="2024-01-15",
+                  created_at=datetime(2024, 4, 15), retention_days=7 * 365, **kwargs):
+        return ArchiveMetadata(
+            archive_id=archive_id,
+            table_name=table_name,
+            partition_key=partition_key,
+            record_count=kwargs.get("record_count", 100),
+            original_size_bytes=kwargs.get("original_size_bytes", 4000),
+            compressed_size_bytes=kwargs.get("compressed_size_bytes", 1000),
+            compression_type="zstd",
+            created_at=created_at.isoformat(),
+            checksum_sha256="abc123",
+            s3_key=f"archives/{table_name}/{partition_key}/{archive_id}.parquet",
+            retention_until=(created_at + timedelta(days=retention_days)).isoformat(),
+            archive_format="parquet",
+            schema=kwargs.get("schema"),
+            first_record_at=kwargs.get("first_record_at"),
+            last_record_at=kwargs.get("last_record_at"),
+            bloom_filter_columns=kwargs.get("bloom_filter_columns"),
+            compression_dictionary_id=kwargs.get("compression_dictionary_id"),
+        )
+
+    def test_add_and_get_round_trip(self, catalog):
+        """Test metadata, including the schema, round-trips"""
+        metadata = self._metadata("a1", schema={"id": "string", "detected_at": "timestamp[us]"})
+        catalog.add(metadata)
+
+        assert catalog.get("a1") == metadata
+        assert catalog.get("missing") is None
+        assert len(catalog) == 1
+
+    def test_catalog_persists_across_connections(self, tmp_path):
+        """Test a reopened catalog keeps its entries and last reconcile"""
+        path = str(tmp_path / "catalog.db")
+        catalog = ArchiveCatalog(path)
+        catalog.add(self._metadata("a1"))
+        assert catalog.last_reconciled() is None
+        catalog.record_reconcile(self.NOW)
+        catalog.close()
+
+        reopened = ArchiveCatalog(path)
+        assert reopened.get("a1") is not None
+        assert reopened.last_reconciled() == self.NOW
+        reopened.close()
+
+    def test_find_by_table_partition_and_date(self, catalog):
+        """Test lookups by table, partition prefix and creation date"""
+        catalog.add(self._metadata("jan-15", partition_key="2024-01-15", created_at=datetime(2024, 4, 15)))
+        catalog.add(self._metadata("jan", partition_key="2024-01", created_at=datetime(2024, 4, 1)))
+        catalog.add(self._metadata("feb-01", partition_key="2024-02-01", created_at=datetime(2024, 5, 1)))
+        catalog.add(self._metadata("audit", table_name="audit_events", created_at=datetime(2024, 4, 15)))
+        catalog.add(self._metadata("jan-2", partition_key="2024-012", created_at=datetime(2024, 4, 15)))
+
+        assert [m.archive_id for m in catalog.find("acm_alerts", "2024-01")] == ["jan", "jan-15"]
+        assert [m.archive_id for m in catalog.find(table_name="audit_events")] == ["audit"]
+        assert [
+            m.archive_id for m in catalog.find(
+                "acm_alerts", created_from=datetime(2024, 4, 10), created_to=datetime(2024, 5, 1)
+            )
+        ] == ["jan-15", "jan-2"]
+        assert len(catalog.find()) == 5
+
+    def test_find_by_record_date_range(self, catalog):
+        """Test archives are matched by the dates of the records they hold"""
+        catalog.add(self._metadata("jan", first_record_at="2024-01-01T00:00:00",
+                                   last_record_at="2024-01-31T23:59:00", bloom_filter_columns=["b_number"]))
+        catalog.add(self._metadata("feb", first_record_at="2024-02-01T00:00:00",
+                                   last_record_at="2024-02-29T23:59:00"))
+        catalog.add(self._metadata("old"))  # Archived before record dates were kept
+
+        found = catalog.find("acm_alerts", records_from=datetime(2024, 1, 20), records_to=datetime(2024, 2, 1))
+
+        assert [m.archive_id for m in found] == ["jan", "old"]
+        assert found[0].bloom_filter_columns == ["b_number"]
+
+    def test_migrates_catalog_without_record_dates(self, tmp_path):
+        """Test a catalog created before the record date columns is upgraded in place"""
+        path = str(tmp_path / "catalog.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE archives (archive_id TEXT PRIMARY KEY, table_name TEXT NOT NULL, "
+            "partition_key TEXT NOT NULL, record_count INTEGER NOT NULL, "
+            "original_size_bytes INTEGER NOT NULL, compressed_size_bytes INTEGER NOT NULL, "
+            "compression_type TEXT NOT NULL, created_at TEXT NOT NULL, checksum_sha256 TEXT NOT NULL, "
+            "s3_key TEXT NOT NULL UNIQUE, retention_until TEXT NOT NULL, archive_format TEXT NOT NULL, "
+            "schema TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO archives VALUES ('a1', 'acm_alerts', '2024-01', 1, 10, 5, 'zstd', "
+            "'2024-02-01T00:00:00', 'abc', 'archives/a1.parquet', '2031-02-01T00:00:00', 'parquet', NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+        catalog = ArchiveCatalog(path)
+        assert catalog.get("a1").first_record_at is None
+        assert catalog.get("a1").compression_dictionary_id is None
+        catalog.add(self._metadata("a2", first_record_at="2024-01-15T00:00:00", compression_dictionary_id=7))
+        assert catalog.get("a2").first_record_at == "2024-01-15T00:00:00"
+        assert catalog.get("a2").compression_dictionary_id == 7
+        catalog.close()
+
+    def test_current_dictionary_is_newest_version(self, catalog):
+        """Test each table's newest trained dictionary is current"""
+        assert catalog.current_dictionary("acm_alerts") is None
+
+        catalog.add_dictionary("acm_alerts", 11, datetime(2024, 1, 1))
+        catalog.add_dictionary("acm_alerts", 22, datetime(2024, 2, 1))
+        catalog.add_dictionary("audit_events", 33, datetime(2024, 3, 1))
+
+        assert catalog.current_dictionary("acm_alerts") == 22
+        assert catalog.current_dictionary("audit_events") == 33
+
+    def test_expired_in_retention_order(self, catalog):
+        """Test only expired archives are returned, longest expired first"""
+        catalog.add(self._metadata("recent", created_at=datetime(2024, 1, 1)))
+        catalog.add(self._metadata("oldest", created_at=datetime(2023, 1, 1)))
+        catalog.add(self._metadata("older", created_at=datetime(2023, 6, 1)))
+        catalog.add(self._metadata("kept", created_at=datetime(2025, 1, 1)))
+
+        assert [m.archive_id for m in catalog.expired(self.NOW)] == ["oldest", "older", "recent"]
+        assert [m.archive_id for m in catalog.expired(self.NOW, limit=2)] == ["oldest", "older"]
+
+        assert catalog.remove(["oldest", "older", "unknown"]) == 2
+        assert [m.archive_id for m in catalog.expired(self.NOW)] == ["recent"]
+
+    def test_statistics_per_table(self, catalog):
+        """Test totals are aggregated per table"""
+        catalog.add(self._metadata("a1", record_count=100, compressed_size_bytes=10, original_size_bytes=40))
+        catalog.add(self._metadata("a2", record_count=50, compressed_size_bytes=5, original_size_bytes=20))
+        catalog.add(self._metadata("b1", table_name="audit_events", record_count=7))
+
+        stats = catalog.statistics()
+
+        assert stats["acm_alerts"] == {
+            "archive_count": 2,
+            "record_count": 150,
+            "compressed_size_bytes": 15,
+            "original_size_bytes": 60,
+        }
+        assert stats["audit_events"]["record_count"] == 7
+
+    def test_replace_all_reports_changes(self, catalog):
+        """Test replacing the contents reports entries added and removed"""
+        catalog.add(self._metadata("kept"))
+        catalog.add(self._metadata("stale"))
+
+        added, removed = catalog.replace_all([self._metadata("kept"), self._metadata("new")])
+
+        assert (added, removed) == (1, 1)
+        assert sorted(m.archive_id for m in catalog.find()) == ["kept", "new"]
+
+    def test_verification_rotation(self, catalog):
+        """Test never-verified archives come first, then the longest since checked"""
+        for archive_id in ("a1", "a2", "a3"):
+            catalog.add(self._metadata(archive_id))
+        catalog.record_verification("a1", VERIFICATION_OK, datetime(2031, 5, 2))
+        catalog.record_verification("a3", VERIFICATION_MISMATCH, datetime(2031, 5, 1), "expected abc, got def")
+
+        assert [m.archive_id for m in catalog.least_recently_verified(3)] == ["a2", "a3", "a1"]
+        assert [m.archive_id for m in catalog.least_recently_verified(1)] == ["a2"]
+
+        [failure] = catalog.verification_failures()
+        assert failure["archive_id"] == "a3"
+        assert failure["status"] == VERIFICATION_MISMATCH
+        assert failure["detail"] == "expected abc, got def"
+
+        # Results go with the archive
+        catalog.remove(["a3"])
+        assert catalog.verification_failures() == []
+
+    def test_concurrent_writers(self, catalog):
+        """Test archival workers can share one catalog"""
+        def add(worker):
+            for i in range(50):
+                catalog.add(self._metadata(f"w{worker}-{i}"))
+
+        threads = [threading.Thread(target=add, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(catalog) == 200
@@ -1,10 +1,31 @@
 """
 Unit tests for compression service
 """
+import json
+import random
+import threading
+
 import pytest
 from ..compression import CompressionService, CompressionType
 
 
+def alert_records(count, seed=0):
+    """Small, repetitive alert records, serialized like JSON archives"""
+    rng = random.Random(seed)
+    return [
+        json.dumps({
+            "id": i,
+            "alert_type": rng.choice(["SIM_BOX", "WANGIRI", "CLI_SPOOFING"]),
+            "a_number": f"+23480{rng.randrange(10**8):08d}",
+            "b_number": f"+23481{rng.randrange(10**8):08d}",
+            "severity": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+            "status": "OPEN",
+            "detected_at": f"2024-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+        }).encode("utf-8")
+        for i in range(count)
+    ]
+
+
 class TestCompressionService:
     """Test suite for CompressionService"""
 
@@ -149,3 +170,103 @@ class TestCompressionService:
         # Both should decompress correctly
         assert service_low.decompress(compressed_low) == data
         assert service_high.decompress(compressed_high) == data
+
+    @pytest.mark.parametrize(
+        "compression_type", [CompressionType.GZIP, CompressionType.ZSTD, CompressionType.NONE]
+    )
+    def test_stream_writer_round_trip(self, compression_type):
+        """Test streamed compression decompresses like compress() output"""
+        import io
+
+        service = CompressionService(compression_type)
+        chunks = [b"Hello, World! " * 1000, b"chunk two " * 500, b""]
+
+        target = io.BytesIO()
+        with service.stream_writer(target) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+        assert not target.closed
+        assert service.decompress(target.getvalue()) == b"".join(chunks)
+
+    @pytest.mark.parametrize(
+        "compression_type", [CompressionType.GZIP, CompressionType.ZSTD, CompressionType.NONE]
+    )
+    def test_stream_reader_round_trip(self, compression_type):
+        """Test compress() output decompresses incrementally"""
+        import io
+
+        service = CompressionService(compression_type)
+        data = b"Hello, World! " * 10000
+        reader = service.stream_reader(io.BytesIO(service.compress(data)))
+
+        chunks = iter(lambda: reader.read(4096), b"")
+        assert b"".join(chunks) == data
+
+    def test_dictionary_compresses_small_archives_better(self):
+        """Test a trained dictionary shrinks small archives and round-trips"""
+        service = CompressionService(CompressionType.ZSTD)
+        samples = alert_records(2000)
+        dictionary_id = service.add_dictionary(service.train_dictionary(samples, 8192))
+        assert service.has_dictionary(dictionary_id)
+
+        data = b"[" + b",".join(alert_records(10, seed=1)) + b"]"
+        plain = service.compress(data)
+        with_dictionary = service.compress(data, dictionary_id)
+
+        assert len(with_dictionary) < len(plain) * 0.8
+        assert service.decompress(with_dictionary, dictionary_id) == data
+
+    def test_dictionary_required_to_decompress(self):
+        """Test dictionary frames need the same dictionary registered"""
+        import io
+
+        trainer = CompressionService(CompressionType.ZSTD)
+        dictionary = trainer.train_dictionary(alert_records(2000), 8192)
+        dictionary_id = trainer.add_dictionary(dictionary)
+
+        target = io.BytesIO()
+        data = b"".join(alert_records(5, seed=2))
+        with trainer.stream_writer(target, dictionary_id) as writer:
+            writer.write(data)
+
+        reader = CompressionService(CompressionType.ZSTD)
+        with pytest.raises(ValueError, match="not loaded"):
+            reader.decompress(target.getvalue(), dictionary_id)
+
+        assert reader.add_dictionary(dictionary) == dictionary_id
+        assert reader.stream_reader(io.BytesIO(target.getvalue()), dictionary_id).read() == data
+
+    def test_zstd_contexts_reused_per_thread(self):
+        """Test compressors are built once per thread, not per call"""
+        service = CompressionService(CompressionType.ZSTD)
+        data = b"Hello, World! " * 100
+
+        service.compress(data)
+        compressor = service._compressor()
+        service.compress(data)
+        assert service._compressor() is compressor
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(service._compressor()))
+        thread.start()
+        thread.join()
+        assert other[0] is not compressor
+
+    def test_multithreaded_compression_round_trip(self):
+        """Test worker threads compress large inputs and streams decodably"""
+        import io
+
+        from .. import compression as compression_module
+
+        service = CompressionService(CompressionType.ZSTD, threads=2)
+        data = b"".join(alert_records(40000))
+        assert len(data) >= compression_module.MULTITHREAD_MIN_BYTES
+
+        assert service.decompress(service.compress(data)) == data
+        assert (None, 2) in service._local.compressors
+
+        target = io.BytesIO()
+        with service.stream_writer(target) as writer:
+            writer.write(data)
+        assert CompressionService(CompressionType.ZSTD).decompress(target.getvalue()) == data
@@ -0,0 +1,227 @@
+"""
+Unit tests for Parallel Archiver
+"""
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+from ..archival_service import ArchivalService
+from ..catalog import ArchiveCatalog
+from ..parallel_archiver import ParallelArchiver
+from ..storage_client import ArchiveMetadata
+from ..config import Config, DatabaseConfig, S3Config, ArchivalConfig, ArchiveFormat
+
+
+class TestParallelArchiver:
+    """Test suite for ParallelArchiver"""
+
+    CUTOFF = datetime(2024, 2, 1, 2, 0)
+
+    @pytest.fixture
+    def test_config(self):
+        """Create test configuration"""
+        return Config(
+            db=DatabaseConfig(
+                host="localhost",
+                port=5433,
+                database="test_db",
+                user="test_user",
+                password="test_pass",
+            ),
+            s3=S3Config(
+                endpoint_url="https://s3.test.com",
+                access_key="test_key",
+                secret_key="test_secret",
+                bucket_name="test-bucket",
+                region="us-east-1",
+            ),
+            archival=ArchivalConfig(
+                max_workers=3,
+                tables_to_archive=["acm_alerts", "audit_events"],
+            ),
+        )
+
+    @pytest.fixture
+    def services(self):
+        """Mock ArchivalService per worker, recorded in creation order"""
+        return []
+
+    @pytest.fixture
+    def archiver(self, test_config, services):
+        """Create ParallelArchiver whose workers get mock services"""
+        oldest = {
+            "acm_alerts": datetime(2024, 1, 29, 13, 45),
+            "audit_events": datetime(2024, 1, 31, 1, 0, tzinfo=timezone.utc),
+        }
+
+        def archive_table(table_name, partition_key, cutoff_date, start_date):
+            return [self._metadata(table_name, partition_key, record_count=10)]
+
+        def factory():
+            service = MagicMock()
+            service.get_oldest_record_date.side_effect = lambda table, cutoff: oldest.get(table)
+            service.archive_table.side_effect = archive_table
+            services.append(service)
+            return service
+
+        return ParallelArchiver(test_config, service_factory=factory)
+
+    @staticmethod
+    def _metadata(table_name, partition_key, record_count):
+        return ArchiveMetadata(
+            archive_id=f"{table_name}-{partition_key}",
+            table_name=table_name,
+            partition_key=partition_key,
+            record_count=record_count,
+            original_size_bytes=4000,
+            compressed_size_bytes=1000,
+            compression_type="zstd",
+            created_at=datetime.utcnow().isoformat(),
+            checksum_sha256="abc123",
+            s3_key=f"archives/{table_name}/{partition_key}.parquet",
+            retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
+        )
+
+    def test_plan_splits_tables_into_days(self, archiver, services):
+        """Test daily partitions from each table's oldest day up to the cutoff"""
+        tasks = archiver.plan(["acm_alerts", "audit_events", "call_detail_records"], self.CUTOFF)
+
+        assert [(t.table_name, t.partition_key) for t in tasks] == [
+            ("acm_alerts", "2024-01-29"),
+            ("acm_alerts", "2024-01-30"),
+            ("acm_alerts", "2024-01-31"),
+            ("audit_events", "2024-01-31"),
+            ("acm_alerts", "2024-02-01"),
+            ("audit_events", "2024-02-01"),
+        ]
+        assert tasks[0].start_date == datetime(2024, 1, 29)
+        assert tasks[0].end_date == datetime(2024, 1, 30)
+
+        # The last partition stops at the cutoff
+        assert tasks[-1].start_date == datetime(2024, 2, 1)
+        assert tasks[-1].end_date == self.CUTOFF
+
+        # The planning connection is closed
+        services[0].close.assert_called_once()
+
+    def test_run_archives_every_partition(self, archiver, services):
+        """Test each partition is archived with its own date bounds"""
+        progress_updates = []
+        archiver.progress_callback = lambda progress, task: progress_updates.append(progress.tasks_finished)
+
+        result = archiver.run(["acm_alerts", "audit_events"], self.CUTOFF)
+
+        calls = [c.kwargs for s in services for c in s.archive_table.call_args_list]
+        assert len(calls) == 6
+        assert {
+            "table_name": "acm_alerts",
+            "partition_key": "2024-01-30",
+            "cutoff_date": datetime(2024, 1, 31),
+            "start_date": datetime(2024, 1, 30),
+        } in calls
+
+        assert len(result.archives) == 6
+        assert result.progress.tasks_done == 6
+        assert result.progress.records == 60
+        assert result.progress.compressed_bytes == 6000
+        assert result.failed_tasks == [] and result.skipped_tasks == []
+        assert progress_updates == [1, 2, 3, 4, 5, 6]
+
+        # One connection per worker (plus planning), all closed
+        assert len(services) <= 1 + 3
+        assert all(s.close.called for s in services)
+
+    def test_run_limits_concurrency_to_max_workers(self, archiver, services):
+        """Test no more than max_workers partitions are archived at once"""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_archive(table_name, partition_key, cutoff_date, start_date):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return []
+
+        factory = archiver._service_factory
+
+        def slow_factory():
+            service = factory()
+            service.archive_table.side_effect = slow_archive
+            return service
+
+        archiver._service_factory = slow_factory
+        result = archiver.run(["acm_alerts", "audit_events"], self.CUTOFF)
+
+        assert result.progress.tasks_done == 6
+        assert 1 < peak <= 3
+
+    def test_run_counts_failed_partitions(self, test_config):
+        """Test a failing partition is counted as failed and its worker reconnects"""
+        test_config.archival.archive_format = ArchiveFormat.JSON
+        connections = []
+        failed = []
+
+        def connect(**kwargs):
+            conn = MagicMock()
+            cursor = conn.cursor.return_value.__enter__.return_value
+            cursor.fetchone.return_value = {"oldest": datetime(2024, 1, 29, 13, 45)}
+            cursor.description = None
+            cursor.rowcount = 1
+
+            def execute(query, params=None):
+                if not query.lstrip().startswith("SELECT *"):
+                    return
+                start_date = params[-2]
+                if conn in failed:
+                    raise AssertionError("failed connection reused")
+                if start_date == datetime(2024, 1, 30):
+                    failed.append(conn)
+                    raise psycopg2.OperationalError("server closed the connection unexpectedly")
+                # One row per partition; the segment after it (params carry
+                # the last key) finds none
+                row = {"id": start_date.day, "detected_at": start_date + timedelta(hours=1)}
+                resumed = len(params) == 5
+                cursor.fetchmany.side_effect = [[]] if resumed else [[row], []]
+
+            cursor.execute.side_effect = execute
+            connections.append(conn)
+            return conn
+
+        catalog = ArchiveCatalog(":memory:")
+        with patch("psycopg2.connect", side_effect=connect):
+            archiver = ParallelArchiver(
+                test_config,
+                service_factory=lambda: ArchivalService(test_config, storage=MagicMock(), catalog=catalog),
+            )
+            result = archiver.run(["acm_alerts"], self.CUTOFF)
+
+        assert [t.partition_key for t in result.failed_tasks] == ["2024-01-30"]
+        assert result.progress.tasks_failed == 1
+        assert result.progress.tasks_done == 3
+        assert [a.partition_key for a in result.archives] == ["2024-01-29", "2024-01-31", "2024-02-01"]
+
+        # The failed transaction was rolled back and its connection closed
+        [bad] = failed
+        assert bad.rollback.called and not bad.commit.called
+        assert bad.close.called
+        assert all(conn.close.called for conn in connections)
+
+    def test_run_skips_partitions_after_deadline(self, archiver, services):
+        """Test partitions not started by the deadline are left for the next run"""
+        result = archiver.run(
+            ["acm_alerts", "audit_events"], self.CUTOFF, deadline=datetime.utcnow() - timedelta(seconds=1)
+        )
+
+        assert len(result.skipped_tasks) == 6
+        assert result.progress.tasks_skipped == 6
+        assert result.archives == []
+        assert not any(s.archive_table.called for s in services)
@@ -5,8 +5,11 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock, patch, call
 
+from .. import scheduler as scheduler_module
+from ..archival_service import ScrubResult
+from ..parallel_archiver import ArchivalProgress, ArchivalRunResult
 from ..scheduler import ArchivalScheduler
-from ..storage_client import ArchiveMetadata
+from ..storage_client import ArchiveMetadata, BulkDeleteResult
 from ..config import Config, DatabaseConfig, S3Config, ArchivalConfig
 
 
@@ -35,6 +38,7 @@ class TestArchivalScheduler:
                 hot_retention_days=90,
                 schedule_cron="0 2 1 * *",  # Monthly at 2 AM
                 tables_to_archive=["acm_alerts", "audit_events"],
+                catalog_path=":memory:",
             ),
         )
 
@@ -81,17 +85,19 @@ class TestArchivalScheduler:
              patch.object(scheduler.scheduler, "get_jobs", return_value=[]):
             scheduler.start()
 
-            # Verify all 3 jobs were added
-            assert mock_add_job.call_count == 3
+            # Verify all 4 jobs were added
+            assert mock_add_job.call_count == 4
 
             # Verify job IDs
             call_ids = [call_args[1]["id"] for call_args in mock_add_job.call_args_list]
             assert "monthly_archival" in call_ids
             assert "daily_cleanup" in call_ids
+            assert "daily_scrub" in call_ids
             assert "weekly_stats" in call_ids
 
-            # Verify scheduler started
+            # Verify scheduler started, after bootstrapping the catalog
             mock_start.assert_called_once()
+            scheduler.archival_service.ensure_catalog.assert_called_once()
 
     def test_stop_shuts_down_scheduler(self, scheduler, mock_archival_service):
         """Test stop() shuts down scheduler and closes service"""
@@ -105,118 +111,113 @@ class TestArchivalScheduler:
             mock_archival_service.close.assert_called_once()
 
     def test_run_archival_job_success(self, scheduler, mock_archival_service, test_config):
-        """Test successful archival job execution"""
-        # Mock archive metadata
-        metadata1 = ArchiveMetadata(
-            archive_id="archive-1",
-            table_name="acm_alerts",
-            partition_key="2024-01",
-            record_count=100,
-            original_size_bytes=5000,
-            compressed_size_bytes=1250,
-            compression_type="zstd",
-            created_at=datetime.utcnow().isoformat(),
-            checksum_sha256="abc123",
-            s3_key="archives/archive-1.zstd",
-            retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
-        )
-
-        metadata2 = ArchiveMetadata(
-            archive_id="archive-2",
-            table_name="audit_events",
-            partition_key="2024-01",
-            record_count=200,
-            original_size_bytes=10000,
-            compressed_size_bytes=2500,
-            compression_type="zstd",
-            created_at=datetime.utcnow().isoformat(),
-            checksum_sha256="def456",
-            s3_key="archives/archive-2.zstd",
-            retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
-        )
+        """Test archival job runs all tables through the parallel archiver"""
+        result = ArchivalRunResult([], ArchivalProgress(tasks_total=2, tasks_done=2, records=300), [], [])
 
-        # Mock archive_table to return metadata
-        mock_archival_service.archive_table.side_effect = [metadata1, metadata2]
+        with patch.object(scheduler_module, "ParallelArchiver") as mock_archiver_cls:
+            mock_archiver_cls.return_value.run.return_value = result
+            scheduler._run_archival_job()
 
-        # Execute job
-        scheduler._run_archival_job()
+        # Verify dictionaries are retrained before archiving
+        mock_archival_service.train_compression_dictionaries.assert_called_once()
 
-        # Verify archive_table called for each table
-        assert mock_archival_service.archive_table.call_count == 2
+        # Verify workers share the service's storage client
+        mock_archiver_cls.assert_called_once_with(
+            test_config,
+            storage=mock_archival_service.storage,
+            catalog=mock_archival_service.catalog,
+        )
+        archiver = mock_archiver_cls.return_value
+        archiver.close.assert_called_once()
 
         # Verify correct tables archived
-        call_args_list = mock_archival_service.archive_table.call_args_list
-        tables_archived = [call_args[1]["table_name"] for call_args in call_args_list]
-        assert "acm_alerts" in tables_archived
-        assert "audit_events" in tables_archived
+        tables, cutoff_date = archiver.run.call_args[0]
+        assert tables == ["acm_alerts", "audit_events"]
 
         # Verify cutoff date calculation
-        for call_args in call_args_list:
-            cutoff_date = call_args[1]["cutoff_date"]
-            expected_cutoff = datetime.utcnow() - timedelta(days=test_config.archival.hot_retention_days)
-            # Allow 1-second tolerance for test execution time
-            assert abs((cutoff_date - expected_cutoff).total_seconds()) < 2
+        expected_cutoff = datetime.utcnow() - timedelta(days=test_config.archival.hot_retention_days)
+        # Allow 1-second tolerance for test execution time
+        assert abs((cutoff_date - expected_cutoff).total_seconds()) < 2
 
-    def test_run_archival_job_no_data(self, scheduler, mock_archival_service):
-        """Test archival job when no data to archive"""
-        # Mock archive_table to return None (no data)
-        mock_archival_service.archive_table.return_value = None
+        # Verify the job stops starting partitions after the time limit
+        deadline = archiver.run.call_args[1]["deadline"]
+        assert abs((deadline - cutoff_date) - timedelta(days=90, hours=4)) < timedelta(seconds=2)
 
-        # Execute job
-        scheduler._run_archival_job()
+    def test_run_archival_job_no_time_limit(self, scheduler, test_config):
+        """Test a zero time limit means no deadline"""
+        test_config.archival.job_time_limit_minutes = 0
 
-        # Verify archive_table still called
-        assert mock_archival_service.archive_table.call_count == 2
+        with patch.object(scheduler_module, "ParallelArchiver") as mock_archiver_cls:
+            scheduler._run_archival_job()
 
-    def test_run_archival_job_partial_failure(self, scheduler, mock_archival_service):
-        """Test archival job continues after table failure"""
-        # Mock first table success, second table failure
-        metadata = ArchiveMetadata(
-            archive_id="archive-1",
-            table_name="acm_alerts",
-            partition_key="2024-01",
-            record_count=100,
-            original_size_bytes=5000,
-            compressed_size_bytes=1250,
-            compression_type="zstd",
-            created_at=datetime.utcnow().isoformat(),
-            checksum_sha256="abc123",
-            s3_key="archives/archive-1.zstd",
-            retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
-        )
+        assert mock_archiver_cls.return_value.run.call_args[1]["deadline"] is None
 
-        mock_archival_service.archive_table.side_effect = [
-            metadata,
-            Exception("S3 upload failed"),
-        ]
+    def test_run_archival_job_failure(self, scheduler):
+        """Test archival job failure is logged, not raised"""
+        with patch.object(scheduler_module, "ParallelArchiver") as mock_archiver_cls:
+            mock_archiver_cls.return_value.run.side_effect = Exception("Database unavailable")
 
-        # Execute job (should not raise exception)
-        scheduler._run_archival_job()
+            # Execute job (should not raise exception)
+            scheduler._run_archival_job()
 
-        # Verify both tables attempted
-        assert mock_archival_service.archive_table.call_count == 2
+        mock_archiver_cls.return_value.close.assert_called_once()
 
     def test_run_cleanup_job_success(self, scheduler, mock_archival_service):
         """Test successful cleanup job execution"""
-        # Mock delete_expired_archives
-        mock_archival_service.delete_expired_archives.return_value = 5
+        # Mock expiry sweep with one partial failure
+        mock_archival_service.sweep_expired_archives.return_value = BulkDeleteResult(
+            deleted=["a1", "a2", "a3", "a4", "a5"], failed={"a6": "AccessDenied: Access Denied"}
+        )
 
         # Execute job
         scheduler._run_cleanup_job()
 
         # Verify deletion called
-        mock_archival_service.delete_expired_archives.assert_called_once()
+        mock_archival_service.sweep_expired_archives.assert_called_once()
 
     def test_run_cleanup_job_failure(self, scheduler, mock_archival_service):
         """Test cleanup job handles failures"""
         # Mock deletion failure
-        mock_archival_service.delete_expired_archives.side_effect = Exception("S3 error")
+        mock_archival_service.sweep_expired_archives.side_effect = Exception("S3 error")
 
         # Execute job (should not raise exception)
         scheduler._run_cleanup_job()
 
         # Verify deletion was attempted
-        mock_archival_service.delete_expired_archives.assert_called_once()
+        mock_archival_service.sweep_expired_archives.assert_called_once()
+
+    def test_run_cleanup_job_fails_loudly_without_catalog(self, scheduler, mock_archival_service):
+        """Test cleanup raises, deleting nothing, if the catalog can't be bootstrapped"""
+        mock_archival_service.ensure_catalog.side_effect = RuntimeError(
+            "Archive catalog bootstrap from S3 failed: AccessDenied"
+        )
+
+        with pytest.raises(RuntimeError, match="bootstrap"):
+            scheduler._run_cleanup_job()
+
+        mock_archival_service.sweep_expired_archives.assert_not_called()
+
+    def test_start_without_scrub(self, scheduler, test_config):
+        """Test the scrub job is not scheduled when disabled"""
+        test_config.archival.scrub_archives_per_run = 0
+        with patch.object(scheduler.scheduler, "add_job") as mock_add_job, \
+             patch.object(scheduler.scheduler, "start"), \
+             patch.object(scheduler.scheduler, "get_jobs", return_value=[]):
+            scheduler.start()
+
+        call_ids = [call_args[1]["id"] for call_args in mock_add_job.call_args_list]
+        assert "daily_scrub" not in call_ids
+
+    def test_run_scrub_job(self, scheduler, mock_archival_service):
+        """Test scrub job verifies a sample and survives failures"""
+        mock_archival_service.scrub_archives.return_value = ScrubResult(
+            verified=["a1", "a2"], mismatched=["a3"], errors={"a4": "SlowDown"}
+        )
+        scheduler._run_scrub_job()
+        mock_archival_service.scrub_archives.assert_called_once_with()
+
+        mock_archival_service.scrub_archives.side_effect = Exception("catalog locked")
+        scheduler._run_scrub_job()  # Should not raise
 
     def test_log_retention_statistics(self, scheduler, mock_archival_service):
         """Test retention statistics logging"""
@@ -279,14 +280,14 @@ class TestArchivalScheduler:
             retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
         )
 
-        mock_archival_service.archive_table.return_value = metadata
+        mock_archival_service.archive_table.return_value = [metadata]
 
         # Trigger manual archival
         cutoff_date = datetime(2024, 1, 1)
-        archive_id = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
+        archive_ids = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
 
         # Verify success
-        assert archive_id == "manual-archive-123"
+        assert archive_ids == ["manual-archive-123"]
 
         # Verify archive_table called with correct parameters
         mock_archival_service.archive_table.assert_called_once_with(
@@ -298,13 +299,13 @@ class TestArchivalScheduler:
     def test_trigger_manual_archival_no_data(self, scheduler, mock_archival_service):
         """Test manual archival when no data exists"""
         # Mock no data to archive
-        mock_archival_service.archive_table.return_value = None
+        mock_archival_service.archive_table.return_value = []
 
         cutoff_date = datetime(2024, 1, 1)
-        archive_id = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
+        archive_ids = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
 
-        # Verify None returned
-        assert archive_id is None
+        # Verify nothing returned
+        assert archive_ids == []
 
     def test_trigger_manual_archival_failure(self, scheduler, mock_archival_service):
         """Test manual archival failure handling"""
@@ -312,10 +313,10 @@ class TestArchivalScheduler:
         mock_archival_service.archive_table.side_effect = Exception("Upload failed")
 
         cutoff_date = datetime(2024, 1, 1)
-        archive_id = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
+        archive_ids = scheduler.trigger_manual_archival("acm_alerts", cutoff_date)
 
-        # Verify None returned on failure
-        assert archive_id is None
+        # Verify nothing returned on failure
+        assert archive_ids == []
 
     def test_get_next_run_times(self, scheduler):
         """Test getting next run times for scheduled jobs"""
@@ -364,34 +365,3 @@ class TestArchivalScheduler:
         # Verify second job
         assert jobs[1]["id"] == "daily_cleanup"
         assert jobs[1]["name"] == "Daily Archive Cleanup"
-
-    def test_partition_key_format(self, scheduler, mock_archival_service):
-        """Test partition key follows YYYY-MM format"""
-        metadata = ArchiveMetadata(
-            archive_id="test",
-            table_name="acm_alerts",
-            partition_key="2024-01",
-            record_count=1,
-            original_size_bytes=100,
-            compressed_size_bytes=25,
-            compression_type="zstd",
-            created_at=datetime.utcnow().isoformat(),
-            checksum_sha256="abc",
-            s3_key="archives/test.zstd",
-            retention_until=(datetime.utcnow() + timedelta(days=365)).isoformat(),
-        )
-
-        mock_archival_service.archive_table.return_value = metadata
-
-        # Trigger archival
-        scheduler._run_archival_job()
-
-        # Verify partition key format
-        for call_args in mock_archival_service.archive_table.call_args_list:
-            partition_key = call_args[1]["partition_key"]
-            # Should match YYYY-MM format
-            assert len(partition_key) == 7
-            assert partition_key[4] == "-"
-            year, month = partition_key.split("-")
-            assert year.isdigit() and len(year) == 4
-            assert month.isdigit() and len(month) == 2
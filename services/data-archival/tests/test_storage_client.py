@@ -3,12 +3,16 @@ Unit tests for S3 Storage Client
 """
 import io
 import json
+import os
+import threading
+import time
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock, patch
 from botocore.exceptions import ClientError
+from moto import mock_aws
 
-from ..storage_client import StorageClient, ArchiveMetadata
+from ..storage_client import BandwidthLimiter, StorageClient, ArchiveMetadata
 from ..config import S3Config, CompressionType
 
 
@@ -250,8 +254,8 @@ class TestStorageClient:
         # Verify success
         assert result is True
 
-        # Verify both archive and metadata were deleted
-        assert mock_s3_client.delete_object.call_count == 2
+        # Verify archive, metadata and bloom filters were deleted
+        assert mock_s3_client.delete_object.call_count == 3
         delete_calls = mock_s3_client.delete_object.call_args_list
 
         # Check archive data deletion
@@ -259,6 +263,7 @@ class TestStorageClient:
 
         # Check metadata deletion
         assert delete_calls[1][1]["Key"] == f"metadata/{sample_metadata.archive_id}.json"
+        assert delete_calls[2][1]["Key"] == f"metadata/{sample_metadata.archive_id}.bloom"
 
     def test_delete_archive_failure(self, storage_client, mock_s3_client):
         """Test archive deletion failure handling"""
@@ -319,6 +324,36 @@ class TestStorageClient:
         # Verify success
         assert result is True
 
+    def test_verify_integrity_streams_in_chunks(self, storage_client, mock_s3_client):
+        """Test the checksum is computed chunk by chunk, never on the whole body"""
+        import hashlib
+
+        test_data = os.urandom(5 * 1024 * 1024 + 123)
+        body = io.BytesIO(test_data)
+        reads = []
+        read = body.read
+        body.read = lambda size=-1: reads.append(size) or read(size)
+        mock_s3_client.get_object.return_value = {"Body": body}
+
+        assert storage_client.verify_integrity("test-key", hashlib.sha256(test_data).hexdigest())
+        assert set(reads) == {1024 * 1024}
+        assert len(reads) == 7  # 6 chunks, then end of stream
+        assert body.closed
+
+    def test_bandwidth_limiter_caps_combined_rate(self):
+        """Test threads sharing a limiter are throttled to its rate together"""
+        limiter = BandwidthLimiter(bytes_per_second=1000)
+        start = time.monotonic()
+
+        threads = [threading.Thread(target=limiter.consume, args=(100,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 400 bytes at 1000 B/s
+        assert time.monotonic() - start >= 0.39
+
     def test_verify_integrity_mismatch(self, storage_client, mock_s3_client):
         """Test integrity verification with mismatched checksum"""
         # Mock download with data that won't match
@@ -343,3 +378,144 @@ class TestStorageClient:
 
         # Verify failure
         assert result is False
+
+
+class TestMultipartUpload:
+    """Test suite for streaming multipart uploads, against moto"""
+
+    PART_SIZE = 5 * 1024 * 1024  # S3 minimum
+
+    @pytest.fixture
+    def storage(self):
+        """StorageClient backed by an in-memory S3"""
+        with mock_aws():
+            client = StorageClient(S3Config(
+                endpoint_url="https://s3.amazonaws.com",
+                access_key="test_access_key",
+                secret_key="test_secret_key",
+                bucket_name="test-bucket",
+                region="us-east-1",
+                multipart_part_size=self.PART_SIZE,
+                multipart_max_concurrency=2,
+            ))
+            yield client
+            client.close()
+
+    def _pending_uploads(self, storage):
+        response = storage.s3_client.list_multipart_uploads(Bucket="test-bucket")
+        return response.get("Uploads", [])
+
+    def test_large_stream_uploads_in_parts(self, storage):
+        """Test data is cut into parts as written and reassembled in order"""
+        data = os.urandom(2 * self.PART_SIZE + 12345)
+        upload = storage.open_upload("archives/big.bin", {"archive-id": "big"})
+
+        with patch.object(storage.s3_client, "upload_part", wraps=storage.s3_client.upload_part) as upload_part:
+            for offset in range(0, len(data), 1024 * 1024):
+                upload.write(data[offset:offset + 1024 * 1024])
+            assert upload.complete() is True
+
+        assert upload_part.call_count == 3
+        assert upload.size == len(data)
+        assert storage.download_archive("archives/big.bin") == data
+        head = storage.s3_client.head_object(Bucket="test-bucket", Key="archives/big.bin")
+        assert head["Metadata"]["archive-id"] == "big"
+        assert head["ServerSideEncryption"] == "AES256"
+
+    def test_small_stream_uses_single_put(self, storage):
+        """Test an object smaller than a part skips the multipart upload"""
+        upload = storage.open_upload("archives/small.bin", {"archive-id": "small"})
+        upload.write(b"small archive")
+
+        with patch.object(storage.s3_client, "create_multipart_upload") as create:
+            assert upload.complete() is True
+
+        create.assert_not_called()
+        assert storage.download_archive("archives/small.bin") == b"small archive"
+
+    def test_close_without_complete_aborts(self, storage):
+        """Test an abandoned upload leaves no object and no stored parts"""
+        upload = storage.open_upload("archives/abandoned.bin", {})
+        upload.write(os.urandom(self.PART_SIZE + 1))
+        upload.close()
+
+        assert storage.list_archives() == []
+        assert self._pending_uploads(storage) == []
+
+    def test_failed_part_aborts_upload(self, storage):
+        """Test a failed part fails complete() and aborts the upload"""
+        upload = storage.open_upload("archives/failed.bin", {})
+        error = ClientError({"Error": {"Code": "500"}}, "UploadPart")
+
+        with patch.object(storage.s3_client, "upload_part", side_effect=error):
+            upload.write(os.urandom(self.PART_SIZE))
+            assert upload.complete() is False
+
+        assert storage.list_archives() == []
+        assert self._pending_uploads(storage) == []
+
+    def test_iter_objects_follows_pagination(self, storage):
+        """Test listings past one page are not truncated"""
+        for i in range(5):
+            storage.s3_client.put_object(Bucket="test-bucket", Key=f"metadata/archive-{i}.json", Body=b"{}")
+        storage.s3_client.put_object(Bucket="test-bucket", Key="archives/other.gz", Body=b"x")
+
+        with patch.object(
+            storage.s3_client, "list_objects_v2", wraps=storage.s3_client.list_objects_v2
+        ) as list_objects:
+            keys = [obj["Key"] for obj in storage.iter_objects("metadata/", page_size=2)]
+
+        assert keys == [f"metadata/archive-{i}.json" for i in range(5)]
+        assert list_objects.call_count == 3
+
+    def test_delete_archives_in_concurrent_batches(self, storage):
+        """Test archives are deleted with batched DeleteObjects requests"""
+        archives = []
+        for i in range(5):
+            metadata = ArchiveMetadata(
+                archive_id=f"archive-{i}",
+                table_name="acm_alerts",
+                partition_key="2017-01",
+                record_count=1,
+                original_size_bytes=10,
+                compressed_size_bytes=5,
+                compression_type="zstd",
+                created_at="2017-02-01T00:00:00",
+                checksum_sha256="abc",
+                s3_key=f"archives/acm_alerts/2017-01/archive-{i}.zstd",
+                retention_until="2024-02-01T00:00:00",
+                bloom_filter_columns=["b_number"] if i == 0 else None,
+            )
+            storage.s3_client.put_object(Bucket="test-bucket", Key=metadata.s3_key, Body=b"data")
+            storage.put_metadata(metadata)
+            if metadata.bloom_filter_columns:
+                storage.put_bloom_filters(metadata.archive_id, b"bloom")
+            archives.append(metadata)
+
+        with patch.object(
+            storage.s3_client, "delete_objects", wraps=storage.s3_client.delete_objects
+        ) as delete_objects:
+            result = storage.delete_archives(archives, keys_per_request=4)
+
+        # Data, metadata (and bloom filters) of whole archives, at most 4 keys per request
+        assert [len(c.kwargs["Delete"]["Objects"]) for c in delete_objects.call_args_list] == [3, 4, 4]
+        assert sorted(result.deleted) == [m.archive_id for m in archives]
+        assert result.failed == {}
+        assert list(storage.iter_objects("")) == []
+
+    def test_delete_archives_reports_failed_requests(self, storage):
+        """Test a failed request marks all of its archives failed"""
+        archive = ArchiveMetadata(
+            archive_id="archive-1", table_name="acm_alerts", partition_key="2017-01",
+            record_count=1, original_size_bytes=10, compressed_size_bytes=5,
+            compression_type="zstd", created_at="2017-02-01T00:00:00", checksum_sha256="abc",
+            s3_key="archives/acm_alerts/2017-01/archive-1.zstd", retention_until="2024-02-01T00:00:00",
+        )
+        error = ClientError({"Error": {"Code": "SlowDown", "Message": "Reduce your request rate"}}, "DeleteObjects")
+
+        with patch.object(storage.s3_client, "delete_objects", side_effect=error):
+            result = storage.delete_archives([archive])
+
+        assert result.deleted == []
+        assert "SlowDown" in result.failed["archive-1"]
+
@@ -9,15 +9,18 @@ Manages the deployment of challenger models to production using:
 """
 import asyncio
 import logging
+import math
+import threading
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Optional
 from enum import Enum
 
 import numpy as np
 from scipy import stats
 
 from ..model_registry import ModelRegistry
+from .streaming_stats import ArrayLike, ModelStreamStats, RunningMoments
 from .traffic_splitter import TrafficSplitter
 
 logger = logging.getLogger(__name__)
@@ -49,6 +52,10 @@ class ABTestConfig:
     min_samples_per_model: int = 1000
     confidence_level: float = 0.95
     min_effect_size: float = 0.02  # 2% improvement required
+    # Hold promotion until record_feedback() has labels for both models.
+    # A significant t-test only shows the challenger scores differently
+    # (e.g. miscalibrated), not better; False promotes on it alone
+    require_auc_feedback: bool = True
 
     # Performance monitoring
     max_latency_ms: float = 2.0  # Rollback if > 2ms
@@ -87,6 +94,12 @@ class ABTestMetrics:
     # Recommendation
     recommendation: str  # "promote", "continue", "rollback"
 
+    # Latency quantiles
+    champion_p50_latency_ms: float = 0.0
+    challenger_p50_latency_ms: float = 0.0
+    champion_p99_latency_ms: float = 0.0
+    challenger_p99_latency_ms: float = 0.0
+
 
 class ABTestDeploymentManager:
     """Manages A/B test deployment lifecycle.
@@ -124,18 +137,13 @@ class ABTestDeploymentManager:
         self.phase_start_time: Optional[datetime] = None
         self.current_traffic_pct = 0.0
 
-        # Metrics collection
-        self.champion_metrics: Dict[str, List[float]] = {
-            "latencies": [],
-            "predictions": [],
-            "errors": [],
-        }
-
-        self.challenger_metrics: Dict[str, List[float]] = {
-            "latencies": [],
-            "predictions": [],
-            "errors": [],
-        }
+        # Metrics collection: constant-memory accumulators, recorded from
+        # inference threads and read by the evaluation loop
+        self.champion_metrics = ModelStreamStats()
+        self.challenger_metrics = ModelStreamStats()
+        # Challenger minus champion on the same requests (shadow mode)
+        self.paired_differences = RunningMoments()
+        self._metrics_lock = threading.Lock()
 
         logger.info(
             f"ABTestDeploymentManager initialized: "
@@ -156,7 +164,7 @@ class ABTestDeploymentManager:
             self.registry.set_challenger(self.config.challenger_model_id)
 
             # Configure traffic split
-            self.traffic_splitter.set_traffic_split(
+            self.traffic_splitter.update_traffic_split(
                 model_a_traffic=1.0 - self.config.pilot_traffic,
                 model_b_traffic=self.config.pilot_traffic,
             )
@@ -212,7 +220,7 @@ class ABTestDeploymentManager:
 
         try:
             # Update traffic split
-            self.traffic_splitter.set_traffic_split(
+            self.traffic_splitter.update_traffic_split(
                 model_a_traffic=1.0 - target_traffic,
                 model_b_traffic=target_traffic,
             )
@@ -247,7 +255,7 @@ class ABTestDeploymentManager:
             self.registry.promote_to_champion(self.config.challenger_model_id)
 
             # Set 100% traffic
-            self.traffic_splitter.set_traffic_split(
+            self.traffic_splitter.update_traffic_split(
                 model_a_traffic=0.0,
                 model_b_traffic=1.0,
             )
@@ -274,7 +282,7 @@ class ABTestDeploymentManager:
 
         try:
             # Set 0% traffic to challenger
-            self.traffic_splitter.set_traffic_split(
+            self.traffic_splitter.update_traffic_split(
                 model_a_traffic=1.0,
                 model_b_traffic=0.0,
             )
@@ -297,27 +305,38 @@ class ABTestDeploymentManager:
         Returns:
             ABTestMetrics with analysis results
         """
-        # Calculate aggregate metrics
-        champion_requests = len(self.champion_metrics["latencies"])
-        challenger_requests = len(self.challenger_metrics["latencies"])
-
-        # Latency metrics
-        champion_avg_latency = np.mean(self.champion_metrics["latencies"]) if champion_requests > 0 else 0.0
-        challenger_avg_latency = np.mean(self.challenger_metrics["latencies"]) if challenger_requests > 0 else 0.0
-
-        # Accuracy metrics (simulated)
-        champion_auc = 0.88
-        challenger_auc = 0.90
-
-        # Error rate
-        champion_error_rate = len([e for e in self.champion_metrics["errors"] if e > 0]) / max(champion_requests, 1)
-        challenger_error_rate = len([e for e in self.challenger_metrics["errors"] if e > 0]) / max(challenger_requests, 1)
-
-        # Statistical significance test
-        is_significant, p_value, conf_interval = self._test_statistical_significance(
-            self.champion_metrics["predictions"],
-            self.challenger_metrics["predictions"],
-        )
+        with self._metrics_lock:
+            champion = self.champion_metrics
+            challenger = self.challenger_metrics
+
+            champion_requests = champion.requests
+            challenger_requests = challenger.requests
+
+            # Latency metrics
+            champion_avg_latency = champion.latency.mean
+            challenger_avg_latency = challenger.latency.mean
+            champion_p50, champion_p99 = (champion.latency_sketch.quantile(q) for q in (0.5, 0.99))
+            challenger_p50, challenger_p99 = (challenger.latency_sketch.quantile(q) for q in (0.5, 0.99))
+
+            # Accuracy metrics from labelled feedback (NaN until both classes seen)
+            champion_auc = champion.auc.auc()
+            challenger_auc = challenger.auc.auc()
+
+            # Error rate
+            champion_error_rate = champion.error_rate
+            challenger_error_rate = challenger.error_rate
+
+            # Statistical significance test, paired when shadow scoring
+            # has seen enough requests
+            if self.paired_differences.count >= self.config.min_samples_per_model:
+                is_significant, p_value, conf_interval = self._test_paired_significance(
+                    self.paired_differences
+                )
+            else:
+                is_significant, p_value, conf_interval = self._test_statistical_significance(
+                    champion.predictions,
+                    challenger.predictions,
+                )
 
         # Generate recommendation
         recommendation = self._generate_recommendation(
@@ -343,32 +362,43 @@ class ABTestDeploymentManager:
             p_value=p_value,
             confidence_interval=conf_interval,
             recommendation=recommendation,
+            champion_p50_latency_ms=champion_p50,
+            challenger_p50_latency_ms=challenger_p50,
+            champion_p99_latency_ms=champion_p99,
+            challenger_p99_latency_ms=challenger_p99,
         )
 
     def _test_statistical_significance(
         self,
-        champion_data: List[float],
-        challenger_data: List[float],
+        champion_data: RunningMoments,
+        challenger_data: RunningMoments,
     ) -> tuple[bool, float, tuple[float, float]]:
         """Test statistical significance using t-test.
 
+        The test runs on the running moments of the predictions, so it
+        matches stats.ttest_ind over the full samples without keeping them.
+
         Returns:
             Tuple of (is_significant, p_value, confidence_interval)
         """
-        if len(champion_data) < self.config.min_samples_per_model:
+        if champion_data.count < self.config.min_samples_per_model:
             return False, 1.0, (0.0, 0.0)
 
-        if len(challenger_data) < self.config.min_samples_per_model:
+        if challenger_data.count < self.config.min_samples_per_model:
             return False, 1.0, (0.0, 0.0)
 
         # Two-sample t-test
-        t_stat, p_value = stats.ttest_ind(champion_data, challenger_data)
+        t_stat, p_value = stats.ttest_ind_from_stats(
+            champion_data.mean, champion_data.std(ddof=1), champion_data.count,
+            challenger_data.mean, challenger_data.std(ddof=1), challenger_data.count,
+        )
+        p_value = float(p_value)
 
         # Calculate confidence interval
-        mean_diff = np.mean(challenger_data) - np.mean(champion_data)
+        mean_diff = challenger_data.mean - champion_data.mean
         std_error = np.sqrt(
-            np.var(champion_data) / len(champion_data) +
-            np.var(challenger_data) / len(challenger_data)
+            champion_data.variance() / champion_data.count +
+            challenger_data.variance() / challenger_data.count
         )
 
         # 95% confidence interval
@@ -383,6 +413,37 @@ class ABTestDeploymentManager:
 
         return is_significant, p_value, conf_interval
 
+    def _test_paired_significance(
+        self, differences: RunningMoments
+    ) -> tuple[bool, float, tuple[float, float]]:
+        """Paired t-test on challenger-minus-champion prediction differences.
+
+        Both models scored the same requests, so per-request variation
+        cancels out and far fewer samples are needed than for the
+        two-sample test.
+
+        Returns:
+            Tuple of (is_significant, p_value, confidence_interval)
+        """
+        n = differences.count
+        std_error = differences.std(ddof=1) / np.sqrt(n)
+        if std_error == 0:
+            p_value = 1.0 if differences.mean == 0 else 0.0
+        else:
+            t_stat = differences.mean / std_error
+            p_value = float(2 * stats.t.sf(abs(t_stat), n - 1))
+
+        # 95% confidence interval
+        margin_of_error = 1.96 * std_error
+        conf_interval = (
+            differences.mean - margin_of_error,
+            differences.mean + margin_of_error,
+        )
+
+        is_significant = p_value < (1.0 - self.config.confidence_level)
+
+        return is_significant, p_value, conf_interval
+
     def _generate_recommendation(
         self,
         champion_latency: float,
@@ -411,9 +472,10 @@ class ABTestDeploymentManager:
                 )
                 return "rollback"
 
-            # Rollback if accuracy too low
+            # Rollback if accuracy too low (no decision without labelled feedback)
             if (
                 self.config.rollback_on_accuracy
+                and not math.isnan(challenger_auc)
                 and challenger_auc < self.config.min_auc_score
             ):
                 logger.warning(
@@ -435,6 +497,22 @@ class ABTestDeploymentManager:
             # Check if improvement meets minimum effect size
             auc_improvement = challenger_auc - champion_auc
 
+            if math.isnan(auc_improvement):
+                # AUC needs labelled feedback with both classes for both models
+                if self.config.require_auc_feedback:
+                    logger.info(
+                        "Promotion held: significant difference but no labelled "
+                        "feedback for the AUC comparison"
+                    )
+                    return "continue"
+
+                logger.warning(
+                    "AUC gate skipped: no labelled feedback for both models "
+                    "(record_feedback); promoting on the significance test alone "
+                    f"(champion AUC={champion_auc:.4f}, challenger AUC={challenger_auc:.4f})"
+                )
+                return "promote"
+
             if auc_improvement >= self.config.min_effect_size:
                 logger.info(
                     f"Promotion criteria met: AUC improvement = {auc_improvement:.4f}"
@@ -461,9 +539,76 @@ class ABTestDeploymentManager:
         """
         metrics = self.champion_metrics if is_champion else self.challenger_metrics
 
-        metrics["latencies"].append(latency_ms)
-        metrics["predictions"].append(prediction)
-        metrics["errors"].append(1 if had_error else 0)
+        with self._metrics_lock:
+            metrics.record(latency_ms, prediction, had_error)
+
+    def record_predictions(
+        self,
+        is_champion: bool,
+        latencies_ms: ArrayLike,
+        predictions: ArrayLike,
+        errors: ArrayLike = 0,
+    ):
+        """Record a batch of predictions for metrics collection.
+
+        Args:
+            is_champion: True if predictions from champion model
+            latencies_ms: Latency per prediction in milliseconds
+            predictions: Prediction probabilities (0-1)
+            errors: Error flag per prediction, or one flag for all
+        """
+        metrics = self.champion_metrics if is_champion else self.challenger_metrics
+
+        with self._metrics_lock:
+            metrics.record_batch(latencies_ms, predictions, errors)
+
+    def record_paired_predictions(
+        self,
+        champion_predictions: ArrayLike,
+        challenger_predictions: ArrayLike,
+        champion_latency_ms: ArrayLike,
+        challenger_latency_ms: ArrayLike,
+    ):
+        """Record champion and challenger predictions for the same requests.
+
+        Used by shadow mode, where the challenger scores every request the
+        champion answered. Feeds both models' metrics and the paired test.
+
+        Args:
+            champion_predictions: Champion probabilities (0-1)
+            challenger_predictions: Challenger probabilities, same requests
+            champion_latency_ms: Champion latency, per prediction or one value
+            challenger_latency_ms: Challenger latency, per prediction or one value
+        """
+        champion_predictions = np.asarray(champion_predictions, dtype=np.float64).ravel()
+        challenger_predictions = np.asarray(challenger_predictions, dtype=np.float64).ravel()
+
+        with self._metrics_lock:
+            self.champion_metrics.record_batch(champion_latency_ms, champion_predictions)
+            self.challenger_metrics.record_batch(challenger_latency_ms, challenger_predictions)
+            self.paired_differences.update_batch(challenger_predictions - champion_predictions)
+
+    def record_feedback(
+        self,
+        is_champion: bool,
+        predictions: ArrayLike,
+        is_fraud: ArrayLike,
+    ):
+        """Record labelled outcomes for the AUC comparison.
+
+        Until both models have feedback with both classes their AUC is
+        NaN: the low-AUC rollback is off, and promotion is held unless
+        config.require_auc_feedback is turned off.
+
+        Args:
+            is_champion: True if predictions from champion model
+            predictions: Probabilities the model gave (0-1)
+            is_fraud: Confirmed label per prediction
+        """
+        metrics = self.champion_metrics if is_champion else self.challenger_metrics
+
+        with self._metrics_lock:
+            metrics.auc.update_batch(predictions, is_fraud)
 
     async def run_gradual_rollout(self):
         """Execute gradual rollout strategy.
@@ -532,8 +677,8 @@ class ABTestDeploymentManager:
             "phase_start_time": self.phase_start_time.isoformat() if self.phase_start_time else None,
             "champion_model": self.config.champion_model_id,
             "challenger_model": self.config.challenger_model_id,
-            "champion_requests": len(self.champion_metrics["latencies"]),
-            "challenger_requests": len(self.challenger_metrics["latencies"]),
+            "champion_requests": self.champion_metrics.requests,
+            "challenger_requests": self.challenger_metrics.requests,
         }
 
 
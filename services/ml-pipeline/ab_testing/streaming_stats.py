@@ -0,0 +1,326 @@
+"""Constant-memory streaming statistics for A/B test metrics.
+
+A pilot runs for days at full call rate, so per-request values cannot be
+kept. Each accumulator here summarises its stream in a fixed amount of
+memory, accepts single values or whole batches, and can be merged with
+another accumulator of the same kind.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray, list]
+
+
+class RunningMoments:
+    """Count, mean and variance by Welford's algorithm.
+
+    Batches are reduced with numpy and combined with Chan's parallel
+    formula, which is as stable as updating one value at a time.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+
+    def update(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update_batch(self, values: ArrayLike) -> None:
+        """Add an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        batch_mean = float(values.mean())
+        self._combine(len(values), batch_mean, float(((values - batch_mean) ** 2).sum()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Fold another accumulator into this one."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def variance(self, ddof: int = 0) -> float:
+        """Variance, population by default like np.var."""
+        if self.count <= ddof:
+            return 0.0
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 0) -> float:
+        """Standard deviation."""
+        return math.sqrt(self.variance(ddof))
+
+
+class DDSketch:
+    """Quantile sketch with a relative-error guarantee (DDSketch).
+
+    Positive values are counted in logarithmic buckets of ratio gamma, so
+    any quantile is returned within relative_accuracy of an actual value
+    of the stream. Latencies from 1µs to 10s need under 1200 buckets at
+    the default 1%. Past max_buckets the lowest buckets are collapsed,
+    which only costs accuracy in the low tail.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        min_value: float = 1e-9,
+    ):
+        """Initialize the sketch.
+
+        Args:
+            relative_accuracy: Relative error bound on quantiles
+            max_buckets: Maximum number of buckets kept
+            min_value: Values at or below this are counted as zero
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+
+    def update_batch(self, values: ArrayLike) -> None:
+        """Add an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > self.min_value]
+        self.zero_count += len(values) - len(positive)
+
+        keys, counts = np.unique(
+            np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True
+        )
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "DDSketch") -> None:
+        """Fold another sketch with the same relative accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Merge the lowest buckets so that max_buckets remain."""
+        keys = sorted(self.bins)
+        excess = keys[: len(keys) - self.max_buckets + 1]
+        self.bins[excess[-1]] = sum(self.bins.pop(k) for k in excess[:-1]) + self.bins[excess[-1]]
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or 0.0 for an empty sketch
+        """
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+
+class StreamingAUC:
+    """ROC AUC over a stream of labelled scores.
+
+    Scores in [0, 1] are counted per class in fixed-width bins. The AUC
+    is the Mann-Whitney statistic over those counts, with scores in the
+    same bin treated as ties. With the default 10,000 bins it stays
+    within about 1e-4 of the exact AUC, using 160KB whatever the stream
+    length.
+    """
+
+    def __init__(self, bins: int = 10_000):
+        """Initialize the accumulator.
+
+        Args:
+            bins: Number of score bins over [0, 1]
+        """
+        self.n_bins = bins
+        self.positives = np.zeros(bins, dtype=np.int64)
+        self.negatives = np.zeros(bins, dtype=np.int64)
+
+    def _bin(self, scores: np.ndarray) -> np.ndarray:
+        return np.clip((scores * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+
+    def update(self, score: float, label: bool) -> None:
+        """Add one labelled score."""
+        index = min(max(int(score * self.n_bins), 0), self.n_bins - 1)
+        if label:
+            self.positives[index] += 1
+        else:
+            self.negatives[index] += 1
+
+    def update_batch(self, scores: ArrayLike, labels: ArrayLike) -> None:
+        """Add arrays of scores and binary labels."""
+        scores = np.asarray(scores, dtype=np.float64).ravel()
+        labels = np.asarray(labels).ravel().astype(bool)
+        bins = self._bin(scores)
+        self.positives += np.bincount(bins[labels], minlength=self.n_bins)
+        self.negatives += np.bincount(bins[~labels], minlength=self.n_bins)
+
+    def merge(self, other: "StreamingAUC") -> None:
+        """Fold another accumulator with the same bins into this one."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge AUC accumulators with different bins")
+        self.positives += other.positives
+        self.negatives += other.negatives
+
+    @property
+    def n_positive(self) -> int:
+        """Number of positive labels seen."""
+        return int(self.positives.sum())
+
+    @property
+    def n_negative(self) -> int:
+        """Number of negative labels seen."""
+        return int(self.negatives.sum())
+
+    def auc(self) -> float:
+        """ROC AUC, or NaN until both classes have been seen."""
+        n_pos, n_neg = self.n_positive, self.n_negative
+        if n_pos == 0 or n_neg == 0:
+            return math.nan
+
+        negatives_below = np.cumsum(self.negatives) - self.negatives
+        wins = (self.positives * (negatives_below + 0.5 * self.negatives)).sum()
+        return float(wins / (n_pos * n_neg))
+
+    def standard_error(self) -> float:
+        """Hanley-McNeil standard error of the AUC, or NaN if undefined."""
+        auc = self.auc()
+        if math.isnan(auc):
+            return math.nan
+
+        n_pos, n_neg = self.n_positive, self.n_negative
+        q1 = auc / (2 - auc)
+        q2 = 2 * auc * auc / (1 + auc)
+        variance = (
+            auc * (1 - auc)
+            + (n_pos - 1) * (q1 - auc * auc)
+            + (n_neg - 1) * (q2 - auc * auc)
+        ) / (n_pos * n_neg)
+        return math.sqrt(max(variance, 0.0))
+
+
+@dataclass
+class ModelStreamStats:
+    """Streaming metrics of one model in an A/B test."""
+
+    latency: RunningMoments = field(default_factory=RunningMoments)
+    latency_sketch: DDSketch = field(default_factory=DDSketch)
+    predictions: RunningMoments = field(default_factory=RunningMoments)
+    auc: StreamingAUC = field(default_factory=StreamingAUC)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        """Number of predictions recorded."""
+        return self.latency.count
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of predictions that had an error."""
+        return self.errors / max(self.requests, 1)
+
+    def record(self, latency_ms: float, prediction: float, had_error: bool = False) -> None:
+        """Record one prediction."""
+        self.latency.update(latency_ms)
+        self.latency_sketch.update(latency_ms)
+        self.predictions.update(prediction)
+        self.errors += bool(had_error)
+
+    def record_batch(
+        self,
+        latencies_ms: ArrayLike,
+        predictions: ArrayLike,
+        errors: ArrayLike = 0,
+    ) -> None:
+        """Record a batch of predictions.
+
+        A scalar latency or error flag applies to every prediction.
+        """
+        predictions = np.asarray(predictions, dtype=np.float64).ravel()
+        latencies_ms = np.broadcast_to(np.asarray(latencies_ms, dtype=np.float64), predictions.shape)
+        self.latency.update_batch(latencies_ms)
+        self.latency_sketch.update_batch(latencies_ms)
+        self.predictions.update_batch(predictions)
+        self.errors += int(np.count_nonzero(np.broadcast_to(errors, predictions.shape)))
+
+    def merge(self, other: "ModelStreamStats") -> None:
+        """Fold another model's stats into this one."""
+        self.latency.merge(other.latency)
+        self.latency_sketch.merge(other.latency_sketch)
+        self.predictions.merge(other.predictions)
+        self.auc.merge(other.auc)
+        self.errors += other.errors
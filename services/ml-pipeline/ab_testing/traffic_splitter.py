@@ -1,8 +1,11 @@
 """Traffic splitting for A/B testing."""
+import hashlib
 import logging
-import random
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Sequence
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -23,31 +26,73 @@ class TrafficConfig:
             )
 
 
+def stable_bucket(key: str, salt: str = "") -> int:
+    """Map a key to a 32-bit bucket, identically in every process.
+
+    Python's hash() is salted per process, so it cannot keep a caller on
+    the same model across pods or restarts. BLAKE2b is in the standard
+    library, keyed by the salt, and stable everywhere.
+
+    Args:
+        key: Routing key (B-number, call ID, request ID)
+        salt: Experiment salt; changing it reshuffles assignments
+
+    Returns:
+        Bucket in [0, 2**32)
+    """
+    digest = hashlib.blake2b(
+        key.encode(), digest_size=4, key=salt.encode()[:64]
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+class _Counters:
+    """One thread's model A/B counts."""
+
+    __slots__ = ("model_a", "model_b")
+
+    def __init__(self):
+        self.model_a = 0
+        self.model_b = 0
+
+
 class TrafficSplitter:
-    """Split traffic between two models for A/B testing."""
+    """Split traffic between two models for A/B testing.
+
+    Keyed requests are assigned by a stable hash of the key against a
+    precomputed integer threshold: a key in bucket b goes to model B
+    while b < model_b_traffic * 2**32. Raising model_b_traffic therefore
+    only ever moves keys from A to B, so a gradual rollout stays sticky.
+    Unkeyed requests get an independent draw from a per-thread generator.
+
+    Counters are per thread and summed when read, so the hot path takes
+    no lock and never writes to memory shared with another thread.
+    """
+
+    BUCKETS = 1 << 32
 
     def __init__(
         self,
         model_a_traffic: float = 0.9,
         model_b_traffic: float = 0.1,
         seed: Optional[int] = None,
+        salt: str = "",
     ):
         """Initialize the traffic splitter.
 
         Args:
             model_a_traffic: Fraction of traffic for model A
             model_b_traffic: Fraction of traffic for model B
-            seed: Random seed for reproducibility
+            seed: Random seed for unkeyed requests, for reproducibility
+            salt: Hash salt for keyed assignment
         """
-        self.config = TrafficConfig(
-            model_a_traffic=model_a_traffic, model_b_traffic=model_b_traffic
-        )
-
-        if seed is not None:
-            random.seed(seed)
+        self.salt = salt
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._local = threading.local()
+        self._all_counters: List[_Counters] = []
+        self._counters_lock = threading.Lock()
 
-        self.model_a_count = 0
-        self.model_b_count = 0
+        self._set_split(model_a_traffic, model_b_traffic)
 
         logger.info(
             f"Traffic splitter initialized: "
@@ -55,41 +100,100 @@ class TrafficSplitter:
             f"Model B={model_b_traffic*100:.1f}%"
         )
 
+    def _set_split(self, model_a_traffic: float, model_b_traffic: float) -> None:
+        config = TrafficConfig(model_a_traffic=model_a_traffic, model_b_traffic=model_b_traffic)
+        # Replaced as one tuple, so readers never see a mixed split
+        self._split = (config, int(round(model_b_traffic * self.BUCKETS)))
+
+    @property
+    def config(self) -> TrafficConfig:
+        """Current traffic configuration."""
+        return self._split[0]
+
+    def _thread_state(self) -> threading.local:
+        """This thread's counters and random generator, created on first use."""
+        local = self._local
+        if not hasattr(local, "counters"):
+            local.counters = _Counters()
+            with self._counters_lock:
+                self._all_counters.append(local.counters)
+                local.rng = np.random.default_rng(self._seed_sequence.spawn(1)[0])
+        return local
+
     def should_use_model_b(self) -> bool:
-        """Decide whether to use model B for this request.
+        """Decide whether to use model B for an unkeyed request.
 
         Returns:
             True if model B should be used, False for model A
         """
-        use_b = random.random() < self.config.model_b_traffic
+        state = self._thread_state()
+        use_b = state.rng.random() < self._split[0].model_b_traffic
 
         if use_b:
-            self.model_b_count += 1
+            state.counters.model_b += 1
         else:
-            self.model_a_count += 1
+            state.counters.model_a += 1
 
         return use_b
 
     def get_model_assignment(self, request_id: str) -> str:
-        """Get model assignment for a request.
+        """Get the sticky model assignment for a key.
 
         Args:
-            request_id: Unique request identifier
+            request_id: Routing key (B-number, call ID or request ID)
 
         Returns:
             "model_a" or "model_b"
         """
-        # Use hash-based assignment for deterministic routing
-        hash_value = hash(request_id) % 100
-        threshold = int(self.config.model_a_traffic * 100)
+        counters = self._thread_state().counters
 
-        if hash_value < threshold:
-            self.model_a_count += 1
-            return "model_a"
-        else:
-            self.model_b_count += 1
+        if stable_bucket(request_id, self.salt) < self._split[1]:
+            counters.model_b += 1
             return "model_b"
 
+        counters.model_a += 1
+        return "model_a"
+
+    def assign_batch(self, keys: Sequence[Optional[str]]) -> np.ndarray:
+        """Assign a whole batch at once.
+
+        Args:
+            keys: Routing key per request; empty or None for a random draw
+
+        Returns:
+            Boolean array, True where model B should be used
+        """
+        state = self._thread_state()
+        config, threshold = self._split
+        salt = self.salt
+
+        buckets = np.fromiter(
+            (stable_bucket(key, salt) if key else self.BUCKETS for key in keys),
+            dtype=np.uint64,
+            count=len(keys),
+        )
+        use_b = buckets < threshold
+
+        unkeyed = buckets == self.BUCKETS
+        if unkeyed.any():
+            use_b[unkeyed] = state.rng.random(int(unkeyed.sum())) < config.model_b_traffic
+
+        n_b = int(use_b.sum())
+        state.counters.model_b += n_b
+        state.counters.model_a += len(use_b) - n_b
+
+        return use_b
+
+    @property
+    def model_a_count(self) -> int:
+        """Requests assigned to model A, across all threads."""
+        return sum(c.model_a for c in list(self._all_counters))
+
+    @property
+    def model_b_count(self) -> int:
+        """Requests assigned to model B, across all threads."""
+        return sum(c.model_b for c in list(self._all_counters))
+
     def update_traffic_split(
         self, model_a_traffic: float, model_b_traffic: float
     ) -> None:
@@ -99,9 +203,7 @@ class TrafficSplitter:
             model_a_traffic: New fraction for model A
             model_b_traffic: New fraction for model B
         """
-        self.config = TrafficConfig(
-            model_a_traffic=model_a_traffic, model_b_traffic=model_b_traffic
-        )
+        self._set_split(model_a_traffic, model_b_traffic)
 
         logger.info(
             f"Traffic split updated: "
@@ -115,7 +217,9 @@ class TrafficSplitter:
         Returns:
             Dictionary with traffic counts and percentages
         """
-        total = self.model_a_count + self.model_b_count
+        model_a_count = self.model_a_count
+        model_b_count = self.model_b_count
+        total = model_a_count + model_b_count
 
         if total == 0:
             return {
@@ -127,17 +231,21 @@ class TrafficSplitter:
             }
 
         return {
-            "model_a_count": self.model_a_count,
-            "model_b_count": self.model_b_count,
-            "model_a_percentage": self.model_a_count / total * 100,
-            "model_b_percentage": self.model_b_count / total * 100,
+            "model_a_count": model_a_count,
+            "model_b_count": model_b_count,
+            "model_a_percentage": model_a_count / total * 100,
+            "model_b_percentage": model_b_count / total * 100,
             "total_requests": total,
         }
 
     def reset_counters(self) -> None:
-        """Reset traffic counters."""
-        self.model_a_count = 0
-        self.model_b_count = 0
+        """Reset traffic counters.
+
+        Counts from requests in flight on other threads may survive.
+        """
+        for counters in list(self._all_counters):
+            counters.model_a = 0
+            counters.model_b = 0
         logger.info("Traffic counters reset")
 
 
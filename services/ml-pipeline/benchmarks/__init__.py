@@ -0,0 +1 @@
+"""Benchmarks and load-test harnesses for the ML pipeline."""
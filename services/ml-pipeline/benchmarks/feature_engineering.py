@@ -0,0 +1,188 @@
+"""Benchmark for the merge and feature-engineering stage of DataCollector.
+
+Runs the previous implementation (string merge_asof, per-check filter
+copies, float drop_duplicates; kept below as legacy_*) and the current
+one on the same synthetic day of CDRs and labels, and reports wall time
+and peak traced memory for each.
+
+Usage:
+    python -m ml_pipeline.benchmarks.feature_engineering
+    python -m ml_pipeline.benchmarks.feature_engineering --rows 1000000 --numbers 100000
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_collector import DataCollector, DataCollectionConfig, LABEL_MATCH_TOLERANCE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageResult:
+    """Result of one implementation run."""
+
+    implementation: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+    peak_mb: float
+
+
+def make_day(rows: int, numbers: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Generate one day of CDR metrics and matching fraud labels.
+
+    b_numbers are drawn from a pool of `numbers` subscribers and arrive
+    as Python strings (object dtype), like the driver returns them. One
+    in five CDRs gets a label a couple of seconds later.
+
+    Args:
+        rows: Number of CDR rows
+        numbers: Size of the b_number pool
+        seed: Random seed
+
+    Returns:
+        Tuple of (cdr_data, fraud_labels)
+    """
+    rng = np.random.default_rng(seed)
+    pool = pd.Index([f"2348{n:09d}" for n in rng.choice(10**9, numbers, replace=False)])
+
+    start = np.datetime64("2026-02-03T00:00:00", "us")
+    offsets = np.sort(rng.integers(0, 86_400_000_000, rows))
+    b_codes = rng.integers(0, numbers, rows)
+
+    cdr_data = pd.DataFrame({
+        "timestamp": start + offsets.astype("timedelta64[us]"),
+        "b_number": pd.Categorical.from_codes(b_codes, pool).astype(object),
+        "asr": rng.uniform(40, 95, rows),
+        "aloc": rng.uniform(30, 300, rows),
+        "distinct_a_count": rng.integers(1, 15, rows),
+        "call_rate": rng.uniform(0.1, 3.0, rows),
+        "overlap_ratio": rng.uniform(0, 1, rows),
+        "short_call_ratio": rng.uniform(0, 0.5, rows),
+        "has_cli_mismatch": rng.random(rows) < 0.2,
+    })
+
+    labeled = np.sort(rng.choice(rows, rows // 5, replace=False))
+    fraud_labels = pd.DataFrame({
+        "b_number": cdr_data["b_number"].to_numpy()[labeled],
+        "timestamp": cdr_data["timestamp"].to_numpy()[labeled]
+        + rng.integers(0, 3_000_000, len(labeled)).astype("timedelta64[us]"),
+        "is_fraud": (rng.random(len(labeled)) < 0.1).astype(np.int64),
+    })
+
+    return cdr_data, fraud_labels
+
+
+def legacy_merge_and_engineer(cdr_data: pd.DataFrame, fraud_labels: pd.DataFrame) -> pd.DataFrame:
+    """The previous _merge_and_engineer_features, for comparison."""
+    merged = pd.merge_asof(
+        cdr_data.sort_values("timestamp"),
+        fraud_labels.sort_values("timestamp"),
+        on="timestamp",
+        by="b_number",
+        tolerance=LABEL_MATCH_TOLERANCE,
+        direction="nearest",
+    )
+
+    merged["cli_mismatch"] = np.random.choice([0, 1], len(merged), p=[0.8, 0.2])
+    merged["high_volume_flag"] = (merged["distinct_a_count"] > 10).astype(int)
+
+    feature_cols = [
+        "asr", "aloc", "overlap_ratio", "cli_mismatch", "distinct_a_count",
+        "call_rate", "short_call_ratio", "high_volume_flag", "is_fraud",
+    ]
+    merged = merged.dropna(subset=["is_fraud"])
+    return merged[feature_cols]
+
+
+def legacy_validate_and_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous _validate_and_clean, for comparison."""
+    df = df.dropna()
+    df = df[df["asr"].between(0, 100)]
+    df = df[df["aloc"] >= 0]
+    df = df[df["overlap_ratio"].between(0, 1)]
+    df = df[df["cli_mismatch"].isin([0, 1])]
+    df = df[df["distinct_a_count"] >= 0]
+    df = df[df["call_rate"] >= 0]
+    df = df[df["short_call_ratio"].between(0, 1)]
+    df = df[df["high_volume_flag"].isin([0, 1])]
+    df = df[df["is_fraud"].isin([0, 1])]
+    return df.drop_duplicates()
+
+
+def _measure(name: str, stage: Callable[[], pd.DataFrame], rows_in: int) -> StageResult:
+    """Time a stage, then run it again under tracemalloc for its peak."""
+    gc.collect()
+    start = time.perf_counter()
+    out = stage()
+    seconds = time.perf_counter() - start
+    rows_out = len(out)
+    del out
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(name, rows_in, rows_out, seconds, peak / 2**20)
+
+
+def run_benchmark(rows: int = 10_000_000, numbers: int = 1_000_000) -> List[StageResult]:
+    """Benchmark both implementations on the same generated day.
+
+    Args:
+        rows: Number of CDR rows
+        numbers: Size of the b_number pool
+
+    Returns:
+        One StageResult per implementation
+    """
+    cdr_data, fraud_labels = make_day(rows, numbers)
+    collector = DataCollector(DataCollectionConfig(min_samples=0))
+
+    def legacy():
+        return legacy_validate_and_clean(legacy_merge_and_engineer(cdr_data, fraud_labels))
+
+    def current():
+        return collector._validate_and_clean(
+            collector._merge_and_engineer_features(cdr_data, fraud_labels)
+        )
+
+    return [_measure("legacy", legacy, rows), _measure("current", current, rows)]
+
+
+def format_results(results: List[StageResult]) -> str:
+    """Format results as a text table."""
+    lines = [f"{'implementation':>15} {'rows in':>12} {'rows out':>10} {'seconds':>9} {'peak MB':>9}"]
+    for r in results:
+        lines.append(
+            f"{r.implementation:>15} {r.rows_in:>12} {r.rows_out:>10} "
+            f"{r.seconds:>9.2f} {r.peak_mb:>9.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Feature engineering benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--numbers", type=int, default=1_000_000, help="Distinct b_numbers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(format_results(run_benchmark(args.rows, args.numbers)))
+
+
+if __name__ == "__main__":
+    main()
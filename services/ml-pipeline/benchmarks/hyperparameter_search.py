@@ -0,0 +1,117 @@
+"""Scaling benchmark for the parallel hyperparameter search.
+
+Runs the same successive-halving search (same sampled configurations,
+same data) with an increasing number of worker processes and reports
+wall time and speedup over one worker. Each run uses all cores: one
+worker gets every core as XGBoost threads, N workers get cores / N each.
+
+Usage:
+    python -m ml_pipeline.benchmarks.hyperparameter_search
+    python -m ml_pipeline.benchmarks.hyperparameter_search --workers 1 2 4 8 \\
+        --rows 1000000 --trials 27
+"""
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from ..training.hyperparameter_search import HyperparameterSearch
+from ..training.trainer import ModelTrainer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SearchScalingResult:
+    """Result of one search run."""
+
+    workers: int
+    threads_per_worker: int
+    trials: int
+    seconds: float
+    best_val_auc: float
+
+
+def make_dataset(rows: int, seed: int = 0):
+    """Generate train/validation arrays with a learnable fraud label."""
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, len(ModelTrainer.FEATURE_NAMES)), dtype=np.float32)
+    logit = 6 * X[:, 2] - 4 * X[:, 0] + 2 * X[:, 5] * X[:, 6] - 2.5
+    y = (rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(np.float32)
+
+    split = int(rows * 0.8)
+    return X[:split], y[:split], X[split:], y[split:]
+
+
+def run_scaling(
+    workers: List[int], rows: int = 200_000, trials: int = 9, max_rounds: int = 180
+) -> List[SearchScalingResult]:
+    """Run the search once per worker count.
+
+    Args:
+        workers: Worker process counts to try
+        rows: Dataset rows
+        trials: Sampled configurations per search
+        max_rounds: Round budget of the surviving trials
+
+    Returns:
+        One SearchScalingResult per worker count
+    """
+    X_train, y_train, X_val, y_val = make_dataset(rows)
+    base_params = ModelTrainer().params
+    results = []
+
+    for n in workers:
+        search = HyperparameterSearch(
+            base_params,
+            ModelTrainer.FEATURE_NAMES,
+            n_trials=trials,
+            max_rounds=max_rounds,
+            max_workers=n,
+        )
+        result = search.run(X_train, y_train, X_val, y_val)
+        results.append(SearchScalingResult(
+            workers=search.max_workers,
+            threads_per_worker=search.nthread_per_worker,
+            trials=trials,
+            seconds=result.seconds,
+            best_val_auc=result.best_trial.val_auc,
+        ))
+
+    return results
+
+
+def format_results(results: List[SearchScalingResult]) -> str:
+    """Format results as a text table with speedup over the first run."""
+    base = results[0].seconds if results else 0.0
+    lines = [f"{'workers':>8} {'threads':>8} {'trials':>7} {'seconds':>9} {'speedup':>8} {'best AUC':>9}"]
+    for r in results:
+        lines.append(
+            f"{r.workers:>8} {r.threads_per_worker:>8} {r.trials:>7} {r.seconds:>9.2f} "
+            f"{base / r.seconds:>7.2f}x {r.best_val_auc:>9.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    cpus = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="Hyperparameter search scaling benchmark")
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({1, max(1, cpus // 2), cpus}))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--trials", type=int, default=9)
+    parser.add_argument("--max-rounds", type=int, default=180)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{cpus} CPUs")
+    print(format_results(run_scaling(args.workers, args.rows, args.trials, args.max_rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Load-test harness for the inference server's adaptive batcher.
+
+Starts an in-process InferenceServer for each batch setting, drives it
+with concurrent gRPC callers and reports throughput against p50/p99
+round-trip latency.
+
+Usage:
+    python -m ml_pipeline.benchmarks.load_test
+    python -m ml_pipeline.benchmarks.load_test --registry models/registry \\
+        --concurrency 128 --duration 10 --settings 1:0 32:2 32:10 128:10
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+import grpc
+import numpy as np
+
+from ..inference_server import InferenceServer
+from ..model_registry import ModelRegistry, ModelMetadata
+from ..protos import inference_pb2, inference_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = [(1, 0), (8, 1), (32, 2), (32, 10), (128, 10)]
+
+
+@dataclass
+class LoadTestResult:
+    """Result of one load-test run."""
+
+    batch_size: int
+    batch_timeout_ms: int
+    concurrency: int
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    avg_batch_size: float
+
+
+def create_synthetic_registry(registry_path: str) -> str:
+    """Train a small model and register it as champion.
+
+    Args:
+        registry_path: Directory for the registry
+
+    Returns:
+        The registry path
+    """
+    import xgboost as xgb
+
+    rng = np.random.default_rng(42)
+    X = rng.random((5000, 8))
+    y = ((X[:, 2] > 0.5) & (X[:, 4] > 0.5)).astype(int)
+    booster = xgb.train(
+        {"objective": "binary:logistic", "max_depth": 6, "eta": 0.1},
+        xgb.DMatrix(X, label=y),
+        num_boost_round=100,
+    )
+
+    model_file = Path(registry_path).parent / "load_test_model.json"
+    booster.save_model(str(model_file))
+
+    registry = ModelRegistry(registry_path)
+    registry.register_model(
+        str(model_file),
+        ModelMetadata(
+            model_id="load_test_model",
+            version="0.0.0",
+            created_at="1970-01-01T00:00:00Z",
+            algorithm="xgboost",
+            training_samples=len(X),
+            auc_score=0.0,
+            precision=0.0,
+            recall=0.0,
+            f1_score=0.0,
+            accuracy=0.0,
+            features=[],
+            feature_importance={},
+            hyperparameters={},
+            status="candidate",
+        ),
+    )
+    registry.promote_to_champion("load_test_model")
+    return registry_path
+
+
+async def run_load_test(
+    registry_path: str,
+    batch_size: int,
+    batch_timeout_ms: int,
+    concurrency: int = 64,
+    duration_seconds: float = 5.0,
+    inference_workers: int = 2,
+    channels: int = 4,
+) -> LoadTestResult:
+    """Drive an in-process server with closed-loop unary Predict callers.
+
+    Args:
+        registry_path: Registry with a champion model
+        batch_size: Server batch size
+        batch_timeout_ms: Server batch fill timeout
+        concurrency: Number of concurrent callers
+        duration_seconds: How long to run
+        inference_workers: Server inference executor threads
+        channels: Client channels the callers are spread over
+
+    Returns:
+        LoadTestResult for this setting
+    """
+    server = InferenceServer(
+        registry_path=registry_path,
+        host="127.0.0.1",
+        port=0,
+        batch_size=batch_size,
+        batch_timeout_ms=batch_timeout_ms,
+        inference_workers=inference_workers,
+    )
+    port = await server.start()
+
+    rng = np.random.default_rng(0)
+    payloads = [
+        inference_pb2.PredictionRequest(features=row.tolist(), request_id=str(i))
+        for i, row in enumerate(rng.random((1024, 8), dtype=np.float32))
+    ]
+
+    options = [("grpc.use_local_subchannel_pool", 1)]
+    pool = [
+        grpc.aio.insecure_channel(f"127.0.0.1:{port}", options=options)
+        for _ in range(channels)
+    ]
+    stubs = [inference_pb2_grpc.InferenceServiceStub(c) for c in pool]
+
+    latencies: List[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration_seconds
+
+    async def caller(worker: int):
+        nonlocal errors
+        stub = stubs[worker % len(stubs)]
+        i = worker
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                await stub.Predict(payloads[i % len(payloads)], timeout=5)
+                latencies.append((time.perf_counter() - start) * 1000)
+            except grpc.aio.AioRpcError:
+                errors += 1
+            i += concurrency
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(caller(w) for w in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        metrics = server.get_metrics()
+    finally:
+        for channel in pool:
+            await channel.close()
+        await server.stop(grace=0)
+
+    p50, p99 = np.percentile(latencies, [50, 99]) if latencies else (0.0, 0.0)
+
+    return LoadTestResult(
+        batch_size=batch_size,
+        batch_timeout_ms=batch_timeout_ms,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        throughput_rps=len(latencies) / elapsed,
+        p50_ms=float(p50),
+        p99_ms=float(p99),
+        avg_batch_size=metrics["avg_batch_size"],
+    )
+
+
+def format_results(results: List[LoadTestResult]) -> str:
+    """Format results as a text table."""
+    lines = [
+        f"{'batch':>6} {'timeout':>8} {'conc':>5} {'req/s':>10} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'avg batch':>10} {'errors':>7}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.batch_size:>6} {r.batch_timeout_ms:>8} {r.concurrency:>5} "
+            f"{r.throughput_rps:>10.0f} {r.p50_ms:>8.2f} {r.p99_ms:>8.2f} "
+            f"{r.avg_batch_size:>10.1f} {r.errors:>7}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_setting(value: str) -> Tuple[int, int]:
+    batch_size, timeout_ms = value.split(":")
+    return int(batch_size), int(timeout_ms)
+
+
+async def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Inference server load test")
+    parser.add_argument("--registry", help="Registry with a champion (default: synthetic)")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--inference-workers", type=int, default=2)
+    parser.add_argument(
+        "--settings",
+        nargs="+",
+        type=_parse_setting,
+        default=DEFAULT_SETTINGS,
+        help="batch_size:batch_timeout_ms pairs",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry_path = args.registry or create_synthetic_registry(f"{tmpdir}/registry")
+
+        results = []
+        for batch_size, timeout_ms in args.settings:
+            results.append(
+                await run_load_test(
+                    registry_path,
+                    batch_size,
+                    timeout_ms,
+                    concurrency=args.concurrency,
+                    duration_seconds=args.duration,
+                    inference_workers=args.inference_workers,
+                )
+            )
+
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
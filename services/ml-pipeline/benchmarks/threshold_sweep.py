@@ -0,0 +1,87 @@
+"""Benchmark for ModelEvaluator threshold sweeps.
+
+Times sweep_thresholds (sort once, binary-search every threshold, plus
+the full ROC/PR curves) against the previous approach of one full
+evaluate() per threshold. The per-threshold approach is only run for a
+few thresholds and extrapolated, since at 50M predictions a 1000-point
+sweep takes hours.
+
+Usage:
+    python -m ml_pipeline.benchmarks.threshold_sweep
+    python -m ml_pipeline.benchmarks.threshold_sweep --rows 50000000 --thresholds 1000
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from ..training.evaluator import ModelEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+def make_predictions(rows: int, fraud_rate: float = 0.02, seed: int = 0):
+    """Generate labels and float32 fraud probabilities."""
+    rng = np.random.default_rng(seed)
+    y_true = (rng.random(rows, dtype=np.float32) < fraud_rate).astype(np.int8)
+    logits = rng.standard_normal(rows, dtype=np.float32) + 2.5 * y_true - 2.0
+    return y_true, (1 / (1 + np.exp(-logits))).astype(np.float32)
+
+
+def run_benchmark(rows: int, n_thresholds: int, legacy_thresholds: int) -> dict:
+    """Time both approaches.
+
+    Args:
+        rows: Number of predictions
+        n_thresholds: Thresholds in the sweep
+        legacy_thresholds: Thresholds actually run per-threshold
+
+    Returns:
+        Dictionary of timings in seconds
+    """
+    y_true, scores = make_predictions(rows)
+    thresholds = np.linspace(0, 1, n_thresholds)
+    evaluator = ModelEvaluator()
+
+    start = time.perf_counter()
+    sweep = evaluator.sweep_thresholds(y_true, scores, thresholds)
+    sweep_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for threshold in thresholds[:: max(1, n_thresholds // legacy_thresholds)][:legacy_thresholds]:
+        evaluator.evaluate(y_true, scores, threshold=threshold)
+    per_threshold = (time.perf_counter() - start) / legacy_thresholds
+
+    return {
+        "rows": rows,
+        "thresholds": n_thresholds,
+        "curve_points": len(sweep.curve_thresholds),
+        "sweep_seconds": sweep_seconds,
+        "per_threshold_seconds": per_threshold,
+        "per_threshold_total_seconds": per_threshold * n_thresholds,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Threshold sweep benchmark")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--thresholds", type=int, default=1000)
+    parser.add_argument("--legacy-thresholds", type=int, default=2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    result = run_benchmark(args.rows, args.thresholds, args.legacy_thresholds)
+    print(
+        f"{result['rows']} predictions, {result['thresholds']} thresholds, "
+        f"{result['curve_points']} curve points\n"
+        f"  sweep_thresholds:       {result['sweep_seconds']:.1f}s\n"
+        f"  evaluate per threshold: {result['per_threshold_seconds']:.1f}s each, "
+        f"~{result['per_threshold_total_seconds']:.0f}s for all (extrapolated)"
+    )
+
+
+if __name__ == "__main__":
+    main()
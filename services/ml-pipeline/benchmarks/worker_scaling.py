@@ -0,0 +1,193 @@
+"""Scaling benchmark for multi-process inference workers.
+
+Scores full batches straight through InferenceWorkerPool for an
+increasing number of worker processes and compares the rows/s against
+the in-process thread executor. The gRPC front-end is left out on
+purpose: a single Python event loop caps unary RPC rate well below what
+the workers can score, so it would hide the scaling being measured.
+
+Usage:
+    python -m ml_pipeline.benchmarks.worker_scaling
+    python -m ml_pipeline.benchmarks.worker_scaling --processes 1 2 4 8 \\
+        --batch-size 256 --duration 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from ..inference_server import InferenceServer
+from ..inference_workers import InferenceWorkerPool
+from .load_test import create_synthetic_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScalingResult:
+    """Result of one scaling run."""
+
+    mode: str
+    workers: int
+    batch_size: int
+    batches: int
+    rows_per_second: float
+    p50_batch_ms: float
+    p99_batch_ms: float
+
+
+async def _drive(score, batch_size: int, concurrency: int, duration_seconds: float):
+    """Run closed-loop batch scorers and collect per-batch latencies."""
+    rng = np.random.default_rng(0)
+    matrix = rng.random((batch_size, 8), dtype=np.float32)
+    mask = np.zeros(batch_size, dtype=bool)
+
+    latencies: List[float] = []
+    stop_at = time.perf_counter() + duration_seconds
+
+    async def scorer():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            await score(matrix, mask)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(scorer() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def _result(mode, workers, batch_size, latencies, elapsed) -> ScalingResult:
+    p50, p99 = np.percentile(latencies, [50, 99]) if latencies else (0.0, 0.0)
+    return ScalingResult(
+        mode=mode,
+        workers=workers,
+        batch_size=batch_size,
+        batches=len(latencies),
+        rows_per_second=len(latencies) * batch_size / elapsed,
+        p50_batch_ms=float(p50),
+        p99_batch_ms=float(p99),
+    )
+
+
+async def run_thread_baseline(
+    registry_path: str, threads: int, batch_size: int, duration_seconds: float = 5.0
+) -> ScalingResult:
+    """Score batches on the in-process inference executor.
+
+    Args:
+        registry_path: Registry with a champion model
+        threads: Inference executor threads
+        batch_size: Rows per batch
+        duration_seconds: How long to run
+
+    Returns:
+        ScalingResult for the thread executor
+    """
+    server = InferenceServer(
+        registry_path=registry_path, port=0, batch_size=batch_size, inference_workers=threads
+    )
+    await server.start_batch_processor()
+    try:
+        latencies, elapsed = await _drive(
+            lambda m, mask: server._score(m, mask), batch_size, threads * 2, duration_seconds
+        )
+    finally:
+        await server.stop_batch_processor()
+    return _result("threads", threads, batch_size, latencies, elapsed)
+
+
+async def run_worker_scaling(
+    registry_path: str,
+    processes: int,
+    batch_size: int,
+    duration_seconds: float = 5.0,
+    slots_per_worker: int = 2,
+) -> ScalingResult:
+    """Score batches on an InferenceWorkerPool.
+
+    Args:
+        registry_path: Registry with a champion model
+        processes: Worker processes
+        batch_size: Rows per batch
+        duration_seconds: How long to run
+        slots_per_worker: Ring slots per worker
+
+    Returns:
+        ScalingResult for this process count
+    """
+    from ..model_registry import ModelRegistry
+
+    _, champion_path = ModelRegistry(registry_path).get_champion()
+    pool = InferenceWorkerPool(processes, batch_size, slots_per_worker=slots_per_worker)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, pool.start, champion_path, None)
+    pool.attach()
+    try:
+        latencies, elapsed = await _drive(
+            pool.score, batch_size, processes * slots_per_worker, duration_seconds
+        )
+    finally:
+        pool.stop()
+    return _result("processes", processes, batch_size, latencies, elapsed)
+
+
+def format_results(results: List[ScalingResult]) -> str:
+    """Format results as a text table with speedup over one worker."""
+    base: Optional[float] = None
+    lines = [
+        f"{'mode':>10} {'workers':>8} {'batch':>6} {'rows/s':>12} {'speedup':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8}"
+    ]
+    for r in results:
+        if r.mode == "processes" and base is None:
+            base = r.rows_per_second
+        speedup = r.rows_per_second / base if base else 1.0
+        lines.append(
+            f"{r.mode:>10} {r.workers:>8} {r.batch_size:>6} {r.rows_per_second:>12.0f} "
+            f"{speedup:>7.2f}x {r.p50_batch_ms:>8.2f} {r.p99_batch_ms:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+async def main():
+    """Main entry point."""
+    cpus = os.cpu_count() or 1
+    default_processes = sorted({1, 2, max(1, cpus // 2), cpus})
+
+    parser = argparse.ArgumentParser(description="Inference worker scaling benchmark")
+    parser.add_argument("--registry", help="Registry with a champion (default: synthetic)")
+    parser.add_argument("--processes", nargs="+", type=int, default=default_processes)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry_path = args.registry or create_synthetic_registry(f"{tmpdir}/registry")
+
+        results = [
+            await run_thread_baseline(
+                registry_path, max(args.processes), args.batch_size, args.duration
+            )
+        ]
+        for processes in args.processes:
+            results.append(
+                await run_worker_scaling(
+                    registry_path, processes, args.batch_size, args.duration
+                )
+            )
+
+    print(f"{cpus} CPUs")
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ class ModelConfig:
 
     # Model paths
     model_registry_path: str = "models/registry"
+    model_registry_backend: Optional[str] = None  # "json", "sqlite" or None (detect)
     active_model_path: str = "models/active/xgboost_masking.json"
 
     # Training parameters
@@ -39,6 +40,12 @@ class InferenceConfig:
     max_workers: int = 10
     batch_size: int = 32
     batch_timeout_ms: int = 10  # Wait max 10ms to fill batch
+    max_stream_in_flight: int = 1024  # Per-PredictStream flow-control window
+    inference_workers: int = 2  # Dedicated XGBoost scoring threads
+    num_processes: int = 0  # Scoring processes (0 = score in-process on threads)
+    registry_poll_seconds: float = 0.0  # Champion hot-swap polling (SQLite registry only)
+    shadow_mode: bool = False  # Challenger scores champion traffic in the background
+    shadow_queue_batches: int = 8  # Shadow batches in flight before shedding
 
     # Feature cache
     cache_enabled: bool = True
@@ -154,6 +161,18 @@ class MLPipelineConfig:
         if env_workers := os.getenv("ML_MAX_WORKERS"):
             config.inference.max_workers = int(env_workers)
 
+        if env_processes := os.getenv("ML_INFERENCE_PROCESSES"):
+            config.inference.num_processes = int(env_processes)
+
+        if env_backend := os.getenv("ML_REGISTRY_BACKEND"):
+            config.model.model_registry_backend = env_backend
+
+        if env_poll := os.getenv("ML_REGISTRY_POLL_SECONDS"):
+            config.inference.registry_poll_seconds = float(env_poll)
+
+        if env_shadow := os.getenv("ML_SHADOW_MODE"):
+            config.inference.shadow_mode = env_shadow.lower() in ("1", "true")
+
         if env_lookback := os.getenv("ML_TRAINING_LOOKBACK_DAYS"):
             config.model.lookback_days = int(env_lookback)
 
@@ -0,0 +1,26 @@
+"""
+Test setup: make the service importable as ml_pipeline
+
+The service is deployed as the ml_pipeline package (see the Dockerfile in
+the README) and its modules use package-relative imports, but this
+directory is named ml-pipeline, which Python can't import. Link it under
+its package name in a temporary directory on sys.path, so `pytest tests/`
+works and spawned worker processes (which inherit sys.path but not
+imported modules) can import it too.
+"""
+import atexit
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+
+PACKAGE = "ml_pipeline"
+
+try:
+    import ml_pipeline  # noqa: F401  (already importable, e.g. installed)
+except ImportError:
+    _link_dir = Path(tempfile.mkdtemp(prefix="ml_pipeline-tests-"))
+    (_link_dir / PACKAGE).symlink_to(Path(__file__).resolve().parent, target_is_directory=True)
+    sys.path.insert(0, str(_link_dir))
+    atexit.register(shutil.rmtree, _link_dir, ignore_errors=True)
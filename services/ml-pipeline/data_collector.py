@@ -4,16 +4,112 @@ Extracts training data from QuestDB time-series and YugabyteDB relational
 databases, prepares features, and creates labeled datasets for model training.
 """
 import asyncio
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 
+from .data_extraction import (
+    CDR_METRICS_QUERY,
+    CDR_METRICS_SCHEMA,
+    FRAUD_LABELS_QUERY,
+    FRAUD_LABELS_SCHEMA,
+    PartitionShardWriter,
+    day_partitions,
+    stream_query,
+)
+from .feature_store import FeatureStore
+
 logger = logging.getLogger(__name__)
 
+# Try to import asyncpg (only needed for extraction_mode="database")
+try:
+    import asyncpg
+
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    asyncpg = None
+
+FEATURE_COLUMNS = [
+    "asr",
+    "aloc",
+    "overlap_ratio",
+    "cli_mismatch",
+    "distinct_a_count",
+    "call_rate",
+    "short_call_ratio",
+    "high_volume_flag",
+    "is_fraud",
+]
+
+# merge_asof tolerance when matching labels to CDRs
+LABEL_MATCH_TOLERANCE = pd.Timedelta("5s")
+
+# Bump when _merge_and_engineer_features changes so stored partitions
+# in the feature store are rebuilt
+FEATURE_SET_VERSION = 2
+
+# Continuous features, stored as float32
+FLOAT_FEATURES = [
+    "asr",
+    "aloc",
+    "overlap_ratio",
+    "distinct_a_count",
+    "call_rate",
+    "short_call_ratio",
+]
+
+# Same threshold as the SIP processor's FeatureExtractor
+HIGH_VOLUME_THRESHOLD = 10
+
+# CDRs matched to labels per vectorized step
+MATCH_CHUNK_ROWS = 1 << 18
+
+
+def check_feature_rows(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Row checks shared by in-memory and external-memory training.
+
+    Args:
+        df: Frame with every column of FEATURE_COLUMNS
+
+    Returns:
+        Tuple of (complete, in_range) boolean row masks
+    """
+    def col(name: str) -> np.ndarray:
+        return df[name].to_numpy()
+
+    def is_flag(name: str) -> np.ndarray:
+        values = col(name)
+        return (values == 0) | (values == 1)
+
+    complete = df.notna().all(axis=1).to_numpy()
+
+    # Validate feature ranges
+    in_range = (
+        (col("asr") >= 0) & (col("asr") <= 100)
+        & (col("aloc") >= 0)
+        & (col("overlap_ratio") >= 0) & (col("overlap_ratio") <= 1)
+        & is_flag("cli_mismatch")
+        & (col("distinct_a_count") >= 0)
+        & (col("call_rate") >= 0)
+        & (col("short_call_ratio") >= 0) & (col("short_call_ratio") <= 1)
+        & is_flag("high_volume_flag")
+        & is_flag("is_fraud")
+    )
+    return complete, in_range
+
+
+def valid_feature_rows(df: pd.DataFrame) -> np.ndarray:
+    """Mask of complete, in-range rows (a ParquetShardIter row_filter)."""
+    complete, in_range = check_feature_rows(df)
+    return complete & in_range
+
 
 @dataclass
 class DataCollectionConfig:
@@ -22,6 +118,9 @@ class DataCollectionConfig:
     # Database connections
     questdb_host: str = "localhost"
     questdb_port: int = 8812
+    questdb_user: str = "admin"
+    questdb_password: str = "quest"
+    questdb_db: str = "qdb"
     yugabyte_host: str = "localhost"
     yugabyte_port: int = 5433
     yugabyte_db: str = "voxguard"
@@ -37,6 +136,13 @@ class DataCollectionConfig:
     window_seconds: int = 5
     min_call_duration: int = 10
 
+    # Extraction: "synthetic" generates data, "database" streams it from
+    # QuestDB and YugabyteDB through server-side cursors
+    extraction_mode: str = "synthetic"
+    fetch_batch_size: int = 50000
+    staging_path: str = ""  # Day-partitioned shards (default: <output_path>/staging)
+    feature_store_path: str = ""  # Reuse engineered days across runs ("" = off)
+
     # Output
     output_path: str = "data/training"
     dataset_version: str = ""
@@ -48,6 +154,10 @@ class DataCollector:
     Features:
     - Extracts CDR metrics from QuestDB time-series
     - Enriches with fraud labels from YugabyteDB
+    - Streams both into day-partitioned Parquet shards and merges one
+      day at a time, so memory does not grow with lookback_days
+    - Reuses complete days from the feature store, so each run only
+      builds the days it has not seen
     - Handles imbalanced datasets with fraud oversampling
     - Validates data quality and feature distributions
     - Exports to Parquet format for efficient training
@@ -65,6 +175,18 @@ class DataCollector:
         self._questdb_conn = None
         self._yugabyte_conn = None
 
+        # Day-partitioned staging shards
+        staging_path = config.staging_path or f"{config.output_path}/staging"
+        self.cdr_shards = PartitionShardWriter(staging_path, "cdr_metrics", CDR_METRICS_SCHEMA)
+        self.label_shards = PartitionShardWriter(
+            staging_path, "fraud_labels", FRAUD_LABELS_SCHEMA
+        )
+
+        # Engineered days reused across runs
+        self.feature_store: Optional[FeatureStore] = (
+            FeatureStore(config.feature_store_path) if config.feature_store_path else None
+        )
+
         # Metrics
         self.total_records_collected = 0
         self.fraud_records = 0
@@ -75,8 +197,17 @@ class DataCollector:
             f"min_samples={config.min_samples}"
         )
 
+    @property
+    def streaming(self) -> bool:
+        """Whether data is streamed from the databases."""
+        return self.config.extraction_mode == "database"
+
     async def connect(self):
         """Connect to databases."""
+        if self.streaming:
+            await self._connect_databases()
+            return
+
         try:
             # In production, these would be actual database connections
             # For now, we'll simulate the connections
@@ -95,6 +226,37 @@ class DataCollector:
             logger.error(f"Failed to connect to databases: {e}")
             raise
 
+    async def _connect_databases(self):
+        """Open asyncpg connections to QuestDB (PG wire) and YugabyteDB."""
+        if not ASYNCPG_AVAILABLE:
+            raise RuntimeError("asyncpg is not installed")
+
+        try:
+            logger.info(f"Connecting to QuestDB at {self.config.questdb_host}:{self.config.questdb_port}")
+            self._questdb_conn = await asyncpg.connect(
+                host=self.config.questdb_host,
+                port=self.config.questdb_port,
+                user=self.config.questdb_user,
+                password=self.config.questdb_password,
+                database=self.config.questdb_db,
+            )
+
+            logger.info(f"Connecting to YugabyteDB at {self.config.yugabyte_host}:{self.config.yugabyte_port}")
+            self._yugabyte_conn = await asyncpg.connect(
+                host=self.config.yugabyte_host,
+                port=self.config.yugabyte_port,
+                user=self.config.yugabyte_user,
+                password=self.config.yugabyte_password,
+                database=self.config.yugabyte_db,
+            )
+
+            logger.info("Database connections established")
+
+        except Exception as e:
+            logger.error(f"Failed to connect to databases: {e}")
+            await self.close()
+            raise
+
     async def collect_training_data(
         self,
         start_date: Optional[datetime] = None,
@@ -117,16 +279,20 @@ class DataCollector:
 
         logger.info(f"Collecting training data from {start_date} to {end_date}")
 
-        # Step 1: Extract CDR metrics from QuestDB
-        cdr_data = await self._extract_cdr_metrics(start_date, end_date)
-        logger.info(f"Extracted {len(cdr_data)} CDR records from QuestDB")
-
-        # Step 2: Extract fraud labels from YugabyteDB
-        fraud_labels = await self._extract_fraud_labels(start_date, end_date)
-        logger.info(f"Extracted {len(fraud_labels)} fraud labels from YugabyteDB")
+        # Steps 1-3 run one day at a time: stream both sources into that
+        # day's shards, then merge the day (or reuse it from the feature
+        # store). Only the engineered feature columns of earlier days are
+        # kept in memory.
+        partitions = [
+            await self._collect_partition(day_start, day_end)
+            for day_start, day_end in day_partitions(start_date, end_date)
+        ]
 
-        # Step 3: Merge and create feature matrix
-        training_df = self._merge_and_engineer_features(cdr_data, fraud_labels)
+        training_df = (
+            pd.concat(partitions, ignore_index=True)
+            if partitions
+            else pd.DataFrame(columns=FEATURE_COLUMNS)
+        )
         logger.info(f"Created feature matrix with {len(training_df)} samples")
 
         # Step 4: Validate data quality
@@ -145,6 +311,160 @@ class DataCollector:
 
         return training_df
 
+    async def backfill(
+        self, start_date: datetime, end_date: datetime, force: bool = False
+    ) -> List[str]:
+        """Build feature store partitions for every full day in a range.
+
+        Args:
+            start_date: First day
+            end_date: End of the range (exclusive)
+            force: Rebuild days that are already stored
+
+        Returns:
+            Dates that were built
+        """
+        if self.feature_store is None:
+            raise RuntimeError("Backfill requires feature_store_path")
+
+        fingerprint = self.feature_fingerprint()
+        built = []
+
+        for day_start, day_end in day_partitions(start_date, end_date):
+            if not self._is_full_day(day_start, day_end):
+                continue
+            if not force and self.feature_store.has_partition(day_start, fingerprint):
+                continue
+
+            await self._stage_partition(day_start, day_end)
+            self.feature_store.write_partition(
+                day_start, self._merge_partition(day_start), fingerprint
+            )
+            built.append(f"{day_start:%Y-%m-%d}")
+
+        logger.info(f"Backfilled {len(built)} feature store partitions")
+        return built
+
+    def feature_fingerprint(self) -> str:
+        """Fingerprint of everything that shapes a stored partition.
+
+        Covers the feature set version, the label rules and the data
+        source, so days generated by synthetic extraction are never
+        reused for database training; stored days built with a
+        different fingerprint are treated as stale.
+        """
+        rules = {
+            "extraction_mode": self.config.extraction_mode,
+            "feature_set_version": FEATURE_SET_VERSION,
+            "feature_columns": FEATURE_COLUMNS,
+            "label_match_tolerance": str(LABEL_MATCH_TOLERANCE),
+            "fraud_label_threshold": self.config.fraud_label_threshold,
+            "window_seconds": self.config.window_seconds,
+            "min_call_duration": self.config.min_call_duration,
+        }
+        digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()
+        return digest[:16]
+
+    @staticmethod
+    def _is_full_day(day_start: datetime, day_end: datetime) -> bool:
+        """Whether a partition window covers a whole calendar day."""
+        midnight = day_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day_start == midnight and day_end == midnight + timedelta(days=1)
+
+    async def _collect_partition(self, day_start: datetime, day_end: datetime) -> pd.DataFrame:
+        """Get one day's engineered features, from the store if possible.
+
+        Only full days are stored; the partial days at either end of the
+        window are always rebuilt.
+        """
+        cacheable = self.feature_store is not None and self._is_full_day(day_start, day_end)
+        fingerprint = self.feature_fingerprint() if cacheable else None
+
+        if cacheable and self.feature_store.has_partition(day_start, fingerprint):
+            day_features = self.feature_store.read_partition(day_start)
+            logger.info(
+                f"Partition {day_start:%Y-%m-%d}: {len(day_features)} samples from feature store"
+            )
+            return day_features
+
+        cdr_rows, label_rows = await self._stage_partition(day_start, day_end)
+        day_features = self._merge_partition(day_start)
+        logger.info(
+            f"Partition {day_start:%Y-%m-%d}: {cdr_rows} CDR records, "
+            f"{label_rows} fraud labels, {len(day_features)} samples"
+        )
+
+        if cacheable:
+            self.feature_store.write_partition(day_start, day_features, fingerprint)
+
+        return day_features
+
+    async def _stage_partition(
+        self, day_start: datetime, day_end: datetime
+    ) -> Tuple[int, int]:
+        """Stream one day of CDR metrics and fraud labels into shards.
+
+        Labels are fetched with LABEL_MATCH_TOLERANCE on both sides so CDRs
+        at the edges of the day can still be matched.
+
+        Returns:
+            Tuple of (CDR rows, label rows) written
+        """
+        cdr_rows = await self.cdr_shards.write_stream(
+            day_start, self._stream_cdr_metrics(day_start, day_end)
+        )
+        label_rows = await self.label_shards.write_stream(
+            day_start,
+            self._stream_fraud_labels(
+                day_start - LABEL_MATCH_TOLERANCE, day_end + LABEL_MATCH_TOLERANCE
+            ),
+        )
+        return cdr_rows, label_rows
+
+    def _merge_partition(self, day: datetime) -> pd.DataFrame:
+        """Merge and engineer features for one staged day."""
+        cdr_data = self.cdr_shards.read(day)
+        fraud_labels = self.label_shards.read(day)
+
+        if cdr_data.empty or fraud_labels.empty:
+            return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+        return self._merge_and_engineer_features(cdr_data, fraud_labels)
+
+    async def _stream_cdr_metrics(
+        self, start_date: datetime, end_date: datetime
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Stream CDR metrics from QuestDB in fetch_batch_size chunks."""
+        if not self.streaming:
+            yield await self._extract_cdr_metrics(start_date, end_date)
+            return
+
+        async for chunk in stream_query(
+            self._questdb_conn,
+            CDR_METRICS_QUERY,
+            start_date,
+            end_date,
+            batch_size=self.config.fetch_batch_size,
+        ):
+            yield chunk
+
+    async def _stream_fraud_labels(
+        self, start_date: datetime, end_date: datetime
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Stream fraud labels from YugabyteDB in fetch_batch_size chunks."""
+        if not self.streaming:
+            yield await self._extract_fraud_labels(start_date, end_date)
+            return
+
+        async for chunk in stream_query(
+            self._yugabyte_conn,
+            FRAUD_LABELS_QUERY,
+            start_date,
+            end_date,
+            batch_size=self.config.fetch_batch_size,
+        ):
+            yield chunk
+
     async def _extract_cdr_metrics(
         self,
         start_date: datetime,
@@ -164,13 +484,21 @@ class DataCollector:
             distinct_a_count,
             call_rate,
             overlap_ratio,
-            short_call_ratio
+            short_call_ratio,
+            has_cli_mismatch
         FROM cdr_metrics
         WHERE timestamp BETWEEN start_date AND end_date
+
+        Reads the whole window into memory; collect_training_data() uses
+        the streaming variant instead.
         """
-        # In production, this would execute actual QuestDB query
-        # For now, generate synthetic data
+        if self.streaming:
+            chunks = [c async for c in self._stream_cdr_metrics(start_date, end_date)]
+            if not chunks:
+                return CDR_METRICS_SCHEMA.empty_table().to_pandas()
+            return pd.concat(chunks, ignore_index=True)
 
+        # Synthetic data when not connected to QuestDB
         logger.info("Executing QuestDB CDR metrics query...")
         await asyncio.sleep(0.5)  # Simulate query time
 
@@ -189,6 +517,7 @@ class DataCollector:
             "call_rate": np.random.uniform(0.1, 3.0, num_samples),
             "overlap_ratio": np.random.uniform(0, 1, num_samples),
             "short_call_ratio": np.random.uniform(0, 0.5, num_samples),
+            "has_cli_mismatch": np.random.choice([False, True], num_samples, p=[0.8, 0.2]),
         }
 
         return pd.DataFrame(data)
@@ -210,10 +539,17 @@ class DataCollector:
             detection_method
         FROM fraud_alerts
         WHERE timestamp BETWEEN start_date AND end_date
+
+        Reads the whole window into memory; collect_training_data() uses
+        the streaming variant instead.
         """
-        # In production, this would execute actual YugabyteDB query
-        # For now, generate synthetic labels
+        if self.streaming:
+            chunks = [c async for c in self._stream_fraud_labels(start_date, end_date)]
+            if not chunks:
+                return FRAUD_LABELS_SCHEMA.empty_table().to_pandas()
+            return pd.concat(chunks, ignore_index=True)
 
+        # Synthetic labels when not connected to YugabyteDB
         logger.info("Executing YugabyteDB fraud labels query...")
         await asyncio.sleep(0.5)  # Simulate query time
 
@@ -256,41 +592,184 @@ class DataCollector:
         5. distinct_a_count - Distinct callers in window
         6. call_rate - Calls per second
         7. short_call_ratio - Ratio of calls < 10 seconds
-        8. high_volume_flag - Binary flag for > 10 calls in 5 seconds
+        8. high_volume_flag - Binary flag for >= 10 distinct callers in 5 seconds
+
+        Labels are matched on integer b_number codes instead of strings,
+        and only the feature columns are materialized: continuous
+        features as float32, flags as int8.
         """
         logger.info("Merging CDR data with fraud labels...")
 
-        # Merge on b_number (approximate time matching)
+        cdr_keys, label_keys = self._encode_b_numbers(
+            cdr_data["b_number"], fraud_labels["b_number"]
+        )
+        match = self._match_labels(
+            cdr_keys,
+            cdr_data["timestamp"].to_numpy(dtype="datetime64[us]"),
+            label_keys,
+            fraud_labels["timestamp"].to_numpy(dtype="datetime64[us]"),
+        )
+
+        # Keep only rows with labels
+        labeled = match >= 0
+        is_fraud = fraud_labels["is_fraud"].to_numpy()[match[labeled]]
+
+        features = {
+            col: cdr_data[col].to_numpy()[labeled].astype(np.float32) for col in FLOAT_FEATURES
+        }
+        features["cli_mismatch"] = self._cli_mismatch(cdr_data)[labeled]
+        features["high_volume_flag"] = (
+            features["distinct_a_count"] >= HIGH_VOLUME_THRESHOLD
+        ).astype(np.int8)
+        features["is_fraud"] = is_fraud.astype(np.int8)
+
+        return pd.DataFrame({col: features[col] for col in FEATURE_COLUMNS})
+
+    @staticmethod
+    def _encode_b_numbers(
+        cdr_numbers: pd.Series, label_numbers: pd.Series
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode both sides' b_numbers as codes over one shared category set.
+
+        Categorical inputs (as read from the staging shards) only have
+        their categories unioned; anything else is factorized once.
+        Missing numbers get -1 and never match.
+        """
+        if isinstance(cdr_numbers.dtype, pd.CategoricalDtype) and isinstance(
+            label_numbers.dtype, pd.CategoricalDtype
+        ):
+            categories = cdr_numbers.cat.categories.union(label_numbers.cat.categories)
+
+            def encode(numbers: pd.Series) -> np.ndarray:
+                mapping = categories.get_indexer(numbers.cat.categories)
+                codes = numbers.cat.codes.to_numpy()
+                return np.where(codes >= 0, mapping[codes], -1).astype(np.int64)
+
+            return encode(cdr_numbers), encode(label_numbers)
+
+        codes, _ = pd.factorize(
+            pd.concat([cdr_numbers.astype(object), label_numbers.astype(object)], ignore_index=True)
+            if isinstance(cdr_numbers.dtype, pd.CategoricalDtype)
+            or isinstance(label_numbers.dtype, pd.CategoricalDtype)
+            else pd.concat([cdr_numbers, label_numbers], ignore_index=True)
+        )
+        return codes[: len(cdr_numbers)], codes[len(cdr_numbers):]
+
+    @staticmethod
+    def _match_labels(
+        cdr_keys: np.ndarray,
+        cdr_times: np.ndarray,
+        label_keys: np.ndarray,
+        label_times: np.ndarray,
+    ) -> np.ndarray:
+        """Find the nearest label for each CDR with the same b_number.
+
+        Same result as merge_asof(by=b_number, direction="nearest",
+        tolerance=LABEL_MATCH_TOLERANCE), computed with sorts and two
+        binary searches over a combined (b_number, time) int64 key.
+
+        Returns:
+            Index into the labels for each CDR, -1 where none matched
+        """
+        match = np.full(len(cdr_keys), -1, dtype=np.int64)
+        if len(cdr_keys) == 0 or len(label_keys) == 0:
+            return match
+
+        cdr_us = cdr_times.view(np.int64)
+        label_us = label_times.view(np.int64)
+        origin = min(cdr_us.min(), label_us.min())
+        tolerance = LABEL_MATCH_TOLERANCE // pd.Timedelta("1us")
+
+        # Leave a gap wider than the tolerance between b_numbers
+        time_bits = int(max(cdr_us.max(), label_us.max()) - origin + tolerance + 1).bit_length()
+        key_bits = int(max(cdr_keys.max(), label_keys.max()) + 1).bit_length()
+        if time_bits + key_bits > 62:
+            # Too many numbers over too long a window for one key
+            return DataCollector._match_labels_asof(cdr_keys, cdr_times, label_keys, label_times)
+
+        def combined(keys: np.ndarray, us: np.ndarray) -> np.ndarray:
+            return (keys << time_bits) | (us - origin)
+
+        label_combined = combined(label_keys, label_us)
+        order = np.argsort(label_combined, kind="stable")
+        labels_sorted = label_combined[order]
+
+        # Searching in sorted order keeps the binary searches cache-friendly
+        rows = np.flatnonzero(cdr_keys >= 0)
+        needle = combined(cdr_keys[rows], cdr_us[rows])
+        needle_order = np.argsort(needle)
+        rows, needle = rows[needle_order], needle[needle_order]
+        del needle_order
+
+        # Chunked so the search temporaries stay small on large partitions
+        for start in range(0, len(needle), MATCH_CHUNK_ROWS):
+            chunk = needle[start:start + MATCH_CHUNK_ROWS]
+            nearest = DataCollector._nearest_within(labels_sorted, chunk, tolerance)
+            matched = nearest >= 0
+            match[rows[start:start + MATCH_CHUNK_ROWS][matched]] = order[nearest[matched]]
+
+        return match
+
+    @staticmethod
+    def _nearest_within(haystack: np.ndarray, needle: np.ndarray, tolerance: int) -> np.ndarray:
+        """Position of the nearest haystack value within tolerance of each needle.
+
+        Ties go to the earlier value, like merge_asof. Returns -1 where
+        nothing is within tolerance.
+        """
+        last = len(haystack) - 1
+        big = np.iinfo(np.int64).max
+
+        # Closest value at or before, and at or after, each needle
+        before = np.searchsorted(haystack, needle, side="right") - 1
+        after = np.searchsorted(haystack, needle, side="left")
+
+        before_gap = needle - haystack[np.maximum(before, 0)]
+        before_gap[before < 0] = big
+        after_gap = haystack[np.minimum(after, last)] - needle
+        after_gap[after > last] = big
+
+        use_before = before_gap <= after_gap
+        nearest = np.where(use_before, before, after)
+        gap = np.where(use_before, before_gap, after_gap)
+
+        nearest[gap > tolerance] = -1
+        return nearest
+
+    @staticmethod
+    def _match_labels_asof(
+        cdr_keys: np.ndarray,
+        cdr_times: np.ndarray,
+        label_keys: np.ndarray,
+        label_times: np.ndarray,
+    ) -> np.ndarray:
+        """_match_labels via merge_asof, for windows the combined key can't hold."""
+        left = pd.DataFrame({"timestamp": cdr_times, "key": cdr_keys, "row": np.arange(len(cdr_keys))})
+        right = pd.DataFrame({
+            "timestamp": label_times,
+            "key": np.where(label_keys >= 0, label_keys, -2),
+            "label": np.arange(len(label_keys)),
+        })
+
         merged = pd.merge_asof(
-            cdr_data.sort_values("timestamp"),
-            fraud_labels.sort_values("timestamp"),
+            left.sort_values("timestamp", kind="stable"),
+            right.sort_values("timestamp", kind="stable"),
             on="timestamp",
-            by="b_number",
-            tolerance=pd.Timedelta("5s"),
+            by="key",
+            tolerance=LABEL_MATCH_TOLERANCE,
             direction="nearest",
         )
 
-        # Engineer additional features
-        merged["cli_mismatch"] = np.random.choice([0, 1], len(merged), p=[0.8, 0.2])
-        merged["high_volume_flag"] = (merged["distinct_a_count"] > 10).astype(int)
-
-        # Select feature columns
-        feature_cols = [
-            "asr",
-            "aloc",
-            "overlap_ratio",
-            "cli_mismatch",
-            "distinct_a_count",
-            "call_rate",
-            "short_call_ratio",
-            "high_volume_flag",
-            "is_fraud",
-        ]
-
-        # Filter to only rows with labels
-        merged = merged.dropna(subset=["is_fraud"])
+        match = np.full(len(cdr_keys), -1, dtype=np.int64)
+        match[merged["row"].to_numpy()] = merged["label"].fillna(-1).to_numpy(dtype=np.int64)
+        return match
 
-        return merged[feature_cols]
+    @staticmethod
+    def _cli_mismatch(cdr_data: pd.DataFrame) -> np.ndarray:
+        """CLI vs P-Asserted-Identity flag as recorded by the SIP processor."""
+        if "has_cli_mismatch" not in cdr_data.columns:
+            return np.zeros(len(cdr_data), dtype=np.int8)
+        return cdr_data["has_cli_mismatch"].fillna(False).to_numpy(dtype=bool).astype(np.int8)
 
     def _validate_and_clean(self, df: pd.DataFrame) -> pd.DataFrame:
         """Validate data quality and clean anomalies.
@@ -300,29 +779,25 @@ class DataCollector:
         - Feature ranges are valid
         - No duplicate records
         - Sufficient samples per class
+
+        All checks are combined into one row mask, so the frame is copied
+        once. Duplicates are found by row hash rather than by comparing
+        float columns.
         """
         logger.info("Validating data quality...")
 
-        # Remove missing values
-        initial_count = len(df)
-        df = df.dropna()
-        logger.info(f"Removed {initial_count - len(df)} rows with missing values")
-
-        # Validate feature ranges
-        df = df[df["asr"].between(0, 100)]
-        df = df[df["aloc"] >= 0]
-        df = df[df["overlap_ratio"].between(0, 1)]
-        df = df[df["cli_mismatch"].isin([0, 1])]
-        df = df[df["distinct_a_count"] >= 0]
-        df = df[df["call_rate"] >= 0]
-        df = df[df["short_call_ratio"].between(0, 1)]
-        df = df[df["high_volume_flag"].isin([0, 1])]
-        df = df[df["is_fraud"].isin([0, 1])]
-
-        # Remove duplicates
-        initial_count = len(df)
-        df = df.drop_duplicates()
-        logger.info(f"Removed {initial_count - len(df)} duplicate rows")
+        complete, in_range = check_feature_rows(df)
+        valid = complete & in_range
+
+        # Identical rows are either all valid or all invalid, so duplicates
+        # can be flagged on the full frame
+        duplicated = pd.util.hash_pandas_object(df, index=False).duplicated().to_numpy()
+
+        logger.info(f"Removed {int((~complete).sum())} rows with missing values")
+        logger.info(f"Removed {int((complete & ~in_range).sum())} rows with out-of-range values")
+        logger.info(f"Removed {int((valid & duplicated).sum())} duplicate rows")
+
+        df = df[valid & ~duplicated]
 
         # Check minimum samples
         fraud_count = (df["is_fraud"] == 1).sum()
@@ -405,6 +880,9 @@ class DataCollector:
     async def close(self):
         """Close database connections."""
         logger.info("Closing database connections")
+        for conn in (self._questdb_conn, self._yugabyte_conn):
+            if conn is not None and hasattr(conn, "close"):
+                await conn.close()
         self._questdb_conn = None
         self._yugabyte_conn = None
 
@@ -414,7 +892,7 @@ class DataCollector:
         Returns:
             Dictionary with collection metrics
         """
-        return {
+        metrics = {
             "total_records": self.total_records_collected,
             "fraud_records": self.fraud_records,
             "non_fraud_records": self.non_fraud_records,
@@ -425,6 +903,13 @@ class DataCollector:
             ),
         }
 
+        if self.feature_store is not None:
+            store_metrics = self.feature_store.get_metrics()
+            metrics["feature_store_hits"] = store_metrics["hits"]
+            metrics["feature_store_misses"] = store_metrics["misses"]
+
+        return metrics
+
 
 async def main():
     """Main entry point for data collection."""
@@ -0,0 +1,219 @@
+"""Streaming extraction of training data into day-partitioned Parquet shards.
+
+Both sources are read through server-side cursors (asyncpg portals) in
+chunks of fetch_batch_size rows and written straight to disk, one
+directory per source and day:
+
+    <staging>/cdr_metrics/date=2026-02-03/part-00000.parquet
+    <staging>/fraud_labels/date=2026-02-03/part-00000.parquet
+
+DataCollector then merges one day at a time, so peak memory is bounded
+by a single day of raw data regardless of the lookback window.
+"""
+import logging
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# QuestDB (PG wire)
+CDR_METRICS_QUERY = """
+SELECT
+    timestamp,
+    b_number,
+    a_number,
+    call_duration,
+    call_status,
+    asr,
+    aloc,
+    distinct_a_count,
+    call_rate,
+    overlap_ratio,
+    short_call_ratio,
+    has_cli_mismatch
+FROM cdr_metrics
+WHERE timestamp >= $1 AND timestamp < $2
+"""
+
+# YugabyteDB
+FRAUD_LABELS_QUERY = """
+SELECT
+    b_number,
+    timestamp,
+    is_fraud,
+    fraud_probability,
+    fraud_type,
+    detection_method
+FROM fraud_alerts
+WHERE timestamp >= $1 AND timestamp < $2
+"""
+
+CDR_METRICS_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us")),
+    ("b_number", pa.string()),
+    ("a_number", pa.string()),
+    ("call_duration", pa.float64()),
+    ("call_status", pa.string()),
+    ("asr", pa.float64()),
+    ("aloc", pa.float64()),
+    ("distinct_a_count", pa.int64()),
+    ("call_rate", pa.float64()),
+    ("overlap_ratio", pa.float64()),
+    ("short_call_ratio", pa.float64()),
+    ("has_cli_mismatch", pa.bool_()),
+])
+
+FRAUD_LABELS_SCHEMA = pa.schema([
+    ("b_number", pa.string()),
+    ("timestamp", pa.timestamp("us")),
+    ("is_fraud", pa.int64()),
+    ("fraud_probability", pa.float64()),
+    ("fraud_type", pa.string()),
+    ("detection_method", pa.string()),
+])
+
+
+def day_partitions(start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into calendar-day windows.
+
+    The first and last windows are clipped to start and end.
+
+    Args:
+        start: Window start
+        end: Window end
+
+    Returns:
+        List of (day_start, day_end) tuples
+    """
+    partitions = []
+    day = datetime(start.year, start.month, start.day, tzinfo=start.tzinfo)
+
+    while day < end:
+        next_day = day + timedelta(days=1)
+        partitions.append((max(day, start), min(next_day, end)))
+        day = next_day
+
+    return partitions
+
+
+async def stream_query(
+    conn, query: str, *args, batch_size: int = 50000
+) -> AsyncIterator[pd.DataFrame]:
+    """Stream a query's result set as DataFrame chunks.
+
+    Uses an asyncpg cursor, so the server holds the result and only
+    batch_size rows are in client memory at a time. Cursors need a
+    transaction; it is read-only in practice and rolled back on error.
+
+    Args:
+        conn: asyncpg connection
+        query: SQL with $n placeholders
+        *args: Query parameters
+        batch_size: Rows per fetch
+
+    Yields:
+        DataFrame per fetched batch
+    """
+    async with conn.transaction():
+        cursor = await conn.cursor(query, *args)
+
+        while True:
+            rows = await cursor.fetch(batch_size)
+            if not rows:
+                break
+
+            yield pd.DataFrame.from_records(
+                [tuple(row.values()) for row in rows], columns=list(rows[0].keys())
+            )
+
+            if len(rows) < batch_size:
+                break
+
+
+class PartitionShardWriter:
+    """Write and read one source's day-partitioned Parquet shards."""
+
+    def __init__(self, root: str, source: str, schema: pa.Schema):
+        """Initialize the writer.
+
+        Args:
+            root: Staging directory
+            source: Source name (subdirectory), e.g. "cdr_metrics"
+            schema: Arrow schema every shard is written with
+        """
+        self.root = Path(root) / source
+        self.source = source
+        self.schema = schema
+
+    def partition_dir(self, day: datetime) -> Path:
+        """Directory holding one day's shards."""
+        return self.root / f"date={day:%Y-%m-%d}"
+
+    def reset(self, day: datetime) -> None:
+        """Remove a day's shards before it is re-extracted."""
+        shutil.rmtree(self.partition_dir(day), ignore_errors=True)
+
+    async def write_stream(self, day: datetime, chunks: AsyncIterator[pd.DataFrame]) -> int:
+        """Write every chunk of a stream as a shard of the day's partition.
+
+        Args:
+            day: Partition day
+            chunks: DataFrame chunks
+
+        Returns:
+            Number of rows written
+        """
+        self.reset(day)
+        partition = self.partition_dir(day)
+        partition.mkdir(parents=True, exist_ok=True)
+
+        rows = 0
+        shard = 0
+        async for chunk in chunks:
+            if chunk.empty:
+                continue
+
+            table = pa.Table.from_pandas(
+                self._normalize(chunk), schema=self.schema, preserve_index=False
+            )
+            pq.write_table(table, partition / f"part-{shard:05d}.parquet")
+
+            rows += len(chunk)
+            shard += 1
+
+        logger.debug(f"Wrote {rows} {self.source} rows for {day:%Y-%m-%d} in {shard} shards")
+        return rows
+
+    def read(self, day: datetime, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read a day's shards into one DataFrame.
+
+        Args:
+            day: Partition day
+            columns: Optional column subset
+
+        Returns:
+            DataFrame (empty, with the schema's columns, if nothing was staged)
+        """
+        partition = self.partition_dir(day)
+        if not partition.exists() or not any(partition.glob("*.parquet")):
+            return self.schema.empty_table().to_pandas()[columns or self.schema.names]
+
+        # Strings come back as categoricals: b_numbers repeat heavily and
+        # the merge encodes them as categories anyway
+        table = pq.read_table(partition, columns=columns, schema=self.schema)
+        return table.to_pandas(strings_to_categorical=True)
+
+    def _normalize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Coerce driver types to what the schema expects."""
+        if "timestamp" in chunk.columns:
+            timestamps = pd.to_datetime(chunk["timestamp"])
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_convert(None)
+            chunk = chunk.assign(timestamp=timestamps)
+        return chunk[self.schema.names]
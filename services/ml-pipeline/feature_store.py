@@ -0,0 +1,294 @@
+"""Local, date-partitioned feature store for training datasets.
+
+Each calendar day of engineered features (the output of
+DataCollector._merge_and_engineer_features, before validation and
+balancing, with duplicate rows removed) is stored as one Parquet file,
+and a manifest records what each file was built from:
+
+    <store>/manifest.json
+    <store>/date=2026-02-03.parquet
+
+A partition is reused only while its fingerprint matches the collector's
+current label rules and feature definitions; changing either makes the
+affected partitions stale, and they are rebuilt on the next collection.
+
+Usage:
+    python -m ml_pipeline.feature_store list --store data/feature_store
+    python -m ml_pipeline.feature_store backfill --start 2026-01-01 --end 2026-02-01
+    python -m ml_pipeline.feature_store invalidate --start 2026-01-20 --end 2026-01-22
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartitionInfo:
+    """Manifest entry for one stored day."""
+
+    date: str  # YYYY-MM-DD
+    rows: int
+    fingerprint: str
+    created_at: str  # ISO 8601 timestamp
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartitionInfo":
+        """Create from dictionary."""
+        return cls(**data)
+
+
+class FeatureStore:
+    """Date-partitioned Parquet store with a JSON manifest."""
+
+    MANIFEST_FILE = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, store_path: str = "data/feature_store"):
+        """Initialize the feature store.
+
+        Args:
+            store_path: Root directory of the store
+        """
+        self.store_path = Path(store_path)
+        self.store_path.mkdir(parents=True, exist_ok=True)
+
+        self.manifest_path = self.store_path / self.MANIFEST_FILE
+        self.partitions: Dict[str, PartitionInfo] = {}
+        self._load_manifest()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def _load_manifest(self) -> None:
+        """Load the manifest, dropping entries whose file is gone."""
+        if not self.manifest_path.exists():
+            return
+
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+
+        for date, entry in manifest.get("partitions", {}).items():
+            if self._partition_file(date).exists():
+                self.partitions[date] = PartitionInfo.from_dict(entry)
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically."""
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "partitions": {
+                date: info.to_dict() for date, info in sorted(self.partitions.items())
+            },
+        }
+
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _partition_file(self, date: str) -> Path:
+        return self.store_path / f"date={date}.parquet"
+
+    @staticmethod
+    def _key(day: datetime) -> str:
+        return day.strftime("%Y-%m-%d")
+
+    def has_partition(self, day: datetime, fingerprint: str) -> bool:
+        """Check whether a day is stored and built with the current rules.
+
+        Args:
+            day: Partition day
+            fingerprint: Current feature/label fingerprint
+
+        Returns:
+            True if the stored partition can be reused
+        """
+        info = self.partitions.get(self._key(day))
+        return info is not None and info.fingerprint == fingerprint
+
+    def read_partition(self, day: datetime) -> pd.DataFrame:
+        """Read one stored day.
+
+        Args:
+            day: Partition day
+
+        Returns:
+            Feature DataFrame for the day
+        """
+        self.hits += 1
+        return pd.read_parquet(self._partition_file(self._key(day)))
+
+    def write_partition(self, day: datetime, df: pd.DataFrame, fingerprint: str) -> None:
+        """Store one day of features, replacing any previous version.
+
+        Duplicate rows are dropped here, once per day, so training from
+        the stored files doesn't have to track rows across passes.
+
+        Args:
+            day: Partition day
+            df: Engineered features for the day
+            fingerprint: Feature/label fingerprint the day was built with
+        """
+        self.misses += 1
+        date = self._key(day)
+        path = self._partition_file(date)
+
+        duplicated = pd.util.hash_pandas_object(df, index=False).duplicated().to_numpy()
+        if duplicated.any():
+            logger.info(f"Partition {date}: dropped {int(duplicated.sum())} duplicate rows")
+            df = df[~duplicated]
+
+        tmp_path = path.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        self.partitions[date] = PartitionInfo(
+            date=date,
+            rows=len(df),
+            fingerprint=fingerprint,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self._save_manifest()
+
+    def invalidate(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fingerprint: Optional[str] = None,
+    ) -> List[str]:
+        """Drop stored partitions so they are rebuilt.
+
+        With no arguments every partition is dropped. start/end limit the
+        range (end exclusive); fingerprint keeps partitions built with
+        that fingerprint and drops the rest (i.e. the stale ones).
+
+        Returns:
+            Dates that were dropped
+        """
+        dropped = []
+        for date, info in list(self.partitions.items()):
+            if start is not None and date < self._key(start):
+                continue
+            if end is not None and date >= self._key(end):
+                continue
+            if fingerprint is not None and info.fingerprint == fingerprint:
+                continue
+
+            self._partition_file(date).unlink(missing_ok=True)
+            del self.partitions[date]
+            dropped.append(date)
+
+        if dropped:
+            self._save_manifest()
+            logger.info(f"Invalidated {len(dropped)} feature store partitions")
+
+        return dropped
+
+    def partition_files(self, start: datetime, end: datetime) -> List[Path]:
+        """Paths of the stored days in [start, end), in date order.
+
+        Used to train straight from the store without loading it.
+        """
+        return [
+            self._partition_file(date)
+            for date in sorted(self.partitions)
+            if self._key(start) <= date < self._key(end)
+        ]
+
+    def list_partitions(self) -> List[PartitionInfo]:
+        """List stored partitions in date order."""
+        return [self.partitions[date] for date in sorted(self.partitions)]
+
+    def get_metrics(self) -> dict:
+        """Get store metrics.
+
+        Returns:
+            Dictionary with store metrics
+        """
+        return {
+            "partitions": len(self.partitions),
+            "rows": sum(p.rows for p in self.partitions.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+async def main():
+    """Feature store CLI."""
+    from .data_collector import DataCollector, DataCollectionConfig
+
+    parser = argparse.ArgumentParser(description="Training feature store")
+    parser.add_argument("--store", default="data/feature_store", help="Feature store path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List stored partitions")
+
+    backfill = commands.add_parser("backfill", help="Build partitions for a date range")
+    backfill.add_argument("--start", type=_parse_date, required=True)
+    backfill.add_argument("--end", type=_parse_date, required=True, help="Exclusive")
+    backfill.add_argument("--force", action="store_true", help="Rebuild stored partitions")
+    backfill.add_argument(
+        "--extraction-mode", default="database", choices=["database", "synthetic"]
+    )
+
+    invalidate = commands.add_parser("invalidate", help="Drop partitions")
+    invalidate.add_argument("--start", type=_parse_date)
+    invalidate.add_argument("--end", type=_parse_date, help="Exclusive")
+    invalidate.add_argument(
+        "--stale", action="store_true",
+        help="Only drop partitions built with other label rules or another extraction mode",
+    )
+    invalidate.add_argument(
+        "--extraction-mode", default="database", choices=["database", "synthetic"],
+        help="Extraction mode the kept partitions were built with (with --stale)",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "list":
+        for info in FeatureStore(args.store).list_partitions():
+            print(f"{info.date}  {info.rows:>10}  {info.fingerprint}  {info.created_at}")
+        return
+
+    collector = DataCollector(
+        DataCollectionConfig(
+            feature_store_path=args.store,
+            extraction_mode=getattr(args, "extraction_mode", "synthetic"),
+        )
+    )
+
+    if args.command == "invalidate":
+        fingerprint = collector.feature_fingerprint() if args.stale else None
+        dropped = collector.feature_store.invalidate(args.start, args.end, fingerprint)
+        print(f"Dropped {len(dropped)} partitions")
+        return
+
+    await collector.connect()
+    try:
+        built = await collector.backfill(args.start, args.end, force=args.force)
+        print(f"Built {len(built)} partitions")
+    finally:
+        await collector.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,24 @@
 """gRPC inference server for real-time ML predictions."""
 import asyncio
 import logging
+import os
+import threading
 import time
+from collections import deque
 from concurrent import futures
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import TYPE_CHECKING, Deque, List, Optional, Dict, Tuple
 
 import grpc
 import numpy as np
 
-from .model_registry import ModelRegistry
+from .inference_workers import InferenceWorkerPool
+from .model_registry import open_registry
 from .ab_testing.traffic_splitter import TrafficSplitter
+from .protos import inference_pb2, inference_pb2_grpc
+
+if TYPE_CHECKING:
+    from .ab_testing.deployment_manager import ABTestDeploymentManager
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +32,7 @@ except ImportError:
     xgb = None
 
 
-# Proto definitions (simplified - in production, generate from .proto file)
+# Internal request/response types; the wire format is protos/inference.proto
 @dataclass
 class PredictionRequest:
     """Request for fraud prediction."""
@@ -44,9 +52,114 @@ class PredictionResponse:
     latency_ms: float
 
 
+class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
+    """gRPC servicer that feeds every RPC through the batch processor."""
+
+    def __init__(self, server: "InferenceServer"):
+        """Initialize the servicer.
+
+        Args:
+            server: Inference server owning the models and request queue
+        """
+        self.server = server
+
+    async def Predict(self, request, context):
+        """Score a single feature vector."""
+        response = await self.server.submit(self._from_proto(request))
+        return self._to_proto(response, request.request_id)
+
+    async def PredictBatch(self, request, context):
+        """Score a batch, answering in request order."""
+        responses = await asyncio.gather(
+            *(self.server.submit(self._from_proto(r)) for r in request.requests)
+        )
+        return inference_pb2.BatchPredictionResponse(
+            responses=[
+                self._to_proto(response, r.request_id)
+                for r, response in zip(request.requests, responses)
+            ]
+        )
+
+    async def PredictStream(self, request_iterator, context):
+        """Score requests from a bidirectional stream as they complete.
+
+        Requests from the stream join the shared batch queue, so one stream
+        is batched together with everything else. At most
+        max_stream_in_flight requests per stream are outstanding; past that
+        the server stops reading and HTTP/2 flow control pushes back.
+        """
+        pending = set()
+        reader = None
+        exhausted = False
+
+        async def score(request):
+            response = await self.server.submit(self._from_proto(request))
+            return self._to_proto(response, request.request_id)
+
+        try:
+            while True:
+                if (
+                    reader is None
+                    and not exhausted
+                    and len(pending) < self.server.max_stream_in_flight
+                ):
+                    reader = asyncio.ensure_future(request_iterator.__anext__())
+
+                waiting = pending | {reader} if reader else pending
+                if not waiting:
+                    break
+
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if reader in done:
+                    try:
+                        pending.add(asyncio.ensure_future(score(reader.result())))
+                    except StopAsyncIteration:
+                        exhausted = True
+                    reader = None
+
+                for task in done & pending:
+                    pending.discard(task)
+                    yield task.result()
+        finally:
+            if reader:
+                reader.cancel()
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _from_proto(request) -> PredictionRequest:
+        return PredictionRequest(
+            features=list(request.features),
+            request_id=request.request_id,
+            model_version=request.model_version or None,
+        )
+
+    @staticmethod
+    def _to_proto(response: PredictionResponse, request_id: str):
+        return inference_pb2.PredictionResponse(
+            is_fraud=response.is_fraud,
+            probability=response.probability,
+            model_version=response.model_version,
+            latency_ms=response.latency_ms,
+            request_id=request_id,
+        )
+
+
 class InferenceServer:
     """gRPC server for real-time model inference."""
 
+    # HTTP/2 keepalive so idle pooled client channels stay connected
+    GRPC_OPTIONS = [
+        ("grpc.keepalive_time_ms", 30000),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_ping_interval_without_data_ms", 10000),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
     def __init__(
         self,
         registry_path: str = "models/registry",
@@ -56,6 +169,12 @@ class InferenceServer:
         batch_size: int = 32,
         batch_timeout_ms: int = 10,
         enable_ab_testing: bool = False,
+        max_stream_in_flight: int = 1024,
+        inference_workers: int = 2,
+        registry_poll_seconds: float = 0.0,
+        shadow_mode: bool = False,
+        shadow_queue_batches: int = 8,
+        ab_deployment: Optional["ABTestDeploymentManager"] = None,
     ):
         """Initialize the inference server.
 
@@ -67,6 +186,18 @@ class InferenceServer:
             batch_size: Batch size for inference
             batch_timeout_ms: Max wait time to fill batch
             enable_ab_testing: Enable A/B testing
+            max_stream_in_flight: Max outstanding requests per PredictStream
+            inference_workers: Threads in the dedicated inference executor;
+                also the number of batches that can be scored concurrently
+            registry_poll_seconds: How often to check the registry for a new
+                champion and hot-swap it (0 = never). Needs the SQLite
+                registry backend, whose champion lookup is cached.
+            shadow_mode: Answer every request with the champion and score
+                the same batches with the challenger in the background
+            shadow_queue_batches: Shadow batches queued or running before
+                new ones are dropped
+            ab_deployment: Deployment manager fed with the paired champion
+                and challenger predictions from shadow mode
         """
         if not XGBOOST_AVAILABLE:
             raise RuntimeError("XGBoost is not installed")
@@ -76,9 +207,13 @@ class InferenceServer:
         self.max_workers = max_workers
         self.batch_size = batch_size
         self.batch_timeout_ms = batch_timeout_ms / 1000.0  # Convert to seconds
+        self.max_stream_in_flight = max_stream_in_flight
+        self.inference_workers = max(1, inference_workers)
 
         # Model registry
-        self.registry = ModelRegistry(registry_path)
+        self.registry = open_registry(registry_path)
+        self.registry_poll_seconds = registry_poll_seconds
+        self.registry_watch_task: Optional[asyncio.Task] = None
 
         # Load champion model
         champion = self.registry.get_champion()
@@ -96,15 +231,41 @@ class InferenceServer:
         self.challenger_model: Optional[xgb.Booster] = None
         self.challenger_id: Optional[str] = None
 
-        # Batching
-        self.request_queue: asyncio.Queue = asyncio.Queue()
+        # Shadow mode: a single background thread scores the challenger on
+        # batches the champion already answered. Slots bound its queue;
+        # batches that find no free slot are dropped, never waited on.
+        self.shadow_mode = shadow_mode
+        self.shadow_queue_batches = max(1, shadow_queue_batches)
+        self.ab_deployment = ab_deployment
+        self.shadow_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._shadow_slots = threading.BoundedSemaphore(self.shadow_queue_batches)
+        self._shadow_model: Optional[Tuple[xgb.Booster, xgb.Booster]] = None
+
+        # Batching: submit() appends to request_queue and resolves _wakeup
+        # once the batcher has what it is waiting for (no polling, no
+        # per-item tasks)
+        self.request_queue: Deque[Tuple[PredictionRequest, asyncio.Future]] = deque()
         self.batch_processor_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Future] = None
+        self._wake_at = 1
+        self._inference_slots: Optional[asyncio.Semaphore] = None
+        self._inflight_batches: set = set()
+
+        # Created by start_batch_processor(); see there
+        self.inference_executor: Optional[futures.ThreadPoolExecutor] = None
+
+        # gRPC
+        self.grpc_server: Optional[grpc.aio.Server] = None
+        self.bound_port: Optional[int] = None
 
         # Metrics
         self.total_requests = 0
         self.champion_requests = 0
         self.challenger_requests = 0
         self.total_latency_ms = 0.0
+        self.total_batches = 0
+        self.shadow_requests = 0
+        self.shadow_dropped = 0
 
     def set_challenger_model(self, model_id: str) -> bool:
         """Set a challenger model for A/B testing.
@@ -132,44 +293,32 @@ class InferenceServer:
         logger.info(f"Set challenger model: {model_id} (10% traffic)")
         return True
 
-    def predict(self, features: np.ndarray) -> tuple[np.ndarray, str]:
-        """Make prediction with the appropriate model.
+    async def handle_request(
+        self, request: PredictionRequest
+    ) -> PredictionResponse:
+        """Score a single request right away, without the batcher.
+
+        Takes the batch path with a batch of one, so model assignment
+        (sticky per request_id), shadow mode and metrics are the same as
+        for submit(). Needs start_batch_processor(), which creates the
+        executors (and the worker pool of MultiProcessInferenceServer).
 
         Args:
-            features: Feature array of shape (n_samples, 8)
+            request: Prediction request
 
         Returns:
-            Tuple of (probabilities, model_id)
+            Prediction response
         """
-        # A/B testing: decide which model to use
-        if (
-            self.enable_ab_testing
-            and self.traffic_splitter
-            and self.challenger_model
-        ):
-            use_challenger = self.traffic_splitter.should_use_model_b()
-
-            if use_challenger:
-                self.challenger_requests += 1
-                dmatrix = xgb.DMatrix(features)
-                proba = self.challenger_model.predict(dmatrix)
-                return proba, self.challenger_id
-            else:
-                self.champion_requests += 1
-                dmatrix = xgb.DMatrix(features)
-                proba = self.champion_model.predict(dmatrix)
-                return proba, self.champion_id
-        else:
-            # Use champion only
-            self.champion_requests += 1
-            dmatrix = xgb.DMatrix(features)
-            proba = self.champion_model.predict(dmatrix)
-            return proba, self.champion_id
+        start_time = time.time()
 
-    async def handle_request(
-        self, request: PredictionRequest
-    ) -> PredictionResponse:
-        """Handle a single prediction request.
+        response = (await self._predict([request]))[0]
+
+        response.latency_ms = (time.time() - start_time) * 1000
+        self.total_latency_ms += response.latency_ms
+        return response
+
+    async def submit(self, request: PredictionRequest) -> PredictionResponse:
+        """Queue a request for the batch processor and wait for its result.
 
         Args:
             request: Prediction request
@@ -178,76 +327,252 @@ class InferenceServer:
             Prediction response
         """
         start_time = time.time()
+        future = asyncio.get_running_loop().create_future()
+        self.request_queue.append((request, future))
+        if len(self.request_queue) >= self._wake_at:
+            self._wake()
+
+        response = await future
+        response.latency_ms = (time.time() - start_time) * 1000
+        self.total_latency_ms += response.latency_ms
+        return response
+
+    def _wake(self) -> None:
+        """Wake the batch processor if it is waiting."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _wait_for_requests(self, count: int, timeout: Optional[float] = None) -> None:
+        """Wait until at least count requests are queued or timeout expires."""
+        if len(self.request_queue) >= count:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._wake_at = count
+        self._wakeup = loop.create_future()
+        timer = loop.call_later(timeout, self._wake) if timeout is not None else None
+        try:
+            await self._wakeup
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._wakeup = None
+            self._wake_at = 1
+
+    async def batch_processor(self):
+        """Assemble adaptive batches and score them on the inference executor.
+
+        Blocks until a request arrives and an inference slot is free. If
+        other batches are still being scored, waits at most
+        batch_timeout_ms for the batch to fill up to batch_size; if the
+        executor is idle, dispatches what is queued right away so a lone
+        request never pays the batching delay. Under load requests pile up
+        while the executor is busy, so batches grow on their own.
+        """
+        self._inference_slots = asyncio.Semaphore(self.inference_workers)
+
+        while True:
+            await self._wait_for_requests(1)
+            await self._inference_slots.acquire()
+
+            if len(self.request_queue) < self.batch_size and self._inflight_batches:
+                await self._wait_for_requests(self.batch_size, self.batch_timeout_ms)
+
+            batch = [
+                self.request_queue.popleft()
+                for _ in range(min(self.batch_size, len(self.request_queue)))
+            ]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight_batches.add(task)
+            task.add_done_callback(self._inflight_batches.discard)
+
+    async def _run_batch(self, batch: List[Tuple[PredictionRequest, asyncio.Future]]):
+        """Score one batch off the event loop and resolve its futures."""
+        try:
+            batch = [(r, f) for r, f in batch if not f.done()]
+            if not batch:
+                return
+
+            responses = await self._predict([r for r, _ in batch])
+
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
 
-        # Convert features to numpy array
-        features = np.array([request.features])
+        except Exception as e:
+            logger.error(f"Batch inference failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._inference_slots.release()
 
-        # Make prediction
-        proba, model_id = self.predict(features)
-        probability = float(proba[0])
+    async def _predict(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """Assign, score and count one batch; queue it for shadow scoring.
 
-        # Calculate latency
-        latency_ms = (time.time() - start_time) * 1000
+        Responses carry latency_ms=0.0; callers fill in their own.
+        """
+        features = [r.features for r in requests]
+        use_challenger = self.assign_models(requests)
+
+        start = time.perf_counter()
+        proba, model_ids = await self._score(features, use_challenger)
+        score_ms = (time.perf_counter() - start) * 1000
+
+        self.total_batches += 1
+        self.total_requests += len(requests)
+        n_challenger = int(np.count_nonzero(use_challenger))
+        self.challenger_requests += n_challenger
+        self.champion_requests += len(requests) - n_challenger
+
+        # Only queues work for the shadow thread, so responses are not delayed
+        if self.shadow_mode:
+            self._submit_shadow(features, proba, score_ms)
+
+        return [
+            PredictionResponse(
+                is_fraud=float(probability) >= 0.7,
+                probability=float(probability),
+                model_version=model_id,
+                latency_ms=0.0,
+            )
+            for probability, model_id in zip(proba, model_ids)
+        ]
+
+    def assign_models(self, requests: List[PredictionRequest]) -> np.ndarray:
+        """Decide per request whether the challenger scores it.
 
-        # Update metrics
-        self.total_requests += 1
-        self.total_latency_ms += latency_ms
+        Args:
+            requests: Requests in the batch
 
-        return PredictionResponse(
-            is_fraud=probability >= 0.7,
-            probability=probability,
-            model_version=model_id,
-            latency_ms=latency_ms,
+        Returns:
+            Boolean mask, True where the challenger model should be used
+        """
+        if self.shadow_mode or not (self.enable_ab_testing and self.traffic_splitter and self.challenger_model):
+            return np.zeros(len(requests), dtype=bool)
+
+        return self.traffic_splitter.assign_batch([r.request_id for r in requests])
+
+    async def _score(
+        self, features: List[List[float]], use_challenger: np.ndarray
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Score a batch on the inference executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.inference_executor, self.score_batch, features, use_challenger
         )
 
-    async def batch_processor(self):
-        """Process requests in batches for efficiency."""
-        while True:
-            batch = []
-            futures_list = []
-
-            # Collect batch with timeout
-            timeout = time.time() + self.batch_timeout_ms
-
-            while len(batch) < self.batch_size and time.time() < timeout:
-                try:
-                    request, future = await asyncio.wait_for(
-                        self.request_queue.get(), timeout=0.001
-                    )
-                    batch.append(request)
-                    futures_list.append(future)
-                except asyncio.TimeoutError:
-                    break
+    @staticmethod
+    def _to_matrix(features: List[List[float]]) -> np.ndarray:
+        """Convert feature rows to a float32 matrix, validating the width."""
+        matrix = np.asarray(features, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != 8:
+            raise ValueError(f"Expected feature rows of length 8, got shape {matrix.shape}")
+        return matrix
 
-            if not batch:
-                await asyncio.sleep(0.001)
-                continue
+    def score_batch(
+        self, features: List[List[float]], use_challenger: np.ndarray
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Score a batch split across champion and challenger.
 
-            # Process batch
-            start_time = time.time()
+        Runs on the inference executor.
 
-            features = np.array([req.features for req in batch])
-            proba, model_id = self.predict(features)
+        Args:
+            features: One 8-feature vector per request
+            use_challenger: Boolean mask from assign_models()
 
-            latency_ms = (time.time() - start_time) * 1000
+        Returns:
+            Tuple of (probabilities, model_id per request)
+        """
+        matrix = self._to_matrix(features)
 
-            # Set results
-            for i, future in enumerate(futures_list):
-                response = PredictionResponse(
-                    is_fraud=float(proba[i]) >= 0.7,
-                    probability=float(proba[i]),
-                    model_version=model_id,
-                    latency_ms=latency_ms / len(batch),
-                )
-                if not future.cancelled():
-                    future.set_result(response)
+        # Take references once so a concurrent model swap can't split a batch
+        champion_model, champion_id = self.champion_model, self.champion_id
+        challenger_model, challenger_id = self.challenger_model, self.challenger_id
+
+        proba = np.empty(len(matrix), dtype=np.float32)
+        model_ids = [champion_id] * len(matrix)
 
-            # Update metrics
-            self.total_requests += len(batch)
-            self.total_latency_ms += latency_ms
+        champion_rows = ~use_challenger
+        if champion_rows.any():
+            proba[champion_rows] = champion_model.predict(xgb.DMatrix(matrix[champion_rows]))
+
+        if use_challenger.any():
+            proba[use_challenger] = challenger_model.predict(xgb.DMatrix(matrix[use_challenger]))
+            for i in np.flatnonzero(use_challenger):
+                model_ids[i] = challenger_id
+
+        return proba, model_ids
+
+    def _submit_shadow(
+        self, features: List[List[float]], champion_proba: np.ndarray, champion_ms: float
+    ) -> None:
+        """Queue a champion-scored batch for challenger scoring, or shed it.
+
+        Sheds the batch when requests are backing up for the primary path
+        or every shadow slot is taken, so shadow work never competes with
+        live traffic for queueing.
+        """
+        challenger_model = self.challenger_model
+        if challenger_model is None or self.shadow_executor is None:
+            return
+
+        if len(self.request_queue) >= self.batch_size or not self._shadow_slots.acquire(blocking=False):
+            self.shadow_dropped += len(features)
+            return
+
+        try:
+            self.shadow_executor.submit(
+                self._score_shadow, challenger_model, features, champion_proba, champion_ms
+            )
+        except RuntimeError:  # Executor shut down
+            self._shadow_slots.release()
+
+    def _score_shadow(
+        self,
+        challenger_model: "xgb.Booster",
+        features: List[List[float]],
+        champion_proba: np.ndarray,
+        champion_ms: float,
+    ) -> None:
+        """Score a batch with the challenger and record the pair.
+
+        Runs on the single shadow thread, with a single-threaded copy of
+        the challenger so it takes at most one core from live scoring.
+        """
+        try:
+            if self._shadow_model is None or self._shadow_model[0] is not challenger_model:
+                booster = challenger_model.copy()
+                booster.set_param({"nthread": 1})
+                self._shadow_model = (challenger_model, booster)
+
+            start = time.perf_counter()
+            proba = self._shadow_model[1].predict(xgb.DMatrix(self._to_matrix(features)))
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            self.shadow_requests += len(proba)
+            if self.ab_deployment is not None:
+                self.ab_deployment.record_paired_predictions(
+                    champion_proba, proba, champion_ms, latency_ms
+                )
+        except Exception as e:
+            logger.error(f"Shadow scoring failed: {e}")
+        finally:
+            self._shadow_slots.release()
 
     async def start_batch_processor(self):
         """Start the batch processing task."""
+        # XGBoost releases the GIL, so scoring on these threads keeps the
+        # event loop free to accept RPCs and assemble the next batch
+        if self.inference_executor is None:
+            self.inference_executor = futures.ThreadPoolExecutor(
+                max_workers=self.inference_workers, thread_name_prefix="inference"
+            )
+        if self.shadow_mode and self.shadow_executor is None:
+            self._shadow_slots = threading.BoundedSemaphore(self.shadow_queue_batches)
+            self.shadow_executor = futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="shadow"
+            )
         self.batch_processor_task = asyncio.create_task(self.batch_processor())
         logger.info("Batch processor started")
 
@@ -259,8 +584,26 @@ class InferenceServer:
                 await self.batch_processor_task
             except asyncio.CancelledError:
                 pass
+            self.batch_processor_task = None
+
+            if self._inflight_batches:
+                await asyncio.gather(*self._inflight_batches, return_exceptions=True)
+
+            while self.request_queue:
+                _, future = self.request_queue.popleft()
+                if not future.done():
+                    future.set_exception(RuntimeError("Inference server stopped"))
+
             logger.info("Batch processor stopped")
 
+        if self.inference_executor is not None:
+            self.inference_executor.shutdown(wait=False)
+            self.inference_executor = None
+
+        if self.shadow_executor is not None:
+            self.shadow_executor.shutdown(wait=False, cancel_futures=True)
+            self.shadow_executor = None
+
     def get_metrics(self) -> Dict[str, float]:
         """Get server metrics.
 
@@ -276,6 +619,13 @@ class InferenceServer:
             "champion_requests": self.champion_requests,
             "challenger_requests": self.challenger_requests,
             "avg_latency_ms": avg_latency,
+            "total_batches": self.total_batches,
+            "avg_batch_size": (
+                self.total_requests / self.total_batches if self.total_batches > 0 else 0.0
+            ),
+            "queue_depth": len(self.request_queue),
+            "shadow_requests": self.shadow_requests,
+            "shadow_dropped": self.shadow_dropped,
             "champion_traffic_pct": (
                 self.champion_requests / self.total_requests * 100
                 if self.total_requests > 0
@@ -285,19 +635,90 @@ class InferenceServer:
 
         return metrics
 
+    async def start(self) -> int:
+        """Start the gRPC server and the batch processor.
+
+        Returns:
+            Port the server is listening on (useful when port=0)
+        """
+        self.grpc_server = grpc.aio.server(
+            futures.ThreadPoolExecutor(max_workers=self.max_workers),
+            options=self.GRPC_OPTIONS,
+        )
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(self), self.grpc_server
+        )
+        self.bound_port = self.grpc_server.add_insecure_port(f"{self.host}:{self.port}")
+
+        await self.start_batch_processor()
+        await self.grpc_server.start()
+
+        if self.registry_poll_seconds > 0:
+            self.registry_watch_task = asyncio.create_task(self.watch_registry())
+
+        logger.info(f"Inference server listening on {self.host}:{self.bound_port}")
+        return self.bound_port
+
+    async def stop(self, grace: float = 5.0):
+        """Stop the gRPC server, letting in-flight RPCs finish.
+
+        Args:
+            grace: Seconds to wait for in-flight RPCs
+        """
+        if self.registry_watch_task:
+            self.registry_watch_task.cancel()
+            try:
+                await self.registry_watch_task
+            except asyncio.CancelledError:
+                pass
+            self.registry_watch_task = None
+
+        if self.grpc_server:
+            await self.grpc_server.stop(grace)
+            self.grpc_server = None
+        await self.stop_batch_processor()
+
+    async def watch_registry(self):
+        """Poll the registry and hot-swap the champion when it changes."""
+        if not hasattr(self.registry, "changes_since"):
+            logger.warning("Registry polling needs the SQLite registry backend; disabled")
+            return
+
+        while True:
+            await asyncio.sleep(self.registry_poll_seconds)
+            try:
+                champion = self.registry.get_champion()
+                if champion and champion[0] != self.champion_id:
+                    await self._swap_champion(*champion)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Registry poll failed: {e}")
+
+    async def _swap_champion(self, model_id: str, model_path: str) -> None:
+        """Load a new champion off the event loop and switch to it."""
+        booster = await asyncio.to_thread(self._load_booster, model_path)
+        self.champion_model, self.champion_id = booster, model_id
+        logger.info(f"Switched to new champion model: {model_id}")
+
+    @staticmethod
+    def _load_booster(model_path: str):
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        return booster
+
     async def serve(self):
         """Start the gRPC server."""
         logger.info(f"Starting inference server on {self.host}:{self.port}")
         logger.info(f"Champion model: {self.champion_id}")
 
-        if self.enable_ab_testing and self.challenger_id:
+        if self.shadow_mode and self.challenger_id:
+            logger.info(f"Challenger model: {self.challenger_id} (shadow)")
+        elif self.enable_ab_testing and self.challenger_id:
             logger.info(f"Challenger model: {self.challenger_id} (10% traffic)")
 
-        # Start batch processor
-        await self.start_batch_processor()
+        await self.start()
 
-        # In production, this would be a real gRPC server
-        # For now, we'll keep the server running
         try:
             while True:
                 await asyncio.sleep(60)
@@ -308,14 +729,150 @@ class InferenceServer:
                 )
         except asyncio.CancelledError:
             logger.info("Server shutting down")
-            await self.stop_batch_processor()
+            await self.stop()
+
+
+class MultiProcessInferenceServer(InferenceServer):
+    """Inference server that scores batches on a pool of worker processes.
+
+    The event loop still accepts RPCs and assembles batches; scoring moves
+    to InferenceWorkerPool, where each process holds its own Boosters and
+    reads batches from a shared-memory ring. This sidesteps the parts of
+    DMatrix construction and prediction that hold the GIL, so throughput
+    scales with cores instead of topping out at one.
+    """
+
+    def __init__(
+        self,
+        registry_path: str = "models/registry",
+        num_processes: int = 2,
+        slots_per_process: int = 2,
+        **kwargs,
+    ):
+        """Initialize the server.
+
+        Args:
+            registry_path: Path to model registry
+            num_processes: Number of scoring processes
+            slots_per_process: Batches each process can have in flight
+            **kwargs: Passed through to InferenceServer
+        """
+        kwargs["inference_workers"] = num_processes * slots_per_process
+        super().__init__(registry_path=registry_path, **kwargs)
+
+        self.num_processes = num_processes
+        self.slots_per_process = slots_per_process
+        self.worker_pool: Optional[InferenceWorkerPool] = None
+
+    def set_challenger_model(self, model_id: str) -> bool:
+        """Set a challenger model for A/B testing.
+
+        Once the workers are running, the challenger only starts receiving
+        traffic after every worker has loaded it.
+
+        Args:
+            model_id: Model ID from registry
+
+        Returns:
+            True if successful (or, with workers running, scheduled)
+        """
+        if self.worker_pool is None:
+            return super().set_challenger_model(model_id)
+
+        model_path = self.registry.get_model_path(model_id)
+        if not model_path:
+            logger.error(f"Model {model_id} not found in registry")
+            return False
+
+        asyncio.get_running_loop().create_task(self._push_challenger(model_id, model_path))
+        return True
+
+    async def _push_challenger(self, model_id: str, model_path: str) -> None:
+        """Load a challenger into every worker, then route traffic to it."""
+        try:
+            await self.worker_pool.load_models(self._model_path(self.champion_id), model_path)
+        except Exception as e:
+            logger.error(f"Failed to load challenger {model_id} into workers: {e}")
+            return
+        super().set_challenger_model(model_id)
+
+    async def _swap_champion(self, model_id: str, model_path: str) -> None:
+        """Load a new champion into every worker, then switch to it."""
+        if self.worker_pool is None:
+            return await super()._swap_champion(model_id, model_path)
+
+        challenger_path = self._model_path(self.challenger_id) if self.challenger_id else None
+        await self.worker_pool.load_models(model_path, challenger_path)
+        await super()._swap_champion(model_id, model_path)
+
+    async def _score(
+        self, features: List[List[float]], use_challenger: np.ndarray
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Score a batch on the worker pool."""
+        matrix = self._to_matrix(features)
+        champion_id, challenger_id = self.champion_id, self.challenger_id
+
+        proba = await self.worker_pool.score(matrix, use_challenger)
+
+        model_ids = [champion_id] * len(matrix)
+        for i in np.flatnonzero(use_challenger):
+            model_ids[i] = challenger_id
+        return proba, model_ids
+
+    async def start_batch_processor(self):
+        """Start the worker processes and the batch processing task."""
+        if self.worker_pool is None:
+            self.worker_pool = InferenceWorkerPool(
+                num_workers=self.num_processes,
+                batch_size=self.batch_size,
+                slots_per_worker=self.slots_per_process,
+            )
+            challenger_path = (
+                self._model_path(self.challenger_id) if self.challenger_id else None
+            )
+            # Spawning and loading models blocks; keep the loop responsive
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.worker_pool.start,
+                self._model_path(self.champion_id),
+                challenger_path,
+            )
+            self.worker_pool.attach()
+
+        self.batch_processor_task = asyncio.create_task(self.batch_processor())
+        logger.info(f"Batch processor started with {self.num_processes} worker processes")
+
+    async def stop_batch_processor(self):
+        """Stop the batch processing task and the worker processes."""
+        await super().stop_batch_processor()
+
+        if self.worker_pool is not None:
+            self.worker_pool.stop()
+            self.worker_pool = None
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Get server metrics, including worker pool state.
+
+        Returns:
+            Metrics dictionary
+        """
+        metrics = super().get_metrics()
+        metrics["worker_processes"] = self.worker_pool.live_workers if self.worker_pool else 0
+        return metrics
+
+    def _model_path(self, model_id: str) -> str:
+        """Resolve a model ID to its file in the registry."""
+        model_path = self.registry.get_model_path(model_id)
+        if not model_path:
+            raise RuntimeError(f"Model {model_id} not found in registry")
+        return model_path
 
 
 async def main():
     """Main entry point."""
     logging.basicConfig(level=logging.INFO)
 
-    server = InferenceServer(
+    server_kwargs = dict(
         registry_path="models/registry",
         host="0.0.0.0",
         port=50051,
@@ -323,8 +880,16 @@ async def main():
         batch_size=32,
         batch_timeout_ms=10,
         enable_ab_testing=False,
+        registry_poll_seconds=float(os.getenv("ML_REGISTRY_POLL_SECONDS", "0")),
+        shadow_mode=os.getenv("ML_SHADOW_MODE", "").lower() in ("1", "true"),
     )
 
+    num_processes = int(os.getenv("ML_INFERENCE_PROCESSES", "0"))
+    if num_processes > 0:
+        server = MultiProcessInferenceServer(num_processes=num_processes, **server_kwargs)
+    else:
+        server = InferenceServer(**server_kwargs)
+
     await server.serve()
 
 
@@ -0,0 +1,535 @@
+"""Multi-process XGBoost scoring over shared-memory ring buffers.
+
+The front-end process (InferenceServer) assembles batches; each worker
+process holds its own champion and challenger Booster and scores batches
+written into its shared-memory ring. Only slot numbers travel over the
+per-worker pipe, feature rows and probabilities never get pickled.
+
+Layout of one worker's ring (slots x batch_size rows):
+
+    rows  float32[slots, batch_size, 8]   feature rows
+    mask  bool[slots, batch_size]         True = score with challenger
+    proba float32[slots, batch_size]      probabilities written back
+
+Model files are read once by the front-end and published in their own
+shared-memory block, which every worker loads its Booster from.
+
+A worker that dies is respawned on the same ring with the current
+models; until it is back, callers wait for a slot on the live workers.
+
+This module is imported by the spawned workers, so it deliberately
+imports nothing beyond NumPy and XGBoost.
+"""
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 8
+
+# Worker pipe messages
+MSG_SCORE = "score"
+MSG_LOAD = "load"
+MSG_STOP = "stop"
+MSG_DONE = "done"
+MSG_READY = "ready"
+MSG_ERROR = "error"
+
+# Attempts to bring a dead worker back before leaving it out of rotation
+RESPAWN_ATTEMPTS = 3
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def _ring_views(
+    buf, slots: int, batch_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Map the rows/mask/proba arrays onto a ring's shared buffer."""
+    rows = np.ndarray((slots, batch_size, N_FEATURES), dtype=np.float32, buffer=buf)
+    mask_offset = rows.nbytes
+    mask = np.ndarray((slots, batch_size), dtype=np.bool_, buffer=buf, offset=mask_offset)
+    proba_offset = _align(mask_offset + mask.nbytes)
+    proba = np.ndarray((slots, batch_size), dtype=np.float32, buffer=buf, offset=proba_offset)
+    return rows, mask, proba
+
+
+def _ring_nbytes(slots: int, batch_size: int) -> int:
+    """Size in bytes of one worker's ring."""
+    rows = slots * batch_size * N_FEATURES * 4
+    mask = slots * batch_size
+    return _align(rows + mask) + slots * batch_size * 4
+
+
+def _align(offset: int, alignment: int = 64) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _load_booster(block: Optional[Tuple[str, int]], nthread: int):
+    """Load a Booster from a shared model block (name, size)."""
+    import xgboost as xgb
+
+    if block is None:
+        return None
+
+    name, size = block
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        booster = xgb.Booster()
+        booster.load_model(bytearray(shm.buf[:size]))
+    finally:
+        shm.close()
+    booster.set_param({"nthread": nthread})
+    return booster
+
+
+def _worker_main(
+    ring_name: str,
+    slots: int,
+    batch_size: int,
+    conn,
+    champion_block: Tuple[str, int],
+    challenger_block: Optional[Tuple[str, int]],
+    nthread: int,
+) -> None:
+    """Worker process loop: score ring slots announced on the pipe."""
+    import xgboost as xgb
+
+    ring = shared_memory.SharedMemory(name=ring_name)
+    rows, mask, proba = _ring_views(ring.buf, slots, batch_size)
+
+    try:
+        champion = _load_booster(champion_block, nthread)
+        challenger = _load_booster(challenger_block, nthread)
+        conn.send((MSG_READY, None))
+    except Exception as e:
+        conn.send((MSG_ERROR, f"model load failed: {e}"))
+        return
+
+    try:
+        while True:
+            message, payload = conn.recv()
+
+            if message == MSG_STOP:
+                break
+
+            if message == MSG_LOAD:
+                try:
+                    new_champion = _load_booster(payload[0], nthread)
+                    new_challenger = _load_booster(payload[1], nthread)
+                    champion, challenger = new_champion, new_challenger
+                    conn.send((MSG_READY, None))
+                except Exception as e:
+                    conn.send((MSG_ERROR, f"model load failed: {e}"))
+                continue
+
+            slot, n = payload
+            try:
+                batch = rows[slot, :n]
+                use_b = mask[slot, :n]
+                out = proba[slot, :n]
+
+                if challenger is None or not use_b.any():
+                    out[:] = champion.predict(xgb.DMatrix(batch))
+                else:
+                    use_a = ~use_b
+                    if use_a.any():
+                        out[use_a] = champion.predict(xgb.DMatrix(batch[use_a]))
+                    out[use_b] = challenger.predict(xgb.DMatrix(batch[use_b]))
+
+                conn.send((MSG_DONE, slot))
+            except Exception as e:
+                conn.send((MSG_ERROR, (slot, str(e))))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del rows, mask, proba
+        ring.close()
+
+
+class SharedModelBlock:
+    """A model file's bytes published in shared memory."""
+
+    def __init__(self, model_path: str):
+        """Copy a model file into a new shared-memory block.
+
+        Args:
+            model_path: Path to the XGBoost model file
+        """
+        data = Path(model_path).read_bytes()
+        self.size = len(data)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        self.shm.buf[: self.size] = data
+
+    @property
+    def handle(self) -> Tuple[str, int]:
+        """(name, size) tuple workers use to attach."""
+        return self.shm.name, self.size
+
+    def release(self) -> None:
+        """Free the block."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class _Worker:
+    """Front-end bookkeeping for one worker process."""
+
+    def __init__(self, index: int, slots: int, batch_size: int):
+        self.index = index
+        self.ring = shared_memory.SharedMemory(
+            create=True, size=_ring_nbytes(slots, batch_size)
+        )
+        self.rows, self.mask, self.proba = _ring_views(self.ring.buf, slots, batch_size)
+        self.free_slots: Deque[int] = deque(range(slots))
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.process = None
+        self.conn = None
+        self.alive = False
+        self.restarting = False
+        self.control: Optional[asyncio.Future] = None
+
+    def release(self) -> None:
+        del self.rows, self.mask, self.proba
+        self.ring.close()
+        self.ring.unlink()
+
+
+class InferenceWorkerPool:
+    """Pool of scoring processes fed through shared-memory rings."""
+
+    def __init__(
+        self,
+        num_workers: int,
+        batch_size: int,
+        slots_per_worker: int = 2,
+        threads_per_worker: int = 1,
+        start_timeout_seconds: float = 60.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            num_workers: Number of worker processes (typically one per core)
+            batch_size: Maximum rows per batch
+            slots_per_worker: Ring slots per worker, i.e. batches in flight
+            threads_per_worker: XGBoost nthread inside each worker
+            start_timeout_seconds: How long to wait for workers to load models
+        """
+        self.num_workers = max(1, num_workers)
+        self.batch_size = batch_size
+        self.slots_per_worker = max(1, slots_per_worker)
+        self.threads_per_worker = threads_per_worker
+        self.start_timeout_seconds = start_timeout_seconds
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._models: List[SharedModelBlock] = []
+        self._model_handles: Tuple[Optional[Tuple[str, int]], Optional[Tuple[str, int]]] = (None, None)
+        self._slot_freed: Optional[asyncio.Condition] = None
+        self._respawns: Dict[int, asyncio.Task] = {}
+        self._next_worker = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.batches_scored = 0
+        self.rows_scored = 0
+        self.workers_respawned = 0
+
+    @property
+    def live_workers(self) -> int:
+        """Number of worker processes still running."""
+        return sum(1 for w in self._workers if w.alive)
+
+    def start(self, champion_path: str, challenger_path: Optional[str] = None) -> None:
+        """Spawn the workers and wait until each has loaded its models.
+
+        Blocks; call it from an executor when an event loop is running.
+
+        Args:
+            champion_path: Champion model file
+            challenger_path: Optional challenger model file
+        """
+        self._publish_models(champion_path, challenger_path)
+
+        for index in range(self.num_workers):
+            worker = _Worker(index, self.slots_per_worker, self.batch_size)
+            self._spawn(worker)
+            self._workers.append(worker)
+
+        for worker in self._workers:
+            if not worker.conn.poll(self.start_timeout_seconds):
+                raise RuntimeError(f"Inference worker {worker.index} did not start")
+            message, payload = worker.conn.recv()
+            if message != MSG_READY:
+                raise RuntimeError(f"Inference worker {worker.index} failed: {payload}")
+            worker.alive = True
+
+        logger.info(
+            f"Started {self.num_workers} inference workers "
+            f"({self.slots_per_worker} slots x {self.batch_size} rows each)"
+        )
+
+    def _spawn(self, worker: _Worker) -> None:
+        """Start a process for a worker on its ring, with the current models."""
+        champion, challenger = self._model_handles
+        parent_conn, child_conn = self._context.Pipe()
+        worker.conn = parent_conn
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker.ring.name,
+                self.slots_per_worker,
+                self.batch_size,
+                child_conn,
+                champion,
+                challenger,
+                self.threads_per_worker,
+            ),
+            name=f"inference-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+
+    def attach(self) -> None:
+        """Start receiving worker results on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._slot_freed = asyncio.Condition()
+        for worker in self._workers:
+            self._loop.add_reader(worker.conn.fileno(), self._on_readable, worker)
+
+    async def score(self, features: np.ndarray, use_challenger: np.ndarray) -> np.ndarray:
+        """Score a batch on the next worker with a free ring slot.
+
+        Waits while every live worker's slots are busy, including while a
+        dead worker is being respawned.
+
+        Args:
+            features: float32 matrix of shape (n, 8), n <= batch_size
+            use_challenger: Boolean mask of length n
+
+        Returns:
+            Probabilities of length n
+        """
+        if len(features) > self.batch_size:
+            parts = await asyncio.gather(*(
+                self.score(features[i:i + self.batch_size], use_challenger[i:i + self.batch_size])
+                for i in range(0, len(features), self.batch_size)
+            ))
+            return np.concatenate(parts)
+
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(self._slot_ready)
+            worker = self._next_free_worker()
+            slot = worker.free_slots.popleft()
+
+        try:
+            n = len(features)
+
+            worker.rows[slot, :n] = features
+            worker.mask[slot, :n] = use_challenger
+
+            future = self._loop.create_future()
+            worker.pending[slot] = future
+            worker.conn.send((MSG_SCORE, (slot, n)))
+
+            await future
+            proba = worker.proba[slot, :n].copy()
+
+            self.batches_scored += 1
+            self.rows_scored += n
+            return proba
+        finally:
+            worker.pending.pop(slot, None)
+            worker.free_slots.append(slot)
+            await self._notify_slot_freed()
+
+    async def load_models(
+        self, champion_path: str, challenger_path: Optional[str] = None
+    ) -> None:
+        """Hot-swap models in every worker.
+
+        Args:
+            champion_path: Champion model file
+            challenger_path: Optional challenger model file
+        """
+        old_models = self._models
+        champion, challenger = self._publish_models(champion_path, challenger_path)
+
+        waiters = []
+        for worker in self._workers:
+            if not worker.alive:
+                continue
+            worker.control = self._loop.create_future()
+            waiters.append(worker.control)
+            worker.conn.send((MSG_LOAD, (champion, challenger)))
+
+        try:
+            await asyncio.gather(*waiters)
+        finally:
+            for block in old_models:
+                block.release()
+
+    def stop(self) -> None:
+        """Stop the workers and free shared memory."""
+        for task in self._respawns.values():
+            task.cancel()
+        self._respawns = {}
+
+        for worker in self._workers:
+            if self._loop is not None and worker.conn is not None:
+                try:
+                    self._loop.remove_reader(worker.conn.fileno())
+                except (ValueError, OSError):
+                    pass
+            if worker.process is not None and worker.process.is_alive():
+                try:
+                    worker.conn.send((MSG_STOP, None))
+                except (BrokenPipeError, OSError):
+                    pass
+            for future in worker.pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Inference worker pool stopped"))
+
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            worker.conn.close()
+            worker.alive = worker.restarting = False
+            worker.release()
+
+        for block in self._models:
+            block.release()
+
+        self._workers = []
+        self._models = []
+        logger.info("Inference worker pool stopped")
+
+    def _publish_models(
+        self, champion_path: str, challenger_path: Optional[str]
+    ) -> Tuple[Tuple[str, int], Optional[Tuple[str, int]]]:
+        """Copy model files into shared memory for the workers."""
+        champion = SharedModelBlock(champion_path)
+        challenger = SharedModelBlock(challenger_path) if challenger_path else None
+        self._models = [b for b in (champion, challenger) if b is not None]
+        self._model_handles = (champion.handle, challenger.handle if challenger else None)
+        return self._model_handles
+
+    def _slot_ready(self) -> bool:
+        """A live worker has a free slot, or no worker is coming back."""
+        if any(w.alive and w.free_slots for w in self._workers):
+            return True
+        return not any(w.alive or w.restarting for w in self._workers)
+
+    async def _notify_slot_freed(self) -> None:
+        async with self._slot_freed:
+            self._slot_freed.notify_all()
+
+    def _next_free_worker(self) -> _Worker:
+        """Round-robin over live workers that have a free slot."""
+        for _ in range(len(self._workers)):
+            worker = self._workers[self._next_worker % len(self._workers)]
+            self._next_worker += 1
+            if worker.alive and worker.free_slots:
+                return worker
+        raise RuntimeError("No live inference worker available")
+
+    def _on_readable(self, worker: _Worker) -> None:
+        """Drain result messages from a worker's pipe."""
+        try:
+            while worker.conn.poll():
+                message, payload = worker.conn.recv()
+
+                if message == MSG_DONE:
+                    future = worker.pending.get(payload)
+                    if future is not None and not future.done():
+                        future.set_result(None)
+
+                elif message == MSG_ERROR and isinstance(payload, tuple):
+                    slot, error = payload
+                    future = worker.pending.get(slot)
+                    if future is not None and not future.done():
+                        future.set_exception(RuntimeError(error))
+
+                elif worker.control is not None and not worker.control.done():
+                    if message == MSG_READY:
+                        worker.control.set_result(None)
+                    else:
+                        worker.control.set_exception(RuntimeError(payload))
+
+        except (EOFError, OSError):
+            self._on_worker_died(worker)
+
+    def _on_worker_died(self, worker: _Worker) -> None:
+        """Take a dead worker out of rotation, fail its in-flight batches and respawn it."""
+        worker.alive = False
+        self._loop.remove_reader(worker.conn.fileno())
+        logger.error(
+            f"Inference worker {worker.index} exited "
+            f"(exit code {worker.process.exitcode if worker.process else None})"
+        )
+
+        error = RuntimeError(f"Inference worker {worker.index} died")
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        if worker.control is not None and not worker.control.done():
+            worker.control.set_exception(error)
+
+        if worker.index not in self._respawns:
+            worker.restarting = True
+            self._respawns[worker.index] = self._loop.create_task(self._respawn(worker))
+
+    async def _respawn(self, worker: _Worker) -> None:
+        """Replace a dead worker's process on the same ring.
+
+        The new process starts with the current models; if they are hot-
+        swapped while it loads, it is sent the newer ones before it
+        rejoins the rotation.
+        """
+        try:
+            for attempt in range(1, RESPAWN_ATTEMPTS + 1):
+                worker.process.join(timeout=0)
+                worker.conn.close()
+
+                handles = self._model_handles
+                self._spawn(worker)
+                worker.control = self._loop.create_future()
+                self._loop.add_reader(worker.conn.fileno(), self._on_readable, worker)
+                try:
+                    await asyncio.wait_for(worker.control, self.start_timeout_seconds)
+                    while handles != self._model_handles:
+                        handles = self._model_handles
+                        worker.control = self._loop.create_future()
+                        worker.conn.send((MSG_LOAD, handles))
+                        await asyncio.wait_for(worker.control, self.start_timeout_seconds)
+                except Exception as e:
+                    logger.error(
+                        f"Inference worker {worker.index} restart {attempt}/{RESPAWN_ATTEMPTS} failed: {e}"
+                    )
+                    try:
+                        self._loop.remove_reader(worker.conn.fileno())
+                    except (ValueError, OSError):
+                        pass
+                    if worker.process.is_alive():
+                        worker.process.terminate()
+                    await asyncio.sleep(RESPAWN_BACKOFF_SECONDS * attempt)
+                    continue
+
+                worker.alive = True
+                self.workers_respawned += 1
+                logger.info(f"Inference worker {worker.index} respawned")
+                return
+
+            logger.error(f"Inference worker {worker.index} left out of rotation after {RESPAWN_ATTEMPTS} restarts")
+        finally:
+            worker.restarting = False
+            self._respawns.pop(worker.index, None)
+            await self._notify_slot_freed()
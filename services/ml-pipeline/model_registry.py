@@ -43,6 +43,9 @@ class ModelMetadata:
     # Performance tracking
     production_metrics: Optional[Dict[str, float]] = None
 
+    # Every trial of the hyperparameter search that produced the model
+    hyperparameter_search: Optional[Dict[str, Any]] = None
+
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return asdict(self)
@@ -374,3 +377,28 @@ class ModelRegistry:
 
         logger.info(f"Deleted model: {model_id}")
         return True
+
+
+def open_registry(
+    registry_path: str = "models/registry", backend: Optional[str] = None
+) -> ModelRegistry:
+    """Open a model registry with the right backend.
+
+    Args:
+        registry_path: Base path for model storage
+        backend: "json", "sqlite", or None to use SQLite when the
+            directory already has a registry.db and JSON otherwise
+
+    Returns:
+        ModelRegistry (or SQLiteModelRegistry)
+    """
+    from .sqlite_registry import SQLiteModelRegistry
+
+    if backend is None:
+        backend = "sqlite" if (Path(registry_path) / SQLiteModelRegistry.DB_FILE).exists() else "json"
+
+    if backend == "sqlite":
+        return SQLiteModelRegistry(registry_path)
+    if backend == "json":
+        return ModelRegistry(registry_path)
+    raise ValueError(f"Unknown registry backend: {backend}")
@@ -0,0 +1 @@
+"""Generated gRPC stubs for the inference API (see inference.proto)."""
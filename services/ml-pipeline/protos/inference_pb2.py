@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: inference.proto
+# Protobuf Python Version: 4.25.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finference.proto\x12\x15voxguard.inference.v1\"P\n\x11PredictionRequest\x12\x10\n\x08\x66\x65\x61tures\x18\x01 \x03(\x02\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x15\n\rmodel_version\x18\x03 \x01(\t\"z\n\x12PredictionResponse\x12\x10\n\x08is_fraud\x18\x01 \x01(\x08\x12\x13\n\x0bprobability\x18\x02 \x01(\x02\x12\x15\n\rmodel_version\x18\x03 \x01(\t\x12\x12\n\nlatency_ms\x18\x04 \x01(\x02\x12\x12\n\nrequest_id\x18\x05 \x01(\t\"T\n\x16\x42\x61tchPredictionRequest\x12:\n\x08requests\x18\x01 \x03(\x0b\x32(.voxguard.inference.v1.PredictionRequest\"W\n\x17\x42\x61tchPredictionResponse\x12<\n\tresponses\x18\x01 \x03(\x0b\x32).voxguard.inference.v1.PredictionResponse2\xcb\x02\n\x10InferenceService\x12^\n\x07Predict\x12(.voxguard.inference.v1.PredictionRequest\x1a).voxguard.inference.v1.PredictionResponse\x12m\n\x0cPredictBatch\x12-.voxguard.inference.v1.BatchPredictionRequest\x1a..voxguard.inference.v1.BatchPredictionResponse\x12h\n\rPredictStream\x12(.voxguard.inference.v1.PredictionRequest\x1a).voxguard.inference.v1.PredictionResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'inference_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_PREDICTIONREQUEST']._serialized_start=42
+  _globals['_PREDICTIONREQUEST']._serialized_end=122
+  _globals['_PREDICTIONRESPONSE']._serialized_start=124
+  _globals['_PREDICTIONRESPONSE']._serialized_end=246
+  _globals['_BATCHPREDICTIONREQUEST']._serialized_start=248
+  _globals['_BATCHPREDICTIONREQUEST']._serialized_end=332
+  _globals['_BATCHPREDICTIONRESPONSE']._serialized_start=334
+  _globals['_BATCHPREDICTIONRESPONSE']._serialized_end=421
+  _globals['_INFERENCESERVICE']._serialized_start=424
+  _globals['_INFERENCESERVICE']._serialized_end=755
+# @@protoc_insertion_point(module_scope)
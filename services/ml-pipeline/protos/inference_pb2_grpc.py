@@ -0,0 +1,136 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from . import inference_pb2 as inference__pb2
+
+
+class InferenceServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Predict = channel.unary_unary(
+                '/voxguard.inference.v1.InferenceService/Predict',
+                request_serializer=inference__pb2.PredictionRequest.SerializeToString,
+                response_deserializer=inference__pb2.PredictionResponse.FromString,
+                )
+        self.PredictBatch = channel.unary_unary(
+                '/voxguard.inference.v1.InferenceService/PredictBatch',
+                request_serializer=inference__pb2.BatchPredictionRequest.SerializeToString,
+                response_deserializer=inference__pb2.BatchPredictionResponse.FromString,
+                )
+        self.PredictStream = channel.stream_stream(
+                '/voxguard.inference.v1.InferenceService/PredictStream',
+                request_serializer=inference__pb2.PredictionRequest.SerializeToString,
+                response_deserializer=inference__pb2.PredictionResponse.FromString,
+                )
+
+
+class InferenceServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Predict(self, request, context):
+        """Score a single feature vector.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictBatch(self, request, context):
+        """Score a caller-assembled batch; responses keep request order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictStream(self, request_iterator, context):
+        """Long-lived bidirectional stream. Responses carry the request_id of
+        the request they answer and may arrive out of order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_InferenceServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=inference__pb2.PredictionRequest.FromString,
+                    response_serializer=inference__pb2.PredictionResponse.SerializeToString,
+            ),
+            'PredictBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictBatch,
+                    request_deserializer=inference__pb2.BatchPredictionRequest.FromString,
+                    response_serializer=inference__pb2.BatchPredictionResponse.SerializeToString,
+            ),
+            'PredictStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PredictStream,
+                    request_deserializer=inference__pb2.PredictionRequest.FromString,
+                    response_serializer=inference__pb2.PredictionResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'voxguard.inference.v1.InferenceService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class InferenceService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/voxguard.inference.v1.InferenceService/Predict',
+            inference__pb2.PredictionRequest.SerializeToString,
+            inference__pb2.PredictionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PredictBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/voxguard.inference.v1.InferenceService/PredictBatch',
+            inference__pb2.BatchPredictionRequest.SerializeToString,
+            inference__pb2.BatchPredictionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PredictStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/voxguard.inference.v1.InferenceService/PredictStream',
+            inference__pb2.PredictionRequest.SerializeToString,
+            inference__pb2.PredictionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -7,22 +7,28 @@ Orchestrates the complete model retraining pipeline:
 4. Model promotion to production (champion/challenger)
 5. Scheduled execution (daily at 2 AM WAT)
 """
+import argparse
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from typing import Optional, Dict
 from enum import Enum
 
 import pandas as pd
+import xgboost as xgb
 
-from .data_collector import DataCollector, DataCollectionConfig
+from .data_collector import DataCollector, DataCollectionConfig, valid_feature_rows
 from .training.trainer import ModelTrainer
 from .training.evaluator import ModelEvaluator
-from .model_registry import ModelRegistry
+from .training.hyperparameter_search import HyperparameterSearch
+from .model_registry import ModelMetadata, open_registry
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_MODES = ("synthetic", "database")
+
 
 class RetrainingStatus(Enum):
     """Status of retraining job."""
@@ -45,12 +51,19 @@ class RetrainingConfig:
     # Data collection
     lookback_days: int = 7
     min_samples_required: int = 1000
+    extraction_mode: str = "synthetic"  # "database" streams from QuestDB and YugabyteDB
+    feature_store_path: str = "data/feature_store"  # "" rebuilds every day each run
+    external_memory: bool = False  # Train from feature store shards on disk (needs the store)
 
     # Training
     max_depth: int = 6
     learning_rate: float = 0.1
     n_estimators: int = 100
 
+    # Hyperparameter search (n_estimators is the per-trial round budget)
+    search_trials: int = 0  # 0 trains the fixed parameters above
+    search_workers: int = 0  # 0 = one process per core (external_memory: in-process unless > 1)
+
     # Quality gates
     min_auc_score: float = 0.85
     min_precision: float = 0.80
@@ -59,6 +72,7 @@ class RetrainingConfig:
 
     # Model registry
     registry_path: str = "models/registry"
+    registry_backend: Optional[str] = None  # "json", "sqlite" or None (detect)
     auto_promote_champion: bool = False  # Manual approval by default
 
     # Notification
@@ -124,11 +138,20 @@ class RetrainingOrchestrator:
         """
         self.config = config
 
+        if config.external_memory and not config.feature_store_path:
+            raise ValueError("external_memory training requires feature_store_path")
+        if config.extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"extraction_mode must be one of {EXTRACTION_MODES}, got {config.extraction_mode!r}"
+            )
+
         # Components
         self.data_collector = DataCollector(
             DataCollectionConfig(
                 lookback_days=config.lookback_days,
                 min_samples=config.min_samples_required,
+                extraction_mode=config.extraction_mode,
+                feature_store_path=config.feature_store_path,
             )
         )
 
@@ -140,7 +163,7 @@ class RetrainingOrchestrator:
 
         self.model_evaluator = ModelEvaluator()
 
-        self.model_registry = ModelRegistry(config.registry_path)
+        self.model_registry = open_registry(config.registry_path, config.registry_backend)
 
         # State
         self.is_running = False
@@ -186,20 +209,21 @@ class RetrainingOrchestrator:
             # Step 1: Data Collection
             logger.info("Step 1/5: Collecting training data...")
             training_df = await self._collect_data()
+            samples = self._sample_count(training_df)
 
-            if len(training_df) < self.config.min_samples_required:
+            if samples < self.config.min_samples_required:
                 raise ValueError(
-                    f"Insufficient samples: {len(training_df)} < "
+                    f"Insufficient samples: {samples} < "
                     f"{self.config.min_samples_required}"
                 )
 
             # Step 2: Train Model
             logger.info("Step 2/5: Training XGBoost model...")
-            model_id, model_path = await self._train_model(training_df)
+            model_id, model_path, dtest = await self._train_model(training_df)
 
             # Step 3: Evaluate Model
             logger.info("Step 3/5: Evaluating model performance...")
-            metrics = await self._evaluate_model(training_df, model_path)
+            metrics = await self._evaluate_model(dtest)
 
             # Step 4: Quality Gates
             logger.info("Step 4/5: Checking quality gates...")
@@ -208,7 +232,7 @@ class RetrainingOrchestrator:
             # Step 5: Model Promotion
             logger.info("Step 5/5: Handling model promotion...")
             promoted_challenger, promoted_champion = await self._handle_promotion(
-                model_id, model_path, metrics, passed_gates, is_improvement
+                model_id, model_path, metrics, samples, passed_gates, is_improvement
             )
 
             # Create result
@@ -222,7 +246,7 @@ class RetrainingOrchestrator:
                 start_time=start_time,
                 end_time=end_time,
                 duration_seconds=duration,
-                samples_collected=collector_metrics["total_records"],
+                samples_collected=samples,
                 fraud_samples=collector_metrics["fraud_records"],
                 non_fraud_samples=collector_metrics["non_fraud_records"],
                 model_id=model_id,
@@ -275,56 +299,150 @@ class RetrainingOrchestrator:
         finally:
             self.is_running = False
 
-    async def _collect_data(self) -> pd.DataFrame:
-        """Step 1: Collect training data."""
+    def _training_window(self) -> tuple[datetime, datetime]:
+        """Full days of the lookback window, ending at midnight today."""
+        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return end - timedelta(days=self.config.lookback_days), end
+
+    def _sample_count(self, training_df: Optional[pd.DataFrame]) -> int:
+        """Number of collected samples, in memory or in the feature store."""
+        if training_df is not None:
+            return len(training_df)
+
+        start, end = self._training_window()
+        return sum(
+            info.rows
+            for info in self.data_collector.feature_store.list_partitions()
+            if f"{start:%Y-%m-%d}" <= info.date < f"{end:%Y-%m-%d}"
+        )
+
+    async def _collect_data(self) -> Optional[pd.DataFrame]:
+        """Step 1: Collect training data.
+
+        In external-memory mode the window is only backfilled into the
+        feature store and None is returned; training reads the store.
+        """
         await self.data_collector.connect()
 
         try:
+            if self.config.external_memory:
+                await self.data_collector.backfill(*self._training_window())
+                return None
+
             training_df = await self.data_collector.collect_training_data()
             return training_df
         finally:
             await self.data_collector.close()
 
-    async def _train_model(self, training_df: pd.DataFrame) -> tuple[str, str]:
+    async def _train_model(self, training_df: Optional[pd.DataFrame]) -> tuple:
         """Step 2: Train XGBoost model.
 
         Returns:
-            Tuple of (model_id, model_path)
+            Tuple of (model_id, model_path, test_dmatrix)
         """
-        # Split features and labels
-        X = training_df.drop("is_fraud", axis=1)
-        y = training_df["is_fraud"]
-
-        # Train model
-        model = await asyncio.to_thread(self.model_trainer.train, X, y)
+        if self.config.search_trials:
+            dtest = await asyncio.to_thread(self._search_model, training_df)
+        elif training_df is None:
+            dtrain, dval, dtest = await asyncio.to_thread(
+                self.model_trainer.prepare_data_from_shards,
+                self._shard_paths(),
+                **self._shard_options(),
+            )
+            await asyncio.to_thread(self.model_trainer.train, dtrain, dval)
+        else:
+            dtrain, dval, dtest = await asyncio.to_thread(
+                self.model_trainer.prepare_data,
+                training_df.rename(columns={"is_fraud": "label"}),
+            )
+            await asyncio.to_thread(self.model_trainer.train, dtrain, dval)
 
         # Generate model ID
-        model_id = f"xgboost_v{datetime.now().strftime('%Y.%m.%d.%H%M%S')}"
+        model_id = ModelTrainer.create_model_id(ModelTrainer.create_version_string())
 
         # Save model
         model_path = f"{self.config.registry_path}/{model_id}.json"
+        self.model_trainer.save_model(model_path)
 
-        # In production, this would actually save the model
-        logger.info(f"Model saved: {model_path}")
+        return model_id, model_path, dtest
 
-        return model_id, model_path
+    def _shard_paths(self) -> list:
+        """Feature store files of the training window."""
+        return self.data_collector.feature_store.partition_files(*self._training_window())
 
-    async def _evaluate_model(
-        self,
-        training_df: pd.DataFrame,
-        model_path: str,
-    ) -> Dict[str, float]:
-        """Step 3: Evaluate model performance.
+    @staticmethod
+    def _shard_options() -> dict:
+        """Read options for the feature store shards.
+
+        Stored partitions are deduplicated when written but not
+        validated, so rows get the same checks as
+        DataCollector._validate_and_clean applies to in-memory training
+        data.
+        """
+        return {
+            "label_column": "is_fraud",
+            "row_filter": valid_feature_rows,
+        }
+
+    def _search_model(self, training_df: Optional[pd.DataFrame]):
+        """Run the hyperparameter search and adopt its best model.
+
+        Returns:
+            Test DMatrix for evaluation
+        """
+        # Quantising shards is the expensive part, so by default they are
+        # built once here and shared by every trial and the evaluation
+        in_process = training_df is None and self.config.search_workers <= 1
+        if in_process:
+            dtrain, dval, dtest = self.model_trainer.prepare_data_from_shards(
+                self._shard_paths(), **self._shard_options()
+            )
+
+        search = HyperparameterSearch(
+            self.model_trainer.params,
+            ModelTrainer.FEATURE_NAMES,
+            n_trials=self.config.search_trials,
+            max_rounds=self.config.n_estimators,
+            max_workers=self.config.search_workers,
+        )
+
+        if in_process:
+            result = search.run_on_matrices(dtrain, dval)
+        elif training_df is None:
+            # Each worker builds its own matrices from the shards
+            result = search.run_from_shards(self._shard_paths(), **self._shard_options())
+            # Test split is built after the pool has exited, with the training cuts
+            _, _, dtest = self.model_trainer.prepare_data_from_shards(
+                self._shard_paths(), **self._shard_options()
+            )
+        else:
+            X_train, X_val, X_test, y_train, y_val, y_test = self.model_trainer.split_data(
+                training_df.rename(columns={"is_fraud": "label"})
+            )
+            result = search.run(X_train, y_train, X_val, y_val)
+            dtest = xgb.DMatrix(X_test, label=y_test, feature_names=ModelTrainer.FEATURE_NAMES)
+
+        self.model_trainer.apply_search_result(result)
+        return dtest
+
+    async def _evaluate_model(self, dtest) -> Dict[str, float]:
+        """Step 3: Evaluate model performance on the held-out test split.
 
         Returns:
             Dictionary with evaluation metrics
         """
-        # Split features and labels
-        X = training_df.drop("is_fraud", axis=1)
-        y = training_df["is_fraud"]
+        y_pred = await asyncio.to_thread(self.model_trainer.predict_from_dmatrix, dtest)
 
         # Evaluate
-        metrics = await asyncio.to_thread(self.model_evaluator.evaluate, X, y, model_path)
+        result = await asyncio.to_thread(
+            self.model_evaluator.evaluate, dtest.get_label(), y_pred
+        )
+        metrics = {
+            "auc": result.auc_score,
+            "accuracy": result.accuracy,
+            "precision": result.precision,
+            "recall": result.recall,
+            "f1": result.f1_score,
+        }
 
         logger.info(
             f"Model metrics: AUC={metrics.get('auc', 0):.4f}, "
@@ -367,10 +485,10 @@ class RetrainingOrchestrator:
 
         if champion:
             champion_id, champion_path = champion
-            champion_metadata = self.model_registry.get_model_metadata(champion_id)
+            champion_metadata = self.model_registry.get_metadata(champion_id)
 
-            if champion_metadata and "metrics" in champion_metadata:
-                champion_auc = champion_metadata["metrics"].get("auc", 0)
+            if champion_metadata:
+                champion_auc = champion_metadata.auc_score
                 new_auc = metrics.get("auc", 0)
 
                 improvement = new_auc - champion_auc
@@ -395,6 +513,7 @@ class RetrainingOrchestrator:
         model_id: str,
         model_path: str,
         metrics: Dict[str, float],
+        training_samples: int,
         passed_gates: bool,
         is_improvement: bool,
     ) -> tuple[bool, bool]:
@@ -407,19 +526,25 @@ class RetrainingOrchestrator:
         promoted_champion = False
 
         # Save model to registry
-        self.model_registry.register_model(
+        search_result = self.model_trainer.search_result
+        metadata = ModelMetadata(
             model_id=model_id,
-            model_path=model_path,
-            metadata={
-                "metrics": metrics,
-                "timestamp": datetime.now().isoformat(),
-                "training_config": {
-                    "max_depth": self.config.max_depth,
-                    "learning_rate": self.config.learning_rate,
-                    "n_estimators": self.config.n_estimators,
-                },
-            },
+            version=model_id.removeprefix("xgboost_v"),
+            created_at=datetime.utcnow().isoformat(),
+            algorithm="xgboost",
+            training_samples=training_samples,
+            auc_score=metrics["auc"],
+            precision=metrics["precision"],
+            recall=metrics["recall"],
+            f1_score=metrics["f1"],
+            accuracy=metrics["accuracy"],
+            features=list(ModelTrainer.FEATURE_NAMES),
+            feature_importance=self.model_trainer.get_feature_importance(),
+            hyperparameters=dict(self.model_trainer.params, n_estimators=self.config.n_estimators),
+            status="candidate",
+            hyperparameter_search=search_result.to_metadata() if search_result else None,
         )
+        self.model_registry.register_model(model_path, metadata)
 
         if not passed_gates:
             logger.warning("Model did not pass quality gates, not promoting")
@@ -427,7 +552,8 @@ class RetrainingOrchestrator:
 
         # Promote to challenger if improvement
         if is_improvement:
-            self.model_registry.set_challenger(model_id)
+            metadata.status = "challenger"
+            self.model_registry.update_metadata(model_id, metadata)
             promoted_challenger = True
             logger.info(f"Model promoted to CHALLENGER: {model_id}")
 
@@ -522,6 +648,14 @@ class RetrainingOrchestrator:
 
 async def main():
     """Main entry point for retraining orchestrator."""
+    parser = argparse.ArgumentParser(description="Model retraining orchestrator")
+    parser.add_argument(
+        "--extraction-mode",
+        default=os.getenv("ML_TRAINING_EXTRACTION_MODE", "synthetic"),
+        choices=EXTRACTION_MODES,
+        help="Training data source (default: $ML_TRAINING_EXTRACTION_MODE or synthetic)",
+    )
+    args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
     config = RetrainingConfig(
@@ -529,6 +663,7 @@ async def main():
         enabled=True,
         lookback_days=7,
         min_samples_required=1000,
+        extraction_mode=args.extraction_mode,
         auto_promote_champion=False,
     )
 
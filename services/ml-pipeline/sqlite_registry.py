@@ -0,0 +1,448 @@
+"""SQLite backend for the model registry.
+
+Same interface as the JSON ModelRegistry, but the index, metadata and
+champion pointer live in one SQLite database (registry.db, WAL mode) in
+the registry directory. Model files are still copied to
+<registry>/<model_id>/model.<ext>.
+
+- Every write is a BEGIN IMMEDIATE transaction, so the orchestrator and
+  any number of inference processes can share a registry: SQLite's file
+  locks serialize writers, readers never see a half-written index, and
+  promoting a champion (archiving the old one, pointing at the new one)
+  is a single transaction.
+- Lookups are indexed queries; list_models reads the summary columns
+  without parsing any metadata.
+- get_champion is cached until PRAGMA data_version reports a commit from
+  another connection, so polling it costs one pragma.
+- Every change is appended to a changes table; changes_since(seq) is the
+  feed consumers (e.g. InferenceServer) poll.
+"""
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .model_registry import ModelMetadata, ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    model_id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    auc_score REAL NOT NULL,
+    precision REAL NOT NULL,
+    recall REAL NOT NULL,
+    deployed_at TEXT,
+    model_path TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS models_status ON models (status, created_at);
+CREATE TABLE IF NOT EXISTS registry_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    at TEXT NOT NULL
+);
+"""
+
+# Change feed events
+EVENT_REGISTERED = "registered"
+EVENT_UPDATED = "updated"
+EVENT_CHAMPION = "champion"
+EVENT_DELETED = "deleted"
+
+
+class SQLiteModelRegistry(ModelRegistry):
+    """Model registry stored in SQLite."""
+
+    DB_FILE = "registry.db"
+    BUSY_TIMEOUT_SECONDS = 30.0
+
+    def __init__(self, registry_path: str = "models/registry"):
+        """Open (or create) the registry.
+
+        A new database in a directory that already holds a JSON registry
+        imports its models and champion.
+
+        Args:
+            registry_path: Base path for model storage
+        """
+        self.registry_path = Path(registry_path)
+        self.registry_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.registry_path / self.DB_FILE
+
+        # One connection shared by this instance's threads; the lock keeps
+        # their statements and transactions from interleaving
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        # executescript() would commit on its own; create the schema
+        # statement by statement inside one transaction instead
+        with self._write() as conn:
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+        # Champion cache, valid while data_version is unchanged
+        self._champion_cache: Optional[tuple] = None
+        self._cached_data_version: Optional[int] = None
+
+        if not self._scalar("SELECT COUNT(*) FROM models"):
+            self._import_json_registry()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            # Our own commits don't bump data_version for this connection
+            self._cached_data_version = None
+
+    def _scalar(self, query: str, *args) -> Any:
+        with self._lock:
+            row = self._conn.execute(query, args).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _log_change(conn: sqlite3.Connection, model_id: str, event: str) -> None:
+        conn.execute(
+            "INSERT INTO changes (model_id, event, at) VALUES (?, ?, ?)",
+            (model_id, event, datetime.utcnow().isoformat()),
+        )
+
+    @staticmethod
+    def _store_metadata(conn: sqlite3.Connection, metadata: ModelMetadata) -> int:
+        """Update a model's metadata and summary columns; returns rows changed."""
+        return conn.execute(
+            """
+            UPDATE models
+            SET version = ?, created_at = ?, status = ?, auc_score = ?,
+                precision = ?, recall = ?, deployed_at = ?, metadata = ?
+            WHERE model_id = ?
+            """,
+            (
+                metadata.version,
+                metadata.created_at,
+                metadata.status,
+                metadata.auc_score,
+                metadata.precision,
+                metadata.recall,
+                metadata.deployed_at,
+                json.dumps(metadata.to_dict()),
+                metadata.model_id,
+            ),
+        ).rowcount
+
+    @staticmethod
+    def _load_metadata(conn: sqlite3.Connection, model_id: str) -> Optional[ModelMetadata]:
+        row = conn.execute(
+            "SELECT metadata FROM models WHERE model_id = ?", (model_id,)
+        ).fetchone()
+        return ModelMetadata.from_dict(json.loads(row[0])) if row else None
+
+    def register_model(self, model_path: str, metadata: ModelMetadata) -> str:
+        """Register a new model in the registry.
+
+        Args:
+            model_path: Path to the model file
+            metadata: Model metadata
+
+        Returns:
+            Model ID
+        """
+        model_id = metadata.model_id
+
+        # Copy the model file first; it only becomes visible with the row
+        model_dir = self.registry_path / model_id
+        model_dir.mkdir(parents=True, exist_ok=True)
+        model_file = Path(model_path)
+        dest_model = model_dir / f"model{model_file.suffix}"
+        tmp_model = dest_model.with_name(dest_model.name + ".tmp")
+        shutil.copy2(model_file, tmp_model)
+        os.replace(tmp_model, dest_model)
+
+        with self._write() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO models (
+                    model_id, version, created_at, status, auc_score,
+                    precision, recall, deployed_at, model_path, metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    model_id,
+                    metadata.version,
+                    metadata.created_at,
+                    metadata.status,
+                    metadata.auc_score,
+                    metadata.precision,
+                    metadata.recall,
+                    metadata.deployed_at,
+                    str(dest_model),
+                    json.dumps(metadata.to_dict()),
+                ),
+            )
+            self._log_change(conn, model_id, EVENT_REGISTERED)
+
+        logger.info(f"Registered model: {model_id} (AUC: {metadata.auc_score:.4f})")
+        return model_id
+
+    def get_model_path(self, model_id: str) -> Optional[str]:
+        """Get the file path for a model.
+
+        Args:
+            model_id: Model identifier
+
+        Returns:
+            Path to model file or None if not found
+        """
+        return self._scalar("SELECT model_path FROM models WHERE model_id = ?", model_id)
+
+    def get_metadata(self, model_id: str) -> Optional[ModelMetadata]:
+        """Get metadata for a model.
+
+        Args:
+            model_id: Model identifier
+
+        Returns:
+            ModelMetadata or None if not found
+        """
+        with self._lock:
+            return self._load_metadata(self._conn, model_id)
+
+    def update_metadata(self, model_id: str, metadata: ModelMetadata) -> bool:
+        """Update metadata for a model.
+
+        Args:
+            model_id: Model identifier
+            metadata: Updated metadata
+
+        Returns:
+            True if successful
+        """
+        with self._write() as conn:
+            if not self._store_metadata(conn, metadata):
+                return False
+            self._log_change(conn, model_id, EVENT_UPDATED)
+        return True
+
+    def promote_to_champion(self, model_id: str) -> bool:
+        """Promote a model to champion (production).
+
+        Archiving the previous champion and switching the pointer happen
+        in one transaction.
+
+        Args:
+            model_id: Model to promote
+
+        Returns:
+            True if successful
+        """
+        with self._write() as conn:
+            new_metadata = self._load_metadata(conn, model_id)
+            if not new_metadata:
+                logger.error(f"Model {model_id} not found in registry")
+                return False
+
+            row = conn.execute(
+                "SELECT value FROM registry_state WHERE key = 'champion'"
+            ).fetchone()
+            old_champion = row[0] if row else None
+
+            if old_champion and old_champion != model_id:
+                old_metadata = self._load_metadata(conn, old_champion)
+                if old_metadata:
+                    old_metadata.status = "archived"
+                    old_metadata.replaced_by = model_id
+                    self._store_metadata(conn, old_metadata)
+
+            new_metadata.status = "champion"
+            new_metadata.deployed_at = datetime.utcnow().isoformat()
+            self._store_metadata(conn, new_metadata)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO registry_state (key, value) VALUES ('champion', ?)",
+                (model_id,),
+            )
+            self._log_change(conn, model_id, EVENT_CHAMPION)
+
+        logger.info(f"Promoted {model_id} to champion (replaced {old_champion})")
+        return True
+
+    def get_champion(self) -> Optional[tuple[str, str]]:
+        """Get the current champion model.
+
+        Cached until another connection commits, so it is cheap to poll.
+
+        Returns:
+            Tuple of (model_id, model_path) or None
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._cached_data_version:
+                return self._champion_cache
+
+            row = self._conn.execute(
+                """
+                SELECT m.model_id, m.model_path
+                FROM registry_state s JOIN models m ON m.model_id = s.value
+                WHERE s.key = 'champion'
+                """
+            ).fetchone()
+
+            self._champion_cache = (row[0], row[1]) if row else None
+            self._cached_data_version = data_version
+            return self._champion_cache
+
+    def list_models(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List all models in the registry.
+
+        Args:
+            status: Filter by status (candidate, champion, archived)
+
+        Returns:
+            List of model summaries, newest first
+        """
+        query = (
+            "SELECT model_id, version, status, created_at, auc_score, precision, "
+            "recall, deployed_at FROM models"
+        )
+        args: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            args = (status,)
+        query += " ORDER BY created_at DESC"
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, args)]
+
+    def delete_model(self, model_id: str) -> bool:
+        """Permanently delete a model.
+
+        Args:
+            model_id: Model to delete
+
+        Returns:
+            True if successful
+        """
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT value FROM registry_state WHERE key = 'champion'"
+            ).fetchone()
+            if row and row[0] == model_id:
+                logger.error(f"Cannot delete champion model {model_id}")
+                return False
+
+            if not conn.execute("DELETE FROM models WHERE model_id = ?", (model_id,)).rowcount:
+                return False
+            self._log_change(conn, model_id, EVENT_DELETED)
+
+        shutil.rmtree(self.registry_path / model_id, ignore_errors=True)
+
+        logger.info(f"Deleted model: {model_id}")
+        return True
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the latest change (0 if none)."""
+        return self._scalar("SELECT COALESCE(MAX(seq), 0) FROM changes")
+
+    def changes_since(self, seq: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Changes committed after a sequence number, oldest first.
+
+        Args:
+            seq: Last sequence number already seen
+            limit: Maximum number of changes to return
+
+        Returns:
+            List of {"seq", "model_id", "event", "at"} dicts
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, model_id, event, at FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _import_json_registry(self) -> None:
+        """Import models and champion from a JSON registry in the same directory."""
+        index_path = self.registry_path / self.REGISTRY_INDEX
+        if not index_path.exists():
+            return
+
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        imported = 0
+        with self._write() as conn:
+            for model_id, info in index.get("models", {}).items():
+                metadata_file = self.registry_path / model_id / self.METADATA_FILE
+                if not metadata_file.exists():
+                    continue
+
+                with open(metadata_file, "r") as f:
+                    metadata = ModelMetadata.from_dict(json.load(f))
+
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO models (
+                        model_id, version, created_at, status, auc_score,
+                        precision, recall, deployed_at, model_path, metadata
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        model_id,
+                        metadata.version,
+                        metadata.created_at,
+                        metadata.status,
+                        metadata.auc_score,
+                        metadata.precision,
+                        metadata.recall,
+                        metadata.deployed_at,
+                        info["model_path"],
+                        json.dumps(metadata.to_dict()),
+                    ),
+                )
+                self._log_change(conn, model_id, EVENT_REGISTERED)
+                imported += 1
+
+            if index.get("champion"):
+                conn.execute(
+                    "INSERT OR REPLACE INTO registry_state (key, value) VALUES ('champion', ?)",
+                    (index["champion"],),
+                )
+                self._log_change(conn, index["champion"], EVENT_CHAMPION)
+
+        logger.info(f"Imported {imported} models from {index_path}")
@@ -1,17 +1,16 @@
 """Unit tests for A/B testing deployment manager."""
 import asyncio
+import logging
+
 import pytest
 from datetime import datetime
 
-import sys
-sys.path.append("..")
-
-from ab_testing.deployment_manager import (
+from ml_pipeline.ab_testing.deployment_manager import (
     ABTestDeploymentManager,
     ABTestConfig,
     DeploymentPhase,
 )
-from model_registry import ModelRegistry
+from ml_pipeline.model_registry import ModelRegistry
 
 
 @pytest.fixture
@@ -126,9 +125,9 @@ class TestABTestDeploymentManager:
             had_error=False,
         )
 
-        assert len(deployment_manager.champion_metrics["latencies"]) == 1
-        assert deployment_manager.champion_metrics["latencies"][0] == 0.8
-        assert len(deployment_manager.challenger_metrics["latencies"]) == 0
+        assert deployment_manager.champion_metrics.requests == 1
+        assert deployment_manager.champion_metrics.latency.mean == 0.8
+        assert deployment_manager.challenger_metrics.requests == 0
 
     def test_record_prediction_challenger(self, deployment_manager):
         """Test recording challenger prediction."""
@@ -139,9 +138,9 @@ class TestABTestDeploymentManager:
             had_error=False,
         )
 
-        assert len(deployment_manager.challenger_metrics["latencies"]) == 1
-        assert deployment_manager.challenger_metrics["latencies"][0] == 0.9
-        assert len(deployment_manager.champion_metrics["latencies"]) == 0
+        assert deployment_manager.challenger_metrics.requests == 1
+        assert deployment_manager.challenger_metrics.latency.mean == 0.9
+        assert deployment_manager.champion_metrics.requests == 0
 
     @pytest.mark.asyncio
     async def test_evaluate_pilot(self, deployment_manager):
@@ -162,6 +161,62 @@ class TestABTestDeploymentManager:
         assert metrics.champion_avg_latency_ms == 0.8
         assert metrics.challenger_avg_latency_ms == 0.9
 
+    @staticmethod
+    def _record_shifted_predictions(manager, samples=50):
+        """Challenger predictions clearly above the champion's."""
+        for i in range(samples):
+            manager.record_prediction(
+                is_champion=True, latency_ms=0.8, prediction=0.40 + (i % 5) * 0.01
+            )
+            manager.record_prediction(
+                is_champion=False, latency_ms=0.9, prediction=0.60 + (i % 5) * 0.01
+            )
+
+    @pytest.mark.asyncio
+    async def test_shifted_scores_without_feedback_hold_promotion(self, deployment_manager):
+        """Test a significant score shift alone doesn't promote by default."""
+        self._record_shifted_predictions(deployment_manager)
+
+        metrics = await deployment_manager._collect_and_analyze_metrics()
+
+        assert metrics.is_statistically_significant
+        assert metrics.recommendation == "continue"
+
+    @pytest.mark.asyncio
+    async def test_promotes_on_significance_when_auc_gate_off(self, test_config, test_registry, caplog):
+        """Test the AUC gate can be turned off, and says so when skipped."""
+        test_config.require_auc_feedback = False
+        manager = ABTestDeploymentManager(test_config, test_registry)
+        self._record_shifted_predictions(manager)
+
+        with caplog.at_level(logging.WARNING):
+            metrics = await manager._collect_and_analyze_metrics()
+
+        assert metrics.recommendation == "promote"
+        assert "AUC gate skipped" in caplog.text
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "champion_scores, expected",
+        [
+            ([0.5, 0.5], "promote"),  # Challenger AUC 1.0 vs 0.5
+            ([0.1, 0.9], "continue"),  # Both 1.0: no AUC improvement
+        ],
+    )
+    async def test_feedback_auc_gates_promotion(
+        self, deployment_manager, champion_scores, expected
+    ):
+        """Test labelled feedback decides promotion once it is available."""
+        self._record_shifted_predictions(deployment_manager)
+        labels = [0, 1] * 50
+
+        deployment_manager.record_feedback(True, champion_scores * 50, labels)
+        deployment_manager.record_feedback(False, [0.1, 0.9] * 50, labels)
+
+        metrics = await deployment_manager._collect_and_analyze_metrics()
+        assert metrics.is_statistically_significant
+        assert metrics.recommendation == expected
+
     def test_get_status(self, deployment_manager):
         """Test getting deployment status."""
         status = deployment_manager.get_status()
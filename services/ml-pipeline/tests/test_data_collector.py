@@ -1,13 +1,15 @@
 """Unit tests for automated data collection pipeline."""
 import asyncio
+import contextlib
 import pytest
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
-import sys
-sys.path.append("..")
 
-from data_collector import DataCollector, DataCollectionConfig
+from ml_pipeline.data_collector import DataCollector, DataCollectionConfig
+from ml_pipeline.data_extraction import day_partitions
+from ml_pipeline.feature_store import FeatureStore
 
 
 @pytest.fixture
@@ -30,6 +32,70 @@ def data_collector(test_config):
     return DataCollector(test_config)
 
 
+class FakeCursor:
+    """asyncpg-style cursor over in-memory records."""
+
+    def __init__(self, records, fetch_sizes):
+        self.records = records
+        self.fetch_sizes = fetch_sizes
+
+    async def fetch(self, n):
+        self.fetch_sizes.append(n)
+        batch, self.records = self.records[:n], self.records[n:]
+        return batch
+
+
+class FakeConnection:
+    """asyncpg-style connection returning records in a timestamp window."""
+
+    def __init__(self, records):
+        self.records = records
+        self.fetch_sizes = []
+        self.queries = 0
+
+    def transaction(self):
+        return contextlib.AsyncExitStack()
+
+    async def cursor(self, query, start, end):
+        self.queries += 1
+        window = [r for r in self.records if start <= r["timestamp"] < end]
+        return FakeCursor(window, self.fetch_sizes)
+
+    async def close(self):
+        pass
+
+
+def make_records(start, hours):
+    """Create one CDR per hour with a matching label 2s later."""
+    cdrs, labels = [], []
+    for i in range(hours):
+        timestamp = start + timedelta(hours=i)
+        b_number = f"23480{i:08d}"
+        cdrs.append({
+            "timestamp": timestamp,
+            "b_number": b_number,
+            "a_number": "2348011111111",
+            "call_duration": 30.0,
+            "call_status": "answered",
+            "asr": float(i % 100),
+            "aloc": 60.0,
+            "distinct_a_count": 3,
+            "call_rate": 1.0,
+            "overlap_ratio": 0.5,
+            "short_call_ratio": 0.2,
+            "has_cli_mismatch": i % 5 == 0,
+        })
+        labels.append({
+            "b_number": b_number,
+            "timestamp": timestamp + timedelta(seconds=2),
+            "is_fraud": i % 4 == 0,
+            "fraud_probability": 0.9 if i % 4 == 0 else 0.1,
+            "fraud_type": "cli_masking" if i % 4 == 0 else "none",
+            "detection_method": "rule_based",
+        })
+    return cdrs, labels
+
+
 class TestDataCollector:
     """Tests for DataCollector."""
 
@@ -82,8 +148,8 @@ class TestDataCollector:
             assert col in training_df.columns
 
         # Verify data types
-        assert training_df["is_fraud"].dtype in [int, bool]
-        assert training_df["cli_mismatch"].dtype in [int, bool]
+        assert pd.api.types.is_integer_dtype(training_df["is_fraud"])
+        assert pd.api.types.is_integer_dtype(training_df["cli_mismatch"])
 
     @pytest.mark.asyncio
     async def test_extract_cdr_metrics(self, data_collector):
@@ -141,6 +207,62 @@ class TestDataCollector:
         assert (cleaned_df["overlap_ratio"] >= 0).all()
         assert (cleaned_df["overlap_ratio"] <= 1).all()
 
+    def test_validate_and_clean_drops_duplicates_and_missing(self, data_collector):
+        """Test duplicates and rows with missing values are removed in one pass."""
+        row = {
+            "asr": 50.0, "aloc": 100.0, "overlap_ratio": 0.5, "cli_mismatch": 0,
+            "distinct_a_count": 3.0, "call_rate": 1.0, "short_call_ratio": 0.2,
+            "high_volume_flag": 0, "is_fraud": 0,
+        }
+        test_df = pd.DataFrame([row, row, {**row, "asr": None}, {**row, "is_fraud": 1}])
+
+        cleaned_df = data_collector._validate_and_clean(test_df)
+
+        assert cleaned_df["is_fraud"].tolist() == [0, 1]
+
+    def test_merge_matches_labels_by_number_and_time(self, data_collector):
+        """Test labels match the same b_number within the tolerance only."""
+        t0 = pd.Timestamp("2026-02-03 12:00:00")
+        cdr_data = pd.DataFrame({
+            "timestamp": [t0, t0, t0 + pd.Timedelta("1min")],
+            "b_number": ["2348011", "2348022", "2348011"],
+            "asr": [50.0, 60.0, 70.0],
+            "aloc": [100.0, 100.0, 100.0],
+            "overlap_ratio": [0.5, 0.5, 0.5],
+            "distinct_a_count": [12, 3, 3],
+            "call_rate": [1.0, 1.0, 1.0],
+            "short_call_ratio": [0.2, 0.2, 0.2],
+            "has_cli_mismatch": [True, False, None],
+        })
+        fraud_labels = pd.DataFrame({
+            "timestamp": [t0 + pd.Timedelta("2s"), t0 + pd.Timedelta("1min")],
+            "b_number": pd.Categorical(["2348011", "2348033"]),
+            "is_fraud": [1, 0],
+        })
+
+        features = data_collector._merge_and_engineer_features(cdr_data, fraud_labels)
+
+        assert features.to_dict("records") == [{
+            "asr": 50.0, "aloc": 100.0, "overlap_ratio": 0.5, "cli_mismatch": 1,
+            "distinct_a_count": 12.0, "call_rate": 1.0, "short_call_ratio": pytest.approx(0.2),
+            "high_volume_flag": 1, "is_fraud": 1,
+        }]
+
+    def test_match_labels_agrees_with_merge_asof(self, data_collector):
+        """Test the combined-key label match picks what merge_asof picks."""
+        rng = np.random.default_rng(7)
+        start = np.datetime64("2026-02-03T00:00:00", "us")
+        cdr_keys = rng.integers(-1, 50, 5000)
+        cdr_times = start + rng.integers(0, 600_000_000, 5000).astype("timedelta64[us]")
+        label_keys = rng.integers(0, 50, 800)
+        label_times = start + rng.integers(0, 600_000_000, 800).astype("timedelta64[us]")
+
+        match = data_collector._match_labels(cdr_keys, cdr_times, label_keys, label_times)
+        expected = data_collector._match_labels_asof(cdr_keys, cdr_times, label_keys, label_times)
+
+        assert (match >= 0).sum() > 100
+        np.testing.assert_array_equal(match, expected)
+
     def test_balance_dataset(self, data_collector):
         """Test dataset balancing."""
         # Create imbalanced dataset (90% non-fraud, 10% fraud)
@@ -209,5 +331,148 @@ class TestDataCollector:
         assert data_collector._yugabyte_conn is None
 
 
+class TestStreamingCollection:
+    """Tests for day-partitioned streaming extraction."""
+
+    def test_day_partitions(self):
+        """Test windows are split on calendar days and clipped."""
+        partitions = day_partitions(datetime(2026, 2, 1, 18), datetime(2026, 2, 3, 6))
+
+        assert partitions == [
+            (datetime(2026, 2, 1, 18), datetime(2026, 2, 2)),
+            (datetime(2026, 2, 2), datetime(2026, 2, 3)),
+            (datetime(2026, 2, 3), datetime(2026, 2, 3, 6)),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_collect_streams_into_day_shards(self, tmp_path):
+        """Test both sources are streamed in batches and merged per day."""
+        config = DataCollectionConfig(
+            extraction_mode="database",
+            fetch_batch_size=7,
+            min_samples=1,
+            output_path=str(tmp_path),
+        )
+        collector = DataCollector(config)
+
+        start = datetime(2026, 2, 1)
+        cdrs, labels = make_records(start, hours=48)
+
+        collector._questdb_conn = FakeConnection(cdrs)
+        collector._yugabyte_conn = FakeConnection(labels)
+
+        training_df = await collector.collect_training_data(start, start + timedelta(days=2))
+
+        # Every CDR matched its label; fraud oversampled to ~30%
+        assert collector.fraud_records == 12
+        assert collector.non_fraud_records == 36
+        assert len(training_df) > 48
+
+        # Flags come from the data, features are float32
+        assert training_df["cli_mismatch"].sum() > 0
+        assert training_df["asr"].dtype == "float32"
+
+        # Fetched in cursor-sized batches, one directory per source and day
+        assert set(collector._questdb_conn.fetch_sizes) == {7}
+        for source in ("cdr_metrics", "fraud_labels"):
+            days = sorted(p.name for p in (tmp_path / "staging" / source).iterdir())
+            assert days == ["date=2026-02-01", "date=2026-02-02"]
+        assert len(list((tmp_path / "staging/cdr_metrics/date=2026-02-01").glob("*.parquet"))) == 4
+
+
+class TestFeatureStore:
+    """Tests for incremental collection through the feature store."""
+
+    @pytest.fixture
+    def collector(self, tmp_path):
+        config = DataCollectionConfig(
+            extraction_mode="database",
+            min_samples=1,
+            output_path=str(tmp_path),
+            feature_store_path=str(tmp_path / "feature_store"),
+        )
+        collector = DataCollector(config)
+        cdrs, labels = make_records(datetime(2026, 2, 1), hours=24 * 4)
+        collector._questdb_conn = FakeConnection(cdrs)
+        collector._yugabyte_conn = FakeConnection(labels)
+        return collector
+
+    @pytest.mark.asyncio
+    async def test_second_run_only_builds_new_days(self, collector):
+        """Test full days are reused and only the new day is queried."""
+        await collector.collect_training_data(datetime(2026, 2, 1), datetime(2026, 2, 4))
+        assert collector._questdb_conn.queries == 3
+
+        await collector.collect_training_data(datetime(2026, 2, 2), datetime(2026, 2, 5))
+
+        assert collector._questdb_conn.queries == 4
+        assert collector.feature_store.hits == 2
+        assert [p.date for p in collector.feature_store.list_partitions()] == [
+            "2026-02-01", "2026-02-02", "2026-02-03", "2026-02-04",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_partial_days_are_not_stored(self, collector):
+        """Test the partial days at the window edges are always rebuilt."""
+        await collector.collect_training_data(
+            datetime(2026, 2, 1, 12), datetime(2026, 2, 3, 6)
+        )
+
+        assert [p.date for p in collector.feature_store.list_partitions()] == ["2026-02-02"]
+
+    @pytest.mark.asyncio
+    async def test_label_rule_change_rebuilds_partitions(self, collector):
+        """Test partitions built with other label rules are stale."""
+        await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 3))
+        assert collector._questdb_conn.queries == 2
+
+        # Nothing to do while the rules are unchanged
+        assert await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 3)) == []
+
+        collector.config.fraud_label_threshold = 0.8
+        assert collector.feature_store.invalidate(
+            fingerprint=collector.feature_fingerprint()
+        ) == ["2026-02-01", "2026-02-02"]
+
+        built = await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 3))
+        assert built == ["2026-02-01", "2026-02-02"]
+        assert collector._questdb_conn.queries == 4
+
+    @pytest.mark.asyncio
+    async def test_synthetic_partitions_are_rebuilt_from_the_database(self, collector):
+        """Test days stored by synthetic extraction are stale for database extraction."""
+        collector.config.extraction_mode = "synthetic"
+        assert await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 2)) == ["2026-02-01"]
+        assert collector._questdb_conn.queries == 0
+
+        collector.config.extraction_mode = "database"
+        built = await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 2))
+
+        assert built == ["2026-02-01"]
+        assert collector._questdb_conn.queries == 1
+        assert collector.feature_store.list_partitions()[0].rows == 24
+
+    def test_write_partition_drops_duplicate_rows(self, tmp_path):
+        """Test a stored day keeps one copy of each repeated row."""
+        store = FeatureStore(str(tmp_path / "feature_store"))
+        day = pd.DataFrame({"asr": [0.5, 0.5, 0.7, 0.5], "is_fraud": [1, 1, 0, 0]})
+
+        store.write_partition(datetime(2026, 2, 1), day, "fp")
+
+        stored = store.read_partition(datetime(2026, 2, 1))
+        assert stored.values.tolist() == [[0.5, 1], [0.7, 0], [0.5, 0]]
+        assert store.list_partitions()[0].rows == 3
+
+    @pytest.mark.asyncio
+    async def test_manifest_survives_restart(self, collector, tmp_path):
+        """Test a new store instance sees partitions from the manifest."""
+        await collector.backfill(datetime(2026, 2, 1), datetime(2026, 2, 2))
+
+        store = FeatureStore(str(tmp_path / "feature_store"))
+
+        assert store.has_partition(datetime(2026, 2, 1), collector.feature_fingerprint())
+        assert store.list_partitions()[0].rows == 24
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
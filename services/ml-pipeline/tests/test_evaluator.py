@@ -0,0 +1,71 @@
+"""Tests for model evaluation."""
+import numpy as np
+import pytest
+from sklearn.metrics import precision_recall_curve, roc_auc_score, roc_curve
+
+from ml_pipeline.training.evaluator import ModelEvaluator
+
+
+@pytest.fixture
+def predictions():
+    """Labels and float32 scores with plenty of ties."""
+    rng = np.random.default_rng(0)
+    y_true = (rng.random(20000) < 0.1).astype(int)
+    scores = np.clip(rng.normal(0.3 + 0.4 * y_true, 0.2), 0, 1)
+    return y_true, np.round(scores, 3).astype(np.float32)
+
+
+def test_threshold_sensitivity_matches_evaluate(predictions):
+    """Test the sweep agrees with a full evaluate at every threshold."""
+    y_true, scores = predictions
+    evaluator = ModelEvaluator(threshold=0.7)
+    thresholds = [0.0, 0.25, 0.5, 0.7, 0.9, 1.01]
+
+    results = evaluator.evaluate_threshold_sensitivity(y_true, scores, thresholds)
+
+    assert evaluator.threshold == 0.7
+    assert list(results) == thresholds
+    for threshold in thresholds:
+        expected = evaluator.evaluate(y_true, scores, threshold=threshold).to_dict()
+        actual = results[threshold].to_dict()
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value), (threshold, key)
+
+
+def test_sweep_curves_match_sklearn(predictions):
+    """Test ROC/PR curves and AUC against sklearn."""
+    y_true, scores = predictions
+    sweep = ModelEvaluator().sweep_thresholds(y_true, scores)
+
+    assert sweep.auc_score == pytest.approx(roc_auc_score(y_true, scores))
+
+    fpr, tpr, _ = sweep.roc_curve()
+    sk_fpr, sk_tpr, _ = roc_curve(y_true, scores, drop_intermediate=False)
+    np.testing.assert_allclose(fpr, sk_fpr)
+    np.testing.assert_allclose(tpr, sk_tpr)
+
+    precision, recall, thresholds = sweep.pr_curve()
+    sk_precision, sk_recall, sk_thresholds = precision_recall_curve(y_true, scores)
+    # sklearn lists thresholds ascending and appends the (1, 0) end point
+    np.testing.assert_allclose(thresholds, sk_thresholds[::-1])
+    np.testing.assert_allclose(precision, sk_precision[-2::-1])
+    np.testing.assert_allclose(recall, sk_recall[-2::-1])
+
+    # Default thresholds are the distinct scores
+    np.testing.assert_array_equal(sweep.thresholds, thresholds)
+
+
+def test_best_threshold(predictions):
+    """Test picking a threshold from the sweep."""
+    y_true, scores = predictions
+    sweep = ModelEvaluator().sweep_thresholds(y_true, scores, np.linspace(0, 1, 101))
+
+    best = sweep.best_threshold("f1_score")
+    assert sweep.f1_score[np.isclose(sweep.thresholds, best)][0] == sweep.f1_score.max()
+
+    strict = sweep.best_threshold("recall", min_precision=0.9)
+    assert sweep.precision[np.isclose(sweep.thresholds, strict)][0] >= 0.9
+
+    with pytest.raises(ValueError):
+        sweep.best_threshold("recall", min_precision=1.1)
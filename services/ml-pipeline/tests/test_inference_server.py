@@ -0,0 +1,408 @@
+"""Tests for the gRPC inference server."""
+import asyncio
+import time
+
+import grpc
+import numpy as np
+import pytest
+import pytest_asyncio
+
+xgb = pytest.importorskip("xgboost")
+
+from ml_pipeline.ab_testing.deployment_manager import ABTestConfig, ABTestDeploymentManager
+from ml_pipeline.benchmarks.load_test import run_load_test
+from ml_pipeline.inference_server import InferenceServer, MultiProcessInferenceServer, PredictionRequest
+from ml_pipeline.model_registry import ModelRegistry, ModelMetadata
+from ml_pipeline.sqlite_registry import SQLiteModelRegistry
+from ml_pipeline.protos import inference_pb2, inference_pb2_grpc
+
+HIGH_RISK = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+LOW_RISK = [80.0, 200.0, 0.1, 0.0, 1.0, 0.2, 0.1, 0.0]
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    """Create a registry with a trained champion model."""
+    rng = np.random.default_rng(42)
+    X = rng.random((500, 8))
+    y = ((X[:, 2] > 0.5) & (X[:, 4] > 0.5)).astype(int)
+    booster = xgb.train(
+        {"objective": "binary:logistic", "max_depth": 3},
+        xgb.DMatrix(X, label=y),
+        num_boost_round=20,
+    )
+    model_file = tmp_path / "model.json"
+    booster.save_model(str(model_file))
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    metadata = ModelMetadata(
+        model_id="xgboost_v1.0.0",
+        version="1.0.0",
+        created_at="2026-02-03T12:00:00Z",
+        algorithm="xgboost",
+        training_samples=500,
+        auc_score=0.92,
+        precision=0.88,
+        recall=0.85,
+        f1_score=0.865,
+        accuracy=0.90,
+        features=[],
+        feature_importance={},
+        hyperparameters={},
+        status="candidate",
+    )
+    registry.register_model(str(model_file), metadata)
+    registry.promote_to_champion("xgboost_v1.0.0")
+    return str(tmp_path / "registry")
+
+
+@pytest_asyncio.fixture
+async def server(registry_path):
+    """Start an in-process inference server on a free port."""
+    server = InferenceServer(registry_path=registry_path, host="127.0.0.1", port=0)
+    await server.start()
+    yield server
+    await server.stop(grace=0)
+
+
+@pytest_asyncio.fixture
+async def stub(server):
+    """Create a stub connected to the in-process server."""
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{server.bound_port}") as channel:
+        yield inference_pb2_grpc.InferenceServiceStub(channel)
+
+
+@pytest.mark.asyncio
+async def test_predict(stub):
+    """Test unary prediction round trip."""
+    response = await stub.Predict(
+        inference_pb2.PredictionRequest(features=HIGH_RISK, request_id="req-1"),
+        timeout=5,
+    )
+
+    assert response.request_id == "req-1"
+    assert response.model_version == "xgboost_v1.0.0"
+    assert 0.0 <= response.probability <= 1.0
+    assert response.is_fraud == (response.probability >= 0.7)
+
+
+@pytest.mark.asyncio
+async def test_predict_batch_preserves_order(stub):
+    """Test batch prediction answers in request order."""
+    requests = [
+        inference_pb2.PredictionRequest(
+            features=HIGH_RISK if i % 2 else LOW_RISK, request_id=str(i)
+        )
+        for i in range(20)
+    ]
+
+    response = await stub.PredictBatch(
+        inference_pb2.BatchPredictionRequest(requests=requests), timeout=5
+    )
+
+    assert [r.request_id for r in response.responses] == [str(i) for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_predict_stream(stub):
+    """Test bidirectional streaming returns one response per request."""
+    async def requests():
+        for i in range(50):
+            yield inference_pb2.PredictionRequest(features=HIGH_RISK, request_id=f"s-{i}")
+
+    responses = [r async for r in stub.PredictStream(requests(), timeout=10)]
+
+    assert sorted(r.request_id for r in responses) == sorted(f"s-{i}" for i in range(50))
+
+
+@pytest.mark.asyncio
+async def test_round_trip_latency(stub, server):
+    """Measure unary round-trip latency against the in-process server."""
+    request = inference_pb2.PredictionRequest(features=HIGH_RISK)
+    await stub.Predict(request, timeout=5)  # warm up the connection
+
+    latencies = []
+    for _ in range(200):
+        start = time.perf_counter()
+        await stub.Predict(request, timeout=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"\nPredict round trip: p50={p50:.2f}ms p99={p99:.2f}ms")
+
+    assert server.total_requests >= 201
+    assert p50 < 50.0
+
+
+@pytest.mark.asyncio
+async def test_deadline_exceeded(stub, server):
+    """Test an expired client deadline is reported as DEADLINE_EXCEEDED."""
+    # With the batcher stopped, requests queue until the deadline passes
+    await server.stop_batch_processor()
+
+    with pytest.raises(grpc.aio.AioRpcError) as exc_info:
+        await stub.Predict(inference_pb2.PredictionRequest(features=HIGH_RISK), timeout=0.2)
+
+    assert exc_info.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+@pytest.mark.asyncio
+async def test_predict_stream_flow_control(registry_path):
+    """Test a small per-stream window still drains a long stream."""
+    server = InferenceServer(
+        registry_path=registry_path, host="127.0.0.1", port=0, max_stream_in_flight=4
+    )
+    port = await server.start()
+
+    async def requests():
+        for i in range(100):
+            yield inference_pb2.PredictionRequest(features=LOW_RISK, request_id=str(i))
+
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = inference_pb2_grpc.InferenceServiceStub(channel)
+            responses = [r async for r in stub.PredictStream(requests(), timeout=10)]
+    finally:
+        await server.stop(grace=0)
+
+    assert len(responses) == 100
+    assert server.total_requests == 100
+
+
+@pytest.mark.asyncio
+async def test_batch_splits_per_request_between_models(registry_path):
+    """Test one batch is split across champion and challenger per request."""
+    server = InferenceServer(
+        registry_path=registry_path, port=0, batch_size=64, enable_ab_testing=True
+    )
+    champion_path = server.registry.get_model_path("xgboost_v1.0.0")
+    challenger = ModelRegistry(registry_path).get_metadata("xgboost_v1.0.0")
+    challenger.model_id = "xgboost_v2.0.0"
+    challenger.status = "candidate"
+    server.registry.register_model(champion_path, challenger)
+    assert server.set_challenger_model("xgboost_v2.0.0")
+
+    requests = [PredictionRequest(features=HIGH_RISK, request_id=f"r-{i}") for i in range(200)]
+    expected = server.assign_models(requests)
+
+    await server.start_batch_processor()
+    try:
+        responses = await asyncio.gather(*(server.submit(r) for r in requests))
+    finally:
+        await server.stop_batch_processor()
+
+    versions = [r.model_version for r in responses]
+    assert versions == [
+        "xgboost_v2.0.0" if use_b else "xgboost_v1.0.0" for use_b in expected
+    ]
+    assert server.total_batches < len(requests)
+    assert server.challenger_requests == int(expected.sum())
+
+
+@pytest.mark.asyncio
+async def test_shadow_mode_pairs_predictions_off_the_hot_path(registry_path):
+    """Test the champion answers everything and the challenger is scored in shadow."""
+    deployment = ABTestDeploymentManager(
+        ABTestConfig("xgboost_v1.0.0", "xgboost_v2.0.0"), ModelRegistry(registry_path)
+    )
+    server = InferenceServer(
+        registry_path=registry_path, port=0, shadow_mode=True,
+        shadow_queue_batches=50, ab_deployment=deployment,
+    )
+    champion_path = server.registry.get_model_path("xgboost_v1.0.0")
+    challenger = ModelRegistry(registry_path).get_metadata("xgboost_v1.0.0")
+    challenger.model_id = "xgboost_v2.0.0"
+    server.registry.register_model(champion_path, challenger)
+    assert server.set_challenger_model("xgboost_v2.0.0")
+
+    await server.start_batch_processor()
+    try:
+        responses = await asyncio.gather(
+            *(server.submit(PredictionRequest(features=HIGH_RISK, request_id=f"r-{i}")) for i in range(50))
+        )
+        await asyncio.to_thread(server.shadow_executor.submit(lambda: None).result)
+
+        # With every shadow slot taken, batches are shed, not queued
+        for _ in range(server.shadow_queue_batches):
+            server._shadow_slots.acquire()
+        await server.submit(PredictionRequest(features=LOW_RISK))
+        for _ in range(server.shadow_queue_batches):
+            server._shadow_slots.release()
+    finally:
+        await server.stop_batch_processor()
+
+    assert {r.model_version for r in responses} == {"xgboost_v1.0.0"}
+    assert server.shadow_requests == 50
+    assert server.shadow_dropped == 1
+    assert deployment.challenger_metrics.requests == 50
+    assert deployment.paired_differences.count == 50
+    assert deployment.paired_differences.mean == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shadow_mode", [False, True])
+async def test_handle_request_takes_the_batch_path(registry_path, shadow_mode):
+    """Test unbatched requests keep sticky A/B assignment and shadow mode."""
+    server = InferenceServer(
+        registry_path=registry_path, port=0, enable_ab_testing=True,
+        shadow_mode=shadow_mode, shadow_queue_batches=100,
+    )
+    champion_path = server.registry.get_model_path("xgboost_v1.0.0")
+    challenger = ModelRegistry(registry_path).get_metadata("xgboost_v1.0.0")
+    challenger.model_id = "xgboost_v2.0.0"
+    server.registry.register_model(champion_path, challenger)
+    assert server.set_challenger_model("xgboost_v2.0.0")
+
+    requests = [PredictionRequest(features=HIGH_RISK, request_id=f"r-{i}") for i in range(100)]
+    expected = server.assign_models(requests)
+
+    await server.start_batch_processor()
+    try:
+        first = [await server.handle_request(r) for r in requests]
+        second = [await server.handle_request(r) for r in requests]
+        if shadow_mode:
+            await asyncio.to_thread(server.shadow_executor.submit(lambda: None).result)
+    finally:
+        await server.stop_batch_processor()
+
+    versions = ["xgboost_v2.0.0" if use_b else "xgboost_v1.0.0" for use_b in expected]
+    assert [r.model_version for r in first] == versions
+    assert [r.model_version for r in second] == versions
+    assert server.challenger_requests == 2 * int(expected.sum())
+
+    if shadow_mode:
+        assert not expected.any()
+        assert server.shadow_requests == 2 * len(requests)
+    else:
+        assert expected.any()
+        assert server.shadow_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_bad_request_fails_only_its_batch(registry_path):
+    """Test malformed features fail their callers without killing the batcher."""
+    server = InferenceServer(registry_path=registry_path, port=0)
+    await server.start_batch_processor()
+    try:
+        with pytest.raises(ValueError):
+            await server.submit(PredictionRequest(features=[1.0, 2.0]))
+
+        response = await server.submit(PredictionRequest(features=LOW_RISK))
+        assert 0.0 <= response.probability <= 1.0
+    finally:
+        await server.stop_batch_processor()
+
+
+@pytest.mark.asyncio
+async def test_multiprocess_server_matches_in_process_scores(registry_path):
+    """Test worker processes score exactly like the in-process server."""
+    features = [HIGH_RISK if i % 3 else LOW_RISK for i in range(100)]
+    requests = [PredictionRequest(features=f, request_id=str(i)) for i, f in enumerate(features)]
+
+    reference = InferenceServer(registry_path=registry_path, port=0)
+    expected, _ = reference.score_batch(features, np.zeros(len(features), dtype=bool))
+
+    server = MultiProcessInferenceServer(
+        registry_path=registry_path, port=0, num_processes=2, batch_size=16
+    )
+    await server.start_batch_processor()
+    try:
+        responses = await asyncio.gather(*(server.submit(r) for r in requests))
+        assert server.get_metrics()["worker_processes"] == 2
+    finally:
+        await server.stop_batch_processor()
+
+    np.testing.assert_allclose([r.probability for r in responses], expected, rtol=1e-6)
+    assert all(r.model_version == "xgboost_v1.0.0" for r in responses)
+    assert server.worker_pool is None
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_respawns_dead_worker(registry_path):
+    """Test a crashed worker is respawned and callers wait instead of erroring."""
+    server = MultiProcessInferenceServer(
+        registry_path=registry_path, port=0, num_processes=2, batch_size=16
+    )
+    await server.start_batch_processor()
+    pool = server.worker_pool
+    try:
+        pool._workers[0].process.kill()
+        for _ in range(100):
+            if pool.live_workers == 1:
+                break
+            await asyncio.sleep(0.05)
+        assert pool.live_workers == 1
+
+        # More batches than the surviving worker has slots all wait their turn
+        matrix = np.array([LOW_RISK] * 16, dtype=np.float32)
+        mask = np.zeros(16, dtype=bool)
+        results = await asyncio.gather(*(pool.score(matrix, mask) for _ in range(4 * pool.slots_per_worker)))
+        assert len(results) == 4 * pool.slots_per_worker
+
+        for _ in range(300):
+            if pool.live_workers == 2:
+                break
+            await asyncio.sleep(0.1)
+        assert pool.live_workers == 2
+        assert pool.workers_respawned == 1
+
+        # The respawned worker scores with the current champion
+        scores = await asyncio.gather(*(pool.score(matrix, mask) for _ in range(8)))
+        np.testing.assert_allclose(scores[0], scores[-1])
+    finally:
+        await server.stop_batch_processor()
+
+
+@pytest.mark.asyncio
+async def test_load_test_harness(registry_path):
+    """Test the load-test harness reports throughput and latency."""
+    result = await run_load_test(
+        registry_path, batch_size=16, batch_timeout_ms=2, concurrency=8, duration_seconds=0.5
+    )
+
+    assert result.requests > 0
+    assert result.errors == 0
+    assert result.throughput_rps > 0
+    assert result.p99_ms >= result.p50_ms
+    assert result.avg_batch_size >= 1.0
+
+
+@pytest.mark.asyncio
+async def test_registry_poll_swaps_champion(registry_path, tmp_path):
+    """Test a champion promoted by another process is picked up by polling."""
+    # Opening SQLite on the JSON registry imports it
+    SQLiteModelRegistry(registry_path).close()
+
+    server = InferenceServer(
+        registry_path=registry_path, host="127.0.0.1", port=0, registry_poll_seconds=0.02
+    )
+    assert isinstance(server.registry, SQLiteModelRegistry)
+    await server.start()
+    try:
+        before = server.score_batch([HIGH_RISK], np.zeros(1, dtype=bool))[0][0]
+
+        # An inverted model from "the orchestrator", via its own connection
+        X = np.random.default_rng(0).random((500, 8))
+        y = ((X[:, 2] <= 0.5) | (X[:, 4] <= 0.5)).astype(int)
+        booster = xgb.train(
+            {"objective": "binary:logistic", "max_depth": 3}, xgb.DMatrix(X, label=y), 20
+        )
+        model_file = tmp_path / "model_v2.json"
+        booster.save_model(str(model_file))
+
+        orchestrator_registry = SQLiteModelRegistry(registry_path)
+        metadata = orchestrator_registry.get_metadata("xgboost_v1.0.0")
+        metadata.model_id, metadata.version, metadata.status = "xgboost_v2.0.0", "2.0.0", "candidate"
+        orchestrator_registry.register_model(str(model_file), metadata)
+        orchestrator_registry.promote_to_champion("xgboost_v2.0.0")
+        orchestrator_registry.close()
+
+        deadline = time.monotonic() + 5
+        while server.champion_id != "xgboost_v2.0.0" and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+
+        assert server.champion_id == "xgboost_v2.0.0"
+        after = server.score_batch([HIGH_RISK], np.zeros(1, dtype=bool))[0][0]
+        assert after < before
+    finally:
+        await server.stop(grace=0)
@@ -5,7 +5,8 @@ from pathlib import Path
 
 import pytest
 
-from ..model_registry import ModelRegistry, ModelMetadata
+from ml_pipeline.model_registry import ModelRegistry, ModelMetadata, open_registry
+from ml_pipeline.sqlite_registry import SQLiteModelRegistry
 
 
 @pytest.fixture
@@ -226,3 +227,107 @@ def test_archive_model(temp_registry, sample_metadata):
         assert metadata.status == "archived"
     finally:
         Path(model_path).unlink()
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    """Create a dummy model file."""
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps({"dummy": "model"}))
+    return str(path)
+
+
+def make_metadata(model_id: str, auc: float = 0.9, created_at: str = "2026-02-03T12:00:00Z"):
+    """Create metadata for a candidate model."""
+    return ModelMetadata(
+        model_id=model_id,
+        version=model_id.removeprefix("xgboost_v"),
+        created_at=created_at,
+        algorithm="xgboost",
+        training_samples=10000,
+        auc_score=auc,
+        precision=0.88,
+        recall=0.85,
+        f1_score=0.865,
+        accuracy=0.90,
+        features=["asr"],
+        feature_importance={"asr": 1.0},
+        hyperparameters={},
+        status="candidate",
+    )
+
+
+def test_sqlite_registry_lifecycle(tmp_path, model_file):
+    """Test register, list, promote and delete on the SQLite backend."""
+    registry = SQLiteModelRegistry(str(tmp_path / "registry"))
+    for i in range(3):
+        registry.register_model(
+            model_file, make_metadata(f"xgboost_v1.{i}.0", 0.9 + i / 100, f"2026-02-0{i + 1}T00:00:00Z")
+        )
+
+    assert [m["model_id"] for m in registry.list_models()] == [
+        "xgboost_v1.2.0", "xgboost_v1.1.0", "xgboost_v1.0.0"
+    ]
+    assert Path(registry.get_model_path("xgboost_v1.0.0")).exists()
+    assert registry.get_champion() is None
+
+    assert registry.promote_to_champion("xgboost_v1.0.0")
+    assert registry.promote_to_champion("xgboost_v1.1.0")
+    assert not registry.promote_to_champion("xgboost_v9.9.9")
+
+    assert registry.get_champion()[0] == "xgboost_v1.1.0"
+    old = registry.get_metadata("xgboost_v1.0.0")
+    assert old.status == "archived"
+    assert old.replaced_by == "xgboost_v1.1.0"
+    assert [m["model_id"] for m in registry.list_models(status="champion")] == ["xgboost_v1.1.0"]
+
+    assert registry.compare_models("xgboost_v1.0.0", "xgboost_v1.2.0")["winner"] == "xgboost_v1.2.0"
+    assert not registry.delete_model("xgboost_v1.1.0")  # champion
+    assert registry.delete_model("xgboost_v1.2.0")
+    assert registry.get_metadata("xgboost_v1.2.0") is None
+
+    events = [(c["model_id"], c["event"]) for c in registry.changes_since(0)]
+    assert events[-3:] == [
+        ("xgboost_v1.0.0", "champion"),
+        ("xgboost_v1.1.0", "champion"),
+        ("xgboost_v1.2.0", "deleted"),
+    ]
+    assert registry.version == len(events)
+
+
+def test_sqlite_registry_sees_other_connections(tmp_path, model_file):
+    """Test the cached champion and change feed follow another process's writes."""
+    path = str(tmp_path / "registry")
+    reader = SQLiteModelRegistry(path)
+    writer = SQLiteModelRegistry(path)
+
+    writer.register_model(model_file, make_metadata("xgboost_v1.0.0"))
+    writer.promote_to_champion("xgboost_v1.0.0")
+    seen = reader.version
+    assert reader.get_champion()[0] == "xgboost_v1.0.0"
+
+    writer.register_model(model_file, make_metadata("xgboost_v1.1.0"))
+    writer.promote_to_champion("xgboost_v1.1.0")
+
+    assert reader.get_champion()[0] == "xgboost_v1.1.0"
+    assert [c["event"] for c in reader.changes_since(seen)] == ["registered", "champion"]
+
+
+def test_open_registry_imports_json(tmp_path, model_file):
+    """Test migrating a JSON registry to SQLite and backend detection."""
+    path = str(tmp_path / "registry")
+    json_registry = ModelRegistry(path)
+    json_registry.register_model(model_file, make_metadata("xgboost_v1.0.0"))
+    json_registry.register_model(model_file, make_metadata("xgboost_v1.1.0"))
+    json_registry.promote_to_champion("xgboost_v1.1.0")
+
+    assert type(open_registry(path)) is ModelRegistry
+
+    registry = open_registry(path, backend="sqlite")
+    assert isinstance(registry, SQLiteModelRegistry)
+    assert registry.get_champion() == json_registry.get_champion()
+    assert len(registry.list_models()) == 2
+
+    assert isinstance(open_registry(path), SQLiteModelRegistry)
+    with pytest.raises(ValueError):
+        open_registry(path, backend="etcd")
@@ -0,0 +1,107 @@
+"""Tests for streaming A/B test statistics."""
+import numpy as np
+import pytest
+from scipy import stats
+from sklearn.metrics import roc_auc_score
+
+from ml_pipeline.ab_testing.deployment_manager import ABTestConfig, ABTestDeploymentManager
+from ml_pipeline.ab_testing.streaming_stats import DDSketch, RunningMoments, StreamingAUC
+from ml_pipeline.model_registry import ModelRegistry
+
+
+def test_running_moments_match_numpy():
+    """Test single, batch and merged updates agree with numpy."""
+    values = np.random.default_rng(0).lognormal(0, 1, 10000)
+
+    single, batched, merged = RunningMoments(), RunningMoments(), RunningMoments()
+    for v in values[:500]:
+        single.update(v)
+    for chunk in np.array_split(values[500:], 7):
+        batched.update_batch(chunk)
+    merged.merge(single)
+    merged.merge(batched)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance() == pytest.approx(values.var())
+    assert merged.variance(ddof=1) == pytest.approx(values.var(ddof=1))
+
+
+def test_ddsketch_quantiles_within_relative_accuracy():
+    """Test latency quantiles are within the sketch's relative error."""
+    latencies = np.random.default_rng(1).lognormal(-0.5, 0.8, 200000)
+    sketch = DDSketch(relative_accuracy=0.01)
+    sketch.update_batch(latencies[:100000])
+    for v in latencies[100000:100100]:
+        sketch.update(v)
+    rest = DDSketch(relative_accuracy=0.01)
+    rest.update_batch(latencies[100100:])
+    sketch.merge(rest)
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = np.quantile(latencies, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.0101)
+    assert len(sketch.bins) < 1000
+
+
+def test_streaming_auc_matches_sklearn():
+    """Test the binned AUC and its feed-in-chunks behaviour."""
+    rng = np.random.default_rng(2)
+    labels = rng.random(50000) < 0.05
+    scores = np.clip(rng.normal(0.3 + 0.3 * labels, 0.15), 0, 1)
+
+    auc = StreamingAUC()
+    for idx in np.array_split(np.arange(len(labels)), 5):
+        auc.update_batch(scores[idx], labels[idx])
+
+    assert auc.auc() == pytest.approx(roc_auc_score(labels, scores), abs=1e-4)
+    assert 0 < auc.standard_error() < 0.01
+    assert np.isnan(StreamingAUC().auc())
+
+
+@pytest.mark.asyncio
+async def test_significance_from_accumulators(tmp_path):
+    """Test the analysis matches a t-test over the raw predictions."""
+    manager = ABTestDeploymentManager(
+        ABTestConfig("champion", "challenger", min_samples_per_model=100),
+        ModelRegistry(str(tmp_path)),
+    )
+    rng = np.random.default_rng(3)
+    champion = rng.beta(2, 8, 3000)
+    challenger = rng.beta(2.2, 8, 2000)
+
+    manager.record_predictions(True, rng.gamma(4, 0.1, 3000), champion)
+    for p in challenger:
+        manager.record_prediction(False, 0.5, p)
+    labels = rng.random(2000) < challenger
+    manager.record_feedback(False, challenger, labels)
+
+    metrics = await manager._collect_and_analyze_metrics()
+
+    assert metrics.p_value == pytest.approx(stats.ttest_ind(champion, challenger).pvalue)
+    assert metrics.champion_requests == 3000
+    assert metrics.challenger_p99_latency_ms == pytest.approx(0.5, rel=0.01)
+    assert metrics.challenger_auc == pytest.approx(roc_auc_score(labels, challenger), abs=1e-3)
+    assert np.isnan(metrics.champion_auc)
+    assert metrics.recommendation == "rollback"  # Challenger AUC below min_auc_score
+
+
+@pytest.mark.asyncio
+async def test_paired_significance_matches_ttest_rel(tmp_path):
+    """Test shadow-mode pairs are analysed with a paired t-test."""
+    manager = ABTestDeploymentManager(
+        ABTestConfig("champion", "challenger", min_samples_per_model=100),
+        ModelRegistry(str(tmp_path)),
+    )
+    rng = np.random.default_rng(4)
+    champion = rng.beta(2, 8, 1000)
+    challenger = np.clip(champion + rng.normal(0.002, 0.01, 1000), 0, 1)
+
+    for idx in np.array_split(np.arange(1000), 10):
+        manager.record_paired_predictions(champion[idx], challenger[idx], 0.4, 0.6)
+
+    metrics = await manager._collect_and_analyze_metrics()
+
+    assert metrics.p_value == pytest.approx(stats.ttest_rel(challenger, champion).pvalue)
+    assert metrics.challenger_requests == 1000
+    assert metrics.challenger_avg_latency_ms == pytest.approx(0.6)
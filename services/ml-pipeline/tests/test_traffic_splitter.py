@@ -0,0 +1,64 @@
+"""Tests for A/B traffic splitting."""
+import threading
+
+import numpy as np
+
+from ml_pipeline.ab_testing.traffic_splitter import TrafficSplitter, stable_bucket
+
+
+def test_bucket_is_pinned():
+    """Test buckets are fixed values, independent of the process hash seed.
+
+    Changing these breaks stickiness for every live experiment.
+    """
+    assert stable_bucket("+27821234567") == 259125998
+    assert stable_bucket("+27821234567", "exp1") == 533951231
+
+
+def test_assign_batch_matches_single_assignment():
+    """Test batch and per-key assignment agree and ramping B is sticky."""
+    keys = [f"call-{i}" for i in range(20000)]
+    splitter = TrafficSplitter(0.9, 0.1)
+
+    batch = splitter.assign_batch(keys)
+    single = np.array([splitter.get_model_assignment(k) == "model_b" for k in keys])
+
+    assert np.array_equal(batch, single)
+    assert abs(batch.mean() - 0.1) < 0.01
+
+    splitter.update_traffic_split(0.7, 0.3)
+    ramped = splitter.assign_batch(keys)
+    assert ramped[batch].all()
+    assert abs(ramped.mean() - 0.3) < 0.015
+
+
+def test_unkeyed_requests_use_seeded_draws():
+    """Test empty keys fall back to reproducible random draws."""
+    draws = [TrafficSplitter(0.5, 0.5, seed=7).assign_batch([""] * 1000) for _ in range(2)]
+
+    assert np.array_equal(draws[0], draws[1])
+    assert 0.4 < draws[0].mean() < 0.6
+
+
+def test_counters_aggregate_across_threads():
+    """Test per-thread counters sum to every assignment made."""
+    splitter = TrafficSplitter(0.8, 0.2, seed=0)
+
+    def work():
+        for i in range(500):
+            splitter.get_model_assignment(f"req-{i}")
+            splitter.should_use_model_b()
+        splitter.assign_batch([f"req-{i}" for i in range(1000)])
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = splitter.get_traffic_stats()
+    assert stats["total_requests"] == 4 * 2000
+    assert stats["model_a_count"] + stats["model_b_count"] == 4 * 2000
+
+    splitter.reset_counters()
+    assert splitter.get_traffic_stats()["total_requests"] == 0
@@ -0,0 +1,170 @@
+"""Tests for model training."""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.data_collector import DataCollectionConfig, DataCollector, valid_feature_rows
+from ml_pipeline.training.external_memory import assign_split, SPLIT_TRAIN, SPLIT_VAL, SPLIT_TEST
+from ml_pipeline.training.hyperparameter_search import HyperparameterSearch
+from ml_pipeline.training.trainer import ModelTrainer
+
+
+def make_features(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate features with a label that depends on them."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "asr": rng.uniform(0, 100, rows).astype(np.float32),
+        "aloc": rng.uniform(0, 300, rows).astype(np.float32),
+        "overlap_ratio": rng.uniform(0, 1, rows).astype(np.float32),
+        "cli_mismatch": rng.integers(0, 2, rows).astype(np.int8),
+        "distinct_a_count": rng.integers(1, 15, rows).astype(np.float32),
+        "call_rate": rng.uniform(0, 3, rows).astype(np.float32),
+        "short_call_ratio": rng.uniform(0, 0.5, rows).astype(np.float32),
+    })
+    df["high_volume_flag"] = (df["distinct_a_count"] > 10).astype(np.int8)
+    df["label"] = ((df["overlap_ratio"] > 0.7) & (df["asr"] < 60)).astype(np.int64)
+    return df
+
+
+@pytest.fixture
+def shard_dir():
+    """Write features as three Parquet shards."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(3):
+            make_features(4000, seed=i).to_parquet(Path(tmpdir) / f"date=2026-02-0{i + 1}.parquet")
+        yield tmpdir
+
+
+def test_assign_split_is_deterministic():
+    """Test the hash split is stable, sized and keeps equal rows together."""
+    df = make_features(20000)
+    split = assign_split(df, test_size=0.2, validation_size=0.1)
+
+    np.testing.assert_array_equal(split, assign_split(df.copy(), test_size=0.2, validation_size=0.1))
+    assert abs((split == SPLIT_TEST).mean() - 0.2) < 0.02
+    assert abs((split == SPLIT_VAL).mean() - 0.1) < 0.02
+    assert abs((split == SPLIT_TRAIN).mean() - 0.7) < 0.02
+
+    doubled = pd.concat([df, df], ignore_index=True)
+    halves = assign_split(doubled).reshape(2, -1)
+    np.testing.assert_array_equal(halves[0], halves[1])
+
+
+def test_prepare_data_from_shards(shard_dir):
+    """Test external-memory training covers every row and learns the label."""
+    trainer = ModelTrainer(n_estimators=30)
+    paths = sorted(Path(shard_dir).glob("*.parquet"))
+
+    dtrain, dval, dtest = trainer.prepare_data_from_shards(paths, batch_rows=1000)
+    assert dtrain.num_row() + dval.num_row() + dtest.num_row() == 12000
+    assert dtrain.num_col() == len(ModelTrainer.FEATURE_NAMES)
+    assert trainer.params["scale_pos_weight"] > 1
+
+    history = trainer.train(dtrain, dval)
+    assert history["val_auc"] > 0.95
+
+    y_pred = trainer.predict_from_dmatrix(dtest)
+    assert len(y_pred) == dtest.num_row()
+
+
+def test_prepare_data_from_shards_cleans_like_in_memory():
+    """Test shard training drops the rows _validate_and_clean drops."""
+    frames = []
+    for i in range(3):
+        df = make_features(2000, seed=i).rename(columns={"label": "is_fraud"})
+        df.loc[df.index[:20], "aloc"] = np.nan
+        df.loc[df.index[20:40], "asr"] = 150
+        df.loc[df.index[40:60], "cli_mismatch"] = 3
+        # Repeats within the shard, across batches and across shards
+        df.iloc[100:150] = df.iloc[1500:1550].to_numpy()
+        df.iloc[1900:1950] = make_features(2000, seed=0).iloc[500:550].to_numpy()
+        frames.append(df)
+
+    cleaned = DataCollector(DataCollectionConfig(min_samples=0))._validate_and_clean(
+        pd.concat(frames, ignore_index=True)
+    )
+    assert len(cleaned) < 6000 - 200
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i, df in enumerate(frames):
+            paths.append(Path(tmpdir) / f"date=2026-02-0{i + 1}.parquet")
+            df.to_parquet(paths[-1])
+
+        dtrain, dval, dtest = ModelTrainer(n_estimators=5).prepare_data_from_shards(
+            paths,
+            label_column="is_fraud",
+            batch_rows=700,
+            row_filter=valid_feature_rows,
+            drop_duplicates=True,
+        )
+
+    assert dtrain.num_row() + dval.num_row() + dtest.num_row() == len(cleaned)
+    assert not np.isnan(dtrain.get_label()).any()
+
+
+def test_prepare_data_from_shards_requires_shards():
+    """Test an empty shard list is rejected."""
+    with pytest.raises(ValueError):
+        ModelTrainer().prepare_data_from_shards([])
+
+
+def test_hyperparameter_search_successive_halving():
+    """Test the search halves the field and returns a usable best model."""
+    df = make_features(6000)
+    trainer = ModelTrainer()
+    X_train, X_val, X_test, y_train, y_val, y_test = trainer.split_data(df)
+
+    search = HyperparameterSearch(
+        trainer.params,
+        ModelTrainer.FEATURE_NAMES,
+        n_trials=6,
+        min_rounds=5,
+        max_rounds=20,
+        reduction_factor=3,
+        max_workers=2,
+    )
+    result = search.run(X_train, y_train, X_val, y_val)
+
+    assert len(result.trials) == 6
+    assert [t.status for t in result.trials].count("completed") == 1
+    assert [t.status for t in result.trials].count("stopped") == 5
+    assert result.best_trial.status == "completed"
+    # Rungs of 5, 15 and 20 rounds: 6 trials -> 2 -> 1
+    assert sorted(len(t.rung_scores) for t in result.trials) == [1, 1, 1, 1, 2, 3]
+    assert len(result.best_trial.rung_scores) == 3
+
+    trainer.apply_search_result(result)
+    assert trainer.params["max_depth"] == result.best_trial.params["max_depth"]
+    assert trainer.predict(X_test).shape == (len(X_test),)
+
+    summary = result.to_metadata()
+    assert summary["best_trial"] == result.best_trial.trial_id
+    assert len(summary["trials"]) == 6
+
+
+def test_hyperparameter_search_on_shard_matrices(shard_dir):
+    """Test shard matrices are built once and shared by in-process trials."""
+    trainer = ModelTrainer()
+    paths = sorted(Path(shard_dir).glob("*.parquet"))
+    dtrain, dval, dtest = trainer.prepare_data_from_shards(paths, batch_rows=1000)
+
+    search = HyperparameterSearch(
+        trainer.params,
+        ModelTrainer.FEATURE_NAMES,
+        n_trials=3,
+        min_rounds=5,
+        max_rounds=15,
+        reduction_factor=3,
+    )
+    result = search.run_on_matrices(dtrain, dval)
+
+    assert result.workers == 1
+    assert [t.status for t in result.trials].count("completed") == 1
+    assert result.best_trial.val_auc > 0.9
+
+    trainer.apply_search_result(result)
+    assert len(trainer.predict_from_dmatrix(dtest)) == dtest.num_row()
@@ -1,7 +1,7 @@
 """Model evaluation and metrics."""
 import logging
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence, Tuple
 
 import numpy as np
 from sklearn.metrics import (
@@ -99,6 +99,99 @@ class EvaluationMetrics:
         return auc_improvement >= min_improvement
 
 
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator, 0.0 where the denominator is 0."""
+    numerator = numerator.astype(np.float64)
+    return np.divide(
+        numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0
+    )
+
+
+@dataclass
+class ThresholdSweep:
+    """Confusion counts and metrics for many thresholds at once.
+
+    Threshold arrays are aligned: index i of every per-threshold array
+    belongs to thresholds[i]. A score counts as positive when it is
+    >= the threshold, as in ModelEvaluator.evaluate. The curve_* arrays
+    hold one point per distinct score, highest score first.
+    """
+
+    thresholds: np.ndarray
+    true_positives: np.ndarray
+    false_positives: np.ndarray
+    true_negatives: np.ndarray
+    false_negatives: np.ndarray
+    precision: np.ndarray
+    recall: np.ndarray
+    f1_score: np.ndarray
+    accuracy: np.ndarray
+    specificity: np.ndarray
+    false_positive_rate: np.ndarray
+
+    # Threshold-free
+    auc_score: float
+    positive_samples: int
+    negative_samples: int
+
+    # ROC/PR curves at every distinct score
+    curve_thresholds: np.ndarray
+    curve_tpr: np.ndarray
+    curve_fpr: np.ndarray
+    curve_precision: np.ndarray
+
+    def roc_curve(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ROC curve as (fpr, tpr, thresholds), starting at (0, 0)."""
+        return (
+            np.concatenate(([0.0], self.curve_fpr)),
+            np.concatenate(([0.0], self.curve_tpr)),
+            np.concatenate(([np.inf], self.curve_thresholds)),
+        )
+
+    def pr_curve(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Precision-recall curve as (precision, recall, thresholds)."""
+        return self.curve_precision, self.curve_tpr, self.curve_thresholds
+
+    def metrics_at(self, index: int) -> EvaluationMetrics:
+        """EvaluationMetrics for thresholds[index]."""
+        tp = int(self.true_positives[index])
+        fn = int(self.false_negatives[index])
+        return EvaluationMetrics(
+            auc_score=self.auc_score,
+            accuracy=float(self.accuracy[index]),
+            precision=float(self.precision[index]),
+            recall=float(self.recall[index]),
+            f1_score=float(self.f1_score[index]),
+            true_positives=tp,
+            true_negatives=int(self.true_negatives[index]),
+            false_positives=int(self.false_positives[index]),
+            false_negatives=fn,
+            specificity=float(self.specificity[index]),
+            false_positive_rate=float(self.false_positive_rate[index]),
+            false_negative_rate=fn / (fn + tp) if (fn + tp) > 0 else 0.0,
+            total_samples=self.positive_samples + self.negative_samples,
+            positive_samples=self.positive_samples,
+            negative_samples=self.negative_samples,
+        )
+
+    def best_threshold(self, metric: str = "f1_score", min_precision: float = 0.0) -> float:
+        """Threshold maximizing a metric, optionally subject to a precision floor.
+
+        Args:
+            metric: Name of a per-threshold array (e.g. "f1_score", "recall")
+            min_precision: Only consider thresholds with at least this precision
+
+        Returns:
+            Best threshold (the highest one on ties)
+        """
+        values = np.where(self.precision >= min_precision, getattr(self, metric), -np.inf)
+        if not np.isfinite(values).any():
+            raise ValueError(f"No threshold reaches precision {min_precision}")
+
+        best = values == values.max()
+        return float(self.thresholds[best].max())
+
+
 class ModelEvaluator:
     """Evaluate model performance."""
 
@@ -111,19 +204,26 @@ class ModelEvaluator:
         self.threshold = threshold
 
     def evaluate(
-        self, y_true: np.ndarray, y_pred_proba: np.ndarray
+        self,
+        y_true: np.ndarray,
+        y_pred_proba: np.ndarray,
+        threshold: Optional[float] = None,
     ) -> EvaluationMetrics:
         """Evaluate model predictions.
 
         Args:
             y_true: True labels (0 or 1)
             y_pred_proba: Predicted probabilities (0-1)
+            threshold: Classification threshold (default: self.threshold)
 
         Returns:
             EvaluationMetrics object
         """
+        if threshold is None:
+            threshold = self.threshold
+
         # Convert probabilities to binary predictions
-        y_pred = (y_pred_proba >= self.threshold).astype(int)
+        y_pred = (y_pred_proba >= threshold).astype(int)
 
         # Core metrics
         auc = roc_auc_score(y_true, y_pred_proba)
@@ -221,16 +321,96 @@ class ModelEvaluator:
         Returns:
             Dictionary mapping thresholds to metrics
         """
-        results = {}
+        sweep = self.sweep_thresholds(y_true, y_pred_proba, thresholds)
+        return {threshold: sweep.metrics_at(i) for i, threshold in enumerate(thresholds)}
+
+    def sweep_thresholds(
+        self,
+        y_true: np.ndarray,
+        y_pred_proba: np.ndarray,
+        thresholds: Optional[Sequence[float]] = None,
+    ) -> ThresholdSweep:
+        """Compute metrics for many thresholds in one pass.
 
-        for threshold in thresholds:
-            original_threshold = self.threshold
-            self.threshold = threshold
-            metrics = self.evaluate(y_true, y_pred_proba)
-            results[threshold] = metrics
-            self.threshold = original_threshold
+        Scores of each class are sorted once; the number of positives
+        and negatives at or above any threshold is then a binary search.
+        That gives the confusion counts for every threshold, and for
+        every distinct score (the ROC/PR curves and AUC), in
+        O(n log n) overall rather than a full evaluation per threshold.
 
-        return results
+        Args:
+            y_true: True labels (0 or 1)
+            y_pred_proba: Predicted probabilities (0-1)
+            thresholds: Thresholds to evaluate (default: every distinct score)
+
+        Returns:
+            ThresholdSweep
+        """
+        labels = np.asarray(y_true).astype(bool, copy=False)
+        scores = np.asarray(y_pred_proba)
+        if not np.issubdtype(scores.dtype, np.floating):
+            scores = scores.astype(np.float64)
+
+        positive_scores = np.sort(scores[labels])
+        negative_scores = np.sort(scores[~labels])
+        n_pos = len(positive_scores)
+        n_neg = len(negative_scores)
+        if n_pos == 0 or n_neg == 0:
+            raise ValueError("Threshold sweep needs both positive and negative samples")
+
+        def counts_at_or_above(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            tp = n_pos - np.searchsorted(positive_scores, points, side="left")
+            fp = n_neg - np.searchsorted(negative_scores, points, side="left")
+            return tp, fp
+
+        # Distinct scores, highest first. Both halves are already sorted,
+        # so the stable (merge-based) sort is close to linear.
+        merged = np.sort(np.concatenate((positive_scores, negative_scores)), kind="stable")
+        distinct = merged[np.r_[merged[1:] != merged[:-1], True]][::-1]
+        del merged
+
+        curve_tp, curve_fp = counts_at_or_above(distinct)
+        curve_tpr = _ratio(curve_tp, n_pos)
+        curve_fpr = _ratio(curve_fp, n_neg)
+        curve_precision = _ratio(curve_tp, curve_tp + curve_fp)
+
+        # Trapezoidal area under the ROC curve from (0, 0), as roc_auc_score
+        fpr = np.concatenate(([0.0], curve_fpr))
+        tpr = np.concatenate(([0.0], curve_tpr))
+        auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+        if thresholds is None:
+            points = distinct
+            tp, fp = curve_tp, curve_fp
+        else:
+            points = np.asarray(thresholds, dtype=np.float64)
+            tp, fp = counts_at_or_above(points.astype(scores.dtype))
+
+        fn = n_pos - tp
+        tn = n_neg - fp
+        precision = _ratio(tp, tp + fp)
+        recall = _ratio(tp, n_pos)
+
+        return ThresholdSweep(
+            thresholds=points,
+            true_positives=tp,
+            false_positives=fp,
+            true_negatives=tn,
+            false_negatives=fn,
+            precision=precision,
+            recall=recall,
+            f1_score=_ratio(2 * precision * recall, precision + recall),
+            accuracy=(tp + tn) / max(n_pos + n_neg, 1),
+            specificity=_ratio(tn, tn + fp),
+            false_positive_rate=_ratio(fp, fp + tn),
+            auc_score=auc,
+            positive_samples=n_pos,
+            negative_samples=n_neg,
+            curve_thresholds=distinct,
+            curve_tpr=curve_tpr,
+            curve_fpr=curve_fpr,
+            curve_precision=curve_precision,
+        )
 
     def compare_models(
         self,
@@ -0,0 +1,223 @@
+"""Out-of-core XGBoost training data streamed from Parquet shards.
+
+ParquetShardIter feeds record batches from on-disk shards (e.g. feature
+store partitions) to xgb.QuantileDMatrix, which keeps only the quantised
+histogram index in memory: about one byte per feature per row instead
+of the float64 matrix and its three train/val/test copies.
+
+Rows are assigned to train/validation/test by hashing a row key, so the
+split is the same on every pass over the data and on every run, without
+holding the dataset in memory for train_test_split.
+
+An optional row filter and duplicate removal apply the same cleaning as
+in-memory training, one batch at a time.
+"""
+import logging
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Try to import XGBoost
+try:
+    import xgboost as xgb
+
+    XGBOOST_AVAILABLE = True
+    _DataIter = xgb.DataIter
+except ImportError:
+    XGBOOST_AVAILABLE = False
+    xgb = None
+    _DataIter = object
+
+SPLIT_TRAIN = 0
+SPLIT_VAL = 1
+SPLIT_TEST = 2
+
+# 16-byte SipHash key; changing it reshuffles every split
+SPLIT_HASH_KEY = "voxguard-split01"
+SPLIT_BUCKETS = 1_000_000
+
+
+def assign_split(
+    batch: pd.DataFrame,
+    test_size: float = 0.2,
+    validation_size: float = 0.1,
+    key_columns: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Assign rows to train/validation/test by hashing their key.
+
+    Args:
+        batch: Rows to assign
+        test_size: Fraction of rows for test
+        validation_size: Fraction of rows for validation
+        key_columns: Columns forming the row key (default: all columns,
+            so identical rows always land in the same split)
+
+    Returns:
+        int8 array of SPLIT_TRAIN / SPLIT_VAL / SPLIT_TEST
+    """
+    keys = batch[list(key_columns)] if key_columns else batch
+    hashes = pd.util.hash_pandas_object(keys, index=False, hash_key=SPLIT_HASH_KEY).to_numpy()
+    bucket = hashes % SPLIT_BUCKETS
+
+    split = np.full(len(batch), SPLIT_TRAIN, dtype=np.int8)
+    split[bucket < (test_size + validation_size) * SPLIT_BUCKETS] = SPLIT_VAL
+    split[bucket < test_size * SPLIT_BUCKETS] = SPLIT_TEST
+    return split
+
+
+class ParquetShardIter(_DataIter):
+    """Stream one split of a set of Parquet shards into XGBoost."""
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        split: int,
+        feature_names: List[str],
+        label_column: str = "label",
+        key_columns: Optional[Sequence[str]] = None,
+        test_size: float = 0.2,
+        validation_size: float = 0.1,
+        batch_rows: int = 1 << 20,
+        row_filter: Optional[Callable[[pd.DataFrame], np.ndarray]] = None,
+        drop_duplicates: bool = False,
+    ):
+        """Initialize the iterator.
+
+        Args:
+            paths: Parquet files to read, in order
+            split: SPLIT_TRAIN, SPLIT_VAL or SPLIT_TEST
+            feature_names: Feature columns, in model order
+            label_column: Label column
+            key_columns: Row key columns for the split hash (default:
+                the features)
+            test_size: Fraction of rows for test
+            validation_size: Fraction of rows for validation
+            batch_rows: Rows per record batch read from disk
+            row_filter: Returns a boolean mask of the rows to keep in a
+                batch (e.g. data_collector.valid_feature_rows)
+            drop_duplicates: Keep only the first occurrence of identical
+                feature and label values in each pass, across shards.
+                Costs 8 bytes per kept row while a pass runs; not needed
+                for feature store partitions, which are deduplicated
+                when written.
+        """
+        if not XGBOOST_AVAILABLE:
+            raise RuntimeError("XGBoost is not installed")
+
+        self.paths = [str(p) for p in paths]
+        self.split = split
+        self.feature_names = list(feature_names)
+        self.label_column = label_column
+        self.key_columns = list(key_columns) if key_columns else None
+        self.test_size = test_size
+        self.validation_size = validation_size
+        self.batch_rows = batch_rows
+        self.row_filter = row_filter
+        self.drop_duplicates = drop_duplicates
+
+        self._columns = list(dict.fromkeys(
+            self.feature_names + [label_column] + (self.key_columns or [])
+        ))
+        self._batches = None
+
+        # Row hashes kept so far in the current pass, as sorted runs of
+        # decreasing length
+        self._seen: List[np.ndarray] = []
+
+        # Counts for the current pass
+        self.rows = 0
+        self.positives = 0
+        self.rows_filtered = 0
+        self.rows_duplicated = 0
+
+        super().__init__()
+
+    def _read_batches(self):
+        for path in self.paths:
+            shard = pq.ParquetFile(path)
+            for record_batch in shard.iter_batches(
+                batch_size=self.batch_rows, columns=self._columns
+            ):
+                yield record_batch.to_pandas()
+
+    def _first_seen(self, rows: pd.DataFrame) -> np.ndarray:
+        """Mask of rows not seen earlier in this pass, and remember them.
+
+        Identical rows hash to the same split when the split key is the
+        features, so each split's iterator removes its own duplicates.
+        """
+        hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+        # Sorted lookups walk each run in order instead of at random
+        unique, index = np.unique(hashes, return_index=True)
+        new = np.ones(len(unique), dtype=bool)
+        for run in self._seen:
+            pos = np.searchsorted(run, unique).clip(max=len(run) - 1)
+            new &= run[pos] != unique
+
+        first = np.zeros(len(hashes), dtype=bool)
+        first[index[new]] = True
+        if not new.any():
+            return first
+
+        # Merge runs like a binary counter, so each hash is re-sorted
+        # O(log N) times per pass instead of once per batch
+        self._seen.append(unique[new])
+        while len(self._seen) > 1 and len(self._seen[-2]) <= 2 * len(self._seen[-1]):
+            newest = self._seen.pop()
+            self._seen[-1] = np.sort(np.concatenate([self._seen[-1], newest]), kind="stable")
+        return first
+
+    def reset(self) -> None:
+        """Rewind to the first shard."""
+        self._batches = None
+
+    def next(self, input_data) -> bool:
+        """Pass the next non-empty batch of this split to XGBoost."""
+        if self._batches is None:
+            self._batches = self._read_batches()
+            self._seen = []
+            self.rows = 0
+            self.positives = 0
+            self.rows_filtered = 0
+            self.rows_duplicated = 0
+
+        for batch in self._batches:
+            mask = assign_split(
+                batch[self.key_columns or self.feature_names],
+                self.test_size,
+                self.validation_size,
+            ) == self.split
+
+            if self.row_filter is not None and mask.any():
+                kept = mask & self.row_filter(batch)
+                self.rows_filtered += int((mask & ~kept).sum())
+                mask = kept
+
+            if self.drop_duplicates and mask.any():
+                candidates = np.flatnonzero(mask)
+                first = self._first_seen(
+                    batch.iloc[candidates][self.feature_names + [self.label_column]]
+                )
+                mask[candidates[~first]] = False
+                self.rows_duplicated += int((~first).sum())
+
+            if not mask.any():
+                continue
+
+            label = batch[self.label_column].to_numpy(dtype=np.float32)[mask]
+            input_data(
+                data=batch[self.feature_names].to_numpy(dtype=np.float32)[mask],
+                label=label,
+                feature_names=self.feature_names,
+            )
+
+            self.rows += len(label)
+            self.positives += int(label.sum())
+            return True
+
+        return False
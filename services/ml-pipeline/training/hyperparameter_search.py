@@ -0,0 +1,461 @@
+"""Parallel hyperparameter search for the XGBoost fraud model.
+
+Candidate configurations are sampled at random from a search space and
+trained with successive halving: every live trial gets a small budget of
+boosting rounds, the best 1/reduction_factor of them continue for
+reduction_factor times as many rounds, and the rest are stopped. Trials
+also early-stop on validation AUC within each rung.
+
+Trials run concurrently in a pool of spawned worker processes. Each
+worker is limited to nthread_per_worker threads so the pool does not
+oversubscribe the cores, and builds the training/validation
+QuantileDMatrix once, when it starts; every trial it runs afterwards
+reuses it. In-memory data reaches the workers as memory-mapped .npy
+files, so the raw arrays are shared through the page cache rather than
+copied per process. Boosters move between rungs as serialized UBJSON.
+
+Shard data is expensive to quantise and every worker would stream the
+shards into its own QuantileDMatrix, so external-memory callers build
+the matrices once and use run_on_matrices, which runs the trials one
+at a time in the calling process with every core.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .external_memory import ParquetShardIter, SPLIT_TRAIN, SPLIT_VAL
+
+logger = logging.getLogger(__name__)
+
+# Try to import XGBoost
+try:
+    import xgboost as xgb
+
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+    xgb = None
+
+# Parameter -> ("int", low, high) | ("float", low, high) | ("log", low, high)
+DEFAULT_SEARCH_SPACE: Dict[str, Tuple[str, float, float]] = {
+    "max_depth": ("int", 3, 10),
+    "eta": ("log", 0.01, 0.3),
+    "subsample": ("float", 0.6, 1.0),
+    "colsample_bytree": ("float", 0.6, 1.0),
+    "min_child_weight": ("log", 1.0, 20.0),
+    "gamma": ("float", 0.0, 5.0),
+}
+
+# Per-worker (dtrain, dval), built by _init_worker
+_worker_data = None
+
+
+@dataclass
+class Trial:
+    """One candidate configuration and how far it got."""
+
+    trial_id: int
+    params: Dict[str, Any]  # Sampled values; the rest come from base_params
+    status: str = "running"  # "running", "completed", "stopped"
+    rung: int = 0
+    rounds: int = 0
+    best_iteration: int = 0
+    val_auc: float = 0.0
+    converged: bool = False  # Early-stopped within a rung
+    seconds: float = 0.0
+    rung_scores: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a hyperparameter search."""
+
+    trials: List[Trial]
+    best_trial: Trial
+    booster: Any  # xgb.Booster of the best trial
+    seconds: float
+    workers: int
+
+    def to_metadata(self) -> dict:
+        """Summary stored in ModelMetadata.hyperparameter_search."""
+        return {
+            "strategy": "successive_halving",
+            "best_trial": self.best_trial.trial_id,
+            "seconds": round(self.seconds, 3),
+            "workers": self.workers,
+            "trials": [trial.to_dict() for trial in self.trials],
+        }
+
+
+def sample_configs(
+    space: Dict[str, Tuple[str, float, float]], n_trials: int, seed: int = 42
+) -> List[Dict[str, Any]]:
+    """Draw random configurations from a search space.
+
+    Args:
+        space: Parameter -> (kind, low, high), kind "int", "float" or "log"
+        n_trials: Number of configurations
+        seed: Random seed
+
+    Returns:
+        List of parameter dicts
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+
+    for _ in range(n_trials):
+        config = {}
+        for name, (kind, low, high) in space.items():
+            if kind == "int":
+                config[name] = int(rng.integers(low, high + 1))
+            elif kind == "log":
+                config[name] = float(np.exp(rng.uniform(math.log(low), math.log(high))))
+            elif kind == "float":
+                config[name] = float(rng.uniform(low, high))
+            else:
+                raise ValueError(f"Unknown search space kind for {name}: {kind}")
+        configs.append(config)
+
+    return configs
+
+
+def _build_matrices(source: dict, feature_names: List[str], max_bin: int):
+    """Build (dtrain, dval) QuantileDMatrix from a data source spec."""
+    if source["kind"] == "arrays":
+        directory = Path(source["path"])
+
+        def load(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+        dtrain = xgb.QuantileDMatrix(
+            load("X_train"), label=load("y_train"), feature_names=feature_names, max_bin=max_bin
+        )
+        dval = xgb.QuantileDMatrix(
+            load("X_val"), label=load("y_val"), feature_names=feature_names,
+            max_bin=max_bin, ref=dtrain,
+        )
+    else:
+        shards = dict(source["shards"], feature_names=feature_names)
+        dtrain = xgb.QuantileDMatrix(ParquetShardIter(split=SPLIT_TRAIN, **shards), max_bin=max_bin)
+        dval = xgb.QuantileDMatrix(
+            ParquetShardIter(split=SPLIT_VAL, **shards), max_bin=max_bin, ref=dtrain
+        )
+
+    return dtrain, dval
+
+
+def _init_worker(source: dict, feature_names: List[str], max_bin: int) -> None:
+    """Pool initializer: build this worker's matrices once."""
+    global _worker_data
+    _worker_data = _build_matrices(source, feature_names, max_bin)
+
+
+def _run_trial(
+    trial_id: int,
+    params: Dict[str, Any],
+    rounds: int,
+    model_raw: Optional[bytes],
+    early_stopping_rounds: int,
+    data: Optional[tuple] = None,
+) -> Tuple[int, float, int, int, bool, bytes, float]:
+    """Train a trial for `rounds` more rounds in a worker.
+
+    `data` is (dtrain, dval) when trials run in the calling process;
+    pool workers use the matrices built by _init_worker.
+
+    Returns:
+        (trial_id, val_auc, best_iteration, total rounds, converged,
+        booster UBJSON, seconds)
+    """
+    start = time.perf_counter()
+    dtrain, dval = data or _worker_data
+
+    previous = xgb.Booster(model_file=bytearray(model_raw)) if model_raw else None
+    evals_result = {}
+    booster = xgb.train(
+        params=params,
+        dtrain=dtrain,
+        num_boost_round=rounds,
+        evals=[(dval, "val")],
+        evals_result=evals_result,
+        early_stopping_rounds=early_stopping_rounds,
+        xgb_model=previous,
+        verbose_eval=False,
+    )
+
+    converged = len(evals_result["val"]["auc"]) < rounds
+
+    return (
+        trial_id,
+        float(booster.best_score),
+        int(booster.best_iteration),
+        booster.num_boosted_rounds(),
+        converged,
+        bytes(booster.save_raw("ubj")),
+        time.perf_counter() - start,
+    )
+
+
+class HyperparameterSearch:
+    """Successive-halving random search over a process pool."""
+
+    def __init__(
+        self,
+        base_params: Dict[str, Any],
+        feature_names: Sequence[str],
+        space: Optional[Dict[str, Tuple[str, float, float]]] = None,
+        n_trials: int = 16,
+        min_rounds: int = 20,
+        max_rounds: int = 300,
+        reduction_factor: int = 3,
+        early_stopping_rounds: int = 20,
+        max_workers: int = 0,
+        nthread_per_worker: int = 0,
+        seed: int = 42,
+    ):
+        """Initialize the search.
+
+        Args:
+            base_params: XGBoost params every trial starts from
+            feature_names: Feature columns, in model order
+            space: Search space (default: DEFAULT_SEARCH_SPACE)
+            n_trials: Number of sampled configurations
+            min_rounds: Boosting rounds in the first rung
+            max_rounds: Total boosting rounds for trials that survive
+            reduction_factor: Keep 1/reduction_factor of trials per rung
+            early_stopping_rounds: Per-rung early stopping on val AUC
+            max_workers: Worker processes (0 = one per core)
+            nthread_per_worker: XGBoost threads per worker (0 = cores / workers)
+            seed: Random seed for sampling
+        """
+        if not XGBOOST_AVAILABLE:
+            raise RuntimeError("XGBoost is not installed")
+        if reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
+
+        cores = os.cpu_count() or 1
+        self.max_workers = min(max_workers or cores, n_trials)
+        self.nthread_per_worker = nthread_per_worker or max(1, cores // self.max_workers)
+
+        self.base_params = dict(base_params)
+        self.feature_names = list(feature_names)
+        self.space = space or DEFAULT_SEARCH_SPACE
+        self.n_trials = n_trials
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.reduction_factor = reduction_factor
+        self.early_stopping_rounds = early_stopping_rounds
+        self.seed = seed
+
+    def run(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray,
+        y_val: np.ndarray,
+    ) -> SearchResult:
+        """Search over in-memory training and validation arrays.
+
+        Args:
+            X_train: Training features
+            y_train: Training labels
+            X_val: Validation features
+            y_val: Validation labels
+
+        Returns:
+            SearchResult
+        """
+        with tempfile.TemporaryDirectory(prefix="hpsearch-") as tmpdir:
+            for name, array in (
+                ("X_train", X_train), ("y_train", y_train), ("X_val", X_val), ("y_val", y_val)
+            ):
+                np.save(Path(tmpdir) / f"{name}.npy", np.ascontiguousarray(array, dtype=np.float32))
+
+            return self._search({"kind": "arrays", "path": tmpdir})
+
+    def run_from_shards(
+        self,
+        paths: Sequence[str],
+        label_column: str = "label",
+        key_columns: Optional[Sequence[str]] = None,
+        test_size: float = 0.2,
+        validation_size: float = 0.1,
+        batch_rows: int = 1 << 20,
+        row_filter: Optional[Callable[[pd.DataFrame], np.ndarray]] = None,
+        drop_duplicates: bool = False,
+    ) -> SearchResult:
+        """Search over Parquet shards, split as ModelTrainer.prepare_data_from_shards.
+
+        Args:
+            paths: Parquet files with the features and label_column
+            label_column: Label column
+            key_columns: Row key columns for the split hash
+            test_size: Test set ratio
+            validation_size: Validation set ratio
+            batch_rows: Rows per record batch read from disk
+            row_filter: Mask of rows to keep in each batch; must be a
+                module-level function so it can be sent to the workers
+            drop_duplicates: Drop repeated rows within each split
+
+        Returns:
+            SearchResult
+        """
+        if not paths:
+            raise ValueError("No shards to search over")
+
+        return self._search({
+            "kind": "shards",
+            "shards": {
+                "paths": [str(p) for p in paths],
+                "label_column": label_column,
+                "key_columns": list(key_columns) if key_columns else None,
+                "test_size": test_size,
+                "validation_size": validation_size,
+                "batch_rows": batch_rows,
+                "row_filter": row_filter,
+                "drop_duplicates": drop_duplicates,
+            },
+        })
+
+    def run_on_matrices(self, dtrain, dval) -> SearchResult:
+        """Search over matrices already built in this process.
+
+        Used for external-memory data, where each pool worker would
+        stream every shard into its own QuantileDMatrix. Trials run one
+        at a time on every core; dtrain and dval are shared by all of
+        them.
+
+        Args:
+            dtrain: Training DMatrix or QuantileDMatrix
+            dval: Validation matrix built with ref=dtrain
+
+        Returns:
+            SearchResult
+        """
+        return self._search(matrices=(dtrain, dval))
+
+    def _rung_rounds(self) -> List[int]:
+        """Cumulative boosting rounds at the end of each rung."""
+        rounds = []
+        budget = self.min_rounds
+        while budget < self.max_rounds:
+            rounds.append(budget)
+            budget *= self.reduction_factor
+        rounds.append(self.max_rounds)
+        return rounds
+
+    def _search(self, source: Optional[dict] = None, matrices: Optional[tuple] = None) -> SearchResult:
+        start = time.perf_counter()
+
+        if matrices is None:
+            workers, nthread = self.max_workers, self.nthread_per_worker
+            run_trial = _run_trial
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(source, self.feature_names, self.base_params.get("max_bin", 256)),
+            )
+        else:
+            workers, nthread = 1, os.cpu_count() or 1
+            run_trial = partial(_run_trial, data=matrices)
+            pool = ThreadPoolExecutor(max_workers=1)
+
+        params = dict(self.base_params, nthread=nthread, verbosity=0)
+        trials = [
+            Trial(trial_id=i, params=config)
+            for i, config in enumerate(sample_configs(self.space, self.n_trials, self.seed))
+        ]
+        models: Dict[int, bytes] = {}
+
+        logger.info(
+            f"Hyperparameter search: {self.n_trials} trials, rungs={self._rung_rounds()}, "
+            f"{workers} workers x {nthread} threads"
+        )
+
+        with pool:
+            live = trials
+            done_rounds = 0
+
+            for rung, target_rounds in enumerate(self._rung_rounds()):
+                # Converged trials keep their score without more rounds
+                futures = [
+                    pool.submit(
+                        run_trial,
+                        trial.trial_id,
+                        dict(params, **trial.params),
+                        target_rounds - done_rounds,
+                        models.get(trial.trial_id),
+                        self.early_stopping_rounds,
+                    )
+                    for trial in live
+                    if not trial.converged
+                ]
+
+                for future in futures:
+                    (
+                        trial_id, val_auc, best_iteration, rounds, converged, raw, seconds
+                    ) = future.result()
+                    trial = trials[trial_id]
+                    trial.val_auc = val_auc
+                    trial.best_iteration = best_iteration
+                    trial.rounds = rounds
+                    trial.converged = converged
+                    trial.seconds += seconds
+                    models[trial_id] = raw
+
+                for trial in live:
+                    trial.rung = rung
+                    trial.rung_scores.append(trial.val_auc)
+
+                done_rounds = target_rounds
+                live = sorted(live, key=lambda t: t.val_auc, reverse=True)
+
+                if target_rounds >= self.max_rounds:
+                    break
+
+                keep = max(1, len(live) // self.reduction_factor)
+                for trial in live[keep:]:
+                    trial.status = "stopped"
+                    models.pop(trial.trial_id, None)
+                live = live[:keep]
+
+                logger.info(
+                    f"Rung {rung}: {target_rounds} rounds, best val AUC "
+                    f"{live[0].val_auc:.4f}, {len(live)} trials continue"
+                )
+
+        for trial in live:
+            trial.status = "completed"
+
+        best = live[0]
+        booster = xgb.Booster(model_file=bytearray(models[best.trial_id]))
+        seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Hyperparameter search done in {seconds:.1f}s: trial {best.trial_id} "
+            f"val AUC {best.val_auc:.4f}"
+        )
+
+        return SearchResult(
+            trials=trials,
+            best_trial=best,
+            booster=booster,
+            seconds=seconds,
+            workers=workers,
+        )
@@ -2,12 +2,14 @@
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Dict, Any, Optional
+from typing import Callable, Tuple, Dict, Any, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
+from .external_memory import ParquetShardIter, SPLIT_TRAIN, SPLIT_VAL, SPLIT_TEST
+
 logger = logging.getLogger(__name__)
 
 # Try to import XGBoost
@@ -64,12 +66,15 @@ class ModelTrainer:
             "subsample": subsample,
             "colsample_bytree": colsample_bytree,
             "seed": random_seed,
+            "tree_method": "hist",
+            "max_bin": 256,
             "verbosity": 1,
         }
 
         self.n_estimators = n_estimators
         self.random_seed = random_seed
         self.model: Optional[xgb.Booster] = None
+        self.search_result = None  # Set by apply_search_result
 
     def prepare_data(
         self, df: pd.DataFrame, test_size: float = 0.2, validation_size: float = 0.1
@@ -84,6 +89,30 @@ class ModelTrainer:
         Returns:
             Tuple of (train_dmatrix, val_dmatrix, test_dmatrix)
         """
+        X_train, X_val, X_test, y_train, y_val, y_test = self.split_data(
+            df, test_size, validation_size
+        )
+
+        # Create DMatrix objects
+        dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=self.FEATURE_NAMES)
+        dval = xgb.DMatrix(X_val, label=y_val, feature_names=self.FEATURE_NAMES)
+        dtest = xgb.DMatrix(X_test, label=y_test, feature_names=self.FEATURE_NAMES)
+
+        return dtrain, dval, dtest
+
+    def split_data(
+        self, df: pd.DataFrame, test_size: float = 0.2, validation_size: float = 0.1
+    ) -> Tuple[np.ndarray, ...]:
+        """Stratified train/val/test split of feature arrays.
+
+        Args:
+            df: DataFrame with features and 'label' column
+            test_size: Test set ratio
+            validation_size: Validation set ratio (from remaining after test)
+
+        Returns:
+            Tuple of (X_train, X_val, X_test, y_train, y_val, y_test)
+        """
         # Validate required columns
         required_cols = self.FEATURE_NAMES + ["label"]
         missing_cols = set(required_cols) - set(df.columns)
@@ -113,10 +142,81 @@ class ModelTrainer:
             f"Data split: Train={len(X_train)}, Val={len(X_val)}, Test={len(X_test)}"
         )
 
-        # Create DMatrix objects
-        dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=self.FEATURE_NAMES)
-        dval = xgb.DMatrix(X_val, label=y_val, feature_names=self.FEATURE_NAMES)
-        dtest = xgb.DMatrix(X_test, label=y_test, feature_names=self.FEATURE_NAMES)
+        return X_train, X_val, X_test, y_train, y_val, y_test
+
+    def prepare_data_from_shards(
+        self,
+        paths: Sequence[str],
+        test_size: float = 0.2,
+        validation_size: float = 0.1,
+        label_column: str = "label",
+        key_columns: Optional[Sequence[str]] = None,
+        batch_rows: int = 1 << 20,
+        row_filter: Optional[Callable[[pd.DataFrame], np.ndarray]] = None,
+        drop_duplicates: bool = False,
+    ) -> Tuple[xgb.DMatrix, xgb.DMatrix, xgb.DMatrix]:
+        """Prepare train/val/test datasets from Parquet shards on disk.
+
+        Each split is streamed through a ParquetShardIter into a
+        QuantileDMatrix, so only one record batch of raw data is in
+        memory at a time. Rows are assigned to splits by hashing
+        key_columns (default: the features) rather than by a shuffled
+        split, which would need the whole dataset. Validation and test
+        reuse the training quantile cuts.
+
+        The class balance of the training split is applied as
+        scale_pos_weight instead of oversampling.
+
+        Args:
+            paths: Parquet files with the features and label_column
+            test_size: Test set ratio
+            validation_size: Validation set ratio (of the whole dataset)
+            label_column: Label column
+            key_columns: Row key columns for the split hash
+            batch_rows: Rows per record batch read from disk
+            row_filter: Mask of rows to keep in each batch
+            drop_duplicates: Drop repeated rows within each split
+
+        Returns:
+            Tuple of (train_dmatrix, val_dmatrix, test_dmatrix)
+        """
+        if not paths:
+            raise ValueError("No shards to train from")
+
+        def shard_iter(split: int) -> ParquetShardIter:
+            return ParquetShardIter(
+                paths,
+                split,
+                self.FEATURE_NAMES,
+                label_column=label_column,
+                key_columns=key_columns,
+                test_size=test_size,
+                validation_size=validation_size,
+                batch_rows=batch_rows,
+                row_filter=row_filter,
+                drop_duplicates=drop_duplicates,
+            )
+
+        max_bin = self.params["max_bin"]
+        train_iter = shard_iter(SPLIT_TRAIN)
+        dtrain = xgb.QuantileDMatrix(train_iter, max_bin=max_bin)
+        dval = xgb.QuantileDMatrix(shard_iter(SPLIT_VAL), max_bin=max_bin, ref=dtrain)
+        dtest = xgb.QuantileDMatrix(shard_iter(SPLIT_TEST), max_bin=max_bin, ref=dtrain)
+
+        if train_iter.positives:
+            self.params["scale_pos_weight"] = (
+                (train_iter.rows - train_iter.positives) / train_iter.positives
+            )
+
+        if row_filter is not None or drop_duplicates:
+            logger.info(
+                f"Training split: removed {train_iter.rows_filtered} invalid and "
+                f"{train_iter.rows_duplicated} duplicate rows"
+            )
+        logger.info(
+            f"Data split: Train={dtrain.num_row()}, Val={dval.num_row()}, "
+            f"Test={dtest.num_row()} (from {len(paths)} shards)"
+        )
 
         return dtrain, dval, dtest
 
@@ -158,6 +258,21 @@ class ModelTrainer:
             "val_auc": evals_result["val"]["auc"][self.model.best_iteration],
         }
 
+    def apply_search_result(self, result) -> None:
+        """Adopt the best trial of a hyperparameter search as the model.
+
+        Args:
+            result: SearchResult from HyperparameterSearch
+        """
+        self.model = result.booster
+        self.params.update(result.best_trial.params)
+        self.search_result = result
+
+        logger.info(
+            f"Using search trial {result.best_trial.trial_id}: "
+            f"val AUC {result.best_trial.val_auc:.4f}, params {result.best_trial.params}"
+        )
+
     def get_feature_importance(self) -> Dict[str, float]:
         """Get feature importance scores.
 
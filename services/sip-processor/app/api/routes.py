@@ -1,4 +1,5 @@
 """API endpoints for SIP processing and masking detection."""
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
@@ -230,18 +231,26 @@ async def model_status() -> dict:
         "model_loaded": engine.model_manager.is_loaded,
         "xgboost_available": engine.model_manager.is_available,
         "detection_method": "xgboost" if engine._use_model else "rule_based",
+        "model_version": engine.model_manager.model_version,
+        "reload_count": engine.model_manager.reload_count,
+        "failed_reloads": engine.model_manager.failed_reloads,
         "threshold": engine.threshold
     }
 
 
 @router.post("/model/reload")
 async def reload_model() -> dict:
-    """Reload the XGBoost model from disk."""
+    """Reload the XGBoost model from disk.
+    
+    The new model is loaded and validated on a background thread while
+    the current one keeps serving requests.
+    """
     engine = get_inference_engine()
-    success = engine.reload_model()
+    success = await asyncio.wrap_future(engine.reload_model_async())
     
     return {
         "success": success,
         "model_loaded": engine.model_manager.is_loaded,
+        "model_version": engine.model_manager.model_version,
         "detection_method": "xgboost" if engine._use_model else "rule_based"
     }
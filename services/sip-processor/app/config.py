@@ -30,6 +30,9 @@ class Settings(BaseSettings):
     
     # Model configuration
     model_path: str = "models/xgboost_masking.json"
+    model_watch_mode: str = "off"  # off, file, registry
+    model_registry_path: str = "models/registry"
+    model_poll_interval_seconds: float = 30.0
     
     # CDR metrics configuration
     cdr_window_seconds: int = 300  # 5-minute window for metrics
@@ -2,9 +2,11 @@
 from .engine import MaskingInferenceEngine
 from .features import FeatureExtractor
 from .model import ModelManager
+from .watcher import ModelWatcher
 
 __all__ = [
     "MaskingInferenceEngine",
     "FeatureExtractor",
-    "ModelManager"
+    "ModelManager",
+    "ModelWatcher"
 ]
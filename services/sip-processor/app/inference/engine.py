@@ -1,5 +1,6 @@
 """XGBoost masking detection inference engine."""
 import logging
+from concurrent.futures import Future
 from dataclasses import dataclass
 from typing import Tuple, Optional
 
@@ -7,6 +8,7 @@ import numpy as np
 
 from .features import FeatureExtractor, MaskingFeatures
 from .model import ModelManager
+from .watcher import ModelWatcher
 from ..cdr.models import CDRMetrics
 
 logger = logging.getLogger(__name__)
@@ -64,6 +66,7 @@ class MaskingInferenceEngine:
         self.threshold = threshold
         self.model_manager = ModelManager(model_path)
         self.feature_extractor = FeatureExtractor()
+        self.model_watcher: Optional[ModelWatcher] = None
         
         # Try to load model
         self._use_model = self.model_manager.load()
@@ -219,8 +222,63 @@ class MaskingInferenceEngine:
     def reload_model(self) -> bool:
         """Reload the XGBoost model.
         
+        The current model keeps serving until the new one has been
+        validated; if the reload fails it stays in place.
+        
         Returns:
             True if model reloaded successfully
         """
-        self._use_model = self.model_manager.load()
-        return self._use_model
+        success = self.model_manager.load()
+        self._on_model_reloaded(success)
+        return success
+    
+    def reload_model_async(self) -> Future:
+        """Reload the XGBoost model on the background reload thread.
+        
+        Returns:
+            Future resolving to True if the model reloaded successfully
+        """
+        future = self.model_manager.load_async()
+        future.add_done_callback(lambda f: self._on_model_reloaded(f.result()))
+        return future
+    
+    def start_model_watcher(
+        self,
+        mode: str,
+        watch_path: Optional[str] = None,
+        poll_interval_seconds: float = 30.0
+    ) -> ModelWatcher:
+        """Start hot-swapping new models as they appear.
+        
+        Args:
+            mode: "file" to watch the model file, "registry" to follow
+                the ModelRegistry champion
+            watch_path: Model file or registry directory to watch
+            poll_interval_seconds: Seconds between polls
+            
+        Returns:
+            The running ModelWatcher
+        """
+        self.stop_model_watcher()
+        self.model_watcher = ModelWatcher(
+            self.model_manager,
+            mode=mode,
+            watch_path=watch_path,
+            poll_interval_seconds=poll_interval_seconds,
+            on_reload=self._on_model_reloaded
+        )
+        self.model_watcher.start()
+        return self.model_watcher
+    
+    def stop_model_watcher(self) -> None:
+        """Stop the model watcher and the background reload thread."""
+        if self.model_watcher:
+            self.model_watcher.stop()
+            self.model_watcher = None
+        self.model_manager.shutdown()
+    
+    def _on_model_reloaded(self, success: bool) -> None:
+        """Switch between model and rules after a reload attempt."""
+        self._use_model = self.model_manager.is_loaded
+        if success:
+            logger.info(f"Serving model version {self.model_manager.model_version}")
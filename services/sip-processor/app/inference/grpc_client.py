@@ -4,14 +4,18 @@ This client connects the SIP-Processor to the centralized ML-Pipeline
 inference server, enabling real-time model updates and A/B testing.
 """
 import asyncio
+import itertools
 import logging
 import time
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 from enum import Enum
 
+import grpc
 import numpy as np
 
+from .protos import inference_pb2, inference_pb2_grpc
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +43,188 @@ class GRPCPredictionResponse:
     latency_ms: float
 
 
+class InferenceStream:
+    """Multiplexed PredictStream session shared by all callers of a client.
+
+    Every request rides one long-lived bidirectional stream. Responses are
+    matched back to their caller by request_id and may arrive in any
+    order, so the server is free to batch across the whole stream.
+
+    Flow control: at most max_in_flight requests are outstanding; further
+    callers wait (within their own deadline) for a slot.
+
+    Reconnect with replay: if the stream breaks, a new one is opened and
+    every request still waiting for an answer is re-sent on it. After
+    max_reconnects consecutive broken streams without a single response,
+    the waiting requests fail so the client's circuit breaker can act.
+    """
+
+    def __init__(
+        self,
+        stub_factory: Callable[[], "inference_pb2_grpc.InferenceServiceStub"],
+        max_in_flight: int = 1024,
+        max_reconnects: int = 3,
+        reconnect_backoff_seconds: float = 0.05,
+    ):
+        """Initialize the stream session.
+
+        Args:
+            stub_factory: Returns a stub from the client's channel pool
+            max_in_flight: Maximum outstanding requests on the stream
+            max_reconnects: Consecutive reconnects before failing requests
+            reconnect_backoff_seconds: Linear backoff between reconnects
+        """
+        self._stub_factory = stub_factory
+        self.max_in_flight = max_in_flight
+        self.max_reconnects = max_reconnects
+        self.reconnect_backoff_seconds = reconnect_backoff_seconds
+
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._ids = itertools.count()
+
+        # request_id -> (future, request, stream generation it was sent on)
+        self._pending: Dict[str, Tuple[asyncio.Future, object, int]] = {}
+        self._call = None
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._generation = 0
+        self._consecutive_reconnects = 0
+        self._closed = False
+
+        # Metrics
+        self.reconnects = 0
+        self.replayed_requests = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for a response."""
+        return len(self._pending)
+
+    async def predict(self, request, timeout: float):
+        """Send a request on the stream and wait for its response.
+
+        Args:
+            request: inference_pb2.PredictionRequest
+            timeout: Seconds until the caller's deadline
+
+        Returns:
+            inference_pb2.PredictionResponse
+
+        Raises:
+            asyncio.TimeoutError: If no response arrives before the deadline
+            grpc.aio.AioRpcError: If the stream cannot be re-established
+        """
+        deadline = time.time() + timeout
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+
+        # Request IDs multiplex the stream, so they must be unique in flight
+        if not request.request_id or request.request_id in self._pending:
+            request.request_id = f"stream-{next(self._ids)}"
+        request_id = request.request_id
+
+        try:
+            future = asyncio.get_running_loop().create_future()
+            if self._call is None:
+                self._open()
+            self._pending[request_id] = (future, request, self._generation)
+            self._send_queue.put_nowait(request)
+
+            return await asyncio.wait_for(future, max(deadline - time.time(), 0.0))
+        finally:
+            self._pending.pop(request_id, None)
+            self._slots.release()
+
+    def _open(self) -> None:
+        """Open a new PredictStream call and start reading from it."""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def requests():
+            while True:
+                request = await queue.get()
+                if request is None:
+                    return
+                yield request
+
+        self._generation += 1
+        self._send_queue = queue
+        self._call = self._stub_factory().PredictStream(requests())
+        self._reader_task = asyncio.ensure_future(self._read(self._call))
+
+    async def _read(self, call) -> None:
+        """Resolve pending futures from the stream until it ends."""
+        try:
+            async for response in call:
+                self._consecutive_reconnects = 0
+                entry = self._pending.get(response.request_id)
+                if entry and not entry[0].done():
+                    entry[0].set_result(response)
+            error: Exception = ConnectionError("Inference stream closed by server")
+        except grpc.aio.AioRpcError as e:
+            error = e
+        except asyncio.CancelledError:
+            return
+
+        if call is not self._call:
+            return
+
+        self._detach()
+        await self._recover(error)
+
+    def _detach(self) -> None:
+        """Forget the current call and end its request iterator."""
+        if self._send_queue is not None:
+            self._send_queue.put_nowait(None)
+        self._call = None
+        self._send_queue = None
+
+    async def _recover(self, error: Exception) -> None:
+        """Reconnect and replay unanswered requests, or fail them."""
+        if self._closed or not self._pending:
+            return
+
+        if self._consecutive_reconnects >= self.max_reconnects:
+            logger.warning(f"Inference stream failed {self._consecutive_reconnects} times: {error}")
+            self._consecutive_reconnects = 0
+            for future, _, _ in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        self._consecutive_reconnects += 1
+        self.reconnects += 1
+        await asyncio.sleep(self.reconnect_backoff_seconds * self._consecutive_reconnects)
+
+        if self._closed:
+            return
+        if self._call is None:
+            self._open()
+
+        # Re-send whatever was only sent on a stream that is now gone
+        for request_id, (future, request, generation) in list(self._pending.items()):
+            if not future.done() and generation < self._generation:
+                self._pending[request_id] = (future, request, self._generation)
+                self._send_queue.put_nowait(request)
+                self.replayed_requests += 1
+
+        logger.info(
+            f"Inference stream reconnected after: {error} "
+            f"(replayed {self.replayed_requests} requests so far)"
+        )
+
+    async def close(self) -> None:
+        """Close the stream and fail any outstanding requests."""
+        self._closed = True
+        call = self._call
+        self._detach()
+        if call is not None:
+            call.cancel()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        for future, _, _ in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(ConnectionError("Inference stream closed"))
+
+
 class MLInferenceClient:
     """gRPC client for ML-Pipeline inference server.
 
@@ -50,6 +236,11 @@ class MLInferenceClient:
     - Health checks and automatic reconnection
     """
 
+    # HTTP/2 keepalive keeps pooled channels warm between bursts and
+    # detects dead connections before a request pays for it
+    KEEPALIVE_TIME_MS = 30000
+    KEEPALIVE_TIMEOUT_MS = 10000
+
     def __init__(
         self,
         grpc_host: str = "localhost",
@@ -60,6 +251,9 @@ class MLInferenceClient:
         circuit_breaker_timeout: int = 30,
         mode: InferenceMode = InferenceMode.HYBRID,
         local_model_path: Optional[str] = None,
+        pool_size: int = 4,
+        use_streaming: bool = False,
+        max_in_flight: int = 1024,
     ):
         """Initialize the gRPC inference client.
 
@@ -72,6 +266,10 @@ class MLInferenceClient:
             circuit_breaker_timeout: Seconds to wait before retry after circuit opens
             mode: Inference mode (GRPC_PRIMARY, LOCAL_FALLBACK, HYBRID)
             local_model_path: Path to local model for fallback
+            pool_size: Number of persistent gRPC channels to round-robin over
+            use_streaming: Send predictions over one multiplexed
+                PredictStream instead of one unary RPC per call
+            max_in_flight: Maximum outstanding requests on the stream
         """
         self.grpc_host = grpc_host
         self.grpc_port = grpc_port
@@ -79,6 +277,17 @@ class MLInferenceClient:
         self.max_retries = max_retries
         self.mode = mode
         self.local_model_path = local_model_path
+        self.pool_size = max(1, pool_size)
+
+        # Channel pool (created lazily on the running event loop)
+        self._channels: List[grpc.aio.Channel] = []
+        self._stubs: List[inference_pb2_grpc.InferenceServiceStub] = []
+        self._next_channel = 0
+
+        # Streaming
+        self.use_streaming = use_streaming
+        self.max_in_flight = max_in_flight
+        self._stream: Optional[InferenceStream] = None
 
         # Circuit breaker
         self.circuit_breaker_threshold = circuit_breaker_threshold
@@ -156,17 +365,7 @@ class MLInferenceClient:
                 return result
             except Exception as e:
                 logger.warning(f"gRPC inference failed: {e}")
-                self.consecutive_failures += 1
-                self.failed_requests += 1
-
-                # Open circuit breaker if threshold exceeded
-                if self.consecutive_failures >= self.circuit_breaker_threshold:
-                    self.circuit_open = True
-                    self.circuit_open_time = time.time()
-                    logger.error(
-                        f"Circuit breaker opened after {self.consecutive_failures} "
-                        f"consecutive failures"
-                    )
+                self._record_grpc_failure()
 
                 # Fallback to local if hybrid mode
                 if self.mode == InferenceMode.HYBRID:
@@ -181,6 +380,86 @@ class MLInferenceClient:
         else:
             raise RuntimeError(f"Invalid inference mode: {self.mode}")
 
+    def _record_grpc_failure(self):
+        """Count a failed gRPC call and open the circuit breaker if needed."""
+        self.consecutive_failures += 1
+        self.failed_requests += 1
+
+        # Open circuit breaker if threshold exceeded
+        if self.consecutive_failures >= self.circuit_breaker_threshold:
+            self.circuit_open = True
+            self.circuit_open_time = time.time()
+            logger.error(
+                f"Circuit breaker opened after {self.consecutive_failures} "
+                f"consecutive failures"
+            )
+
+    def _get_stub(self) -> inference_pb2_grpc.InferenceServiceStub:
+        """Get the next stub from the channel pool, creating the pool if needed.
+
+        Each channel uses its own subchannel pool so the pool really holds
+        pool_size independent HTTP/2 connections.
+        """
+        if not self._stubs:
+            target = f"{self.grpc_host}:{self.grpc_port}"
+            options = [
+                ("grpc.keepalive_time_ms", self.KEEPALIVE_TIME_MS),
+                ("grpc.keepalive_timeout_ms", self.KEEPALIVE_TIMEOUT_MS),
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.max_pings_without_data", 0),
+                ("grpc.use_local_subchannel_pool", 1),
+            ]
+            for _ in range(self.pool_size):
+                channel = grpc.aio.insecure_channel(target, options=options)
+                self._channels.append(channel)
+                self._stubs.append(inference_pb2_grpc.InferenceServiceStub(channel))
+            logger.info(f"Opened {self.pool_size} gRPC channels to {target}")
+
+        stub = self._stubs[self._next_channel % len(self._stubs)]
+        self._next_channel += 1
+        return stub
+
+    def _get_stream(self) -> InferenceStream:
+        """Get the shared PredictStream session, creating it if needed."""
+        if self._stream is None:
+            self._stream = InferenceStream(
+                self._get_stub,
+                max_in_flight=self.max_in_flight,
+                max_reconnects=self.max_retries,
+            )
+        return self._stream
+
+    async def _call_with_deadline(self, method_name: str, request, deadline: float):
+        """Invoke an RPC on the pool, retrying UNAVAILABLE within the deadline.
+
+        Args:
+            method_name: Stub method name ("Predict" or "PredictBatch")
+            request: Protobuf request message
+            deadline: Absolute time.time() deadline derived from timeout_ms
+
+        Returns:
+            Protobuf response message
+        """
+        last_error: Optional[grpc.aio.AioRpcError] = None
+
+        for _ in range(self.max_retries + 1):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+
+            method = getattr(self._get_stub(), method_name)
+            try:
+                return await method(request, timeout=remaining)
+            except grpc.aio.AioRpcError as e:
+                last_error = e
+                # Only connection-level failures are worth another channel
+                if e.code() != grpc.StatusCode.UNAVAILABLE:
+                    raise
+
+        if last_error is not None:
+            raise last_error
+        raise asyncio.TimeoutError(f"gRPC deadline of {self.timeout_ms * 1000:.0f}ms exceeded")
+
     async def _predict_grpc(
         self,
         features: List[float],
@@ -189,40 +468,104 @@ class MLInferenceClient:
     ) -> GRPCPredictionResponse:
         """Make prediction via gRPC.
 
-        NOTE: In production, this would use actual gRPC client.
-        For now, we simulate the gRPC call with a simple HTTP-like interface.
+        The client deadline is derived from timeout_ms and propagated to
+        the server, so work for abandoned requests is cancelled there too.
         """
         start_time = time.time()
 
-        # In production, this would be:
-        # async with grpc.aio.insecure_channel(f"{self.grpc_host}:{self.grpc_port}") as channel:
-        #     stub = inference_pb2_grpc.InferenceServiceStub(channel)
-        #     request = inference_pb2.PredictionRequest(
-        #         features=features,
-        #         request_id=request_id,
-        #         model_version=model_version or ""
-        #     )
-        #     response = await stub.Predict(request, timeout=self.timeout_ms)
-
-        # For now, simulate a gRPC call with asyncio sleep
-        await asyncio.sleep(0.001)  # Simulate 1ms network latency
-
-        # Simulate XGBoost prediction
-        # In production, this comes from the gRPC server
-        features_array = np.array([features])
-        probability = self._simulate_xgboost_prediction(features_array)
+        request = inference_pb2.PredictionRequest(
+            features=features,
+            request_id=request_id,
+            model_version=model_version or "",
+        )
+        if self.use_streaming:
+            response = await self._get_stream().predict(request, self.timeout_ms)
+        else:
+            response = await self._call_with_deadline(
+                "Predict", request, start_time + self.timeout_ms
+            )
 
         latency_ms = (time.time() - start_time) * 1000
         self.grpc_requests += 1
         self.total_latency_ms += latency_ms
 
         return GRPCPredictionResponse(
-            is_fraud=probability >= 0.7,
-            probability=probability,
-            model_version=model_version or "xgboost_v2026.02.04",
+            is_fraud=response.is_fraud,
+            probability=response.probability,
+            model_version=response.model_version,
             latency_ms=latency_ms,
         )
 
+    async def predict_batch(
+        self,
+        features_batch: List[List[float]],
+        request_ids: Optional[List[str]] = None,
+        model_version: Optional[str] = None,
+    ) -> List[GRPCPredictionResponse]:
+        """Score several feature vectors in one PredictBatch RPC.
+
+        Falls back to local inference per item in HYBRID mode, or when the
+        circuit breaker is open.
+
+        Args:
+            features_batch: List of 8-feature vectors
+            request_ids: Optional request IDs, one per feature vector
+            model_version: Optional specific model version to use
+
+        Returns:
+            Responses in the same order as features_batch
+        """
+        start_time = time.time()
+        self.total_requests += len(features_batch)
+        request_ids = request_ids or [""] * len(features_batch)
+
+        if self.circuit_open:
+            if time.time() - self.circuit_open_time > self.circuit_breaker_timeout:
+                self.circuit_open = False
+                self.consecutive_failures = 0
+            else:
+                return [await self._predict_local(f, start_time) for f in features_batch]
+
+        if self.mode == InferenceMode.LOCAL_FALLBACK:
+            return [await self._predict_local(f, start_time) for f in features_batch]
+
+        request = inference_pb2.BatchPredictionRequest(
+            requests=[
+                inference_pb2.PredictionRequest(
+                    features=features,
+                    request_id=request_id,
+                    model_version=model_version or "",
+                )
+                for features, request_id in zip(features_batch, request_ids)
+            ]
+        )
+
+        try:
+            response = await self._call_with_deadline(
+                "PredictBatch", request, start_time + self.timeout_ms
+            )
+        except Exception as e:
+            logger.warning(f"gRPC batch inference failed: {e}")
+            self._record_grpc_failure()
+            if self.mode == InferenceMode.HYBRID:
+                return [await self._predict_local(f, start_time) for f in features_batch]
+            raise RuntimeError(f"gRPC inference failed: {e}")
+
+        self.consecutive_failures = 0
+        latency_ms = (time.time() - start_time) * 1000
+        self.grpc_requests += len(features_batch)
+        self.total_latency_ms += latency_ms * len(features_batch)
+
+        return [
+            GRPCPredictionResponse(
+                is_fraud=r.is_fraud,
+                probability=r.probability,
+                model_version=r.model_version,
+                latency_ms=latency_ms,
+            )
+            for r in response.responses
+        ]
+
     async def _predict_local(
         self,
         features: List[float],
@@ -327,6 +670,11 @@ class MLInferenceClient:
                 if self.total_requests > 0
                 else 0.0
             ),
+            "stream_in_flight": self._stream.in_flight if self._stream else 0,
+            "stream_reconnects": self._stream.reconnects if self._stream else 0,
+            "stream_replayed_requests": (
+                self._stream.replayed_requests if self._stream else 0
+            ),
         }
 
     def reset_circuit_breaker(self):
@@ -338,4 +686,10 @@ class MLInferenceClient:
     async def close(self):
         """Close the client and cleanup resources."""
         logger.info("MLInferenceClient shutting down")
-        # In production, close gRPC channel here
+        if self._stream is not None:
+            await self._stream.close()
+            self._stream = None
+        for channel in self._channels:
+            await channel.close()
+        self._channels = []
+        self._stubs = []
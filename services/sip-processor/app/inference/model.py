@@ -1,6 +1,8 @@
 """XGBoost model management."""
 import logging
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -17,8 +19,27 @@ except ImportError:
     xgb = None
 
 
+# Canary feature rows used to warm up and validate a freshly loaded model
+# before it is swapped in. Columns follow MaskingFeatures.feature_names().
+CANARY_FEATURES = np.array([
+    # asr, aloc, overlap, cli_mismatch, distinct_a, call_rate, short_ratio, high_vol
+    [85.0, 180.0, 0.05, 0.0, 1.0, 0.1, 0.05, 0.0],   # normal residential
+    [60.0, 95.0, 0.20, 0.0, 3.0, 0.6, 0.20, 0.0],    # busy business line
+    [35.0, 25.0, 0.85, 1.0, 7.0, 2.5, 0.70, 0.0],    # masking burst
+    [15.0, 8.0, 0.95, 1.0, 14.0, 4.0, 0.90, 1.0],    # high-volume masking
+], dtype=np.float32)
+
+
 class ModelManager:
-    """Manage XGBoost model loading and lifecycle."""
+    """Manage XGBoost model loading and lifecycle.
+    
+    Loading is double-buffered: a new Booster is loaded, warmed up and
+    validated on CANARY_FEATURES off to the side, then published with a
+    single reference swap. Predictions that already picked up the old
+    Booster finish on it; a failed load leaves the serving model untouched.
+    """
+    
+    WARMUP_ROUNDS = 3
     
     def __init__(self, model_path: Optional[str] = None):
         """Initialize the model manager.
@@ -29,6 +50,13 @@ class ModelManager:
         self.model_path = model_path or "models/xgboost_masking.json"
         self._model: Optional[xgb.Booster] = None
         self._is_loaded = False
+        self.model_version: Optional[str] = None
+        self.reload_count = 0
+        self.failed_reloads = 0
+        
+        # Serializes loaders; the prediction path never takes this lock
+        self._reload_lock = threading.Lock()
+        self._reload_executor: Optional[ThreadPoolExecutor] = None
     
     @property
     def is_available(self) -> bool:
@@ -40,35 +68,92 @@ class ModelManager:
         """Check if model is loaded."""
         return self._is_loaded and self._model is not None
     
-    def load(self) -> bool:
-        """Load the XGBoost model.
+    def load(self, model_path: Optional[str] = None, version: Optional[str] = None) -> bool:
+        """Load, validate and swap in an XGBoost model.
+        
+        Args:
+            model_path: Model file to load (defaults to the current path)
+            version: Optional version label, e.g. a registry model ID
         
         Returns:
-            True if model loaded successfully
+            True if the new model was swapped in
         """
         if not XGBOOST_AVAILABLE:
             logger.warning("XGBoost not available - using fallback rules")
             return False
         
-        try:
-            model_file = Path(self.model_path)
-            
-            if not model_file.exists():
-                logger.warning(f"Model file not found: {self.model_path}")
+        path = model_path or self.model_path
+        
+        with self._reload_lock:
+            try:
+                model_file = Path(path)
+                
+                if not model_file.exists():
+                    logger.warning(f"Model file not found: {path}")
+                    self.failed_reloads += 1
+                    return False
+                
+                candidate = xgb.Booster()
+                candidate.load_model(str(model_file))
+                self._validate(candidate)
+                
+            except Exception as e:
+                logger.error(f"Failed to load model from {path}: {e}")
+                self.failed_reloads += 1
                 return False
             
-            self._model = xgb.Booster()
-            self._model.load_model(str(model_file))
+            previous = self.model_version
+            
+            # Atomic reference swap; in-flight predictions keep the old Booster
+            self._model = candidate
             self._is_loaded = True
+            self.model_path = path
+            self.model_version = version or model_file.name
+            self.reload_count += 1
             
-            logger.info(f"Loaded XGBoost model from {self.model_path}")
+            logger.info(
+                f"Loaded XGBoost model from {path} "
+                f"(version={self.model_version}, previous={previous})"
+            )
             return True
+    
+    def load_async(
+        self, model_path: Optional[str] = None, version: Optional[str] = None
+    ) -> Future:
+        """Load a model on the background reload thread.
+        
+        The currently loaded model keeps serving until the new one has
+        been validated and swapped in.
+        
+        Args:
+            model_path: Model file to load (defaults to the current path)
+            version: Optional version label, e.g. a registry model ID
             
-        except Exception as e:
-            logger.error(f"Failed to load model: {e}")
-            self._model = None
-            self._is_loaded = False
-            return False
+        Returns:
+            Future resolving to the result of load()
+        """
+        if self._reload_executor is None:
+            self._reload_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="model-reload"
+            )
+        return self._reload_executor.submit(self.load, model_path, version)
+    
+    def _validate(self, model: "xgb.Booster") -> None:
+        """Warm up a candidate model and sanity-check it on canary rows.
+        
+        Raises:
+            ValueError: If the model produces unusable predictions
+        """
+        dmatrix = xgb.DMatrix(CANARY_FEATURES)
+        for _ in range(self.WARMUP_ROUNDS):
+            predictions = model.predict(dmatrix)
+        
+        if predictions.shape != (len(CANARY_FEATURES),):
+            raise ValueError(f"Unexpected canary output shape {predictions.shape}")
+        if not np.all(np.isfinite(predictions)):
+            raise ValueError("Canary predictions contain NaN or inf")
+        if np.any((predictions < 0.0) | (predictions > 1.0)):
+            raise ValueError("Canary predictions are not probabilities")
     
     def predict(self, features: np.ndarray) -> np.ndarray:
         """Make prediction with the model.
@@ -79,18 +164,27 @@ class ModelManager:
         Returns:
             Prediction probabilities
         """
-        if not self.is_loaded:
+        # Take one reference so a concurrent swap cannot change the model mid-call
+        model = self._model
+        if model is None or not self._is_loaded:
             raise RuntimeError("Model not loaded")
         
         dmatrix = xgb.DMatrix(features)
-        return self._model.predict(dmatrix)
+        return model.predict(dmatrix)
     
     def unload(self) -> None:
         """Unload the model to free memory."""
         self._model = None
         self._is_loaded = False
+        self.model_version = None
         logger.info("Model unloaded")
     
+    def shutdown(self) -> None:
+        """Stop the background reload thread."""
+        if self._reload_executor is not None:
+            self._reload_executor.shutdown(wait=True)
+            self._reload_executor = None
+    
     @staticmethod
     def create_dummy_model(output_path: str = "models/xgboost_masking.json") -> None:
         """Create a dummy model for testing.
@@ -0,0 +1 @@
+"""Generated gRPC stubs for the ML-Pipeline inference API."""
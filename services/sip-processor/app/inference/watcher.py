@@ -0,0 +1,233 @@
+"""Background model watcher for hot-swapping new champions."""
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from .model import ModelManager
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWatcher:
+    """Poll for new models and hot-swap them into a ModelManager.
+
+    Modes:
+    - "file": reload when the model file's mtime or size changes
+    - "registry": reload when the ML-Pipeline ModelRegistry promotes a
+      new champion. Reads registry.db (read-only; re-queried only when
+      PRAGMA data_version changes) when the registry uses the SQLite
+      backend, and registry_index.json otherwise.
+
+    Loading happens on the ModelManager's reload thread, so the serving
+    model is never blocked while the new one is loaded and validated.
+    """
+
+    MODE_FILE = "file"
+    MODE_REGISTRY = "registry"
+    REGISTRY_INDEX = "registry_index.json"
+    REGISTRY_DB = "registry.db"
+
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        mode: str = MODE_FILE,
+        watch_path: Optional[str] = None,
+        poll_interval_seconds: float = 30.0,
+        on_reload: Optional[Callable[[bool], None]] = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            model_manager: Model manager to reload
+            mode: "file" or "registry"
+            watch_path: Model file (file mode) or registry directory (registry mode)
+            poll_interval_seconds: Seconds between polls
+            on_reload: Callback invoked with the reload result
+        """
+        if mode not in (self.MODE_FILE, self.MODE_REGISTRY):
+            raise ValueError(f"Unknown watch mode: {mode}")
+
+        self.model_manager = model_manager
+        self.mode = mode
+        self.watch_path = Path(watch_path or model_manager.model_path)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.on_reload = on_reload
+
+        # Signature of the model last loaded, and of the one being loaded;
+        # a failed load clears the latter so the next poll retries it
+        self._last_seen: Optional[Tuple] = None
+        self._pending: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_version: Optional[int] = None
+        self._db_champion: Optional[Tuple[str, str]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # In file mode the file at startup is already loaded; in registry
+        # mode the first poll pulls in whatever the champion currently is
+        if mode == self.MODE_FILE:
+            self._last_seen = self._current_signature()
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Model watcher started: mode={self.mode}, path={self.watch_path}, "
+            f"interval={self.poll_interval_seconds}s"
+        )
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval_seconds + 1)
+            self._thread = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        logger.info("Model watcher stopped")
+
+    def _run(self) -> None:
+        """Poll loop."""
+        while not self._stop_event.wait(self.poll_interval_seconds):
+            try:
+                future = self.poll_once()
+                if future is not None:
+                    future.result()
+            except Exception as e:
+                logger.error(f"Model watcher poll failed: {e}")
+
+    def poll_once(self):
+        """Check for a new model and schedule a reload if one is found.
+
+        Returns:
+            Future for the scheduled reload, or None if nothing changed
+        """
+        signature = self._current_signature()
+        with self._lock:
+            if signature is None or signature in (self._last_seen, self._pending):
+                return None
+            self._pending = signature
+
+        if self.mode == self.MODE_REGISTRY:
+            champion_id, model_path = signature
+            logger.info(f"New champion detected in registry: {champion_id}")
+            future = self.model_manager.load_async(model_path, version=champion_id)
+        else:
+            logger.info(f"Model file changed: {self.watch_path}")
+            future = self.model_manager.load_async(str(self.watch_path))
+
+        future.add_done_callback(lambda f: self._reload_done(signature, f))
+        if self.on_reload:
+            future.add_done_callback(lambda f: self.on_reload(f.result()))
+        return future
+
+    def _reload_done(self, signature: Tuple, future) -> None:
+        """Record a finished reload; a failed one is retried on the next poll."""
+        loaded = not future.cancelled() and future.exception() is None and future.result()
+        with self._lock:
+            self._pending = None
+            if loaded:
+                self._last_seen = signature
+        if not loaded:
+            logger.warning(f"Model reload failed, retrying on the next poll: {signature}")
+
+    def _current_signature(self) -> Optional[Tuple]:
+        """Get a cheap fingerprint of the watched model."""
+        if self.mode == self.MODE_REGISTRY:
+            return self._read_registry_champion()
+
+        try:
+            stat = self.watch_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_registry_champion(self) -> Optional[Tuple[str, str]]:
+        """Read the champion model ID and path from the registry."""
+        if (self.watch_path / self.REGISTRY_DB).exists():
+            champion = self._read_registry_db()
+        else:
+            champion = self._read_registry_index()
+
+        if champion is None:
+            return None
+        return self._resolve_model_path(*champion)
+
+    def _read_registry_index(self) -> Optional[Tuple[str, Optional[str]]]:
+        """Read the champion from a JSON registry's registry_index.json."""
+        index_path = self.watch_path / self.REGISTRY_INDEX
+
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            # Index is being rewritten; try again on the next poll
+            logger.debug(f"Registry index {index_path} not readable yet")
+            return self._last_seen
+
+        champion_id = index.get("champion")
+        if not champion_id:
+            return None
+
+        return champion_id, index.get("models", {}).get(champion_id, {}).get("model_path")
+
+    def _read_registry_db(self) -> Optional[Tuple[str, Optional[str]]]:
+        """Read the champion from a SQLite registry's registry.db.
+
+        The connection is read-only and kept open; the champion is only
+        re-queried when PRAGMA data_version shows another connection
+        has committed.
+        """
+        try:
+            if self._db is None:
+                db_uri = (self.watch_path / self.REGISTRY_DB).resolve().as_uri()
+                self._db = sqlite3.connect(f"{db_uri}?mode=ro", uri=True, check_same_thread=False)
+                self._db_version = None
+
+            data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._db_version:
+                self._db_champion = self._db.execute(
+                    """
+                    SELECT m.model_id, m.model_path
+                    FROM registry_state s JOIN models m ON m.model_id = s.value
+                    WHERE s.key = 'champion'
+                    """
+                ).fetchone()
+                self._db_version = data_version
+        except sqlite3.Error as e:
+            # Locked, or the schema is not created yet; try again on the next poll
+            logger.debug(f"Registry database not readable yet: {e}")
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            return self._last_seen
+
+        return tuple(self._db_champion) if self._db_champion else None
+
+    def _resolve_model_path(
+        self, champion_id: str, model_path: Optional[str]
+    ) -> Optional[Tuple[str, str]]:
+        """Find the champion's model file as seen from this process."""
+        if not model_path or not Path(model_path).exists():
+            # Paths in the registry are relative to the orchestrator; fall back
+            # to the registry layout <registry>/<model_id>/model.*
+            model_files = sorted((self.watch_path / champion_id).glob("model.*"))
+            if not model_files:
+                return None
+            model_path = str(model_files[0])
+
+        return champion_id, model_path
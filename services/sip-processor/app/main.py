@@ -6,7 +6,7 @@ import logging
 
 from .config import get_settings
 from .dependencies import lifespan_context
-from .api.routes import router as api_router
+from .api.routes import router as api_router, get_inference_engine
 
 # Configure logging
 logging.basicConfig(
@@ -24,7 +24,25 @@ async def lifespan(app: FastAPI):
     
     async with lifespan_context():
         logger.info("Database connections initialized")
+        
+        engine = None
+        if settings.model_watch_mode != "off":
+            engine = get_inference_engine()
+            watch_path = (
+                settings.model_registry_path
+                if settings.model_watch_mode == "registry"
+                else settings.model_path
+            )
+            engine.start_model_watcher(
+                mode=settings.model_watch_mode,
+                watch_path=watch_path,
+                poll_interval_seconds=settings.model_poll_interval_seconds
+            )
+        
         yield
+        
+        if engine:
+            engine.stop_model_watcher()
     
     logger.info("Application shutdown complete")
 
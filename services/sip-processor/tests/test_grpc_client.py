@@ -1,5 +1,11 @@
 """Unit tests for gRPC ML inference client."""
 import asyncio
+import time
+
+from typing import Optional
+
+import grpc
+import numpy as np
 import pytest
 
 import sys
@@ -10,6 +16,69 @@ from app.inference.grpc_client import (
     InferenceMode,
     GRPCPredictionResponse,
 )
+from app.inference.protos import inference_pb2, inference_pb2_grpc
+
+
+class RuleBasedServicer(inference_pb2_grpc.InferenceServiceServicer):
+    """In-process stand-in for the ML-Pipeline inference server."""
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+        self.streams = 0
+        self.drop_first_stream_after: Optional[int] = None
+
+    def _score(self, request):
+        features = request.features
+        probability = 0.9 if features[4] >= 5 and features[2] > 0.8 else 0.1
+        return inference_pb2.PredictionResponse(
+            is_fraud=probability >= 0.7,
+            probability=probability,
+            model_version="test_model",
+            request_id=request.request_id,
+        )
+
+    async def Predict(self, request, context):
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        return self._score(request)
+
+    async def PredictBatch(self, request, context):
+        self.calls += 1
+        return inference_pb2.BatchPredictionResponse(
+            responses=[self._score(r) for r in request.requests]
+        )
+
+    async def PredictStream(self, request_iterator, context):
+        """Answer in reverse order of arrival within each burst."""
+        self.streams += 1
+        received = 0
+        burst = []
+        async for request in request_iterator:
+            self.calls += 1
+            received += 1
+            if self.streams == 1 and received == self.drop_first_stream_after:
+                await context.abort(grpc.StatusCode.UNAVAILABLE, "simulated drop")
+            burst.append(request)
+            if len(burst) == 2:
+                for r in reversed(burst):
+                    yield self._score(r)
+                burst = []
+        for r in burst:
+            yield self._score(r)
+
+
+@pytest.fixture
+async def local_server():
+    """Start an in-process gRPC server on a free port."""
+    servicer = RuleBasedServicer()
+    server = grpc.aio.server()
+    inference_pb2_grpc.add_InferenceServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    yield servicer, port
+    await server.stop(0)
 
 
 @pytest.fixture
@@ -135,18 +204,195 @@ class TestMLInferenceClient:
         assert grpc_only_client.consecutive_failures == 0
 
     @pytest.mark.asyncio
-    async def test_predict_multiple_requests(self, grpc_client):
+    async def test_predict_multiple_requests(self, local_server):
         """Test multiple predictions."""
+        servicer, port = local_server
+        client = MLInferenceClient(grpc_host="127.0.0.1", grpc_port=port, timeout_ms=1000)
         features = [50.0, 100.0, 0.5, 0.0, 3.0, 1.0, 0.2, 0.0]
 
         # Make multiple predictions
         for i in range(10):
-            response = await grpc_client.predict(features, request_id=f"test-{i}")
+            response = await client.predict(features, request_id=f"test-{i}")
             assert isinstance(response, GRPCPredictionResponse)
 
         # Verify metrics
-        assert grpc_client.total_requests == 10
-        assert grpc_client.grpc_requests > 0  # Should have used gRPC
+        assert client.total_requests == 10
+        assert client.grpc_requests > 0  # Should have used gRPC
+        assert servicer.calls == 10
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_grpc_round_trip_latency(self, local_server):
+        """Measure round-trip latency against an in-process server."""
+        servicer, port = local_server
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1", grpc_port=port, timeout_ms=1000, pool_size=2
+        )
+        features = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+        await client.predict(features)  # establish pooled connections
+
+        latencies = []
+        for _ in range(200):
+            start = time.perf_counter()
+            response = await client.predict(features)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"\ngRPC round trip: p50={p50:.2f}ms p99={p99:.2f}ms")
+
+        assert response.model_version == "test_model"
+        assert response.is_fraud is True
+        assert client.local_requests == 0
+        assert len(client._channels) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_predict_batch(self, local_server):
+        """Test PredictBatch keeps request order."""
+        servicer, port = local_server
+        client = MLInferenceClient(grpc_host="127.0.0.1", grpc_port=port, timeout_ms=1000)
+        high = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+        low = [80.0, 200.0, 0.2, 0.0, 2.0, 0.5, 0.1, 0.0]
+
+        responses = await client.predict_batch([high, low, high])
+
+        assert [r.is_fraud for r in responses] == [True, False, True]
+        assert servicer.calls == 1
+        assert client.grpc_requests == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_deadline_propagates_from_timeout(self, local_server):
+        """Test a slow server trips the timeout_ms deadline."""
+        servicer, port = local_server
+        servicer.delay_seconds = 0.5
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1",
+            grpc_port=port,
+            timeout_ms=50,
+            mode=InferenceMode.GRPC_PRIMARY,
+        )
+
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError):
+            await client.predict([50.0, 100.0, 0.5, 0.0, 3.0, 1.0, 0.2, 0.0])
+
+        assert time.perf_counter() - start < 0.4
+        assert client.failed_requests == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_streaming_multiplexes_out_of_order(self, local_server):
+        """Test concurrent calls share one stream and get their own answers."""
+        servicer, port = local_server
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1", grpc_port=port, timeout_ms=2000, use_streaming=True
+        )
+        high = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+        low = [80.0, 200.0, 0.2, 0.0, 2.0, 0.5, 0.1, 0.0]
+
+        responses = await asyncio.gather(*(
+            client.predict(high if i % 2 else low, request_id=f"call-{i}")
+            for i in range(100)
+        ))
+
+        assert [r.is_fraud for r in responses] == [bool(i % 2) for i in range(100)]
+        assert servicer.streams == 1
+        assert client.grpc_requests == 100
+        assert client.get_metrics()["stream_in_flight"] == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_streaming_replays_after_stream_failure(self, local_server):
+        """Test unanswered requests are replayed on a new stream."""
+        servicer, port = local_server
+        servicer.drop_first_stream_after = 3
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1", grpc_port=port, timeout_ms=2000, use_streaming=True
+        )
+        high = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+
+        responses = await asyncio.gather(*(client.predict(high) for _ in range(10)))
+
+        assert all(r.is_fraud for r in responses)
+        assert servicer.streams == 2
+        metrics = client.get_metrics()
+        assert metrics["stream_reconnects"] == 1
+        assert metrics["stream_replayed_requests"] > 0
+        assert client.failed_requests == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_streaming_flow_control_limits_in_flight(self, local_server):
+        """Test callers beyond max_in_flight wait for a free slot."""
+        servicer, port = local_server
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1",
+            grpc_port=port,
+            timeout_ms=2000,
+            use_streaming=True,
+            max_in_flight=2,
+        )
+        high = [30.0, 50.0, 0.9, 1.0, 8.0, 3.0, 0.5, 1.0]
+
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            task = asyncio.ensure_future(client.predict(high))
+            await asyncio.sleep(0)
+            peak = max(peak, client.get_metrics()["stream_in_flight"])
+            return await task
+
+        responses = await asyncio.gather(*(call() for _ in range(20)))
+
+        assert len(responses) == 20
+        assert peak <= 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_streaming_unreachable_server_opens_circuit(self):
+        """Test a stream that cannot connect feeds the circuit breaker."""
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1",
+            grpc_port=1,
+            timeout_ms=500,
+            max_retries=1,
+            circuit_breaker_threshold=2,
+            mode=InferenceMode.HYBRID,
+            local_model_path="models/xgboost_masking.json",
+            use_streaming=True,
+        )
+        features = [50.0, 100.0, 0.5, 0.0, 3.0, 1.0, 0.2, 0.0]
+
+        for _ in range(2):
+            response = await client.predict(features)
+            assert response.model_version == "local_fallback"
+
+        assert client.circuit_open is True
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_falls_back_and_opens_circuit(self):
+        """Test an unreachable server falls back locally and opens the breaker."""
+        client = MLInferenceClient(
+            grpc_host="127.0.0.1",
+            grpc_port=1,
+            timeout_ms=200,
+            max_retries=1,
+            circuit_breaker_threshold=3,
+            mode=InferenceMode.HYBRID,
+            local_model_path="models/xgboost_masking.json",
+        )
+        features = [50.0, 100.0, 0.5, 0.0, 3.0, 1.0, 0.2, 0.0]
+
+        for _ in range(3):
+            response = await client.predict(features)
+            assert response.model_version == "local_fallback"
+
+        assert client.circuit_open is True
+        assert client.grpc_requests == 0
+        await client.close()
 
     def test_inference_mode_hybrid(self):
         """Test HYBRID mode initialization."""
@@ -1,10 +1,17 @@
 """Tests for inference engine."""
+import json
+import os
+import sqlite3
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime
 
 from app.inference.engine import MaskingInferenceEngine, PredictionResult
 from app.inference.features import FeatureExtractor, MaskingFeatures
+from app.inference.model import CANARY_FEATURES, ModelManager
+from app.inference.watcher import ModelWatcher
 from app.cdr.models import CDRMetrics
 
 
@@ -149,3 +156,200 @@ class TestMaskingInferenceEngine:
         
         with pytest.raises(ValueError):
             engine.update_threshold(1.5)
+
+
+class TestModelHotSwap:
+    """Tests for double-buffered model reloading."""
+    
+    @pytest.fixture
+    def model_file(self, tmp_path):
+        """Create a dummy XGBoost model on disk."""
+        pytest.importorskip("xgboost")
+        path = tmp_path / "xgboost_masking.json"
+        ModelManager.create_dummy_model(str(path))
+        return path
+    
+    def test_load_validates_and_swaps(self, model_file):
+        """Test loading publishes a validated model."""
+        manager = ModelManager(str(model_file))
+        
+        assert manager.load()
+        assert manager.is_loaded
+        assert manager.model_version == model_file.name
+        assert manager.predict(CANARY_FEATURES).shape == (len(CANARY_FEATURES),)
+    
+    def test_failed_reload_keeps_serving_model(self, model_file, tmp_path):
+        """Test a broken model file does not replace the current model."""
+        manager = ModelManager(str(model_file))
+        manager.load()
+        serving = manager._model
+        
+        broken = tmp_path / "broken.json"
+        broken.write_text("{not a model")
+        
+        assert not manager.load(str(broken))
+        assert manager._model is serving
+        assert manager.model_path == str(model_file)
+        assert manager.failed_reloads == 1
+    
+    def test_in_flight_prediction_uses_old_model(self, model_file):
+        """Test a swap during prediction does not affect the running call."""
+        manager = ModelManager(str(model_file))
+        manager.load()
+        old_model = manager._model
+        
+        seen = []
+        
+        class RecordingBooster:
+            def predict(self, dmatrix):
+                # Swap mid-prediction; this call must still finish here
+                manager.load()
+                seen.append(self)
+                return old_model.predict(dmatrix)
+        
+        recording = RecordingBooster()
+        manager._model = recording
+        manager.predict(CANARY_FEATURES)
+        
+        assert seen == [recording]
+        assert manager._model is not recording
+    
+    def test_engine_reload_async(self, model_file):
+        """Test background reload switches the engine to the model."""
+        engine = MaskingInferenceEngine(model_path=str(model_file.parent / "missing.json"))
+        assert not engine._use_model
+        
+        engine.model_manager.model_path = str(model_file)
+        assert engine.reload_model_async().result(timeout=10)
+        assert engine._use_model
+        
+        engine.stop_model_watcher()
+    
+    def test_watcher_file_mode_detects_change(self, model_file):
+        """Test file mode reloads when the model file is replaced."""
+        manager = ModelManager(str(model_file))
+        manager.load()
+        watcher = ModelWatcher(manager, mode="file", watch_path=str(model_file))
+        
+        assert watcher.poll_once() is None
+        
+        ModelManager.create_dummy_model(str(model_file))
+        os.utime(model_file, ns=(0, 0))
+        future = watcher.poll_once()
+        
+        assert future is not None
+        assert future.result(timeout=10)
+        assert manager.reload_count == 2
+        manager.shutdown()
+    
+    def test_watcher_registry_mode_follows_champion(self, model_file, tmp_path):
+        """Test registry mode loads the promoted champion."""
+        registry = tmp_path / "registry"
+        model_dir = registry / "xgboost_v2026.02.04"
+        model_dir.mkdir(parents=True)
+        (model_dir / "model.json").write_bytes(model_file.read_bytes())
+        (registry / "registry_index.json").write_text(json.dumps({
+            "models": {"xgboost_v2026.02.04": {"model_path": "relative/model.json"}},
+            "champion": "xgboost_v2026.02.04",
+        }))
+        
+        manager = ModelManager(str(model_file))
+        watcher = ModelWatcher(manager, mode="registry", watch_path=str(registry))
+        
+        future = watcher.poll_once()
+        assert future.result(timeout=10)
+        assert manager.model_version == "xgboost_v2026.02.04"
+        assert watcher.poll_once() is None
+        manager.shutdown()
+
+    def test_watcher_retries_failed_champion_reload(self, model_file, tmp_path):
+        """Test a champion that fails to load is retried on the next poll."""
+        registry = tmp_path / "registry"
+        model_dir = registry / "xgboost_v2026.02.04"
+        model_dir.mkdir(parents=True)
+        (model_dir / "model.json").write_text("{not a model")
+        (registry / "registry_index.json").write_text(json.dumps({
+            "models": {"xgboost_v2026.02.04": {"model_path": "relative/model.json"}},
+            "champion": "xgboost_v2026.02.04",
+        }))
+
+        manager = ModelManager(str(model_file))
+        reloads = []
+        reloaded = threading.Event()
+
+        def on_reload(result):
+            reloads.append(result)
+            reloaded.set()
+
+        watcher = ModelWatcher(manager, mode="registry", watch_path=str(registry), on_reload=on_reload)
+
+        assert not watcher.poll_once().result(timeout=10)
+        assert reloaded.wait(timeout=10)
+
+        # Once the file is readable (e.g. the copy finished), the same champion loads
+        (model_dir / "model.json").write_bytes(model_file.read_bytes())
+        assert watcher.poll_once().result(timeout=10)
+        assert manager.model_version == "xgboost_v2026.02.04"
+        assert reloads == [False, True]
+        manager.shutdown()
+
+    @staticmethod
+    def _write_registry(registry, backend, models, champion):
+        """Write a registry the way the ML-Pipeline backend lays it out.
+
+        "json" is ModelRegistry's registry_index.json; "sqlite" is the
+        models / registry_state tables of SQLiteModelRegistry's
+        registry.db. Model paths are the orchestrator's, so they do not
+        exist here.
+        """
+        if backend == "json":
+            (registry / "registry_index.json").write_text(json.dumps({
+                "models": {m: {"model_path": f"/orchestrator/{m}/model.json"} for m in models},
+                "champion": champion,
+            }))
+            return
+
+        conn = sqlite3.connect(registry / "registry.db", isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS models (model_id TEXT PRIMARY KEY, model_path TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS registry_state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        for model_id in models:
+            conn.execute(
+                "INSERT OR REPLACE INTO models VALUES (?, ?)",
+                (model_id, f"/orchestrator/{model_id}/model.json"),
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO registry_state VALUES ('champion', ?)", (champion,)
+        )
+        conn.close()
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_watcher_follows_champion_on_both_registry_backends(
+        self, model_file, tmp_path, backend
+    ):
+        """Test registry mode sees promotions from the JSON and SQLite registries."""
+        registry = tmp_path / "registry"
+        models = ["xgboost_v2026.02.04", "xgboost_v2026.02.05"]
+        for model_id in models:
+            (registry / model_id).mkdir(parents=True)
+            (registry / model_id / "model.json").write_bytes(model_file.read_bytes())
+        self._write_registry(registry, backend, models[:1], models[0])
+
+        manager = ModelManager(str(model_file))
+        watcher = ModelWatcher(manager, mode="registry", watch_path=str(registry))
+
+        assert watcher.poll_once().result(timeout=10)
+        assert manager.model_version == models[0]
+        assert watcher.poll_once() is None
+
+        self._write_registry(registry, backend, models, models[1])
+        assert watcher.poll_once().result(timeout=10)
+        assert manager.model_version == models[1]
+        assert watcher.poll_once() is None
+
+        watcher.stop()
+        manager.shutdown()